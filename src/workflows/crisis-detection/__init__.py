@@ -3,14 +3,32 @@ Crisis Detection Workflow Package
 Real-time monitoring and intelligent crisis detection for political campaigns
 """
 
-from .agents.crisis_detection import CrisisDetectionAgent
-from .agents.monitoring import MentionlyticsAgent
-from .agents.alert_routing import AlertRoutingAgent
-from .workflow import CrisisDetectionWorkflow
+import importlib
 
-__all__ = [
-    "CrisisDetectionAgent",
-    "MentionlyticsAgent", 
-    "AlertRoutingAgent",
-    "CrisisDetectionWorkflow"
-]
\ No newline at end of file
+# Exports are resolved on first access (PEP 562), so importing a light
+# entry point (e.g. RateLimiter or verify_webhook_signature in a webhook
+# worker) does not pull in LangGraph, LangChain or the OpenAI client.
+_EXPORTS = {
+    "CrisisDetectionAgent": ".agents.crisis_detection",
+    "MentionlyticsAgent": ".agents.monitoring",
+    "AlertRoutingAgent": ".agents.alert_routing",
+    "CrisisDetectionWorkflow": ".workflow",
+    "CrisisReplay": ".replay",
+    "run_replay": ".replay",
+    "RateLimiter": ".utils.rate_limiter",
+    "verify_webhook_signature": ".agents.monitoring"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,32 @@
+"""
+Crisis Detection Agents
+"""
+
+import importlib
+
+# Exports are resolved on first access (PEP 562)
+_EXPORTS = {
+    "CrisisDetectionAgent": ".crisis_detection",
+    "CrisisMention": ".crisis_detection",
+    "CrisisAnalysis": ".crisis_detection",
+    "MentionlyticsAgent": ".monitoring",
+    "MentionlyticsConfig": ".monitoring",
+    "verify_webhook_signature": ".monitoring",
+    "AlertRoutingAgent": ".alert_routing",
+    "AlertRoute": ".alert_routing",
+    "AlertPriority": ".alert_routing"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,16 +3,22 @@ Alert Routing Agent - Intelligent distribution of crisis alerts
 """
 
 import asyncio
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import re
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 import logging
 
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
 from .crisis_detection import CrisisAnalysis
+from ..utils.bounded_history import BoundedHistory
+from ..utils.llm_gateway import LLMGateway
+from ..utils.model_cascade import ModelCascade, create_model_cascade
+from ..utils.recipient_index import RecipientIndex
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +51,14 @@ class RecipientProfile(BaseModel):
     response_history: Dict = {}  # Track response times and effectiveness
 
 
+class PersonalizationMode(Enum):
+    """How alert messages are personalized per recipient"""
+    LLM = "llm"                                      # One LLM call per recipient
+    BATCH = "batch"                                  # One LLM call for all recipients
+    TEMPLATE = "template"                            # Cached per-role templates only
+    TEMPLATE_THEN_ENRICH = "template_then_enrich"    # Template now, LLM follow-up later
+
+
 class AlertRoute(BaseModel):
     """Routing plan for an alert"""
     recipient: RecipientProfile
@@ -53,21 +67,187 @@ class AlertRoute(BaseModel):
     priority: AlertPriority
     expected_response_time: int = 30  # minutes
     escalation_plan: Optional[Dict] = None
+    message_source: str = "llm"  # "llm" or "template"
+    enrich_pending: bool = False  # Templated message awaiting LLM follow-up
+    alert_id: str = Field(default_factory=lambda: uuid.uuid4().hex)  # Used to acknowledge the alert
+
+
+def make_alert_id(alert_key: str, recipient_id: str, threat_type: str) -> str:
+    """Deterministic alert ID, so re-routing the same alert reuses its delivery idempotency keys"""
+    return hashlib.sha256(f"{alert_key}|{recipient_id}|{threat_type}".encode("utf-8")).hexdigest()[:32]
+
+
+# Prompt message specs; the LLM gateway compiles each template once
+RECIPIENT_SELECTION_PROMPT_MESSAGES = [
+    ("system", """You are an expert at crisis management for political campaigns.
+    Select the most appropriate team members to handle this crisis based on:
+    1. Their expertise areas matching the crisis type
+    2. Their current availability (working hours)
+    3. The severity and urgency of the situation
+    4. Past response effectiveness
+    
+    Available team members: {team_members}"""),
+    ("human", """Select recipients for this crisis:
+    
+    Crisis Type: {threat_type}
+    Severity: {severity}/10
+    Priority: {priority}
+    Affected Topics: {affected_topics}
+    Current Time: {current_time}
+    
+    Return a list of recipient IDs who should be notified, ordered by importance.""")
+]
+
+
+PERSONALIZATION_PROMPT_MESSAGES = [
+    ("system", """Create a concise, actionable alert message for a campaign team member.
+    Tailor the message to their role and expertise.
+    Include:
+    1. Clear subject/headline
+    2. Brief crisis summary (2-3 sentences)
+    3. Why they specifically are being notified
+    4. Immediate actions they should take
+    5. Escalation instructions if needed
+    
+    Keep it under 200 words for SMS/Slack, 500 words for email."""),
+    ("human", """Create alert message for:
+    
+    Recipient: {role} with expertise in {expertise}
+    Priority: {priority}
+    
+    Crisis Summary:
+    - Type: {threat_type}
+    - Severity: {severity}/10
+    - Key Issues: {affected_topics}
+    
+    Mention Summary: {mention_summary}
+    
+    Recommended Actions: {recommended_actions}""")
+]
+
+
+BATCH_PERSONALIZATION_PROMPT_MESSAGES = [
+    ("system", """Create concise, actionable alert messages for several campaign team members.
+    Tailor each message to the recipient's role and expertise.
+    Each message should include:
+    1. Clear subject/headline
+    2. Brief crisis summary (2-3 sentences)
+    3. Why they specifically are being notified
+    4. Immediate actions they should take
+    
+    Keep each message under 200 words.
+    Start each message with a line containing only "### " followed by the recipient ID."""),
+    ("human", """Create alert messages for these recipients:
+    {recipients}
+    
+    Priority: {priority}
+    
+    Crisis Summary:
+    - Type: {threat_type}
+    - Severity: {severity}/10
+    - Key Issues: {affected_topics}
+    
+    Mention Summary: {mention_summary}
+    
+    Recommended Actions: {recommended_actions}""")
+]
+
+
+# Per-role focus line used by templated (LLM-free) alert messages
+ROLE_MESSAGE_FOCUS = {
+    "campaign_manager": "You own the overall response decision and resourcing.",
+    "comms_director": "Prepare the press and messaging response.",
+    "digital_director": "Assess online spread and prepare the social media response.",
+    "legal_counsel": "Review legal exposure before any public response."
+}
+
+MESSAGE_TEMPLATE = (
+    "[{priority}] Crisis alert: {threat_type} (severity {severity}/10)\n"
+    "Key issues: {affected_topics}\n"
+    "Why you: {focus}\n"
+    "Immediate actions:\n{recommended_actions}\n\n"
+    "{mention_summary}"
+)
 
 
 class AlertRoutingAgent:
     """Intelligent alert routing based on context and recipient profiles"""
     
-    def __init__(self, openai_api_key: str):
-        self.llm = ChatOpenAI(
-            model="gpt-4",
+    def __init__(
+        self,
+        openai_api_key: str,
+        model_cascade: Optional[ModelCascade] = None,
+        model_tiers: Optional[List[Dict[str, Any]]] = None,
+        confidence_threshold: float = 0.6,
+        severity_threshold: int = 7,
+        gateway: Optional[LLMGateway] = None,
+        personalization_mode: PersonalizationMode = PersonalizationMode.BATCH,
+        immediate_priorities: Tuple[AlertPriority, ...] = (AlertPriority.CRITICAL,),
+        use_llm_selection: bool = False,
+        llm_shortlist_size: int = 10,
+        selection_cache_size: int = 256,
+        max_concurrent_routes: int = 8,
+        personalization_timeout_seconds: float = 20.0,
+        history_size: int = 1000,
+        response_history_size: int = 100,
+        history_dir: Optional[str] = None
+    ):
+        """
+        Initialize alert routing agent
+        
+        Args:
+            openai_api_key: OpenAI API key for the default model cascade
+            model_cascade: Pre-built model cascade (overrides model_tiers)
+            model_tiers: Tier configs for the default model cascade
+            confidence_threshold: Analyses below this confidence use the top tier
+            severity_threshold: Analyses at or above this severity use the top tier
+            gateway: Shared LLM gateway for the default model cascade
+            personalization_mode: Default message personalization strategy
+            immediate_priorities: Priorities that always get a templated
+                message immediately, followed by an LLM-personalized update
+            use_llm_selection: Refine indexed recipient selection with the LLM
+            llm_shortlist_size: Indexed candidates offered to the LLM
+            selection_cache_size: Cached LLM selections (threat, priority, hour)
+            max_concurrent_routes: Recipients whose routes are built at once
+            personalization_timeout_seconds: Deadline for an LLM-personalized
+                message before the recipient gets the template instead
+            history_size: Routing decisions kept in memory
+            response_history_size: Responses kept in memory per recipient
+            history_dir: Directory older history records spill to (None: dropped)
+        """
+        # Cheap tier handles routing calls first; high-stakes alerts and
+        # unparseable selections escalate to the top tier
+        self.cascade = model_cascade or create_model_cascade(
+            openai_api_key,
             temperature=0.3,
-            openai_api_key=openai_api_key
+            tiers=model_tiers,
+            gateway=gateway
         )
+        self.gateway = self.cascade.gateway
+        self.confidence_threshold = confidence_threshold
+        self.severity_threshold = severity_threshold
+        self.personalization_mode = personalization_mode
+        self.immediate_priorities = immediate_priorities
+        self._role_templates: Dict[str, str] = {}
+        self.use_llm_selection = use_llm_selection
+        self.llm_shortlist_size = llm_shortlist_size
+        self.selection_cache_size = selection_cache_size
+        self._selection_cache: OrderedDict = OrderedDict()
+        self.max_concurrent_routes = max_concurrent_routes
+        self.personalization_timeout_seconds = personalization_timeout_seconds
         self.recipient_profiles: Dict[str, RecipientProfile] = {}
-        self.routing_history: List[Dict] = []
+        self.recipient_index = RecipientIndex()
+        self.history_dir = history_dir
+        self.response_history_size = response_history_size
+        self.routing_history = BoundedHistory("routing", max_records=history_size, spill_dir=history_dir)
+        self.response_histories: Dict[str, BoundedHistory] = {}
         self._load_recipient_profiles()
         
+    @property
+    def llm(self) -> Any:
+        """Top-tier chat model (created on first use)"""
+        return self.cascade.top_tier.llm
+    
     def _load_recipient_profiles(self):
         """Load recipient profiles from database"""
         # In production, load from database
@@ -118,17 +298,49 @@ class AlertRoutingAgent:
                 availability_hours=(9, 18)
             )
         }
+        
+        if self.history_dir:
+            # Restore response averages saved by a previous run
+            for key, profile in self.recipient_profiles.items():
+                history = self.get_response_history(key)
+                if history.total_count:
+                    self._apply_response_averages(profile, history)
+        
+        self.recipient_index = RecipientIndex(self.recipient_profiles.values())
+    
+    def add_recipient_profile(self, key: str, profile: RecipientProfile) -> None:
+        """Add or replace a recipient profile and keep the selection index current"""
+        previous = self.recipient_profiles.get(key)
+        if previous and previous.id != profile.id:
+            self.recipient_index.remove(previous.id)
+        
+        self.recipient_profiles[key] = profile
+        self.recipient_index.add(profile)
+        self._selection_cache.clear()
     
     async def route_alert(
         self,
         crisis_analysis: CrisisAnalysis,
         mention_summary: str,
-        current_time: Optional[datetime] = None
+        current_time: Optional[datetime] = None,
+        personalization_mode: Optional[PersonalizationMode] = None,
+        use_llm_selection: Optional[bool] = None,
+        alert_key: Optional[str] = None
     ) -> List[AlertRoute]:
-        """Intelligently route alerts based on crisis analysis"""
+        """
+        Intelligently route alerts based on crisis analysis
+        
+        personalization_mode and use_llm_selection override the agent's
+        defaults for this alert (e.g. templates only for fast-lane alerts).
+        Each route's alert_id is derived from alert_key (what triggered the
+        alert, e.g. the analyzed mention IDs; default: current_time), the
+        recipient and the threat type.
+        """
         
         if not current_time:
             current_time = datetime.now()
+        if alert_key is None:
+            alert_key = current_time.isoformat()
         
         # Determine alert priority
         priority = self._determine_priority(crisis_analysis)
@@ -137,50 +349,159 @@ class AlertRoutingAgent:
         recipients = await self._select_recipients(
             crisis_analysis=crisis_analysis,
             priority=priority,
+            current_time=current_time,
+            use_llm_selection=use_llm_selection
+        )
+        
+        mode = personalization_mode or self._get_personalization_mode(priority)
+        
+        # Batch mode personalizes every recipient in a single LLM call
+        batch_messages: Dict[str, str] = {}
+        if mode == PersonalizationMode.BATCH:
+            try:
+                batch_messages = await asyncio.wait_for(
+                    self._personalize_batch(
+                        recipients=recipients,
+                        crisis_analysis=crisis_analysis,
+                        mention_summary=mention_summary,
+                        priority=priority
+                    ),
+                    timeout=self.personalization_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Batch personalization timed out, using templates")
+        
+        # Build routes concurrently (bounded); gather keeps recipient order
+        semaphore = asyncio.Semaphore(self.max_concurrent_routes)
+        
+        async def build(recipient: RecipientProfile) -> AlertRoute:
+            async with semaphore:
+                return await self._build_route(
+                    recipient=recipient,
+                    crisis_analysis=crisis_analysis,
+                    mention_summary=mention_summary,
+                    priority=priority,
+                    mode=mode,
+                    batch_messages=batch_messages,
+                    current_time=current_time,
+                    alert_key=alert_key
+                )
+        
+        routing_plan = list(await asyncio.gather(*(build(recipient) for recipient in recipients)))
+        
+        # Store routing decision for learning
+        self._store_routing_decision(routing_plan, crisis_analysis)
+        
+        return routing_plan
+    
+    async def _build_route(
+        self,
+        recipient: RecipientProfile,
+        crisis_analysis: CrisisAnalysis,
+        mention_summary: str,
+        priority: AlertPriority,
+        mode: PersonalizationMode,
+        batch_messages: Dict[str, str],
+        current_time: datetime,
+        alert_key: str
+    ) -> AlertRoute:
+        """Build the route for one recipient"""
+        # Select channels based on priority and preferences
+        channels = await self._select_channels(
+            recipient=recipient,
+            priority=priority,
             current_time=current_time
         )
         
-        # Create routing plan for each recipient
-        routing_plan = []
-        for recipient in recipients:
-            # Select channels based on priority and preferences
-            channels = await self._select_channels(
-                recipient=recipient,
-                priority=priority,
-                current_time=current_time
-            )
-            
-            # Personalize message for recipient
-            message = await self._personalize_message(
+        # Personalize message for recipient
+        message = None
+        enrich_pending = mode == PersonalizationMode.TEMPLATE_THEN_ENRICH
+        if mode == PersonalizationMode.LLM:
+            try:
+                message = await asyncio.wait_for(
+                    self._personalize_message(
+                        recipient=recipient,
+                        crisis_analysis=crisis_analysis,
+                        mention_summary=mention_summary,
+                        priority=priority
+                    ),
+                    timeout=self.personalization_timeout_seconds
+                )
+            except Exception as e:
+                # Send the template now; the LLM version follows as an update
+                logger.warning(f"Personalization failed for {recipient.id}, using template: {e!r}")
+                enrich_pending = True
+        elif recipient.id in batch_messages:
+            message = batch_messages[recipient.id]
+        
+        message_source = "llm"
+        if message is None:
+            message = self._render_template_message(
                 recipient=recipient,
                 crisis_analysis=crisis_analysis,
                 mention_summary=mention_summary,
                 priority=priority
             )
-            
-            # Create escalation plan if needed
-            escalation_plan = None
-            if priority in [AlertPriority.CRITICAL, AlertPriority.HIGH]:
-                escalation_plan = self._create_escalation_plan(
-                    recipient=recipient,
-                    priority=priority
-                )
-            
-            route = AlertRoute(
+            message_source = "template"
+        
+        # Create escalation plan if needed
+        escalation_plan = None
+        if priority in [AlertPriority.CRITICAL, AlertPriority.HIGH]:
+            escalation_plan = self._create_escalation_plan(
                 recipient=recipient,
-                channels=channels,
-                message=message,
-                priority=priority,
-                expected_response_time=self._get_expected_response_time(priority),
-                escalation_plan=escalation_plan
+                priority=priority
             )
-            
-            routing_plan.append(route)
         
-        # Store routing decision for learning
-        self._store_routing_decision(routing_plan, crisis_analysis)
+        return AlertRoute(
+            recipient=recipient,
+            channels=channels,
+            message=message,
+            priority=priority,
+            expected_response_time=self._get_expected_response_time(priority),
+            escalation_plan=escalation_plan,
+            message_source=message_source,
+            enrich_pending=enrich_pending,
+            alert_id=make_alert_id(alert_key, recipient.id, crisis_analysis.threat_type)
+        )
+    
+    async def enrich_routes(
+        self,
+        routes: List[AlertRoute],
+        crisis_analysis: CrisisAnalysis,
+        mention_summary: str
+    ) -> List[AlertRoute]:
+        """
+        Produce LLM-personalized follow-ups for routes sent with templates
+        
+        Returns copies of the pending routes with personalized messages;
+        recipients the LLM did not cover are left out.
+        """
+        pending = [route for route in routes if route.enrich_pending]
+        if not pending:
+            return []
+        
+        messages = await self._personalize_batch(
+            recipients=[route.recipient for route in pending],
+            crisis_analysis=crisis_analysis,
+            mention_summary=mention_summary,
+            priority=pending[0].priority
+        )
         
-        return routing_plan
+        return [
+            route.copy(update={
+                "message": messages[route.recipient.id],
+                "message_source": "llm",
+                "enrich_pending": False
+            })
+            for route in pending
+            if route.recipient.id in messages
+        ]
+    
+    def _get_personalization_mode(self, priority: AlertPriority) -> PersonalizationMode:
+        """Personalization strategy for an alert priority"""
+        if priority in self.immediate_priorities:
+            return PersonalizationMode.TEMPLATE_THEN_ENRICH
+        return self.personalization_mode
     
     def _determine_priority(self, crisis_analysis: CrisisAnalysis) -> AlertPriority:
         """Determine alert priority from crisis analysis"""
@@ -197,76 +518,103 @@ class AlertRoutingAgent:
         self,
         crisis_analysis: CrisisAnalysis,
         priority: AlertPriority,
-        current_time: datetime
+        current_time: datetime,
+        use_llm_selection: Optional[bool] = None
     ) -> List[RecipientProfile]:
-        """Select optimal recipients using LLM reasoning"""
-        
-        # Build prompt for recipient selection
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert at crisis management for political campaigns.
-            Select the most appropriate team members to handle this crisis based on:
-            1. Their expertise areas matching the crisis type
-            2. Their current availability (working hours)
-            3. The severity and urgency of the situation
-            4. Past response effectiveness
-            
-            Available team members: {team_members}"""),
-            ("human", """Select recipients for this crisis:
-            
-            Crisis Type: {threat_type}
-            Severity: {severity}/10
-            Priority: {priority}
-            Affected Topics: {affected_topics}
-            Current Time: {current_time}
-            
-            Return a list of recipient IDs who should be notified, ordered by importance.""")
-        ])
-        
-        # Format team members
-        team_info = []
-        current_hour = current_time.hour
+        """Select optimal recipients from the recipient index"""
+        if use_llm_selection is None:
+            use_llm_selection = self.use_llm_selection
+        
+        # Indexed selection: expertise match, local availability, response score
+        selected = self.recipient_index.select(
+            threat_type=crisis_analysis.threat_type,
+            priority=priority.value,
+            current_time=current_time,
+            affected_topics=crisis_analysis.affected_topics
+        )
         
-        for profile in self.recipient_profiles.values():
-            is_available = (
-                profile.availability_hours[0] <= current_hour <= profile.availability_hours[1]
+        # Optional LLM refinement over the indexed shortlist
+        if use_llm_selection and selected:
+            shortlist = self.recipient_index.select(
+                threat_type=crisis_analysis.threat_type,
+                priority=priority.value,
+                current_time=current_time,
+                affected_topics=crisis_analysis.affected_topics,
+                limit=self.llm_shortlist_size
             )
-            team_info.append({
-                "id": profile.id,
-                "role": profile.role,
-                "expertise": profile.expertise_areas,
-                "available": is_available,
-                "response_score": profile.response_history.get("avg_score", 0.7)
-            })
-        
-        # Get LLM recommendation
-        chain = prompt | self.llm
-        
-        result = await chain.ainvoke({
-            "team_members": team_info,
-            "threat_type": crisis_analysis.threat_type,
-            "severity": crisis_analysis.severity,
-            "priority": priority.value,
-            "affected_topics": crisis_analysis.affected_topics,
-            "current_time": current_time.strftime("%H:%M %Z")
-        })
-        
-        # Parse recipient IDs from response
-        selected_ids = self._parse_recipient_ids(result.content)
-        
-        # Return selected profiles
-        selected = []
-        for recipient_id in selected_ids:
-            if recipient_id in self.recipient_profiles:
-                selected.append(self.recipient_profiles[recipient_id])
+            selected = await self._refine_recipients_with_llm(
+                crisis_analysis=crisis_analysis,
+                priority=priority,
+                current_time=current_time,
+                shortlist=shortlist
+            ) or selected
         
         # Ensure minimum recipients based on priority
-        if priority == AlertPriority.CRITICAL and len(selected) < 2:
-            # Add campaign manager if not already included
-            if "campaign_manager" not in selected_ids:
-                selected.append(self.recipient_profiles["campaign_manager"])
+        manager = self.recipient_profiles.get("campaign_manager")
+        has_manager = any(profile.role == "campaign_manager" for profile in selected)
+        if manager and not has_manager:
+            if not selected or (priority == AlertPriority.CRITICAL and len(selected) < 2):
+                selected.append(manager)
         
         return selected
     
+    async def _refine_recipients_with_llm(
+        self,
+        crisis_analysis: CrisisAnalysis,
+        priority: AlertPriority,
+        current_time: datetime,
+        shortlist: List[RecipientProfile]
+    ) -> List[RecipientProfile]:
+        """Let the LLM pick from the shortlist, cached per threat, priority and hour"""
+        cache_key = (crisis_analysis.threat_type, priority.value, current_time.strftime("%Y%m%d%H"))
+        
+        if cache_key in self._selection_cache:
+            self._selection_cache.move_to_end(cache_key)
+            selected_ids = self._selection_cache[cache_key]
+        else:
+            prompt = self.gateway.get_prompt("select_recipients", RECIPIENT_SELECTION_PROMPT_MESSAGES)
+            
+            hour_cache: Dict[str, int] = {}
+            team_info = [
+                {
+                    "id": profile.id,
+                    "role": profile.role,
+                    "expertise": profile.expertise_areas,
+                    "available": self.recipient_index.is_available(profile, current_time, hour_cache),
+                    "response_score": profile.response_history.get("avg_score", 0.7)
+                }
+                for profile in shortlist
+            ]
+            
+            try:
+                content = await self.cascade.ainvoke(
+                    task="select_recipients",
+                    prompt=prompt,
+                    inputs={
+                        "team_members": team_info,
+                        "threat_type": crisis_analysis.threat_type,
+                        "severity": crisis_analysis.severity,
+                        "priority": priority.value,
+                        "affected_topics": crisis_analysis.affected_topics,
+                        "current_time": current_time.strftime("%H:%M %Z")
+                    },
+                    should_escalate=lambda output: not self._parse_recipient_ids(output, shortlist)
+                )
+            except Exception as e:
+                logger.error(f"LLM recipient refinement failed, using index selection: {e}")
+                return []
+            
+            selected_ids = self._parse_recipient_ids(content, shortlist)
+            self._selection_cache[cache_key] = selected_ids
+            if len(self._selection_cache) > self.selection_cache_size:
+                self._selection_cache.popitem(last=False)
+        
+        return [
+            self.recipient_index.profiles[recipient_id]
+            for recipient_id in selected_ids
+            if recipient_id in self.recipient_index.profiles
+        ]
+    
     async def _select_channels(
         self,
         recipient: RecipientProfile,
@@ -331,46 +679,127 @@ class AlertRoutingAgent:
     ) -> str:
         """Create personalized alert message using LLM"""
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """Create a concise, actionable alert message for a campaign team member.
-            Tailor the message to their role and expertise.
-            Include:
-            1. Clear subject/headline
-            2. Brief crisis summary (2-3 sentences)
-            3. Why they specifically are being notified
-            4. Immediate actions they should take
-            5. Escalation instructions if needed
-            
-            Keep it under 200 words for SMS/Slack, 500 words for email."""),
-            ("human", """Create alert message for:
-            
-            Recipient: {role} with expertise in {expertise}
-            Priority: {priority}
-            
-            Crisis Summary:
-            - Type: {threat_type}
-            - Severity: {severity}/10
-            - Key Issues: {affected_topics}
-            
-            Mention Summary: {mention_summary}
-            
-            Recommended Actions: {recommended_actions}""")
-        ])
+        prompt = self.gateway.get_prompt("personalize_message", PERSONALIZATION_PROMPT_MESSAGES)
         
-        chain = prompt | self.llm
+        # Severe or uncertain crises go straight to the top tier
+        high_stakes = (
+            crisis_analysis.severity >= self.severity_threshold
+            or crisis_analysis.confidence < self.confidence_threshold
+        )
+        
+        return await self.cascade.ainvoke(
+            task="personalize_message",
+            prompt=prompt,
+            inputs={
+                "role": recipient.role,
+                "expertise": ", ".join(recipient.expertise_areas),
+                "priority": priority.value.upper(),
+                "threat_type": crisis_analysis.threat_type,
+                "severity": crisis_analysis.severity,
+                "affected_topics": ", ".join(crisis_analysis.affected_topics),
+                "mention_summary": mention_summary[:200],
+                "recommended_actions": "\n".join(crisis_analysis.recommended_actions[:3])
+            },
+            should_escalate=lambda message: not message.strip(),
+            min_tier=len(self.cascade.tiers) - 1 if high_stakes else 0
+        )
+    
+    async def _personalize_batch(
+        self,
+        recipients: List[RecipientProfile],
+        crisis_analysis: CrisisAnalysis,
+        mention_summary: str,
+        priority: AlertPriority
+    ) -> Dict[str, str]:
+        """Personalize messages for all recipients with a single LLM call"""
+        if not recipients:
+            return {}
+        
+        prompt = self.gateway.get_prompt(
+            "personalize_batch",
+            BATCH_PERSONALIZATION_PROMPT_MESSAGES
+        )
         
-        result = await chain.ainvoke({
-            "role": recipient.role,
-            "expertise": ", ".join(recipient.expertise_areas),
-            "priority": priority.value.upper(),
-            "threat_type": crisis_analysis.threat_type,
-            "severity": crisis_analysis.severity,
-            "affected_topics": ", ".join(crisis_analysis.affected_topics),
-            "mention_summary": mention_summary[:200],
-            "recommended_actions": "\n".join(crisis_analysis.recommended_actions[:3])
-        })
+        recipient_lines = "\n".join(
+            f"- {r.id}: {r.role} with expertise in {', '.join(r.expertise_areas)}"
+            for r in recipients
+        )
+        expected_ids = {r.id for r in recipients}
         
-        return result.content
+        high_stakes = (
+            crisis_analysis.severity >= self.severity_threshold
+            or crisis_analysis.confidence < self.confidence_threshold
+        )
+        
+        try:
+            messages = await self.cascade.ainvoke(
+                task="personalize_batch",
+                prompt=prompt,
+                inputs={
+                    "recipients": recipient_lines,
+                    "priority": priority.value.upper(),
+                    "threat_type": crisis_analysis.threat_type,
+                    "severity": crisis_analysis.severity,
+                    "affected_topics": ", ".join(crisis_analysis.affected_topics),
+                    "mention_summary": mention_summary[:200],
+                    "recommended_actions": "\n".join(crisis_analysis.recommended_actions[:3])
+                },
+                parse=lambda result: self._parse_batch_messages(result.content, expected_ids),
+                should_escalate=lambda parsed: len(parsed) < len(expected_ids),
+                min_tier=len(self.cascade.tiers) - 1 if high_stakes else 0
+            )
+        except Exception as e:
+            # Callers fall back to templates for any recipient left out
+            logger.error(f"Batch personalization failed: {e}")
+            return {}
+        
+        return messages
+    
+    def _parse_batch_messages(self, llm_output: str, expected_ids: set) -> Dict[str, str]:
+        """Split a batched LLM response into per-recipient messages"""
+        messages = {}
+        sections = re.split(r"^###\s*(\S+)\s*$", llm_output, flags=re.MULTILINE)
+        
+        # re.split yields [preamble, id1, body1, id2, body2, ...]
+        for recipient_id, body in zip(sections[1::2], sections[2::2]):
+            recipient_id = recipient_id.strip("*:`")
+            if recipient_id in expected_ids and body.strip():
+                messages[recipient_id] = body.strip()
+        
+        return messages
+    
+    def _render_template_message(
+        self,
+        recipient: RecipientProfile,
+        crisis_analysis: CrisisAnalysis,
+        mention_summary: str,
+        priority: AlertPriority
+    ) -> str:
+        """Render an alert message from the cached role template (no LLM)"""
+        return self._get_role_template(recipient.role).format(
+            priority=priority.value.upper(),
+            threat_type=crisis_analysis.threat_type,
+            severity=crisis_analysis.severity,
+            affected_topics=", ".join(crisis_analysis.affected_topics) or "n/a",
+            recommended_actions="\n".join(
+                f"- {action}" for action in crisis_analysis.recommended_actions[:3]
+            ),
+            mention_summary=mention_summary[:300]
+        )
+    
+    def _get_role_template(self, role: str) -> str:
+        """Get the message template for a role, building it on first use"""
+        template = self._role_templates.get(role)
+        if template is None:
+            focus = ROLE_MESSAGE_FOCUS.get(
+                role,
+                f"Your {role.replace('_', ' ')} expertise is needed."
+            )
+            # Escape braces so the focus text survives str.format
+            focus = focus.replace("{", "{{").replace("}", "}}")
+            template = MESSAGE_TEMPLATE.replace("{focus}", focus)
+            self._role_templates[role] = template
+        return template
     
     def _create_escalation_plan(
         self,
@@ -412,20 +841,26 @@ class AlertRoutingAgent:
         }
         return response_times[priority]
     
-    def _parse_recipient_ids(self, llm_output: str) -> List[str]:
-        """Parse recipient IDs from LLM output"""
-        # Simple parsing - look for known recipient IDs
-        selected_ids = []
-        
-        for recipient_id in self.recipient_profiles.keys():
-            if recipient_id in llm_output.lower():
-                selected_ids.append(recipient_id)
-        
-        # If no specific IDs found, default to campaign manager
-        if not selected_ids:
-            selected_ids = ["campaign_manager"]
+    def _parse_recipient_ids(
+        self,
+        llm_output: str,
+        candidates: List[RecipientProfile]
+    ) -> List[str]:
+        """Parse recipient IDs from LLM output, ordered by first mention"""
+        # Accept either the profile id (cm_001) or its role key (campaign_manager)
+        output = llm_output.lower()
+        positions = []
+        
+        for profile in candidates:
+            found = [
+                output.find(token)
+                for token in (profile.id.lower(), profile.role.lower())
+                if token in output
+            ]
+            if found:
+                positions.append((min(found), profile.id))
         
-        return selected_ids
+        return [recipient_id for _, recipient_id in sorted(positions)]
     
     def _store_routing_decision(
         self,
@@ -451,6 +886,30 @@ class AlertRoutingAgent:
         # In production, persist to database
         logger.info(f"Stored routing decision for {len(routing_plan)} recipients")
     
+    def get_response_history(self, recipient_id: str) -> BoundedHistory:
+        """A recipient's response history (created on first use)"""
+        history = self.response_histories.get(recipient_id)
+        if history is None:
+            history = self.response_histories[recipient_id] = BoundedHistory(
+                f"responses_{recipient_id}",
+                max_records=self.response_history_size,
+                spill_dir=self.history_dir,
+                aggregate_fields=("effectiveness_score", "response_time_minutes")
+            )
+        return history
+    
+    def _apply_response_averages(self, profile: RecipientProfile, history: BoundedHistory) -> None:
+        """Copy a response history's running averages onto the profile"""
+        profile.response_history["avg_score"] = history.mean("effectiveness_score")
+        profile.response_history["avg_response_time_minutes"] = history.mean("response_time_minutes")
+        profile.response_history["response_count"] = history.total_count
+    
+    def close(self) -> None:
+        """Spill routing and response histories to history_dir (e.g. on shutdown)"""
+        self.routing_history.close()
+        for history in self.response_histories.values():
+            history.close()
+    
     async def update_response_effectiveness(
         self,
         recipient_id: str,
@@ -461,22 +920,17 @@ class AlertRoutingAgent:
         if recipient_id in self.recipient_profiles:
             profile = self.recipient_profiles[recipient_id]
             
-            # Update response history
-            if "responses" not in profile.response_history:
-                profile.response_history["responses"] = []
-            
-            profile.response_history["responses"].append({
+            # Responses are kept outside the profile (which is copied into
+            # every route); the profile only carries running averages
+            history = self.get_response_history(recipient_id)
+            history.append({
                 "timestamp": datetime.now(),
                 "response_time_minutes": response_time,
                 "effectiveness_score": effectiveness_score
             })
             
-            # Calculate average score
-            scores = [
-                r["effectiveness_score"] 
-                for r in profile.response_history["responses"]
-            ]
-            profile.response_history["avg_score"] = sum(scores) / len(scores)
+            self._apply_response_averages(profile, history)
+            self.recipient_index.update_score(profile.id, profile.response_history["avg_score"])
             
             logger.info(
                 f"Updated response effectiveness for {recipient_id}: "
@@ -3,18 +3,24 @@ Crisis Detection Agent - Core intelligence for identifying and analyzing potenti
 """
 
 import asyncio
-from typing import Dict, List, Optional, Tuple
+import heapq
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
-from langchain.agents import AgentExecutor
-from langchain.memory import ConversationSummaryBufferMemory
-from langchain.tools import Tool
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain.callbacks import AsyncCallbackHandler
 from pydantic import BaseModel, Field
 
+from ..utils.bounded_history import BoundedHistory
+from ..utils.llm_gateway import LLMGateway
+from ..utils.model_cascade import ModelCascade, create_model_cascade
+
+if TYPE_CHECKING:
+    from langchain.memory import ConversationSummaryBufferMemory
+    from langchain.tools import Tool
+
+    from ..utils.author_influence import AuthorInfluenceCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,7 +30,9 @@ class CrisisMention(BaseModel):
     content: str
     source: str
     author: Optional[str] = None
+    author_verified: bool = False
     url: Optional[str] = None
+    parent_id: Optional[str] = None  # Post this mention quotes or reposts
     sentiment_score: float = Field(ge=-1.0, le=1.0)
     reach_count: int = 0
     engagement_count: int = 0
@@ -43,29 +51,118 @@ class CrisisAnalysis(BaseModel):
     reasoning: str
 
 
+# Prompt message specs; the LLM gateway compiles each template once
+ANALYSIS_PROMPT_MESSAGES = [
+    ("system", """You are a crisis detection expert for political campaigns. 
+    Analyze mentions for potential crises considering:
+    1. Historical patterns of similar events
+    2. Current campaign context and vulnerabilities
+    3. Media amplification potential
+    4. Opponent activity patterns
+    5. Public sentiment trends
+    
+    Previous relevant events: {history}
+    Known crisis patterns: {patterns}"""),
+    ("human", """Analyze these mentions for crisis potential:
+    
+    Mentions: {mentions}
+    Campaign Context: {campaign_context}
+    
+    Provide a comprehensive crisis analysis including:
+    - Severity (1-10)
+    - Confidence level (0-1)
+    - Threat type classification
+    - Affected topics
+    - Recommended immediate actions
+    - Whether escalation is required""")
+]
+
+
 class CrisisDetectionAgent:
     """Intelligent crisis detection with context awareness and learning"""
     
-    def __init__(self, openai_api_key: str, memory_max_tokens: int = 2000):
-        self.llm = ChatOpenAI(
-            model="gpt-4",
+    def __init__(
+        self,
+        openai_api_key: str,
+        memory_max_tokens: int = 2000,
+        model_cascade: Optional[ModelCascade] = None,
+        model_tiers: Optional[List[Dict[str, Any]]] = None,
+        confidence_threshold: float = 0.6,
+        severity_threshold: int = 7,
+        gateway: Optional[LLMGateway] = None,
+        pattern_history_size: int = 100,
+        max_prompt_patterns: int = 10,
+        history_dir: Optional[str] = None,
+        use_memory: bool = True,
+        author_cache: Optional["AuthorInfluenceCache"] = None
+    ):
+        # Cheap tier handles every analysis first; the top tier is only
+        # consulted for low-confidence or high-severity results
+        self.cascade = model_cascade or create_model_cascade(
+            openai_api_key,
             temperature=0.2,
-            openai_api_key=openai_api_key
+            tiers=model_tiers,
+            gateway=gateway
         )
-        
-        self.memory = ConversationSummaryBufferMemory(
-            llm=self.llm,
-            max_token_limit=memory_max_tokens,
-            return_messages=True,
-            memory_key="crisis_history"
+        self.gateway = self.cascade.gateway
+        self.confidence_threshold = confidence_threshold
+        self.severity_threshold = severity_threshold
+        
+        # Chat models, memory and tools are built on first use, so LangChain
+        # and the OpenAI client are only imported once analysis starts
+        self.memory_max_tokens = memory_max_tokens
+        # Replays disable conversation memory so each window is analyzed
+        # on its own, as it would have been at the time
+        self.use_memory = use_memory
+        self._memory: Optional["ConversationSummaryBufferMemory"] = None
+        self._tools: Optional[List["Tool"]] = None
+        
+        # Configured patterns always go into the prompt; learned ones are
+        # bounded in memory (older ones spill to history_dir) and only the
+        # most recent max_prompt_patterns are included
+        self.known_patterns: List[Dict] = []
+        self.crisis_patterns = BoundedHistory(
+            "crisis_patterns",
+            max_records=pattern_history_size,
+            spill_dir=history_dir,
+            timestamp_field="first_seen"
         )
-        
-        self.tools = self._create_tools()
-        self.crisis_patterns = []
+        self.max_prompt_patterns = max_prompt_patterns
         self._load_crisis_patterns()
         
-    def _create_tools(self) -> List[Tool]:
+        # Cross-cycle author statistics (repeat offenders, posting rates)
+        self.author_cache = author_cache
+        
+    @property
+    def llm(self) -> Any:
+        """Top-tier chat model"""
+        return self.cascade.top_tier.llm
+    
+    @property
+    def memory(self) -> "ConversationSummaryBufferMemory":
+        """Conversation summary memory, created on first use"""
+        if self._memory is None:
+            from langchain.memory import ConversationSummaryBufferMemory
+            
+            self._memory = ConversationSummaryBufferMemory(
+                llm=self.llm,
+                max_token_limit=self.memory_max_tokens,
+                return_messages=True,
+                memory_key="crisis_history"
+            )
+        return self._memory
+    
+    @property
+    def tools(self) -> List["Tool"]:
+        """Analysis tools, created on first use"""
+        if self._tools is None:
+            self._tools = self._create_tools()
+        return self._tools
+    
+    def _create_tools(self) -> List["Tool"]:
         """Create tools for crisis analysis"""
+        from langchain.tools import Tool
+        
         return [
             Tool(
                 name="analyze_sentiment_context",
@@ -97,67 +194,55 @@ class CrisisDetectionAgent:
     async def analyze_mentions(
         self, 
         mentions: List[CrisisMention],
-        campaign_context: Optional[Dict] = None
+        campaign_context: Optional[Dict] = None,
+        current_time: Optional[datetime] = None
     ) -> CrisisAnalysis:
         """Analyze mentions for potential crisis indicators"""
         
         # Get historical context
-        historical_context = await self._get_historical_context(mentions)
+        historical_context = await self._get_historical_context(mentions) if self.use_memory else ""
         
         # Build analysis prompt
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a crisis detection expert for political campaigns. 
-            Analyze mentions for potential crises considering:
-            1. Historical patterns of similar events
-            2. Current campaign context and vulnerabilities
-            3. Media amplification potential
-            4. Opponent activity patterns
-            5. Public sentiment trends
-            
-            Previous relevant events: {history}
-            Known crisis patterns: {patterns}"""),
-            ("human", """Analyze these mentions for crisis potential:
-            
-            Mentions: {mentions}
-            Campaign Context: {campaign_context}
-            
-            Provide a comprehensive crisis analysis including:
-            - Severity (1-10)
-            - Confidence level (0-1)
-            - Threat type classification
-            - Affected topics
-            - Recommended immediate actions
-            - Whether escalation is required""")
-        ])
+        prompt = self.gateway.get_prompt("analyze_mentions", ANALYSIS_PROMPT_MESSAGES)
         
         # Format mentions for analysis
         mentions_text = self._format_mentions(mentions)
         
-        # Run analysis
-        chain = prompt | self.llm
-        
-        result = await chain.ainvoke({
-            "history": historical_context,
-            "patterns": self.crisis_patterns,
-            "mentions": mentions_text,
-            "campaign_context": campaign_context or {}
-        })
-        
-        # Parse and validate analysis
-        analysis = self._parse_analysis(result.content)
+        # Run analysis through the model cascade, parsing each tier's output
+        analysis = await self.cascade.ainvoke(
+            task="analyze_mentions",
+            prompt=prompt,
+            inputs={
+                "history": historical_context,
+                "patterns": [*self.known_patterns, *self.crisis_patterns.recent(self.max_prompt_patterns)],
+                "mentions": mentions_text,
+                "campaign_context": campaign_context or {}
+            },
+            parse=lambda result: self._parse_analysis(result.content),
+            should_escalate=self._needs_escalation
+        )
         
         # Store in memory for future context
-        await self.memory.save_context(
-            {"mentions": mentions_text, "campaign_context": str(campaign_context)},
-            {"analysis": str(analysis.dict())}
-        )
+        if self.use_memory:
+            await self.memory.asave_context(
+                {"mentions": mentions_text, "campaign_context": str(campaign_context)},
+                {"analysis": str(analysis.dict())}
+            )
         
         # Update patterns if this is a new crisis type
         if analysis.severity >= 7:
-            await self._update_crisis_patterns(mentions, analysis)
+            await self._update_crisis_patterns(mentions, analysis, current_time)
         
         return analysis
     
+    def _needs_escalation(self, analysis: CrisisAnalysis) -> bool:
+        """Check whether a cheap-tier analysis should go to a stronger model"""
+        return (
+            analysis.threat_type == "parse_error"
+            or analysis.confidence < self.confidence_threshold
+            or analysis.severity >= self.severity_threshold
+        )
+    
     async def _analyze_sentiment_context(self, mentions: List[Dict]) -> Dict:
         """Contextual sentiment analysis with campaign awareness"""
         positive_count = sum(1 for m in mentions if m.get('sentiment_score', 0) > 0.3)
@@ -263,6 +348,9 @@ class CrisisDetectionAgent:
     
     async def _identify_key_influencers(self, mentions: List[Dict]) -> List[Dict]:
         """Identify influential accounts in the mention stream"""
+        if self.author_cache is not None:
+            return self._identify_known_influencers(mentions)
+        
         influencers = []
         
         for mention in mentions:
@@ -280,6 +368,19 @@ class CrisisDetectionAgent:
         
         return influencers[:10]  # Top 10 influencers
     
+    def _identify_known_influencers(self, mentions: List[Dict], limit: int = 10) -> List[Dict]:
+        """Influencers among the mentions' authors, ranked with their cross-cycle history"""
+        influencers = []
+        for author in {m.get('author') for m in mentions if m.get('author')}:
+            stats = self.author_cache.get(author)
+            if stats is None:
+                continue
+            # Repeat offenders count even when their reach is modest
+            if stats.max_reach > 5000 or stats.crisis_count:
+                influencers.append(self.author_cache.describe(stats))
+        
+        return heapq.nlargest(limit, influencers, key=lambda x: (x['influence'], x['reach']))
+    
     async def _generate_response_strategy(self, analysis: Dict) -> List[str]:
         """Generate strategic response recommendations"""
         strategies = []
@@ -330,15 +431,32 @@ class CrisisDetectionAgent:
         """Parse LLM output into structured analysis"""
         # This is a simplified parser - in production, use more robust parsing
         try:
-            # Extract key values using regex or structured parsing
+            # Extract key values using regex; a missing confidence is
+            # treated as low so the cascade can escalate
             severity = 5  # Default
-            confidence = 0.7
+            confidence = 0.5
             threat_type = "unknown"
             
-            # Simple keyword extraction for demonstration
-            if "severity:" in llm_output.lower():
-                # Extract severity score
-                pass
+            severity_match = re.search(r"severity\W{0,5}(\d{1,2})", llm_output, re.IGNORECASE)
+            if severity_match:
+                severity = min(max(int(severity_match.group(1)), 1), 10)
+            
+            confidence_match = re.search(
+                r"confidence(?: level)?\W{0,5}(\d*\.?\d+)(%?)", llm_output, re.IGNORECASE
+            )
+            if confidence_match:
+                confidence = float(confidence_match.group(1))
+                if confidence_match.group(2) or confidence > 1:
+                    confidence /= 100
+                confidence = min(max(confidence, 0.0), 1.0)
+            
+            threat_match = re.search(
+                r"threat type(?: classification)?\W{0,5}([A-Za-z][A-Za-z0-9 _-]{2,40})",
+                llm_output,
+                re.IGNORECASE
+            )
+            if threat_match:
+                threat_type = threat_match.group(1).strip().lower().replace(" ", "_").replace("-", "_")
             
             return CrisisAnalysis(
                 severity=severity,
@@ -368,11 +486,15 @@ class CrisisDetectionAgent:
         for m in mentions:
             keywords.update(m.keywords)
         
-        # Get relevant memories
-        query = f"Crisis involving: {', '.join(list(keywords)[:5])}"
-        memories = await self.memory.aget_relevant_documents(query)
+        # Summary buffer memory has no search; use the most recent turns
+        # that share a keyword with the current mentions
+        variables = await self.memory.aload_memory_variables({})
+        memories = [
+            str(m.content) for m in variables.get(self.memory.memory_key, [])
+            if any(k in str(m.content) for k in keywords)
+        ]
         
-        return "\n".join([m.page_content for m in memories[:3]])
+        return "\n".join(memories[-3:])
     
     async def _calculate_sentiment_trend(self, mentions: List[Dict]) -> str:
         """Calculate sentiment trend over time"""
@@ -401,7 +523,7 @@ class CrisisDetectionAgent:
     def _load_crisis_patterns(self):
         """Load known crisis patterns from database or config"""
         # In production, load from database
-        self.crisis_patterns = [
+        self.known_patterns = [
             {
                 "type": "misinformation_spread",
                 "indicators": ["fact-check", "false", "lies", "misleading"],
@@ -422,19 +544,22 @@ class CrisisDetectionAgent:
     async def _update_crisis_patterns(
         self, 
         mentions: List[CrisisMention], 
-        analysis: CrisisAnalysis
+        analysis: CrisisAnalysis,
+        current_time: Optional[datetime] = None
     ):
         """Learn from new crisis patterns"""
+        current_time = current_time or datetime.now()
+        
         # Extract common keywords from high-severity crisis
         keywords = set()
         for m in mentions:
             keywords.update(m.keywords)
         
         new_pattern = {
-            "type": f"learned_{datetime.now().strftime('%Y%m%d')}",
+            "type": f"learned_{current_time.strftime('%Y%m%d')}",
             "indicators": list(keywords)[:10],
             "typical_severity": analysis.severity,
-            "first_seen": datetime.now().isoformat()
+            "first_seen": current_time.isoformat()
         }
         
         self.crisis_patterns.append(new_pattern)
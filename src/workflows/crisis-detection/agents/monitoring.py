@@ -3,23 +3,47 @@ Monitoring Agents - Connect to external monitoring services
 """
 
 import asyncio
-import aiohttp
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 import hashlib
 import hmac
 from urllib.parse import urlencode
 
-from langchain.tools import Tool
 from pydantic import BaseModel, Field
 
+from ..utils.mention_batch import MentionBatch
 from ..utils.rate_limiter import RateLimiter
-from .crisis_detection import CrisisMention
+from ..utils.text_processing import TextProcessingPool
+from ..utils.trending import TrendingKeywordTracker
+
+if TYPE_CHECKING:
+    import aiohttp
 
 logger = logging.getLogger(__name__)
 
 
+def verify_webhook_signature(payload: bytes, signature: str, secret: Optional[str]) -> bool:
+    """
+    Verify a Mentionlytics webhook signature (HMAC-SHA256 of the raw body)
+
+    Module-level so webhook receivers can check signatures without
+    constructing an agent; aiohttp is only imported once an agent makes a
+    request.
+    """
+    if not secret:
+        logger.warning("No webhook secret configured")
+        return False
+    
+    expected_signature = hmac.new(
+        secret.encode(),
+        payload,
+        hashlib.sha256
+    ).hexdigest()
+    
+    return hmac.compare_digest(expected_signature, signature)
+
+
 class MentionlyticsConfig(BaseModel):
     """Configuration for Mentionlytics API"""
     api_key: str
@@ -31,26 +55,37 @@ class MentionlyticsConfig(BaseModel):
 class MentionlyticsAgent:
     """Agent for monitoring mentions via Mentionlytics API"""
     
-    def __init__(self, config: MentionlyticsConfig):
+    def __init__(
+        self,
+        config: MentionlyticsConfig,
+        trending_tracker: Optional[TrendingKeywordTracker] = None,
+        text_pool: Optional[TextProcessingPool] = None
+    ):
         self.config = config
+        self.trending = trending_tracker or TrendingKeywordTracker()
+        # Large pages are keyword-extracted in worker processes; the owner
+        # of the pool (e.g. the workflow) closes it
+        self.text_pool = text_pool or TextProcessingPool()
         self.rate_limiter = RateLimiter(
             max_requests=100,
             time_window=3600  # 100 requests per hour
         )
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional["aiohttp.ClientSession"] = None
         self._last_fetch_time = datetime.now() - timedelta(hours=1)
         
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        self._get_session()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         if self.session:
             await self.session.close()
+            # The next entry (e.g. the next workflow cycle) opens a new session
+            self.session = None
     
-    async def scan(self) -> List[CrisisMention]:
+    async def scan(self) -> MentionBatch:
         """Scan for new mentions from Mentionlytics"""
         try:
             await self.rate_limiter.acquire()
@@ -61,12 +96,16 @@ class MentionlyticsAgent:
                 until=datetime.now()
             )
             
-            # Convert to CrisisMention objects
-            mentions = []
-            for data in mentions_data:
-                mention = self._parse_mention(data)
-                if mention:
-                    mentions.append(mention)
+            # Validate the whole page into a compact batch (no per-mention models)
+            mentions, rejected = MentionBatch.from_api_page(mentions_data)
+            if rejected:
+                logger.warning(f"Rejected {rejected} malformed mentions from Mentionlytics")
+            
+            # Keyword extraction is CPU-bound; keep it off the event loop
+            mentions.set_keywords(await self.text_pool.extract_keywords(mentions.content))
+            
+            # Feed stream-wide trending detection
+            self.trending.update_many(mentions.keywords, mentions.published_ts)
             
             # Update last fetch time
             self._last_fetch_time = datetime.now()
@@ -76,7 +115,7 @@ class MentionlyticsAgent:
             
         except Exception as e:
             logger.error(f"Error scanning Mentionlytics: {e}")
-            return []
+            return MentionBatch()
     
     async def _fetch_mentions(
         self, 
@@ -85,8 +124,9 @@ class MentionlyticsAgent:
         keywords: Optional[List[str]] = None
     ) -> List[Dict]:
         """Fetch mentions from Mentionlytics API"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        import aiohttp
+        
+        session = self._get_session()
         
         # Build query parameters
         params = {
@@ -105,7 +145,7 @@ class MentionlyticsAgent:
         url = f"{self.config.base_url}/mentions"
         
         try:
-            async with self.session.get(
+            async with session.get(
                 url,
                 params=params,
                 headers=headers,
@@ -120,6 +160,13 @@ class MentionlyticsAgent:
             logger.error(f"Mentionlytics API error: {e}")
             return []
     
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Shared HTTP session, created (and aiohttp imported) on first request"""
+        if self.session is None or self.session.closed:
+            import aiohttp
+            self.session = aiohttp.ClientSession()
+        return self.session
+    
     def _get_auth_headers(self, method: str, path: str, params: Dict) -> Dict:
         """Generate authentication headers for Mentionlytics API"""
         # Create signature based on Mentionlytics auth requirements
@@ -143,60 +190,22 @@ class MentionlyticsAgent:
             'Content-Type': 'application/json'
         }
     
-    def _parse_mention(self, data: Dict) -> Optional[CrisisMention]:
-        """Parse Mentionlytics data into CrisisMention"""
-        try:
-            # Extract keywords from content
-            content = data.get('content', '')
-            keywords = self._extract_keywords(content)
-            
-            return CrisisMention(
-                mention_id=data.get('id', ''),
-                content=content,
-                source=data.get('source', 'unknown'),
-                author=data.get('author', {}).get('name'),
-                url=data.get('url'),
-                sentiment_score=data.get('sentiment', {}).get('score', 0),
-                reach_count=data.get('author', {}).get('reach', 0),
-                engagement_count=data.get('engagement', {}).get('total', 0),
-                published_at=datetime.fromisoformat(
-                    data.get('published_at', datetime.now().isoformat())
-                ),
-                keywords=keywords
-            )
-        except Exception as e:
-            logger.error(f"Error parsing mention: {e}")
-            return None
-    
-    def _extract_keywords(self, content: str) -> List[str]:
-        """Extract relevant keywords from content"""
-        # Simple keyword extraction - in production use NLP
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'}
-        
-        words = content.lower().split()
-        keywords = [
-            word.strip('.,!?;:"') 
-            for word in words 
-            if len(word) > 3 and word not in stop_words
-        ]
-        
-        # Return top 10 most common keywords
-        from collections import Counter
-        word_counts = Counter(keywords)
-        return [word for word, _ in word_counts.most_common(10)]
+    def get_emerging_terms(self, limit: int = 10) -> List[Dict]:
+        """Get terms trending above their baseline across all parsed mentions"""
+        return self.trending.emerging_terms(limit=limit)
     
     async def get_mention_details(self, mention_id: str) -> Optional[Dict]:
         """Get detailed information about a specific mention"""
         try:
             await self.rate_limiter.acquire()
             
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            import aiohttp
+            session = self._get_session()
             
             headers = self._get_auth_headers('GET', f'/mentions/{mention_id}', {})
             url = f"{self.config.base_url}/mentions/{mention_id}"
             
-            async with self.session.get(
+            async with session.get(
                 url,
                 headers=headers,
                 timeout=aiohttp.ClientTimeout(total=30)
@@ -211,8 +220,8 @@ class MentionlyticsAgent:
     async def setup_webhook(self, webhook_url: str) -> bool:
         """Setup webhook for real-time mention notifications"""
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            import aiohttp
+            session = self._get_session()
             
             data = {
                 'url': webhook_url,
@@ -223,7 +232,7 @@ class MentionlyticsAgent:
             headers = self._get_auth_headers('POST', '/webhooks', {})
             url = f"{self.config.base_url}/webhooks"
             
-            async with self.session.post(
+            async with session.post(
                 url,
                 json=data,
                 headers=headers,
@@ -245,32 +254,22 @@ class MentionlyticsAgent:
     
     def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
         """Verify webhook signature from Mentionlytics"""
-        if not self.config.webhook_secret:
-            logger.warning("No webhook secret configured")
-            return False
-        
-        expected_signature = hmac.new(
-            self.config.webhook_secret.encode(),
-            payload,
-            hashlib.sha256
-        ).hexdigest()
-        
-        return hmac.compare_digest(expected_signature, signature)
+        return verify_webhook_signature(payload, signature, self.config.webhook_secret)
 
 
 class NewsWhipAgent:
     """Placeholder for NewsWhip integration"""
     
-    async def scan(self) -> List[CrisisMention]:
+    async def scan(self) -> MentionBatch:
         """Scan NewsWhip for trending stories"""
         # Placeholder - implement when NewsWhip credentials available
-        return []
+        return MentionBatch()
 
 
 class SocialMediaAgent:
     """Placeholder for direct social media monitoring"""
     
-    async def scan(self) -> List[CrisisMention]:
+    async def scan(self) -> MentionBatch:
         """Scan social media platforms"""
         # Placeholder - implement platform-specific monitoring
-        return []
\ No newline at end of file
+        return MentionBatch()
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Crisis Detection Workflow Benchmarks
+"""
@@ -0,0 +1,87 @@
+"""
+Author Influence Benchmark
+
+Runs a day of ten-minute monitoring cycles and, after each cycle, finds
+the most influential authors two ways: re-aggregating every mention seen
+so far by author (what cross-cycle influence needs without a cache), and
+updating the AuthorInfluenceCache incrementally and asking it for the
+top authors.
+"""
+
+import random
+import sys
+import time
+
+from ..utils.author_influence import AuthorInfluenceCache
+from ..utils.mention_batch import MentionBatch
+
+CYCLES = 144  # One day of ten-minute scans
+
+
+def generate_cycle(count: int, start: float, rng: random.Random) -> MentionBatch:
+    """One scan's worth of mentions from a heavy-tailed author population"""
+    batch = MentionBatch()
+    for i in range(count):
+        # A few accounts post far more often than the rest
+        author = f"user{min(int(rng.paretovariate(0.8)), 50000)}"
+        batch._append(
+            f"m{int(start)}-{i}", "", "twitter", author, None,
+            rng.uniform(-1, 1),
+            int(rng.paretovariate(1.2) * 300),
+            0,
+            start + rng.uniform(0, 600),
+            ()
+        )
+    return batch
+
+
+def rescan_top_authors(history: list, k: int) -> list:
+    """Aggregate reach by author over the whole history and sort"""
+    totals = {}
+    for batch in history:
+        for author, reach in zip(batch.author, batch.reach_count):
+            totals[author] = totals.get(author, 0) + reach
+    return sorted(totals, key=totals.get, reverse=True)[:k]
+
+
+def run_benchmark(cycle_size: int = 2000, k: int = 10, seed: int = 3) -> dict:
+    """Run benchmark and return results"""
+    rng = random.Random(seed)
+    start = 1767225600.0
+    cycles = [generate_cycle(cycle_size, start + c * 600, rng) for c in range(CYCLES)]
+
+    history = []
+    started = time.perf_counter()
+    for batch in cycles:
+        history.append(batch)
+        rescan = rescan_top_authors(history, k)
+    rescan_seconds = time.perf_counter() - started
+
+    cache = AuthorInfluenceCache()
+    started = time.perf_counter()
+    for batch in cycles:
+        cache.observe_batch(batch)
+        cached = [a["author"] for a in cache.top_authors(k)]
+    cache_seconds = time.perf_counter() - started
+
+    return {
+        "mentions": cycle_size * CYCLES,
+        "authors": len(cache),
+        "rescan_seconds": rescan_seconds,
+        "cache_seconds": cache_seconds,
+        "speedup": rescan_seconds / cache_seconds,
+        # The cache ranks by recency-weighted reach, so the lists can differ
+        "top_overlap": len(set(rescan) & set(cached)) / k
+    }
+
+
+if __name__ == "__main__":
+    cycle_size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results = run_benchmark(cycle_size)
+
+    print("👤 Author Influence Benchmark")
+    print("=" * 29)
+    print(f"Mentions: {results['mentions']:,} over {CYCLES} cycles from {results['authors']:,} authors")
+    print(f"  rescan history {results['rescan_seconds']:7.2f}s")
+    print(f"  author cache   {results['cache_seconds']:7.2f}s")
+    print(f"Speedup: {results['speedup']:.0f}x, top authors shared: {results['top_overlap']:.0%}")
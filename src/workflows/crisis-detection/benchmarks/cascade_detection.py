@@ -0,0 +1,173 @@
+"""
+Cascade Detection Benchmark
+
+Streams mentions at 1M/day (organic posts, reposts and link shares from a
+large vocabulary) with a coordinated attack starting part-way through:
+sock accounts amplify one seed post by reposting it, sharing its link and
+pasting lightly edited copies, at a rate that doubles every five minutes.
+Reports when CascadeDetector flags the attack as coordinated versus when
+a raw-volume alarm (per-minute count above the trailing hour's mean plus
+four standard deviations) fires, plus throughput and key counts.
+"""
+
+import math
+import random
+import sys
+import time
+
+from ..utils.cascades import CascadeDetector
+from ..utils.mention_batch import MentionBatch
+
+PER_MINUTE = 1000000 // (24 * 60)
+VOCABULARY = [f"w{i}" for i in range(20000)]
+NEWS_URLS = [f"https://news.example.com/story/{i}" for i in range(5000)]
+SEED_TEXT = (
+    "Leaked memo shows Smith campaign knew about the hospital closures "
+    "months before the vote and said nothing"
+)
+
+
+def organic_mention(rng: random.Random, index: int, timestamp: float, recent: list) -> tuple:
+    """One background mention: a post, a repost of a recent post or a link share"""
+    author = f"user{rng.randrange(200000)}"
+    mention_id = f"m{index}"
+    content = " ".join(rng.choices(VOCABULARY, k=rng.randrange(8, 25)))
+    parent_id = None
+    roll = rng.random()
+    if roll < 0.05 and recent:
+        parent_id = rng.choice(recent)
+    elif roll < 0.07:
+        # Zipf-like popularity over news links
+        content += " " + NEWS_URLS[min(int(rng.paretovariate(1.1)) - 1, len(NEWS_URLS) - 1)]
+    return (
+        mention_id, content, "twitter", author,
+        f"https://social.example.com/{author}/status/{index}",
+        rng.uniform(-0.6, 0.8), int(rng.paretovariate(1.2) * 200), 0, timestamp, (), False,
+        parent_id
+    )
+
+
+def attack_mention(rng: random.Random, index: int, timestamp: float) -> tuple:
+    """One amplification of the seed: repost, link share or edited copy"""
+    author = f"sock{rng.randrange(3000)}"
+    roll = rng.random()
+    parent_id = None
+    if roll < 0.3:
+        content, parent_id = f"RT @whistle {SEED_TEXT}", "seed"
+    elif roll < 0.6:
+        words = rng.choices(VOCABULARY, k=6)
+        content = " ".join(words) + " https://social.example.com/whistle/status/seed"
+    else:
+        words = SEED_TEXT.split()
+        words.insert(rng.randrange(len(words)), f"#{rng.choice(('wakeup', 'truth', 'smithlies'))}")
+        content = f"@user{rng.randrange(1000)} " + " ".join(words)
+    return (
+        f"a{index}", content, "twitter", author,
+        f"https://social.example.com/{author}/status/a{index}",
+        -0.7, int(rng.paretovariate(1.5) * 100), 0, timestamp, (), False, parent_id
+    )
+
+
+def run_benchmark(hours: float = 6.0, attack_hour: float = 4.0, seed: int = 5) -> dict:
+    """Run benchmark and return results"""
+    rng = random.Random(seed)
+    start = 1767225600.0
+    minutes = int(hours * 60)
+    attack_minute = int(attack_hour * 60)
+
+    detector = CascadeDetector()
+    counts = []
+    recent: list = []
+    index = 0
+    observe_seconds = 0.0
+    peak_keys = peak_cascades = 0
+    volume_alarm = cascade_alarm = None
+    background_flagged = set()
+
+    for minute in range(minutes):
+        batch = MentionBatch()
+        minute_start = start + minute * 60
+        rows = [
+            organic_mention(rng, index + i, minute_start + rng.uniform(0, 60), recent)
+            for i in range(PER_MINUTE)
+        ]
+        index += PER_MINUTE
+
+        if minute >= attack_minute:
+            elapsed = minute - attack_minute
+            if elapsed == 0:
+                rows.append((
+                    "seed", SEED_TEXT, "twitter", "whistle",
+                    "https://social.example.com/whistle/status/seed",
+                    -0.8, 40000, 0, minute_start, (), False, None
+                ))
+            rate = min(2 ** (elapsed / 5), 300)
+            for i in range(int(rate)):
+                rows.append(attack_mention(rng, index + i, minute_start + rng.uniform(0, 60)))
+            index += int(rate)
+
+        rows.sort(key=lambda row: row[8])
+        for row in rows:
+            batch._append(*row)
+        recent = (recent + rng.sample(batch.mention_id, 50))[-2000:]
+        counts.append(len(batch))
+
+        started = time.perf_counter()
+        detector.observe_batch(batch)
+        observe_seconds += time.perf_counter() - started
+        stats = detector.get_stats()
+        peak_keys = max(peak_keys, stats["keys"])
+        peak_cascades = max(peak_cascades, stats["cascades"])
+
+        # Raw volume: this minute against the trailing hour
+        if volume_alarm is None and minute >= 60:
+            window = counts[-61:-1]
+            mean = sum(window) / len(window)
+            deviation = math.sqrt(sum((c - mean) ** 2 for c in window) / len(window))
+            if counts[-1] > mean + 4 * max(deviation, math.sqrt(mean)) and minute >= attack_minute:
+                volume_alarm = minute - attack_minute
+
+        for cascade in detector.coordinated_cascades(timestamp=minute_start + 60):
+            if cascade["seed_id"] != "seed":
+                background_flagged.add(cascade["seed_id"])
+            elif cascade_alarm is None:
+                cascade_alarm = minute - attack_minute
+
+    return {
+        "mentions": index,
+        "per_minute": PER_MINUTE,
+        "observe_seconds": observe_seconds,
+        "seconds_per_million": observe_seconds / index * 1e6,
+        "peak_keys": peak_keys,
+        "max_keys": detector.max_keys,
+        "peak_cascades": peak_cascades,
+        "cascade_alarm_minutes": cascade_alarm,
+        "volume_alarm_minutes": volume_alarm,
+        "background_coordinated": len(background_flagged),
+        "top_cascades": detector.top_cascades(3)
+    }
+
+
+if __name__ == "__main__":
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 6.0
+    results = run_benchmark(hours, attack_hour=hours * 2 / 3)
+
+    print("🕸️ Cascade Detection Benchmark")
+    print("=" * 30)
+    print(f"Mentions: {results['mentions']:,} ({results['per_minute']:,}/min background)")
+    print(f"Detector: {results['observe_seconds']:.1f}s "
+          f"({results['seconds_per_million']:.0f}s of one core per million mentions)")
+    print(f"Peak keys: {results['peak_keys']:,} of {results['max_keys']:,}, "
+          f"peak cascades: {results['peak_cascades']:,}")
+
+    def minutes(value):
+        return "never" if value is None else f"{value} min after start"
+
+    print("Coordinated attack detected:")
+    print(f"  cascade detector {minutes(results['cascade_alarm_minutes'])}")
+    print(f"  raw volume       {minutes(results['volume_alarm_minutes'])}")
+    print(f"Background cascades ever flagged as coordinated: {results['background_coordinated']}")
+    for cascade in results["top_cascades"]:
+        print(f"  {cascade['size']:5,} mentions, {cascade['authors']:4,} authors, "
+              f"{cascade['growth_per_minute']:5.1f}/min (burst {cascade['burst']:4.1f}x): "
+              f"{cascade['seed_content'][:40]}")
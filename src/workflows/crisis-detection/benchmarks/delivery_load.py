@@ -0,0 +1,191 @@
+"""
+Delivery Channel Load Test
+
+Drives deliveries through the real HTTP channel implementations against
+a local stand-in server for SendGrid, Twilio, Slack and FCM (run in a
+separate process so it does not share the client's event loop), and
+reports throughput and tail latency per channel.
+"""
+
+import asyncio
+import multiprocessing
+import random
+import sys
+import time
+
+from aiohttp import web
+
+from ..tools.channels import (
+    EmailChannel,
+    SMSChannel,
+    SlackChannel,
+    PhoneCallChannel,
+    PushNotificationChannel
+)
+from ..utils.latency_sketch import LatencySketch
+
+
+def create_stub_app(latency_seconds: float = 0.002, failure_rate: float = 0.0) -> web.Application:
+    """Provider stand-ins returning each API's success response shape"""
+    rng = random.Random(7)
+
+    def respond(success):
+        async def handler(request: web.Request) -> web.Response:
+            await request.read()
+            await asyncio.sleep(latency_seconds)
+            if rng.random() < failure_rate:
+                return web.json_response({"message": "Service unavailable"}, status=503)
+            return success(request)
+        return handler
+
+    app = web.Application()
+    app.router.add_post(
+        "/v3/mail/send",
+        respond(lambda r: web.Response(status=202, headers={"X-Message-Id": "sg-stub"}))
+    )
+    app.router.add_post(
+        "/2010-04-01/Accounts/{sid}/{resource}.json",
+        respond(lambda r: web.json_response({"sid": "SMstub", "status": "queued"}, status=201))
+    )
+    app.router.add_post(
+        "/v1/Services/{sid}/Notifications",
+        respond(lambda r: web.json_response({"sid": "NTstub"}, status=201))
+    )
+    app.router.add_post(
+        "/api/conversations.open",
+        respond(lambda r: web.json_response({"ok": True, "channel": {"id": "Gstub"}}))
+    )
+    app.router.add_post(
+        "/api/chat.postMessage",
+        respond(lambda r: web.json_response({"ok": True, "ts": "1700000000.000100"}))
+    )
+    app.router.add_post(
+        "/v1/projects/{project}/messages:send",
+        respond(lambda r: web.json_response({"name": "projects/stub/messages/1"}))
+    )
+    return app
+
+
+def _serve_stub(port_pipe, latency_seconds: float, failure_rate: float) -> None:
+    """Child process: run the stand-in server and report its port"""
+    async def serve():
+        runner = web.AppRunner(create_stub_app(latency_seconds, failure_rate), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0, backlog=1024)
+        await site.start()
+        port_pipe.send(site._server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def create_channels(base_url: str, max_connections: int) -> dict:
+    """Channels with stub credentials pointed at the stand-in server"""
+    common = {"base_url": base_url, "max_connections": max_connections}
+    twilio = {**common, "account_sid": "ACstub", "auth_token": "token", "from_number": "+15550000000"}
+    return {
+        "email": EmailChannel({**common, "api_key": "SG.stub"}),
+        "sms": SMSChannel({**twilio, "notify_service_sid": "ISstub", "notify_base_url": base_url}),
+        "slack": SlackChannel({**common, "bot_token": "xoxb-stub"}),
+        "phone_call": PhoneCallChannel(twilio),
+        "push": PushNotificationChannel({**common, "project_id": "stub", "access_token": "ya29.stub"})
+    }
+
+
+async def run_benchmark(
+    deliveries: int = 5000,
+    concurrency: int = 50,
+    latency_seconds: float = 0.002,
+    failure_rate: float = 0.0,
+    broadcast_size: int = 1000
+) -> dict:
+    """Run load test and return results"""
+    port_pipe, child_pipe = multiprocessing.Pipe()
+    server = multiprocessing.Process(
+        target=_serve_stub,
+        args=(child_pipe, latency_seconds, failure_rate),
+        daemon=True
+    )
+    server.start()
+    port = port_pipe.recv()
+
+    channels = create_channels(f"http://127.0.0.1:{port}", max_connections=concurrency)
+    names = list(channels)
+    sketches = {name: LatencySketch() for name in names}
+    failures = {name: 0 for name in names}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    recipient = {
+        "id": "bench",
+        "email": "bench@example.com",
+        "phone": "+15551234567",
+        "slack_id": "U0BENCH",
+        "device_token": "device-token"
+    }
+    metadata = {"priority": "high"}
+
+    async def deliver(i: int, record: bool = True) -> None:
+        name = names[i % len(names)]
+        async with semaphore:
+            started = time.perf_counter()
+            result = await channels[name].send(f"Crisis alert {i}", recipient, metadata)
+            if record:
+                sketches[name].add((time.perf_counter() - started) * 1000)
+                failures[name] += not result["success"]
+
+    try:
+        # Open the connection pools first so the run measures steady state
+        await asyncio.gather(*(deliver(i, record=False) for i in range(concurrency)))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(deliver(i) for i in range(deliveries)))
+        seconds = time.perf_counter() - started
+
+        # One broadcast through the bulk APIs
+        roster = [{**recipient, "id": f"v{i}"} for i in range(broadcast_size)]
+        broadcast_started = time.perf_counter()
+        broadcast = await asyncio.gather(
+            channels["email"].send_bulk("Broadcast", roster, metadata),
+            channels["sms"].send_bulk("Broadcast", roster, metadata)
+        )
+        broadcast_seconds = time.perf_counter() - broadcast_started
+    finally:
+        await asyncio.gather(*(channel.close() for channel in channels.values()))
+        server.terminate()
+        server.join()
+
+    overall = LatencySketch()
+    for sketch in sketches.values():
+        overall.merge(sketch)
+
+    return {
+        "deliveries": deliveries,
+        "concurrency": concurrency,
+        "seconds": seconds,
+        "deliveries_per_second": deliveries / seconds,
+        "latency_ms": overall.quantiles(),
+        "channels": {
+            name: {"latency_ms": sketches[name].quantiles(), "failures": failures[name]}
+            for name in names
+        },
+        "broadcast_recipients": broadcast_size,
+        "broadcast_seconds": broadcast_seconds,
+        "broadcast_delivered": sum(r["success"] for results in broadcast for r in results)
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    results = asyncio.run(run_benchmark(count))
+
+    latency = results["latency_ms"]
+    print("📡 Delivery Channel Load Test")
+    print("=" * 28)
+    print(f"Deliveries: {results['deliveries']:,} at concurrency {results['concurrency']} "
+          f"in {results['seconds']:.2f}s ({results['deliveries_per_second']:,.0f}/s)")
+    print(f"Latency: p50 {latency['p50']:.1f}ms, p95 {latency['p95']:.1f}ms, p99 {latency['p99']:.1f}ms")
+    for name, channel in results["channels"].items():
+        q = channel["latency_ms"]
+        print(f"  {name:<10} p50 {q['p50']:6.1f}ms  p99 {q['p99']:6.1f}ms  failures {channel['failures']}")
+    print(f"Broadcast: {results['broadcast_delivered']:,} email+SMS deliveries to "
+          f"{results['broadcast_recipients']:,} recipients in {results['broadcast_seconds'] * 1000:.0f}ms")
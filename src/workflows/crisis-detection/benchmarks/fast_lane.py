@@ -0,0 +1,122 @@
+"""
+Fast Lane Benchmark
+
+Pushes webhook deliveries (500 mentions every 100ms) into the workflow
+with a handful of damaging posts from large accounts mixed in, and times
+each one from enqueue to the first alert send through the real routing
+agent, delivery outbox and workers (provider sends are stand-ins with a
+fixed latency). Compares that with waiting for the next polling cycle.
+"""
+
+import asyncio
+import random
+import re
+import sys
+import time
+
+from ..agents.monitoring import MentionlyticsConfig
+from ..utils.mention_batch import MentionBatch
+from ..workflow import CrisisDetectionWorkflow
+
+WORDS = (
+    "candidate policy healthcare economy debate rally votes poll town hall "
+    "taxes climate reform jobs border plan smith jones"
+).split()
+INCIDENTS = (
+    "Leaked memo shows Smith knew about the hospital closures",
+    "Fact-check: Smith's claims about the jobs plan are false",
+    "Smith caught on tape mocking town hall voters",
+    "Thousands protest against the Smith border plan"
+)
+PROVIDER_SECONDS = 0.15  # Stand-in provider API latency per send
+POLL_SECONDS = 300  # Scan interval a mention otherwise waits on
+
+
+def generate_delivery(count: int, start: int, rng: random.Random, incident: int = None) -> MentionBatch:
+    """One webhook delivery; with incident set, one mention is a damaging high-reach post"""
+    batch = MentionBatch()
+    now = time.time()
+    for i in range(count):
+        batch._append(
+            f"m{start + i}", " ".join(rng.choices(WORDS, k=20)), "twitter",
+            f"user{rng.randrange(50000)}", None,
+            rng.uniform(-1, 1), int(rng.paretovariate(1.1) * 50), 0, now, ()
+        )
+    if incident is not None:
+        batch._append(
+            f"incident{incident}", f"{INCIDENTS[incident % len(INCIDENTS)]} (incident-{incident})",
+            "twitter", f"outlet{incident}", f"https://social.example.com/outlet{incident}/status/{incident}",
+            -0.85, 5000000, 0, now, (), True
+        )
+    return batch
+
+
+async def run_benchmark(deliveries: int = 100, incidents: int = 8, seed: int = 3) -> dict:
+    """Run benchmark and return results"""
+    rng = random.Random(seed)
+    workflow = CrisisDetectionWorkflow(
+        "bench",
+        MentionlyticsConfig(api_key="bench", api_secret="bench"),
+        # Every incident is timed on its own rather than folded into a digest
+        delivery_config={"suppression": {"enabled": False}}
+    )
+
+    first_sent = {}
+
+    def stand_in(channel_name):
+        async def send(message, recipient, metadata=None):
+            await asyncio.sleep(PROVIDER_SECONDS)
+            for incident in re.findall(r"incident-(\d+)", message):
+                first_sent.setdefault(int(incident), time.perf_counter())
+            return {"success": True, "channel": channel_name, "message_id": "stand-in"}
+        return send
+
+    for channel_name, channel in workflow.delivery_manager.channels.items():
+        channel.send = stand_in(channel_name)
+
+    incident_at = dict(zip(rng.sample(range(deliveries), incidents), range(incidents)))
+    enqueued = {}
+    select_seconds = 0.0
+    for d in range(deliveries):
+        batch = generate_delivery(500, d * 500, rng, incident_at.get(d))
+        if d in incident_at:
+            enqueued[incident_at[d]] = time.perf_counter()
+        started = time.perf_counter()
+        workflow.enqueue_mentions(batch)
+        select_seconds += time.perf_counter() - started
+        await asyncio.sleep(0.1)
+
+    await workflow.wait_for_background_tasks()
+    stats = workflow.get_fast_lane_metrics()
+    await workflow.close()
+
+    latencies = sorted(first_sent[i] - enqueued[i] for i in enqueued if i in first_sent)
+    return {
+        "mentions": deliveries * 500 + incidents,
+        "incidents": incidents,
+        "incidents_alerted": len(latencies),
+        "fast_lane_selected": stats["selected"],
+        "fast_lane_alerts": stats["alerts"],
+        "first_alert_p50": latencies[len(latencies) // 2] if latencies else None,
+        "first_alert_max": latencies[-1] if latencies else None,
+        "enqueue_ms": select_seconds / deliveries * 1000,
+        "polling_average_wait": POLL_SECONDS / 2
+    }
+
+
+if __name__ == "__main__":
+    deliveries = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    results = asyncio.run(run_benchmark(deliveries))
+
+    print("⚡ Fast Lane Benchmark")
+    print("=" * 21)
+    print(f"Mentions: {results['mentions']:,} pushed, {results['incidents']} damaging posts from 5M-reach accounts")
+    print(f"Fast lane: {results['fast_lane_selected']} mentions selected, {results['fast_lane_alerts']} alerts, "
+          f"{results['incidents_alerted']}/{results['incidents']} incidents alerted")
+    if results["first_alert_p50"] is not None:
+        print(f"Enqueue to first alert send: p50 {results['first_alert_p50']:.2f}s, "
+              f"max {results['first_alert_max']:.2f}s "
+              f"(includes a {PROVIDER_SECONDS * 1000:.0f}ms stand-in provider call)")
+    print(f"Without the fast lane: {results['polling_average_wait']:.0f}s average wait for the next "
+          f"{POLL_SECONDS // 60}-minute scan, plus enrichment and LLM analysis")
+    print(f"Enqueue cost (selection included): {results['enqueue_ms']:.2f}ms per 500-mention delivery")
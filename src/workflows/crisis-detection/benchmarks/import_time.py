@@ -0,0 +1,84 @@
+"""
+Cold-Start Import Benchmark
+
+Imports each entry point in a fresh interpreter and reports wall time,
+peak RSS and which heavy dependencies were loaded, so regressions in
+lazy loading show up as numbers rather than slow workers.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Name of the top-level package this benchmark belongs to
+PACKAGE = __package__.rsplit(".", 1)[0] if __package__ else "crisis_detection"
+
+HEAVY_MODULES = ("langgraph", "langchain", "langchain_core", "langchain_openai", "openai", "aiohttp", "pydantic")
+
+# Entry point name -> statements run in the fresh interpreter
+ENTRY_POINTS = {
+    "package": f"import {PACKAGE}",
+    "rate_limiter": f"from {PACKAGE} import RateLimiter",
+    "webhook": f"from {PACKAGE} import verify_webhook_signature",
+    "monitoring": f"from {PACKAGE} import MentionlyticsAgent",
+    "delivery": f"from {PACKAGE}.tools import DeliveryManager",
+    "workflow": f"from {PACKAGE} import CrisisDetectionWorkflow",
+    "first_analysis": (
+        f"from {PACKAGE} import CrisisDetectionAgent\n"
+        "agent = CrisisDetectionAgent('sk-benchmark')\n"
+        "agent.llm, agent.memory, agent.gateway.get_prompt('p', [('human', '{x}')])"
+    )
+}
+
+_PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+exec(compile({code!r}, "<entry point>", "exec"))
+seconds = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+
+def measure(code: str) -> dict:
+    """Run code in a fresh interpreter and return its import time, RSS and loaded modules"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(code=code, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(repeats: int = 3) -> dict:
+    """Run benchmark and return results"""
+    baseline = measure("pass")
+    results = {}
+    for name, code in ENTRY_POINTS.items():
+        runs = [measure(code) for _ in range(repeats)]
+        results[name] = {
+            "seconds": statistics.median(r["seconds"] for r in runs),
+            "rss_mb": statistics.median(r["rss_mb"] for r in runs),
+            "loaded": runs[-1]["loaded"]
+        }
+    return {"baseline_rss_mb": baseline["rss_mb"], "entry_points": results}
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    results = run_benchmark(repeats)
+
+    print("🚀 Cold-Start Import Benchmark")
+    print("=" * 30)
+    print(f"Bare interpreter RSS: {results['baseline_rss_mb']:.0f} MB")
+    for name, r in results["entry_points"].items():
+        loaded = ", ".join(r["loaded"]) or "-"
+        print(f"  {name:<15} {r['seconds'] * 1000:7.0f}ms  {r['rss_mb']:5.0f} MB  loads: {loaded}")
@@ -0,0 +1,128 @@
+"""
+Load Shedding Benchmark
+
+Pushes a 100x viral spike (webhook deliveries of 500 mentions) between two
+cycles and processes it two ways: buffering and enriching everything, and
+through the workflow's bounded MentionQueue, per-cycle cap and enrichment
+cap. Reports peak buffered mentions and memory, enrichment work, and how
+many of the mentions that matter (reach of 10k or more, or negative
+mentions from accounts with 1k+ reach) made it through.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from ..utils.load_shedding import LoadShedder, MentionQueue
+from ..utils.mention_batch import MentionBatch
+from ..utils.text_processing import relevance_score
+
+WORDS = (
+    "candidate policy healthcare economy debate rally votes poll town hall "
+    "taxes climate reform jobs border plan smith jones leaked scandal"
+).split()
+CAMPAIGN_CONTEXT = {"candidate_name": "Smith", "key_issues": ["healthcare", "economy"]}
+LOOKUP_MS = 1.0  # Modeled per-mention history lookup (vector search)
+
+
+def generate_delivery(count: int, start: int, rng: random.Random) -> MentionBatch:
+    """One webhook delivery during the spike"""
+    batch = MentionBatch()
+    for i in range(count):
+        batch._append(
+            f"m{start + i}", " ".join(rng.choices(WORDS, k=20)), "twitter",
+            f"user{rng.randrange(50000)}", None,
+            rng.uniform(-1, 1), int(rng.paretovariate(1.1) * 50), 0,
+            1767225600.0 + (start + i) / 100, ()
+        )
+    return batch
+
+
+def important(batch: MentionBatch) -> set:
+    """Mentions that must survive shedding"""
+    return {
+        mention_id
+        for mention_id, reach, sentiment in zip(batch.mention_id, batch.reach_count, batch.sentiment_score)
+        if reach >= 10000 or (reach >= 1000 and sentiment <= -0.5)
+    }
+
+
+def enrich(batch: MentionBatch) -> float:
+    """The CPU side of enrich_context; returns seconds taken"""
+    started = time.perf_counter()
+    enriched = [
+        {"mention": mention, "campaign_relevance": relevance_score(mention.content, CAMPAIGN_CONTEXT)}
+        for mention in batch
+    ]
+    assert len(enriched) == len(batch)
+    return time.perf_counter() - started
+
+
+def run_benchmark(normal_cycle: int = 1000, spike_factor: int = 100, seed: int = 9) -> dict:
+    """Run benchmark and return results"""
+    rng = random.Random(seed)
+    total = normal_cycle * spike_factor
+    deliveries = [generate_delivery(500, start, rng) for start in range(0, total, 500)]
+    expected = set().union(*(important(d) for d in deliveries))
+
+    # Unbounded: everything is buffered and enriched
+    tracemalloc.start()
+    buffered = MentionBatch()
+    for delivery in deliveries:
+        buffered.extend(delivery)
+    unbounded_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    unbounded_seconds = enrich(buffered)
+
+    # Bounded: the workflow's queue, cycle cap and enrichment cap
+    shedder = LoadShedder(seed=seed)
+    queue = MentionQueue(max_mentions=20000, shedder=shedder)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for delivery in deliveries:
+        queue.put(delivery)
+    put_seconds = time.perf_counter() - started
+    bounded_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    cycle = shedder.shed(queue.drain(), 10000, "cycle")
+    enriched = shedder.shed(cycle, 2000, "enrich")
+    bounded_seconds = enrich(enriched)
+    kept = important(cycle) & expected
+
+    return {
+        "spike_mentions": total,
+        "important": len(expected),
+        "unbounded_peak_buffered": len(buffered),
+        "unbounded_peak_mb": unbounded_peak / 1e6,
+        "unbounded_enriched": len(buffered),
+        "unbounded_enrich_seconds": unbounded_seconds + len(buffered) * LOOKUP_MS / 1000,
+        "bounded_peak_buffered": queue.peak,
+        "bounded_peak_mb": bounded_peak / 1e6,
+        "put_ms": put_seconds / len(deliveries) * 1000,
+        "cycle_mentions": len(cycle),
+        "bounded_enriched": len(enriched),
+        "bounded_enrich_seconds": bounded_seconds + len(enriched) * LOOKUP_MS / 1000,
+        "important_kept": len(kept) / len(expected) if expected else 1.0,
+        "shed": shedder.get_stats()["stages"]
+    }
+
+
+if __name__ == "__main__":
+    spike_factor = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    results = run_benchmark(spike_factor=spike_factor)
+
+    print("🚦 Load Shedding Benchmark")
+    print("=" * 25)
+    print(f"Spike: {results['spike_mentions']:,} mentions, {results['important']:,} that matter")
+    print(f"  unbounded: {results['unbounded_peak_buffered']:7,} buffered ({results['unbounded_peak_mb']:5.0f} MB), "
+          f"{results['unbounded_enriched']:7,} enriched in {results['unbounded_enrich_seconds']:6.1f}s")
+    print(f"  bounded:   {results['bounded_peak_buffered']:7,} buffered ({results['bounded_peak_mb']:5.0f} MB), "
+          f"{results['bounded_enriched']:7,} enriched in {results['bounded_enrich_seconds']:6.1f}s")
+    print(f"  (enrichment includes a modeled {LOOKUP_MS:.0f}ms history lookup per mention)")
+    print(f"Queue put: {results['put_ms']:.2f}ms per 500-mention delivery")
+    print(f"Cycle admitted {results['cycle_mentions']:,}; mentions that matter kept: {results['important_kept']:.0%}")
+    for stage, stats in results["shed"].items():
+        print(f"  {stage:6} shed {stats['shed']:7,} in {stats['overloads']} passes "
+              f"(last kept {stats['last_kept']:,}, {stats['last_protected']:,} protected by reach)")
@@ -0,0 +1,130 @@
+"""
+Mention Archive Benchmark
+
+Archives a day of synthetic mentions in ten-minute cycles, then answers
+"negative mentions with reach over 10k in the last 6 hours" from a freshly
+opened MentionArchive and, for comparison, by scanning the same mentions
+as a JSON-lines file.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from ..utils.mention_archive import MentionArchive
+from ..utils.mention_batch import MentionBatch
+
+SOURCES = ["twitter", "facebook", "news", "reddit", "instagram", "tiktok"]
+WORDS = (
+    "candidate policy healthcare economy scandal debate rally votes poll "
+    "leaked taxes climate reform jobs border plan fact check misleading"
+).split()
+
+CYCLES = 144  # One day of ten-minute scans
+
+
+def generate_cycle(count: int, start: float, rng: random.Random) -> MentionBatch:
+    """One scan's worth of mentions published over ten minutes"""
+    batch = MentionBatch()
+    for i in range(count):
+        batch._append(
+            f"m{int(start)}-{i}",
+            " ".join(rng.choices(WORDS, k=18)),
+            rng.choice(SOURCES),
+            f"user{rng.randrange(20000)}",
+            f"https://example.com/post/{int(start)}-{i}",
+            rng.uniform(-1, 1),
+            int(rng.paretovariate(1.2) * 300),  # Heavy-tailed like real reach
+            rng.randrange(5000),
+            start + rng.uniform(0, 600),
+            ()
+        )
+    return batch
+
+
+def run_benchmark(count: int = 300000, seed: int = 7) -> dict:
+    """Run benchmark and return results"""
+    rng = random.Random(seed)
+    start = 1767225600.0  # 2026-01-01
+    end = start + CYCLES * 600
+    cycle_size = max(1, count // CYCLES)
+    query = {"start": end - 6 * 3600, "min_reach": 10000, "max_sentiment": -0.3}
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive_dir = os.path.join(directory, "archive")
+        jsonl_path = os.path.join(directory, "mentions.jsonl")
+
+        archive = MentionArchive(archive_dir)
+        write_seconds = 0.0
+        with open(jsonl_path, "w") as f:
+            for cycle in range(CYCLES):
+                batch = generate_cycle(cycle_size, start + cycle * 600, rng)
+                for record in batch:
+                    f.write(json.dumps(record.dict(), default=str) + "\n")
+
+                started = time.perf_counter()
+                archive.append(batch)
+                write_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        archive.close()
+        write_seconds += time.perf_counter() - started
+        stats = archive.get_stats()
+
+        # Cold open: only segment headers are read; columns are mapped on demand
+        started = time.perf_counter()
+        archive = MentionArchive(archive_dir)
+        matches = archive.query(**query)
+        query_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        warm_matches = archive.query(**query)
+        warm_seconds = time.perf_counter() - started
+        archive.close()
+
+        started = time.perf_counter()
+        scan_matches = 0
+        with open(jsonl_path) as f:
+            for line in f:
+                mention = json.loads(line)
+                if (
+                    mention["reach_count"] >= query["min_reach"]
+                    and mention["sentiment_score"] <= query["max_sentiment"]
+                    and datetime.fromisoformat(mention["published_at"]).timestamp() >= query["start"]
+                ):
+                    scan_matches += 1
+        scan_seconds = time.perf_counter() - started
+        jsonl_bytes = os.path.getsize(jsonl_path)
+
+    return {
+        "mentions": stats["archived"],
+        "segments": stats["segments"],
+        "write_seconds": write_seconds,
+        "archive_mb": stats["disk_bytes"] / 1e6,
+        "jsonl_mb": jsonl_bytes / 1e6,
+        "matches": len(matches),
+        "cold_query_ms": query_seconds * 1000,
+        "warm_query_ms": warm_seconds * 1000,
+        "consistent": len(warm_matches) == len(matches) == scan_matches,
+        "jsonl_scan_ms": scan_seconds * 1000
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    results = run_benchmark(count)
+
+    print("🗄️ Mention Archive Benchmark")
+    print("=" * 27)
+    print(f"Mentions: {results['mentions']:,} in {results['segments']} segments, "
+          f"written in {results['write_seconds']:.2f}s")
+    print(f"On disk: {results['archive_mb']:.0f} MB (JSON lines: {results['jsonl_mb']:.0f} MB)")
+    print(f"Negative mentions with reach >= 10k, last 6 hours: {results['matches']:,}")
+    print(f"  archive (cold open) {results['cold_query_ms']:8.1f}ms")
+    print(f"  archive (warm)      {results['warm_query_ms']:8.1f}ms")
+    print(f"  JSON-lines scan     {results['jsonl_scan_ms']:8.1f}ms")
+    print(f"Same answer: {results['consistent']}")
@@ -0,0 +1,119 @@
+"""
+Mention Representation Benchmark
+
+Compares building one CrisisMention model per API item (and copying each
+with .dict() during enrichment) against validating whole pages into a
+columnar MentionBatch, for time and peak memory.
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from ..agents.crisis_detection import CrisisMention
+from ..utils.mention_batch import MentionBatch
+from ..utils.text_processing import extract_keywords
+
+SOURCES = ["twitter", "facebook", "news", "reddit", "instagram", "tiktok"]
+WORDS = (
+    "candidate policy healthcare economy scandal debate rally votes poll "
+    "leaked taxes climate reform jobs border plan fact check misleading"
+).split()
+
+
+def generate_items(count: int, page_size: int = 100, seed: int = 11) -> list:
+    """Pages of synthetic Mentionlytics API items"""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    items = [
+        {
+            "id": f"m{i}",
+            "content": " ".join(rng.choices(WORDS, k=18)),
+            "source": rng.choice(SOURCES),
+            "author": {"name": f"user{rng.randrange(5000)}", "reach": rng.randrange(200000)},
+            "url": f"https://example.com/post/{i}",
+            "sentiment": {"score": rng.uniform(-1, 1)},
+            "engagement": {"total": rng.randrange(5000)},
+            "published_at": (start + timedelta(seconds=i)).isoformat()
+        }
+        for i in range(count)
+    ]
+    return [items[i:i + page_size] for i in range(0, count, page_size)]
+
+
+def model_path(pages: list) -> tuple:
+    """One validated model per item, copied with .dict() for enrichment"""
+    mentions = []
+    for page in pages:
+        for data in page:
+            content = data.get("content", "")
+            mentions.append(CrisisMention(
+                mention_id=data.get("id", ""),
+                content=content,
+                source=data.get("source", "unknown"),
+                author=data.get("author", {}).get("name"),
+                url=data.get("url"),
+                sentiment_score=data.get("sentiment", {}).get("score", 0),
+                reach_count=data.get("author", {}).get("reach", 0),
+                engagement_count=data.get("engagement", {}).get("total", 0),
+                published_at=datetime.fromisoformat(data["published_at"]),
+                keywords=extract_keywords(content)
+            ))
+    enriched = [{"mention": m.dict(), "reach": m.reach_count} for m in mentions]
+    return mentions, enriched
+
+
+def batch_path(pages: list) -> tuple:
+    """Page-at-a-time validation into a columnar batch; enrichment holds views"""
+    mentions = MentionBatch()
+    for page in pages:
+        batch, _ = MentionBatch.from_api_page(page, extract_keywords)
+        mentions.extend(batch)
+    enriched = [{"mention": m, "reach": m.reach_count} for m in mentions]
+    return mentions, enriched
+
+
+def measure(fn, pages: list) -> dict:
+    """Wall time and peak traced memory of one run"""
+    gc.collect()
+    started = time.perf_counter()
+    fn(pages)
+    seconds = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"seconds": seconds, "peak_mb": peak / 1e6}
+
+
+def run_benchmark(count: int = 100000) -> dict:
+    """Run benchmark and return results"""
+    pages = generate_items(count)
+    models = measure(model_path, pages)
+    batch = measure(batch_path, pages)
+    return {
+        "mentions": count,
+        "models": models,
+        "batch": batch,
+        "speedup": models["seconds"] / batch["seconds"],
+        "memory_ratio": models["peak_mb"] / batch["peak_mb"]
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    results = run_benchmark(count)
+
+    print("🧮 Mention Representation Benchmark")
+    print("=" * 35)
+    print(f"Mentions: {results['mentions']:,}")
+    for name in ("models", "batch"):
+        r = results[name]
+        print(f"  {name:<7} {r['seconds']:.2f}s  peak {r['peak_mb']:.0f} MB")
+    print(f"Speedup: {results['speedup']:.1f}x, memory: {results['memory_ratio']:.1f}x less")
@@ -0,0 +1,81 @@
+"""
+Delivery Outbox Throughput Benchmark
+
+Measures enqueue and drain throughput of the SQLite delivery outbox
+against local channel stubs with simulated provider latency.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from ..tools.outbox import DeliveryOutbox
+
+
+async def run_benchmark(
+    alerts: int = 2000,
+    channels_per_alert: int = 3,
+    workers: int = 32,
+    latency_seconds: float = 0.005
+) -> dict:
+    """Run throughput benchmark and return results"""
+    channels = ["email", "sms", "slack", "push", "phone_call"][:channels_per_alert]
+    completed = 0
+    
+    async def send(payload, channel, key):
+        # Local stub standing in for a provider API call
+        await asyncio.sleep(latency_seconds)
+        return {"success": True, "channel": channel}
+    
+    async def complete(payload, results):
+        nonlocal completed
+        completed += 1
+    
+    with tempfile.TemporaryDirectory() as directory:
+        outbox = DeliveryOutbox(
+            handler=send,
+            on_alert_complete=complete,
+            store_path=os.path.join(directory, "outbox.db"),
+            concurrency=workers
+        )
+        
+        started = time.perf_counter()
+        for i in range(alerts):
+            outbox.enqueue(f"alert{i}", {"message": f"Crisis alert {i}"}, channels)
+        enqueue_seconds = time.perf_counter() - started
+        
+        # Replaying the same alerts must not create new jobs
+        for i in range(0, alerts, 10):
+            outbox.enqueue(f"alert{i}", {"message": f"Crisis alert {i}"}, channels)
+        
+        await outbox.drain()
+        total_seconds = time.perf_counter() - started
+        stats = outbox.get_stats()
+        await outbox.stop()
+    
+    jobs = alerts * channels_per_alert
+    return {
+        "jobs": jobs,
+        "workers": workers,
+        "enqueue_per_second": alerts / enqueue_seconds,
+        "jobs_per_second": jobs / total_seconds,
+        "seconds": total_seconds,
+        "alerts_completed": completed,
+        **stats
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results = asyncio.run(run_benchmark(count))
+    
+    print("📬 Delivery Outbox Throughput")
+    print("=" * 29)
+    print(f"Jobs: {results['jobs']:,} with {results['workers']} workers in {results['seconds']:.2f}s")
+    print(f"Enqueue: {results['enqueue_per_second']:,.0f} alerts/s")
+    print(f"Drain: {results['jobs_per_second']:,.0f} jobs/s")
+    print(f"Alerts completed: {results['alerts_completed']:,}, "
+          f"duplicates skipped: {results['duplicates']:,}")
+    print(f"Jobs by status: {results['jobs_by_status']}")
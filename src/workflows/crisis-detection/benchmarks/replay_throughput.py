@@ -0,0 +1,89 @@
+"""
+Replay Throughput Benchmark
+
+Writes a synthetic gzip mention archive with a scandal burst part-way
+through, replays it with the offline heuristic model, and reports the
+non-LLM throughput per stage and whether the burst was caught.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from ..replay import run_replay
+
+WORDS = (
+    "candidate policy healthcare economy debate rally votes poll town hall "
+    "taxes climate reform jobs border plan smith jones"
+).split()
+
+CAMPAIGN_CONTEXT = {
+    "candidate_name": "Smith",
+    "key_issues": ["healthcare", "economy", "climate"],
+    "opponents": ["Jones"]
+}
+
+
+def write_archive(path: str, count: int, seed: int = 11) -> datetime:
+    """Write count mentions two seconds apart; returns the burst start time"""
+    rng = random.Random(seed)
+    start = datetime(2024, 3, 1)
+    burst = range(int(count * 0.6), int(count * 0.6) + max(count // 200, 50))
+
+    with gzip.open(path, "wt") as f:
+        for i in range(count):
+            crisis = i in burst
+            content = " ".join(rng.choices(WORDS, k=20))
+            if crisis:
+                content += " leaked scandal exposed smith"
+            f.write(json.dumps({
+                "id": f"m{i}",
+                "content": content,
+                "source": rng.choice(("twitter", "facebook", "news")),
+                "author": {"name": f"user{rng.randrange(5000)}", "reach": rng.randrange(100000 if crisis else 3000)},
+                "sentiment": {"score": -0.8 if crisis else rng.uniform(-0.25, 0.6)},
+                "engagement": {"total": rng.randrange(50)},
+                "published_at": (start + timedelta(seconds=2 * i)).isoformat()
+            }) + "\n")
+
+    return start + timedelta(seconds=2 * burst.start)
+
+
+async def run_benchmark(count: int = 200000) -> dict:
+    """Run benchmark and return results"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "mentions.jsonl.gz")
+        burst_start = write_archive(path, count)
+        report = await run_replay([path], CAMPAIGN_CONTEXT)
+
+    return {
+        "mentions": report["mentions"],
+        "windows": report["windows"],
+        "alerts": report["alerts"],
+        "burst_start": burst_start.isoformat(),
+        "first_detection_by_threat": report["first_detection_by_threat"],
+        "stage_seconds": report["stage_seconds"],
+        "non_llm_mentions_per_minute": report["non_llm_mentions_per_minute"],
+        "wall_seconds": report["wall_seconds"]
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    results = asyncio.run(run_benchmark(count))
+
+    print("⏪ Replay Throughput Benchmark")
+    print("=" * 29)
+    print(f"Mentions: {results['mentions']:,} in {results['windows']:,} windows, "
+          f"{results['alerts']:,} alerts (burst starts {results['burst_start']})")
+    for threat, detected_at in results["first_detection_by_threat"].items():
+        print(f"  first {threat}: {detected_at}")
+    for stage, seconds in results["stage_seconds"].items():
+        print(f"  {stage:<9} {seconds:6.2f}s")
+    print(f"Non-LLM throughput: {results['non_llm_mentions_per_minute']:,.0f} mentions/min "
+          f"(wall {results['wall_seconds']:.1f}s)")
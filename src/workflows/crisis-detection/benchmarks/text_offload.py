@@ -0,0 +1,94 @@
+"""
+Text Processing Offload Benchmark
+
+Extracts keywords and scores relevance for one large mention page, inline
+on the event loop versus through the shared-memory process pool, while a
+heartbeat task measures how long the event loop is blocked.
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from ..utils.text_processing import TextProcessingPool
+
+WORDS = (
+    "candidate policy healthcare economy scandal debate rally votes poll "
+    "leaked taxes clean climate reform jobs border plan fact check misleading "
+    "smith jones the and for with about"
+).split()
+
+CAMPAIGN_CONTEXT = {
+    "candidate_name": "Smith",
+    "key_issues": ["healthcare", "economy", "climate"],
+    "opponents": ["Jones"]
+}
+
+
+def generate_texts(count: int, words_per_text: int = 60, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=words_per_text)) for _ in range(count)]
+
+
+async def _heartbeat(interval: float, stalls: list, stop: asyncio.Event) -> None:
+    """Record how late each tick runs (time the loop was blocked)"""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        stalls.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _measure(pool: TextProcessingPool, texts: list) -> dict:
+    stalls: list = []
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(0.005, stalls, stop))
+    await asyncio.sleep(0.02)
+
+    started = time.perf_counter()
+    keywords = await pool.extract_keywords(texts)
+    scores = await pool.relevance_scores(texts, CAMPAIGN_CONTEXT)
+    seconds = time.perf_counter() - started
+
+    stop.set()
+    await heartbeat
+    return {
+        "seconds": seconds,
+        "max_stall_ms": max(stalls) * 1000,
+        "keywords": len(keywords),
+        "scores": len(scores)
+    }
+
+
+async def run_benchmark(count: int = 50000, max_workers: int = None) -> dict:
+    """Run benchmark and return results"""
+    texts = generate_texts(count)
+
+    inline = await _measure(TextProcessingPool(min_batch_size=count + 1), texts)
+
+    pool = TextProcessingPool(max_workers=max_workers)
+    try:
+        # Start the workers first so the run measures steady state
+        await pool.extract_keywords(texts[:pool.min_batch_size])
+        offloaded = await _measure(pool, texts)
+    finally:
+        pool.close()
+
+    return {
+        "texts": count,
+        "workers": pool.max_workers,
+        "inline": inline,
+        "offloaded": offloaded
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    results = asyncio.run(run_benchmark(count))
+
+    print("🧵 Text Processing Offload Benchmark")
+    print("=" * 36)
+    print(f"Texts: {results['texts']:,}, workers: {results['workers']}")
+    for name in ("inline", "offloaded"):
+        r = results[name]
+        print(f"  {name:<9} {r['seconds']:.2f}s  max event loop stall {r['max_stall_ms']:.0f}ms")
@@ -0,0 +1,67 @@
+"""
+Trending Keyword Throughput Benchmark
+
+Measures update throughput and memory footprint of the streaming
+heavy-hitter tracker fed with a synthetic Zipf-distributed keyword stream.
+"""
+
+import random
+import sys
+import time
+from itertools import accumulate
+
+from ..utils.trending import TrendingKeywordTracker
+
+
+def generate_stream(mentions: int, vocabulary: int = 50000, terms_per_mention: int = 10):
+    """Generate keyword lists following a Zipf-like distribution"""
+    rng = random.Random(42)
+    words = [f"term{i}" for i in range(vocabulary)]
+    # Cumulative weights once, rather than per choices() call
+    cum_weights = list(accumulate(1.0 / (rank + 1) for rank in range(vocabulary)))
+    
+    for _ in range(mentions):
+        yield rng.choices(words, cum_weights=cum_weights, k=terms_per_mention)
+
+
+def run_benchmark(mentions: int = 200000) -> dict:
+    """Run throughput benchmark and return results"""
+    tracker = TrendingKeywordTracker()
+    stream = list(generate_stream(mentions))
+    
+    # Inject a burst in the final tenth of the stream
+    burst_start = int(mentions * 0.9)
+    for keywords in stream[burst_start:]:
+        keywords.append("breakingscandal")
+    
+    # Simulate a day of traffic
+    start_ts = time.time() - 86400
+    step = 86400 / mentions
+    
+    started = time.perf_counter()
+    for i, keywords in enumerate(stream):
+        tracker.update(keywords, timestamp=start_ts + i * step)
+    elapsed = time.perf_counter() - started
+    
+    return {
+        "mentions": mentions,
+        "seconds": elapsed,
+        "mentions_per_second": mentions / elapsed,
+        "terms_per_second": sum(len(k) for k in stream) / elapsed,
+        "emerging": [t["term"] for t in tracker.emerging_terms(limit=5)],
+        **tracker.get_stats()
+    }
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    results = run_benchmark(count)
+    
+    print("📊 Trending Keyword Throughput")
+    print("=" * 30)
+    print(f"Mentions: {results['mentions']:,} in {results['seconds']:.2f}s")
+    print(f"Throughput: {results['mentions_per_second']:,.0f} mentions/s "
+          f"({results['terms_per_second']:,.0f} terms/s)")
+    print(f"Sketch memory: {results['memory_bytes'] / 1024:.0f} KiB, "
+          f"candidates: {results['candidates']}")
+    print(f"Emerging: {', '.join(results['emerging']) or 'none'}")
@@ -10,7 +10,7 @@ import os
 from datetime import datetime
 from typing import Dict, Optional
 
-from ..workflow import run_crisis_detection
+from ..workflow import CrisisDetectionWorkflow, run_crisis_detection
 from ..agents.monitoring import MentionlyticsConfig
 from ..utils.state import WorkflowState
 
@@ -215,18 +215,24 @@ async def continuous_monitoring_example():
     scan_count = 0
     alerts_sent = 0
     
+    # One workflow for every scan, so alert suppression, escalation timers
+    # and the delivery outbox carry over between cycles
+    workflow = CrisisDetectionWorkflow(
+        openai_api_key=openai_api_key,
+        mentionlytics_config=MentionlyticsConfig(
+            api_key=mentionlytics_api_key,
+            api_secret=mentionlytics_api_secret
+        ),
+        history_dir=os.getenv("CRISIS_HISTORY_DIR", "crisis_history")
+    )
+    
     try:
         while True:
             scan_count += 1
             print(f"🔍 Scan #{scan_count} - {datetime.now().strftime('%H:%M:%S')}")
             
             try:
-                result = await run_crisis_detection(
-                    openai_api_key=openai_api_key,
-                    mentionlytics_api_key=mentionlytics_api_key,
-                    mentionlytics_api_secret=mentionlytics_api_secret,
-                    campaign_context=campaign_context
-                )
+                result = await workflow.run({"campaign_context": campaign_context})
                 
                 # Check for threats
                 if result.get('threat_detected'):
@@ -257,6 +263,8 @@ async def continuous_monitoring_example():
     except KeyboardInterrupt:
         print("\n🛑 Monitoring stopped by user")
         print(f"📊 Final stats: {scan_count} scans completed, {alerts_sent} alerts sent")
+    finally:
+        await workflow.close()
 
 
 async def webhook_integration_example():
@@ -0,0 +1,37 @@
+"""
+Shared fixtures: a hand-advanced clock, so the tests never wait on
+wall-clock time
+"""
+
+import pytest
+
+from ..tools import escalation, outbox, retry_queue
+from ..utils import circuit_breaker, model_cascade
+
+
+class FakeClock:
+    """Stand-in for the time module that only moves when advanced"""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    """Patch the clock of every time-driven module under test"""
+    fake = FakeClock()
+    for module in (escalation, outbox, retry_queue, circuit_breaker, model_cascade):
+        monkeypatch.setattr(module, "time", fake)
+    return fake
@@ -0,0 +1,71 @@
+"""
+Cascade union-find linking and key generation rotation
+"""
+
+from ..utils.cascades import CascadeDetector
+
+
+def observe(detector, mention_id, timestamp, url=None, parent_id=None, author=None):
+    # Short posts get no content signature, so only ids and URLs link
+    return detector.observe(
+        mention_id, f"post {mention_id}", author or f"user-{mention_id}", 100, -0.5, timestamp,
+        url=url, parent_id=parent_id
+    )
+
+
+def test_replies_and_shared_urls_join_one_cascade():
+    detector = CascadeDetector(horizon_seconds=3600, start_time=0)
+
+    assert observe(detector, "m1", 0, url="https://news.example.com/story") == 1
+    assert observe(detector, "m2", 10, parent_id="m1") == 2
+    assert observe(detector, "m3", 20, url="https://news.example.com/story?utm_source=x") == 3
+    assert observe(detector, "m4", 30) == 1
+    assert len(detector) == 2
+
+    # A reply to both cascades merges them
+    detector.observe("m5", "quoting https://news.example.com/story", "user-m5", 100, -0.5, 40, parent_id="m4")
+    assert len(detector) == 1
+    assert detector.get_stats()["merges"] == 1
+
+
+def test_keys_survive_one_rotation_and_expire_after_a_horizon():
+    detector = CascadeDetector(horizon_seconds=100, start_time=0)
+    observe(detector, "m1", 0)
+    observe(detector, "m2", 10, parent_id="m1")
+
+    # Half a horizon later the keys move to the previous generation
+    observe(detector, "m3", 60)
+    assert detector.stats["rotations"] == 1
+    assert observe(detector, "m4", 70, parent_id="m1") == 3
+
+    # m4 refreshed m1's key; untouched for another full horizon it expires
+    observe(detector, "m5", 130)
+    observe(detector, "m6", 200)
+    assert detector.stats["rotations"] == 3
+    assert detector.stats["expired_cascades"] >= 1
+    assert observe(detector, "m7", 210, parent_id="m1") == 1
+
+
+def test_rotation_collapses_the_forest_to_live_roots():
+    detector = CascadeDetector(horizon_seconds=100, start_time=0)
+    previous = None
+    for i in range(20):
+        observe(detector, f"m{i}", i, parent_id=previous)
+        previous = f"m{i}"
+
+    detector._rotate(20)
+
+    assert len(detector) == 1
+    assert all(parent == root for root, parent in detector._parent.items())
+    assert observe(detector, "late", 21, parent_id="m0") == 21
+
+
+def test_max_keys_bounds_memory():
+    detector = CascadeDetector(horizon_seconds=10 ** 6, max_keys=40, start_time=0)
+    for i in range(500):
+        observe(detector, f"m{i}", i, url=f"https://example.com/{i}")
+
+    stats = detector.get_stats()
+    assert stats["rotations"] > 0
+    assert stats["keys"] <= detector.max_keys + 2
+    assert len(detector) <= stats["keys"]
@@ -0,0 +1,148 @@
+"""
+Channel bulk requests and provider error mapping (no network: requests
+go to a fake _post)
+"""
+
+import asyncio
+
+from ..tools.channels import EmailChannel, PushNotificationChannel, SMSChannel
+
+SENDGRID_BAD_ADDRESS = {
+    "errors": [{
+        "message": "Does not contain a valid address.",
+        "field": "personalizations.0.to.0.email",
+        "help": "http://sendgrid.com/docs/API_Reference/Web_API_v3/Mail/errors.html#message.personalizations.to"
+    }]
+}
+
+
+class FakeSendGrid:
+    """Rejects any request that contains a bad address, accepts the rest"""
+
+    def __init__(self, bad_addresses):
+        self.bad_addresses = set(bad_addresses)
+        self.requests = []
+
+    async def __call__(self, path, metadata, base_url=None, **kwargs):
+        addresses = [p["to"][0]["email"] for p in kwargs["json"]["personalizations"]]
+        self.requests.append(addresses)
+        if self.bad_addresses.intersection(addresses):
+            return 400, SENDGRID_BAD_ADDRESS, {}
+        return 202, {}, {"X-Message-Id": f"batch-{len(self.requests)}"}
+
+
+def email_channel(provider) -> EmailChannel:
+    channel = EmailChannel({"api_key": "SG.test"})
+    channel._post = provider
+    return channel
+
+
+def test_rejected_bulk_request_is_split_down_to_the_bad_address():
+    provider = FakeSendGrid(["bad@example"])
+    channel = email_channel(provider)
+    recipients = [{"id": i, "email": f"user{i}@example.com"} for i in range(16)]
+    recipients[11]["email"] = "bad@example"
+
+    results = asyncio.run(channel.send_bulk("Statement at noon", recipients, {"priority": "high"}))
+
+    assert [r["success"] for r in results] == [i != 11 for i in range(16)]
+    assert results[11]["error_type"] == "invalid_recipient"
+    # One full request, then one split per level down to the bad address
+    assert len(provider.requests) == 9
+    assert sum(len(request) for request in provider.requests if "bad@example" not in request) == 15
+
+
+def test_accepted_bulk_request_is_one_provider_call():
+    provider = FakeSendGrid([])
+    channel = email_channel(provider)
+    recipients = [{"id": i, "email": f"user{i}@example.com"} for i in range(40)]
+    recipients.append({"id": "no-email"})
+
+    results = asyncio.run(channel.send_bulk("Statement at noon", recipients, {}))
+
+    assert len(provider.requests) == 1
+    assert all(r["success"] for r in results[:40])
+    assert results[40]["error_type"] == "invalid_recipient"
+    assert len({r["message_id"] for r in results[:40]}) == 40
+
+
+def test_channels_without_a_bulk_endpoint_send_one_request_per_recipient():
+    assert SMSChannel({}).bulk_size == 1
+    assert SMSChannel({"notify_service_sid": "IS123"}).bulk_size == 10000
+    assert PushNotificationChannel({}).bulk_size == 1
+    assert EmailChannel({}).bulk_size == 1000
+
+
+def fake_post(status, body):
+    async def post(path, metadata, base_url=None, **kwargs):
+        return status, body, {}
+    return post
+
+
+def send(channel, status, body, recipient):
+    channel._post = fake_post(status, body)
+    return asyncio.run(channel.send("Statement at noon", recipient, {}))
+
+
+TWILIO = {"account_sid": "AC123", "auth_token": "secret", "from_number": "+15550000000"}
+FCM = {"project_id": "campaign", "access_token": "ya29.test"}
+
+
+def test_recipient_error_codes_map_to_invalid_recipient():
+    email = send(EmailChannel({"api_key": "SG.test"}), 400, SENDGRID_BAD_ADDRESS, {"email": "bad@example"})
+    sms = send(SMSChannel(TWILIO), 400, {"code": 21211, "message": "Invalid 'To' Phone Number"}, {"phone": "+1"})
+    push = send(PushNotificationChannel(FCM), 404, {
+        "error": {
+            "code": 404,
+            "message": "Requested entity was not found.",
+            "status": "NOT_FOUND",
+            "details": [{"@type": "type.googleapis.com/google.firebase.fcm.v1.FcmError", "errorCode": "UNREGISTERED"}]
+        }
+    }, {"device_token": "stale"})
+
+    for result in (email, sms, push):
+        assert not result["success"]
+        assert result["error_type"] == "invalid_recipient"
+
+
+def test_other_client_errors_are_provider_errors():
+    # Wrong base_url, malformed body, bad sender, bad credentials
+    cases = [
+        (EmailChannel({"api_key": "SG.test"}), 404, {}, {"email": "a@example.com"}),
+        (EmailChannel({"api_key": "SG.test"}), 400, {
+            "errors": [{"message": "The from address does not match a verified Sender Identity.", "field": "from"}]
+        }, {"email": "a@example.com"}),
+        (SMSChannel(TWILIO), 400, {"code": 21602, "message": "Message body is required."}, {"phone": "+15551234567"}),
+        (SMSChannel(TWILIO), 401, {"code": 20003, "message": "Authenticate"}, {"phone": "+15551234567"}),
+        (PushNotificationChannel(FCM), 400, {
+            "error": {"code": 400, "message": "Invalid JSON payload", "status": "INVALID_ARGUMENT"}
+        }, {"device_token": "token"})
+    ]
+
+    for channel, status, body, recipient in cases:
+        result = send(channel, status, body, recipient)
+        assert result["error_type"] == "provider_error", (channel.name, status, body)
+        assert result["status"] == status
+
+
+def test_throttling_and_timeouts_keep_their_types():
+    channel = SMSChannel(TWILIO)
+    assert send(channel, 429, {"code": 20429, "message": "Too Many Requests"}, {"phone": "+1555"})["error_type"] == "rate_limited"
+    assert send(channel, 408, {}, {"phone": "+1555"})["error_type"] == "timeout"
+
+
+def test_bulk_request_rejected_for_a_provider_error_is_not_split():
+    requests = []
+
+    async def post(path, metadata, base_url=None, **kwargs):
+        requests.append(path)
+        return 404, {}, {}
+
+    channel = EmailChannel({"api_key": "SG.test"})
+    channel._post = post
+    recipients = [{"id": i, "email": f"user{i}@example.com"} for i in range(8)]
+
+    results = asyncio.run(channel.send_bulk("Statement at noon", recipients, {}))
+
+    assert len(requests) == 1
+    assert {result["error_type"] for result in results} == {"provider_error"}
@@ -0,0 +1,111 @@
+"""
+Circuit breaker state transitions
+"""
+
+from ..utils.circuit_breaker import CircuitBreaker
+
+
+def open_breaker(**kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker("email", failure_threshold=3, reset_timeout_seconds=60, half_open_requests=2, **kwargs)
+    for _ in range(3):
+        breaker.record_failure("provider_error")
+    return breaker
+
+
+def test_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker("email", failure_threshold=3)
+    breaker.record_failure("provider_error")
+    breaker.record_failure("provider_error")
+    assert breaker.status == CircuitBreaker.CLOSED
+
+    breaker.record_failure("provider_error")
+
+    assert breaker.status == CircuitBreaker.OPEN
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+    assert breaker.next_retry_time == clock.time() + 60
+
+
+def test_half_opens_after_reset_timeout_and_closes_on_successful_probes(clock):
+    breaker = open_breaker()
+
+    clock.advance(59)
+    assert not breaker.allow_request()
+    clock.advance(1)
+    assert not breaker.is_open()
+    assert breaker.allow_request()
+    assert breaker.status == CircuitBreaker.HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.status == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.status == CircuitBreaker.CLOSED
+    assert breaker.next_retry_time is None
+
+
+def test_failed_probe_reopens(clock):
+    breaker = open_breaker()
+    clock.advance(60)
+    assert breaker.allow_request()
+
+    breaker.record_failure("provider_error")
+
+    assert breaker.status == CircuitBreaker.OPEN
+    assert breaker.next_retry_time == clock.time() + 60
+
+
+def test_ignored_failure_types_do_not_trip(clock):
+    breaker = CircuitBreaker("sms", failure_threshold=2, failure_types={"provider_error", "timeout"})
+    for _ in range(5):
+        breaker.record_failure("invalid_recipient")
+    assert breaker.status == CircuitBreaker.CLOSED
+
+    breaker.record_failure("timeout")
+    breaker.record_failure("provider_error")
+    assert breaker.status == CircuitBreaker.OPEN
+
+
+def test_failures_outside_monitoring_period_are_forgotten(clock):
+    breaker = CircuitBreaker("slack", failure_threshold=3, monitoring_period_seconds=300)
+    breaker.record_failure("provider_error")
+    breaker.record_failure("provider_error")
+
+    clock.advance(301)
+    breaker.record_failure("provider_error")
+
+    assert breaker.status == CircuitBreaker.CLOSED
+    assert breaker.failures == 1
+
+
+def test_half_open_lets_only_half_open_requests_probes_through(clock):
+    breaker = open_breaker()
+    clock.advance(60)
+
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    assert breaker.is_open()
+
+    # A finished probe frees its slot
+    breaker.record_success()
+    assert not breaker.is_open()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.status == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+
+def test_ignored_failure_frees_its_probe_slot(clock):
+    breaker = open_breaker(failure_types={"provider_error"})
+    clock.advance(60)
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+    breaker.record_failure("invalid_recipient")
+
+    assert breaker.status == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
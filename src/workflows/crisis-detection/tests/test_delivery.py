@@ -0,0 +1,80 @@
+"""
+Delivery manager stores, bulk sends and rate budgets
+"""
+
+import asyncio
+
+from ..tools.delivery import DeliveryManager
+
+
+def test_pending_escalation_survives_close_and_reopen(clock, tmp_path):
+    config = {"history_dir": str(tmp_path)}
+
+    async def first_run():
+        manager = DeliveryManager(config)
+        manager.start()
+        manager.escalations.schedule("alert-1", 15, {"escalate_to": ["campaign_manager"]})
+        await manager.close()
+
+    async def second_run():
+        manager = DeliveryManager(config)
+        manager.start()
+        pending = manager.escalations.get_pending()
+        await manager.close()
+        return pending
+
+    asyncio.run(first_run())
+    pending = asyncio.run(second_run())
+
+    assert (tmp_path / "escalations.db").exists()
+    assert [record["alert_id"] for record in pending] == ["alert-1"]
+    assert pending[0]["escalate_to"] == ["campaign_manager"]
+
+
+def count_tokens(manager: DeliveryManager):
+    taken = []
+    wait_for_capacity = manager.rate_limiter.wait_for_capacity
+
+    async def counting(service_name, tokens=1):
+        taken.append(service_name)
+        await wait_for_capacity(service_name, tokens)
+
+    manager.rate_limiter.wait_for_capacity = counting
+    return taken
+
+
+def test_bulk_send_takes_one_token_per_provider_request():
+    roster = [{"id": f"v{i}", "phone": f"+1555000{i:04d}"} for i in range(25)]
+
+    async def broadcast(sms_config):
+        manager = DeliveryManager({"sms": {"dry_run": True, **sms_config}, "outbox": {"enabled": False}})
+        taken = count_tokens(manager)
+        results = await manager._send_bulk_on_channel("sms", "Statement at noon", roster, {}, [[]] * len(roster))
+        await manager.close()
+        return taken, results
+
+    taken, results = asyncio.run(broadcast({}))
+    assert taken == ["twilio"] * 25
+    assert all(result["success"] for result in results)
+
+    taken, results = asyncio.run(broadcast({"notify_service_sid": "IS123"}))
+    assert taken == ["twilio"]
+    assert all(result["success"] for result in results)
+
+
+def test_sends_over_a_channel_budget_wait_instead_of_hanging():
+    async def scenario():
+        manager = DeliveryManager({"slack": {"dry_run": True}, "outbox": {"enabled": False}})
+        manager.rate_limiter.add_service("slack", max_requests=2, time_window=0.2)
+        sends = [
+            manager._send_on_channel("slack", "Statement at noon", {"id": f"s{i}", "slack_id": f"U{i}"}, {})
+            for i in range(6)
+        ]
+        results = await asyncio.wait_for(asyncio.gather(*sends), timeout=3)
+        await manager.close()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert len(results) == 6
+    assert all(result["success"] for result in results)
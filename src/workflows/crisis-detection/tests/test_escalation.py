@@ -0,0 +1,69 @@
+"""
+Escalation timers persisted across restarts
+"""
+
+import asyncio
+import sqlite3
+
+from ..tools.escalation import EscalationScheduler
+
+
+def test_pending_timers_survive_restart(clock, tmp_path):
+    store_path = str(tmp_path / "escalations.db")
+    fired = []
+
+    async def on_escalate(record):
+        fired.append(record["alert_id"])
+
+    async def before_restart():
+        scheduler = EscalationScheduler(on_escalate, store_path)
+        scheduler.schedule("alert-1", 10, {"escalate_to": ["chief_of_staff"]})
+        scheduler.schedule("alert-2", 30, {"escalate_to": ["campaign_manager"]})
+        scheduler.schedule("alert-3", 5, {"escalate_to": ["press_secretary"]})
+        scheduler.acknowledge("alert-3")
+        scheduler.stop()
+
+    async def after_restart():
+        scheduler = EscalationScheduler(on_escalate, store_path)
+        scheduler.start()
+        assert scheduler.pending_count() == 2
+        # alert-1 came due while the process was down and fires at once
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        pending = scheduler.get_pending()
+        scheduler.stop()
+        return pending
+
+    asyncio.run(before_restart())
+    clock.advance(11 * 60)
+    pending = asyncio.run(after_restart())
+
+    assert fired == ["alert-1"]
+    assert [record["alert_id"] for record in pending] == ["alert-2"]
+    assert pending[0]["escalate_to"] == ["campaign_manager"]
+    with sqlite3.connect(store_path) as db:
+        stored = db.execute("SELECT alert_id FROM escalation_timers").fetchall()
+    assert stored == [("alert-2",)]
+
+
+def test_rescheduling_replaces_the_timer(clock, tmp_path):
+    fired = []
+
+    async def on_escalate(record):
+        fired.append((record["alert_id"], record["fire_at"]))
+
+    async def scenario():
+        scheduler = EscalationScheduler(on_escalate, str(tmp_path / "escalations.db"))
+        scheduler.schedule("alert-1", 0, {})
+        later = scheduler.schedule("alert-1", 60, {})
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        count = scheduler.pending_count()
+        scheduler.stop()
+        return later, count
+
+    later, count = asyncio.run(scenario())
+
+    assert fired == []
+    assert count == 1
+    assert later == clock.time() + 3600
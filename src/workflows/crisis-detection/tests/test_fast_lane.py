@@ -0,0 +1,98 @@
+"""
+Fast-lane selection and provisional analysis
+"""
+
+from ..utils.fast_lane import DEFAULT_THREAT_TYPE, FastLane
+from ..utils.mention_batch import MentionBatch
+
+SCANDAL = {"type": "scandal_emergence", "indicators": ["scandal", "investigation"], "typical_severity": 7}
+
+
+def batch(rows) -> MentionBatch:
+    """Mentions from (content, reach, sentiment, verified) rows, ids m0, m1, ..."""
+    mentions, rejected = MentionBatch.from_api_page([
+        {
+            "id": f"m{i}",
+            "content": content,
+            "author": {"name": f"user{i}", "reach": reach, "verified": verified},
+            "sentiment": {"score": sentiment},
+            "url": f"https://example.com/{i}",
+            "published_at": "2024-10-01T12:00:00"
+        }
+        for i, (content, reach, sentiment, verified) in enumerate(rows)
+    ])
+    assert rejected == 0
+    return mentions
+
+
+def test_selects_damaging_mentions_grouped_by_threat_type():
+    lane = FastLane(patterns=[SCANDAL])
+    mentions = batch([
+        ("Candidate faces investigation over donations", 200000, -0.7, False),  # pattern hit
+        ("Candidate is terrible", 200000, -0.7, True),                        # verified author
+        ("Candidate is terrible", 2000000, -0.6, False),                      # huge reach
+        ("Candidate is terrible", 200000, -0.7, False),                       # nothing extra
+        ("Candidate scandal", 50000, -0.9, True),                             # reach too low
+        ("Candidate scandal deepens", 5000000, -0.2, True)                    # not negative enough
+    ])
+
+    groups = lane.select(mentions)
+
+    assert groups == {"scandal_emergence": [0], DEFAULT_THREAT_TYPE: [1, 2]}
+    assert lane.stats["selected"] == 3
+
+
+def test_each_mention_is_selected_once():
+    lane = FastLane()
+    mentions = batch([("Candidate is terrible", 2000000, -0.6, False)])
+
+    assert lane.select(mentions) == {DEFAULT_THREAT_TYPE: [0]}
+    assert lane.select(mentions) == {}
+    assert lane.selected_ids(["m0", "m0", "m9"]) == ["m0"]
+
+
+def test_monitor_keywords_filter_off_topic_mentions():
+    lane = FastLane(keywords=["Candidate"])
+    mentions = batch([
+        ("Stock market falls sharply", 2000000, -0.9, True),
+        ("CANDIDATE slammed in debate", 2000000, -0.9, True)
+    ])
+
+    assert lane.select(mentions) == {DEFAULT_THREAT_TYPE: [1]}
+
+
+def test_indicators_match_whole_words_only():
+    lane = FastLane(patterns=[SCANDAL])
+
+    assert lane.match_pattern("An Investigation was opened") == (SCANDAL, ["investigation"])
+    assert lane.match_pattern("Scandalous remarks") is None
+
+
+def test_provisional_analysis_builds_on_the_pattern_severity():
+    lane = FastLane(patterns=[SCANDAL])
+    mentions = batch([
+        ("Candidate under investigation", 3000000, -0.9, True),
+        ("More on the candidate scandal", 150000, -0.6, False)
+    ])
+
+    analysis = lane.analyze(mentions, "scandal_emergence")
+
+    # Typical 7, plus reach, verified author and sentiment
+    assert analysis.severity == 10
+    assert analysis.escalation_required
+    assert analysis.affected_topics == ["investigation", "scandal"]
+    assert "https://example.com/0" in analysis.recommended_actions[0]
+
+    plain = lane.analyze(batch([("Candidate is terrible", 200000, -0.6, True)]), DEFAULT_THREAT_TYPE)
+    assert plain.severity == 7 and not plain.escalation_required
+
+
+def test_record_alert_tracks_mention_to_alert_latency():
+    lane = FastLane()
+    mentions = batch([("Candidate is terrible", 2000000, -0.6, False)])
+
+    lane.record_alert(mentions, now=mentions.published_ts[0] + 12)
+
+    stats = lane.get_stats()
+    assert stats["alerts"] == 1
+    assert abs(stats["latency_seconds"]["p50"] - 12) < 0.5
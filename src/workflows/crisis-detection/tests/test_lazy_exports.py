@@ -0,0 +1,45 @@
+"""
+Package exports and LLM dependencies load lazily
+"""
+
+import importlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE = __package__.rsplit(".", 1)[0]
+PACKAGE_PARENT = str(Path(__file__).parents[2])
+
+LLM_MODULES = ("langgraph", "langchain", "langchain_core", "langchain_openai", "openai")
+
+
+def loaded_after(statement: str, modules) -> list:
+    """Which of modules a fresh interpreter has imported after running statement"""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import json, sys\n{statement}\nprint(json.dumps([m for m in {tuple(modules)!r} if m in sys.modules]))"],
+        cwd=PACKAGE_PARENT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize("name", ["RateLimiter", "verify_webhook_signature"])
+def test_light_entry_points_do_not_import_the_workflow(name):
+    heavy = (f"{PACKAGE}.workflow", "aiohttp") + LLM_MODULES
+
+    assert loaded_after(f"from {PACKAGE} import {name}", heavy) == []
+
+
+def test_importing_the_workflow_defers_the_llm_stack():
+    assert loaded_after(f"from {PACKAGE} import CrisisDetectionWorkflow", LLM_MODULES) == []
+
+
+def test_exports_resolve_on_first_access():
+    package = importlib.import_module(PACKAGE)
+
+    assert set(package.__all__) <= set(dir(package))
+    assert package.RateLimiter.__module__ == f"{PACKAGE}.utils.rate_limiter"
+    with pytest.raises(AttributeError):
+        getattr(package, "NotAnExport")
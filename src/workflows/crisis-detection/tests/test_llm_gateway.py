@@ -0,0 +1,121 @@
+"""
+LLM gateway rate budgets, request coalescing and retries
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from ..utils.llm_gateway import LLMGateway
+from ..utils.rate_limiter import RateLimiter
+
+
+class ScriptedChatModel:
+    """Chat model that raises or answers from a script, one entry per call"""
+
+    def __init__(self, *script, delay: float = 0.0):
+        self.script = list(script)
+        self.delay = delay
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        step = self.script[min(self.calls, len(self.script)) - 1]
+        if isinstance(step, Exception):
+            raise step
+        return AIMessage(content=step)
+
+
+def invoke(gateway: LLMGateway, llm, text: str = "hello"):
+    prompt = gateway.get_prompt("echo", [("human", "{text}")])
+    return gateway.ainvoke(llm, prompt, {"text": text}, task="echo")
+
+
+def test_spent_budget_waits_for_refill_without_deadlock():
+    limiter = RateLimiter(max_requests=2, time_window=0.2)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(5):
+            assert await asyncio.wait_for(limiter.acquire(), timeout=1)
+        return loop.time() - started
+
+    # Two tokens up front, then one refill every 0.1s
+    assert asyncio.run(scenario()) >= 0.25
+
+
+def test_waiting_caller_does_not_block_others():
+    limiter = RateLimiter(max_requests=1, time_window=0.2)
+
+    async def scenario():
+        await limiter.acquire()
+        waiters = [asyncio.create_task(limiter.acquire()) for _ in range(3)]
+        await asyncio.wait_for(asyncio.gather(*waiters), timeout=2)
+
+    asyncio.run(scenario())
+
+
+def test_gateway_call_over_budget_times_out_instead_of_hanging():
+    gateway = LLMGateway(requests_per_minute=1, timeout_seconds=0.2, max_retries=0)
+    llm = ScriptedChatModel("first", "second")
+
+    async def scenario():
+        assert (await invoke(gateway, llm, "one")).content == "first"
+        await asyncio.wait_for(invoke(gateway, llm, "two"), timeout=2)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(scenario())
+    assert llm.calls == 1
+    assert gateway.get_stats()["tasks"]["echo"]["errors"] == 1
+
+
+def test_gateway_call_over_budget_finishes_once_refilled():
+    gateway = LLMGateway(requests_per_minute=1, timeout_seconds=1, max_retries=0)
+    gateway.request_limiter = RateLimiter(max_requests=1, time_window=0.2)
+    llm = ScriptedChatModel("first", "second")
+
+    async def scenario():
+        await invoke(gateway, llm, "one")
+        return await invoke(gateway, llm, "two")
+
+    assert asyncio.run(scenario()).content == "second"
+
+
+def test_identical_concurrent_requests_share_one_call():
+    gateway = LLMGateway(requests_per_minute=100)
+    llm = ScriptedChatModel("shared", delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(invoke(gateway, llm), invoke(gateway, llm), invoke(gateway, llm, "other"))
+
+    same, coalesced, other = asyncio.run(scenario())
+
+    assert llm.calls == 2
+    assert same is coalesced
+    assert other is not same
+    assert gateway.get_stats()["tasks"]["echo"]["coalesced"] == 1
+
+
+def test_transient_errors_are_retried():
+    gateway = LLMGateway(requests_per_minute=100, max_retries=2, backoff_seconds=[0])
+    llm = ScriptedChatModel(asyncio.TimeoutError(), ConnectionError("reset"), "recovered")
+    llm.script[1].status_code = 503
+
+    assert asyncio.run(invoke(gateway, llm)).content == "recovered"
+    stats = gateway.get_stats()["tasks"]["echo"]
+    assert stats["retries"] == 2
+    assert stats["errors"] == 0
+    assert [call["outcome"] for call in gateway.call_history] == ["error", "error", "success"]
+
+
+def test_non_retryable_errors_raise_at_once():
+    gateway = LLMGateway(requests_per_minute=100, max_retries=2, backoff_seconds=[0])
+    llm = ScriptedChatModel(ValueError("bad request"), "unreachable")
+
+    with pytest.raises(ValueError):
+        asyncio.run(invoke(gateway, llm))
+    assert llm.calls == 1
+    assert gateway.get_stats()["tasks"]["echo"]["retries"] == 0
@@ -0,0 +1,92 @@
+"""
+Load shedding between workflow stages
+"""
+
+from ..utils.load_shedding import LoadShedder, MentionQueue, mention_priority
+from ..utils.mention_batch import MentionBatch
+
+
+def batch(rows) -> MentionBatch:
+    """Mentions from (reach, sentiment) pairs, ids m0, m1, ..."""
+    mentions, rejected = MentionBatch.from_api_page([
+        {
+            "id": f"m{i}",
+            "content": f"mention {i}",
+            "author": {"name": f"user{i}", "reach": reach},
+            "sentiment": {"score": sentiment},
+            "published_at": "2024-10-01T12:00:00"
+        }
+        for i, (reach, sentiment) in enumerate(rows)
+    ])
+    assert rejected == 0
+    return mentions
+
+
+def test_negative_mentions_outrank_larger_neutral_ones():
+    assert mention_priority(5000, -0.8) > mention_priority(50000, 0.0)
+    assert mention_priority(5000, 0.5) == mention_priority(5000, 0.0)
+
+
+def test_batch_within_capacity_is_not_copied():
+    shedder = LoadShedder()
+    mentions = batch([(100, 0.0)] * 5)
+
+    assert shedder.shed(mentions, 5) is mentions
+    assert shedder.shed_count() == 0
+
+
+def test_overload_keeps_protected_and_highest_priority_mentions_in_order():
+    shedder = LoadShedder(protect_reach=10000, sample_fraction=0)
+    mentions = batch([
+        (50000, 0.5),   # protected
+        (100, 0.0),
+        (2000, -0.9),
+        (20000, 0.0),   # protected
+        (3000, 0.1),
+        (10, -0.2),
+        (5000, -0.5)
+    ])
+
+    admitted = shedder.shed(mentions, 4, "cycle")
+
+    # Two protected, then the two best of the rest
+    assert admitted.mention_id == ["m0", "m2", "m3", "m6"]
+    assert shedder.get_stats()["stages"]["cycle"] == {
+        "overloads": 1, "shed": 3, "last_offered": 7, "last_kept": 4, "last_protected": 2
+    }
+
+
+def test_protected_mentions_are_kept_past_capacity():
+    shedder = LoadShedder(protect_reach=10000)
+    mentions = batch([(20000, 0.0)] * 5 + [(100, -1.0)] * 5)
+
+    admitted = shedder.shed(mentions, 3)
+
+    assert admitted.mention_id == ["m0", "m1", "m2", "m3", "m4"]
+
+
+def test_sampled_share_is_reproducible_with_a_seed():
+    rows = [(1000 + i, 0.0) for i in range(100)]
+
+    first = LoadShedder(sample_fraction=0.5, seed=7).shed(batch(rows), 20)
+    second = LoadShedder(sample_fraction=0.5, seed=7).shed(batch(rows), 20)
+
+    assert len(first) == 20
+    assert first.mention_id == second.mention_id
+    # The top half is the highest reach; the sample comes from the rest
+    assert {f"m{i}" for i in range(90, 100)} <= set(first.mention_id)
+
+
+def test_queue_sheds_down_to_the_low_watermark_when_full():
+    queue = MentionQueue(max_mentions=10, shedder=LoadShedder(sample_fraction=0), low_watermark=0.5, name="webhook")
+
+    assert queue.put(batch([(100, 0.0)] * 8)) == 0
+    shed = queue.put(batch([(100 + i, -0.5) for i in range(4)]))
+
+    assert shed == 7
+    assert len(queue) == 5
+    assert queue.get_stats() == {"received": 12, "buffered": 5, "peak": 12, "max_mentions": 10, "shed": 7}
+    drained = queue.drain()
+    assert len(drained) == 5 and len(queue) == 0
+    # The negative mentions from the second put survived
+    assert sum(1 for score in drained.sentiment_score if score < 0) == 4
@@ -0,0 +1,110 @@
+"""
+Columnar mention archive: range queries, compaction and restarts
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+from ..replay import run_replay
+from ..utils.mention_archive import MentionArchive
+from ..utils.mention_batch import MentionBatch
+from .test_replay import START, api_item, campaign_items, write_jsonl
+
+
+def mentions(count: int, start: float = START, step: float = 60, offset: int = 0) -> MentionBatch:
+    """Alternating sources, rising reach, sentiment from negative to positive"""
+    batch, rejected = MentionBatch.from_api_page([
+        {
+            **api_item(offset + i, start + i * step, -1 + 2 * i / count, 1000 * (i + 1), f"mention {offset + i}"),
+            "source": "twitter" if i % 2 else "news"
+        }
+        for i in range(count)
+    ])
+    assert rejected == 0
+    return batch
+
+
+def test_query_filters_segments_and_buffered_rows_in_publish_order(tmp_path):
+    archive = MentionArchive(str(tmp_path), partition_seconds=3600, flush_rows=40, index_interval=4)
+    archive.append(mentions(40))
+    # Not flushed yet, and published earlier than some archived rows
+    archive.append(mentions(10, start=START + 30, offset=100))
+
+    assert archive.get_stats()["segments"] == 1 and archive.get_stats()["buffered"] == 10
+    everything = archive.query()
+    assert len(everything) == 50
+    assert list(everything.published_ts) == sorted(everything.published_ts)
+
+    window = archive.query(start=START + 600, end=START + 1200)
+    assert [ts - START for ts in window.published_ts] == [600 + 60 * i for i in range(11)]
+    assert archive.count(start=START + 600, end=START + 1200) == 11
+
+    negative_news = archive.query(max_sentiment=-0.35, sources=["news"], min_reach=5000)
+    assert negative_news.mention_id == ["m4", "m6", "m8", "m10", "m12"]
+    assert archive.query(limit=3).mention_id == ["m0", "m100", "m1"]
+    archive.close()
+
+
+def test_archive_survives_reopen_and_compaction(tmp_path):
+    archive = MentionArchive(str(tmp_path), partition_seconds=3600, flush_rows=10, compact_segments=3)
+    for part in range(5):
+        archive.append(mentions(10, start=START + part * 600, step=60, offset=part * 10))
+    expected = archive.query()
+    stats = archive.get_stats()
+    archive.close()
+
+    assert stats["compactions"] >= 1
+    assert stats["archived"] == 50
+
+    reopened = MentionArchive(str(tmp_path), partition_seconds=3600)
+    assert reopened.query().mention_id == expected.mention_id
+    assert reopened.query().keywords == expected.keywords
+    reopened.compact()
+    assert reopened.get_stats()["segments"] == len(reopened._partitions)
+    assert reopened.query().content == expected.content
+    reopened.close()
+
+
+def test_interrupted_compaction_is_finished_on_load(tmp_path):
+    archive = MentionArchive(str(tmp_path), flush_rows=10, compact_segments=100)
+    archive.append(mentions(10))
+    archive.append(mentions(10, start=START + 600, offset=10))
+    old_segments = sorted(os.listdir(tmp_path))
+    # Keep copies of the inputs, as if the crash hit before they were deleted
+    contents = {name: (tmp_path / name).read_bytes() for name in old_segments}
+    archive.compact()
+    archive.close()
+    for name, data in contents.items():
+        (tmp_path / name).write_bytes(data)
+
+    reopened = MentionArchive(str(tmp_path))
+
+    assert len(reopened.query()) == 20
+    assert not any((tmp_path / name).exists() for name in old_segments)
+    reopened.close()
+
+
+def test_drop_before_removes_whole_partitions(tmp_path):
+    archive = MentionArchive(str(tmp_path), partition_seconds=3600, flush_rows=1)
+    archive.append(mentions(3, start=START, step=3600))
+
+    assert archive.drop_before(START + 3600) == 1
+    assert len(archive.query()) == 2
+    archive.close()
+
+
+def test_replaying_an_archive_directory_matches_the_jsonl_replay(tmp_path):
+    items = campaign_items()
+    archive = MentionArchive(str(tmp_path / "archive"), flush_rows=15)
+    archive.append(MentionBatch.from_api_page(items)[0])
+    archive.close()
+    jsonl = write_jsonl(tmp_path / "mentions.jsonl", items)
+    context = {"monitor_keywords": ["candidate"]}
+
+    from_archive = asyncio.run(run_replay([str(tmp_path / "archive")], context))
+    from_jsonl = asyncio.run(run_replay([jsonl], context))
+
+    for field in ("mentions", "windows", "alerts", "severity_counts", "alert_log"):
+        assert from_archive[field] == from_jsonl[field]
+    assert from_archive["alert_log"][0]["detected_at"] == datetime.fromtimestamp(START + 1800).isoformat()
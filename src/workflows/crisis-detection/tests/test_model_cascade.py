@@ -0,0 +1,124 @@
+"""
+Model cascade and crisis analysis against fake chat models
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from ..agents.crisis_detection import CrisisDetectionAgent, CrisisMention
+from ..utils.llm_gateway import LLMGateway
+from ..utils.model_cascade import ModelCascade, ModelTier
+
+
+class FailingChatModel:
+    """Chat model whose every call raises a non-retryable error"""
+
+    async def ainvoke(self, messages):
+        raise ValueError("model unavailable")
+
+
+def make_cascade(fast_llm, full_llm) -> ModelCascade:
+    gateway = LLMGateway(requests_per_minute=1000, max_retries=0)
+    return ModelCascade(
+        [
+            ModelTier("fast", llm=fast_llm, cost_per_1k_tokens=0.001),
+            ModelTier("full", llm=full_llm, cost_per_1k_tokens=0.1)
+        ],
+        gateway=gateway
+    )
+
+
+def run_prompt(cascade: ModelCascade, **kwargs):
+    prompt = cascade.gateway.get_prompt("echo", [("human", "{text}")])
+    return asyncio.run(cascade.ainvoke("echo", prompt, {"text": "hello"}, **kwargs))
+
+
+def test_cheap_tier_result_is_accepted(clock):
+    cascade = make_cascade(
+        FakeListChatModel(responses=["fast answer"]),
+        FakeListChatModel(responses=["full answer"])
+    )
+
+    assert run_prompt(cascade, should_escalate=lambda result: False) == "fast answer"
+    metrics = cascade.get_metrics()["echo"]
+    assert metrics["fast"]["accepted"] == 1
+    assert metrics["fast"]["acceptance_rate"] == 1
+    assert "full" not in metrics
+
+
+def test_rejected_result_escalates_to_next_tier(clock):
+    cascade = make_cascade(
+        FakeListChatModel(responses=["unsure"]),
+        FakeListChatModel(responses=["sure"])
+    )
+
+    result = run_prompt(cascade, should_escalate=lambda result: result == "unsure")
+
+    assert result == "sure"
+    metrics = cascade.get_metrics()["echo"]
+    assert metrics["fast"]["escalated"] == 1
+    assert metrics["full"]["accepted"] == 1
+
+
+def test_top_tier_result_is_never_escalated(clock):
+    cascade = make_cascade(
+        FakeListChatModel(responses=["unsure"]),
+        FakeListChatModel(responses=["still unsure"])
+    )
+
+    assert run_prompt(cascade, should_escalate=lambda result: True) == "still unsure"
+    assert cascade.get_metrics()["echo"]["full"]["accepted"] == 1
+
+
+def test_tier_error_escalates_and_top_tier_error_raises(clock):
+    failing = FailingChatModel()
+    cascade = make_cascade(failing, FakeListChatModel(responses=["fallback"]))
+    assert run_prompt(cascade) == "fallback"
+    assert cascade.get_metrics()["echo"]["fast"]["error"] == 1
+
+    cascade = make_cascade(FakeListChatModel(responses=["fast"]), FailingChatModel())
+    with pytest.raises(ValueError):
+        run_prompt(cascade, min_tier=1)
+
+
+def make_mentions():
+    return [
+        CrisisMention(
+            mention_id="m1",
+            content="Candidate caught lying about the budget",
+            source="twitter",
+            sentiment_score=-0.8,
+            reach_count=5000,
+            published_at=datetime(2024, 3, 1, 12, 0)
+        )
+    ]
+
+
+@pytest.mark.parametrize("fast_output, expected_tier", [
+    ("Severity: 3\nConfidence: 0.9\nThreat type: misinformation", "fast"),
+    ("Severity: 3\nConfidence: 0.4\nThreat type: misinformation", "full"),
+    ("Severity: 8\nConfidence: 0.9\nThreat type: scandal", "full")
+])
+def test_agent_escalates_low_confidence_and_high_severity(clock, fast_output, expected_tier):
+    full_output = "Severity: 9\nConfidence: 0.95\nThreat type: scandal"
+    cascade = make_cascade(
+        FakeListChatModel(responses=[fast_output]),
+        FakeListChatModel(responses=[full_output])
+    )
+    agent = CrisisDetectionAgent("test-key", model_cascade=cascade, use_memory=False)
+
+    analysis = asyncio.run(agent.analyze_mentions(make_mentions(), {"candidate": "Smith"}))
+
+    metrics = cascade.get_metrics()["analyze_mentions"]
+    assert metrics[expected_tier]["accepted"] == 1
+    if expected_tier == "fast":
+        assert analysis.severity == 3
+        assert analysis.threat_type == "misinformation"
+        assert "full" not in metrics
+    else:
+        assert metrics["fast"]["escalated"] == 1
+        assert analysis.severity == 9
+        assert analysis.escalation_required
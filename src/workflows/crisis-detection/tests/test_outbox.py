@@ -0,0 +1,205 @@
+"""
+Delivery outbox idempotency, retries and restart recovery
+"""
+
+import asyncio
+import sqlite3
+
+from ..tools.outbox import DeliveryOutbox
+
+
+def job_rows(store_path):
+    with sqlite3.connect(store_path) as db:
+        return db.execute(
+            "SELECT idempotency_key, status, attempts FROM outbox_jobs ORDER BY idempotency_key"
+        ).fetchall()
+
+
+def completed_flags(store_path):
+    with sqlite3.connect(store_path) as db:
+        return db.execute("SELECT alert_id, completed FROM outbox_alerts").fetchall()
+
+
+def test_enqueueing_the_same_alert_twice_sends_once(clock, tmp_path):
+    sent = []
+
+    async def handler(payload, channel, key):
+        sent.append(key)
+        return {"success": True}
+
+    async def scenario():
+        outbox = DeliveryOutbox(handler, store_path=str(tmp_path / "outbox.db"))
+        first = outbox.enqueue("alert-1", {"title": "Breaking"}, ["email", "sms"])
+        second = outbox.enqueue("alert-1", {"title": "Breaking"}, ["email", "sms"])
+        await outbox.drain()
+        third = outbox.enqueue("alert-1", {"title": "Breaking"}, ["email"])
+        await outbox.drain()
+        stats = outbox.get_stats()
+        await outbox.close()
+        return first, second, third, stats
+
+    first, second, third, stats = asyncio.run(scenario())
+
+    assert first == ["alert-1:email", "alert-1:sms"]
+    assert second == [] and third == []
+    assert sorted(sent) == ["alert-1:email", "alert-1:sms"]
+    assert stats["duplicates"] == 3
+    assert stats["jobs_by_status"] == {"sent": 2}
+
+
+def test_failed_job_retries_after_restart(clock, tmp_path):
+    store_path = str(tmp_path / "outbox.db")
+    completed = []
+
+    async def failing(payload, channel, key):
+        return {"success": False, "error": "provider down"}
+
+    async def succeeding(payload, channel, key):
+        return {"success": True, "message_id": "m-1"}
+
+    async def on_alert_complete(payload, results):
+        completed.append((payload["title"], results))
+
+    async def before_restart():
+        outbox = DeliveryOutbox(
+            failing, on_alert_complete, store_path, base_delay_seconds=30, max_delay_seconds=30
+        )
+        outbox.enqueue("alert-1", {"title": "Breaking"}, ["email"])
+        await outbox.drain()
+        awaiting = outbox.get_stats()["awaiting_retry"]
+        await outbox.close()
+        return awaiting
+
+    async def after_restart():
+        outbox = DeliveryOutbox(succeeding, on_alert_complete, store_path)
+        outbox.start()
+        await outbox.drain()
+        await outbox.close()
+
+    assert asyncio.run(before_restart()) == 1
+    assert job_rows(store_path) == [("alert-1:email", "pending", 1)]
+    assert completed == []
+
+    clock.advance(31)
+    asyncio.run(after_restart())
+
+    assert job_rows(store_path) == [("alert-1:email", "sent", 2)]
+    assert completed == [("Breaking", {"email": {"success": True, "message_id": "m-1"}})]
+    assert completed_flags(store_path) == [("alert-1", 1)]
+
+
+def test_interrupted_job_is_resent_on_start(clock, tmp_path):
+    store_path = str(tmp_path / "outbox.db")
+    sent = []
+
+    async def handler(payload, channel, key):
+        sent.append(key)
+        return {"success": True}
+
+    async def crash_mid_send():
+        outbox = DeliveryOutbox(handler, store_path=store_path)
+        outbox.enqueue("alert-1", {"title": "Breaking"}, ["slack"])
+        # The process dies before a worker settles the job
+        await outbox.close()
+
+    async def restart():
+        outbox = DeliveryOutbox(handler, store_path=store_path)
+        outbox.start()
+        await outbox.drain()
+        await outbox.close()
+
+    asyncio.run(crash_mid_send())
+    with sqlite3.connect(store_path) as db:
+        db.execute("UPDATE outbox_jobs SET status = 'in_progress'")
+    assert sent == []
+
+    asyncio.run(restart())
+
+    assert sent == ["alert-1:slack"]
+    assert job_rows(store_path) == [("alert-1:slack", "sent", 1)]
+
+
+def test_alert_completes_only_after_callback_succeeds(clock, tmp_path):
+    store_path = str(tmp_path / "outbox.db")
+    completed = []
+
+    async def handler(payload, channel, key):
+        return {"success": True}
+
+    async def broken_callback(payload, results):
+        raise RuntimeError("history store unavailable")
+
+    async def on_alert_complete(payload, results):
+        await asyncio.sleep(0.05)
+        completed.append(sorted(results))
+
+    async def run(callback, enqueue):
+        outbox = DeliveryOutbox(handler, callback, store_path)
+        if enqueue:
+            outbox.enqueue("alert-1", {"title": "Breaking"}, ["email", "sms"])
+        else:
+            outbox.start()
+        await outbox.drain()
+        # Completion of already-finished alerts runs as its own task on
+        # start; close() waits for it
+        await outbox.close()
+
+    asyncio.run(run(broken_callback, enqueue=True))
+    assert completed_flags(store_path) == [("alert-1", 0)]
+
+    asyncio.run(run(on_alert_complete, enqueue=False))
+    assert completed == [["email", "sms"]]
+    assert completed_flags(store_path) == [("alert-1", 1)]
+
+
+def test_non_retryable_failure_is_dead_lettered_at_once(clock, tmp_path):
+    calls = []
+    dead = []
+
+    async def handler(payload, channel, key):
+        calls.append(key)
+        return {"success": False, "error": "invalid number", "retryable": False}
+
+    async def on_dead_letter(payload, channel, result):
+        dead.append((channel, result["error"]))
+
+    async def scenario():
+        outbox = DeliveryOutbox(
+            handler, store_path=str(tmp_path / "outbox.db"), on_dead_letter=on_dead_letter, max_attempts=5
+        )
+        outbox.enqueue("alert-1", {"title": "Breaking"}, ["sms"])
+        await outbox.drain()
+        stats = outbox.get_stats()
+        await outbox.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert calls == ["alert-1:sms"]
+    assert dead == [("sms", "invalid number")]
+    assert stats["failed"] == 1 and stats["retried"] == 0
+
+
+def test_retry_at_defers_without_using_an_attempt(clock, tmp_path):
+    store_path = str(tmp_path / "outbox.db")
+    calls = []
+
+    async def handler(payload, channel, key):
+        calls.append(key)
+        if len(calls) == 1:
+            return {"success": False, "error": "circuit open", "retry_at": clock.time()}
+        return {"success": True}
+
+    async def scenario():
+        outbox = DeliveryOutbox(handler, store_path=store_path, max_attempts=1)
+        outbox.enqueue("alert-1", {"title": "Breaking"}, ["email"])
+        await outbox.drain()
+        stats = outbox.get_stats()
+        await outbox.close()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    assert len(calls) == 2
+    assert stats["deferred"] == 1 and stats["sent"] == 1
+    assert job_rows(store_path) == [("alert-1:email", "sent", 1)]
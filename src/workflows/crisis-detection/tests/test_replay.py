@@ -0,0 +1,75 @@
+"""
+Historical replay over archived mentions (offline heuristic model)
+"""
+
+import asyncio
+import gzip
+import json
+from datetime import datetime
+
+from ..replay import iter_archive_pages, run_replay
+
+# Aligned to a 15-minute window boundary
+START = 1_700_000_100
+
+
+def api_item(i: int, published: float, score: float, reach: int, content: str) -> dict:
+    return {
+        "id": f"m{i}",
+        "content": content,
+        "source": "twitter",
+        "author": {"name": f"user{i % 7}", "reach": reach},
+        "sentiment": {"score": score},
+        "engagement": {"total": 5},
+        "published_at": datetime.fromtimestamp(published).isoformat()
+    }
+
+
+def campaign_items() -> list:
+    """A calm window, then a scandal spreading in the next one"""
+    calm = [
+        api_item(i, START + i * 30, 0.4, 100, "Great rally downtown for the candidate")
+        for i in range(20)
+    ]
+    scandal = [
+        api_item(100 + i, START + 900 + i * 30, -0.8, 20000, "Candidate caught lying about healthcare scandal")
+        for i in range(20)
+    ]
+    return calm + scandal
+
+
+def write_jsonl(path, items, compress: bool = False) -> str:
+    lines = "".join(json.dumps(item) + "\n" for item in items) + "not json\n"
+    if compress:
+        with gzip.open(path, "wt") as f:
+            f.write(lines)
+    else:
+        path.write_text(lines)
+    return str(path)
+
+
+def test_archive_pages_read_plain_and_compressed_files(tmp_path):
+    items = campaign_items()
+    plain = write_jsonl(tmp_path / "mentions.jsonl", items)
+    compressed = write_jsonl(tmp_path / "mentions.jsonl.gz", items, compress=True)
+
+    for path in (plain, compressed):
+        pages = list(iter_archive_pages(path, page_size=15))
+        assert [len(page) for page in pages] == [15, 15, 10]
+        assert pages[0][0]["id"] == "m0"
+
+
+def test_replay_alerts_when_the_scandal_window_closes(tmp_path):
+    path = write_jsonl(tmp_path / "mentions.jsonl.gz", campaign_items(), compress=True)
+
+    report = asyncio.run(run_replay([path], {"monitor_keywords": ["candidate"]}))
+
+    assert report["mentions"] == 40
+    assert report["windows"] == 2 and report["windows_analyzed"] == 2
+    assert report["alerts"] == 1
+    alert = report["alert_log"][0]
+    assert alert["window_start"] == datetime.fromtimestamp(START + 900).isoformat()
+    assert alert["detected_at"] == datetime.fromtimestamp(START + 1800).isoformat()
+    assert alert["detection_delay_seconds"] == 900
+    assert alert["severity"] >= report["alert_threshold"]
+    assert report["alerts_by_threshold"][1] == 2
@@ -0,0 +1,99 @@
+"""
+Delayed retry queue backoff, dead-lettering and deferral
+"""
+
+import asyncio
+import random
+
+from ..tools.retry_queue import DelayedRetryQueue, full_jitter_backoff
+
+
+async def settle(queue: DelayedRetryQueue) -> None:
+    """Run the loop until no retry is waiting or in flight"""
+    for _ in range(100):
+        if not queue.pending_count():
+            break
+        await asyncio.sleep(0)
+    # Let dead-letter callbacks finish
+    await asyncio.sleep(0)
+
+
+def test_backoff_is_capped_full_jitter():
+    rng = random.Random(7)
+    for attempts in range(1, 12):
+        cap = min(60, 2 * 2 ** (attempts - 1))
+        delays = [full_jitter_backoff(attempts, 2, 60, rng) for _ in range(50)]
+        assert all(0 <= delay <= cap for delay in delays)
+    assert max(full_jitter_backoff(10, 2, 60, rng) for _ in range(200)) > 30
+
+
+def test_dead_letters_after_max_attempts(clock):
+    dead = []
+    calls = []
+
+    async def handler(payload):
+        calls.append(payload["id"])
+        payload["last_error"] = "provider down"
+        return False
+
+    async def on_dead_letter(item):
+        dead.append(item)
+
+    async def scenario():
+        queue = DelayedRetryQueue(handler, on_dead_letter, max_attempts=3, base_delay_seconds=0)
+        assert queue.schedule({"id": "a1"}, error="first failure")
+        await settle(queue)
+        return queue
+
+    queue = asyncio.run(scenario())
+
+    assert calls == ["a1", "a1"]
+    assert [item["attempts"] for item in dead] == [3]
+    assert dead[0]["last_error"] == "provider down"
+    assert queue.stats["dead_lettered"] == 1
+    assert len(queue.dead_letters) == 1
+
+
+def test_dead_letters_once_too_old(clock):
+    calls = []
+
+    async def handler(payload):
+        calls.append(payload["id"])
+        return False
+
+    async def scenario():
+        queue = DelayedRetryQueue(handler, max_attempts=10, base_delay_seconds=0, max_age_seconds=900)
+        queue.schedule({"id": "a1"})
+        clock.advance(901)
+        await settle(queue)
+        return queue
+
+    queue = asyncio.run(scenario())
+
+    assert calls == ["a1"]
+    assert queue.dead_letters[0]["attempts"] == 2
+
+
+def test_retry_at_defers_without_using_an_attempt(clock):
+    calls = []
+
+    async def handler(payload):
+        calls.append(payload["id"])
+        if len(calls) == 1:
+            payload["retry_at"] = clock.time()
+            return False
+        return True
+
+    async def scenario():
+        queue = DelayedRetryQueue(handler, max_attempts=2, base_delay_seconds=0)
+        queue.schedule({"id": "a1"})
+        await settle(queue)
+        return queue
+
+    queue = asyncio.run(scenario())
+
+    # Two handler calls with max_attempts=2 only fit if the deferral was free
+    assert calls == ["a1", "a1"]
+    assert queue.stats["deferred"] == 1
+    assert queue.stats["succeeded"] == 1
+    assert not queue.dead_letters
@@ -0,0 +1,108 @@
+"""
+Alert suppression windows, digests and persistence
+"""
+
+import asyncio
+
+from ..agents.alert_routing import AlertPriority, AlertRoute, RecipientProfile
+from ..agents.crisis_detection import CrisisAnalysis
+from ..tools.suppression import AlertSuppressor
+
+NOW = 1_700_000_000.0
+
+
+def route(recipient_id: str = "press-1") -> AlertRoute:
+    return AlertRoute(
+        recipient=RecipientProfile(id=recipient_id, name="Press Desk", role="communications"),
+        channels=["email"],
+        message="Negative coverage of the rally is spreading",
+        priority=AlertPriority.HIGH
+    )
+
+
+def analysis(severity: int = 7, topics=("Rally", "Healthcare")) -> CrisisAnalysis:
+    return CrisisAnalysis(
+        severity=severity,
+        confidence=0.8,
+        threat_type="Misinformation",
+        affected_topics=list(topics),
+        recommended_actions=["Issue statement"],
+        escalation_required=False,
+        reasoning="Coordinated reposting"
+    )
+
+
+def test_repeats_inside_the_window_are_suppressed():
+    suppressor = AlertSuppressor(window_minutes=30)
+
+    assert suppressor.check(route(), analysis(), now=NOW)
+    assert not suppressor.check(route(), analysis(topics=["healthcare", "rally"]), now=NOW + 60)
+    # Other recipients and other topics have their own keys
+    assert suppressor.check(route("press-2"), analysis(), now=NOW + 60)
+    assert suppressor.check(route(), analysis(topics=["Economy"]), now=NOW + 60)
+    # The window has closed
+    assert suppressor.check(route(), analysis(), now=NOW + 30 * 60)
+
+    assert suppressor.get_stats()["suppressed"] == 1
+
+
+def test_higher_severity_bypasses_suppression():
+    suppressor = AlertSuppressor(window_minutes=30)
+
+    assert suppressor.check(route(), analysis(severity=6), now=NOW)
+    assert not suppressor.check(route(), analysis(severity=6), now=NOW + 60)
+    assert suppressor.check(route(), analysis(severity=8), now=NOW + 120)
+    assert not suppressor.check(route(), analysis(severity=8), now=NOW + 180)
+
+    assert suppressor.get_stats()["severity_bypass"] == 1
+
+
+def test_digest_goes_out_when_the_window_closes_and_the_window_doubles():
+    digests = []
+
+    async def on_digest(latest_route, latest_analysis, entry):
+        digests.append((latest_analysis.severity, entry["suppressed"]))
+
+    async def scenario():
+        # 60ms starting window, capped at 4x
+        suppressor = AlertSuppressor(on_digest, window_minutes=0.001, max_window_minutes=0.004)
+        assert suppressor.check(route(), analysis())
+        assert not suppressor.check(route(), analysis())
+        assert not suppressor.check(route(), analysis())
+        await asyncio.sleep(0.1)
+        report = suppressor.get_suppressed()
+        suppressor.stop()
+        return report
+
+    report = asyncio.run(scenario())
+
+    assert digests == [(7, 2)]
+    assert report[0]["total_suppressed"] == 2
+    assert report[0]["window_minutes"] == 0.002
+
+
+def test_window_resets_when_it_closes_without_repeats():
+    suppressor = AlertSuppressor(window_minutes=10, max_window_minutes=40)
+    key = suppressor.key(route(), analysis())
+
+    suppressor.check(route(), analysis(), now=NOW)
+    suppressor.check(route(), analysis(), now=NOW + 60)
+    suppressor.check(route(), analysis(), now=NOW + 600)
+    assert suppressor._entries[key]["window_seconds"] == 1200
+
+    suppressor.check(route(), analysis(), now=NOW + 1800)
+    assert suppressor._entries[key]["window_seconds"] == 600
+
+
+def test_suppression_carries_over_a_restart(tmp_path):
+    store_path = str(tmp_path / "suppression.db")
+
+    first = AlertSuppressor(window_minutes=30, store_path=store_path)
+    assert first.check(route(), analysis(), now=NOW)
+    assert not first.check(route(), analysis(), now=NOW + 60)
+    first.stop()
+
+    second = AlertSuppressor(window_minutes=30, store_path=store_path)
+    assert not second.check(route(), analysis(), now=NOW + 120)
+    assert second.get_suppressed()[0]["total_suppressed"] == 2
+    second.stop()
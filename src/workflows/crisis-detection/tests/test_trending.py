@@ -0,0 +1,63 @@
+"""
+Decayed count-min sketch and trending keyword tracker
+"""
+
+import pytest
+
+from ..utils.trending import CountMinSketch, TrendingKeywordTracker
+
+
+def test_counts_halve_every_half_life():
+    sketch = CountMinSketch(width=256, depth=4, half_life_seconds=60, start_time=0)
+    sketch.add("recall", count=8, timestamp=0)
+
+    assert sketch.estimate("recall", timestamp=0) == pytest.approx(8)
+    assert sketch.estimate("recall", timestamp=60) == pytest.approx(4)
+    assert sketch.estimate("recall", timestamp=180) == pytest.approx(1)
+    assert sketch.total(timestamp=120) == pytest.approx(2)
+
+
+def test_later_observations_outweigh_earlier_ones():
+    sketch = CountMinSketch(width=256, depth=4, half_life_seconds=60, start_time=0)
+    sketch.add("old", timestamp=0)
+    sketch.add("new", timestamp=120)
+
+    assert sketch.estimate("new", timestamp=120) == pytest.approx(4 * sketch.estimate("old", timestamp=120))
+
+
+def test_no_half_life_means_no_decay():
+    sketch = CountMinSketch(width=256, depth=4, start_time=0)
+    sketch.add("steady", count=3, timestamp=0)
+
+    assert sketch.estimate("steady", timestamp=10 ** 6) == 3
+
+
+def test_rescale_moves_landmark_and_preserves_estimates():
+    factors = []
+    sketch = CountMinSketch(width=256, depth=4, half_life_seconds=1, start_time=0)
+    sketch.on_rescale = factors.append
+    sketch.add("early", timestamp=0)
+    sketch.add("mid", timestamp=30)
+
+    # A weight of 2**50 is past the rescale threshold
+    sketch.add("late", timestamp=50)
+
+    assert sketch.landmark == 50
+    assert factors == [pytest.approx(2.0 ** -50)]
+    assert sketch.estimate("late", timestamp=50) == pytest.approx(1)
+    assert sketch.estimate("mid", timestamp=50) == pytest.approx(2.0 ** -20)
+    assert sketch.estimate("early", timestamp=50) == pytest.approx(2.0 ** -50)
+    assert sketch.total(timestamp=50) == pytest.approx(1 + 2.0 ** -20 + 2.0 ** -50)
+
+
+def test_tracker_rescales_top_k_scores_with_the_sketch():
+    tracker = TrendingKeywordTracker(width=256, top_k=10, short_half_life_seconds=1, start_time=0)
+    tracker.update(["scandal", "scandal", "budget"], timestamp=0)
+    before = dict(tracker.top_k.scores)
+
+    tracker.update(["rally"], timestamp=50)
+
+    assert tracker.current.landmark == 50
+    assert tracker.top_k.scores["scandal"] == pytest.approx(before["scandal"] * 2.0 ** -50)
+    assert tracker.top_k.scores["rally"] == pytest.approx(1)
+    assert [term for term, _ in tracker.top_k.items()] == ["rally", "scandal", "budget"]
@@ -0,0 +1,27 @@
+"""
+Branch join timings
+"""
+
+from ..workflow import critical_path_seconds
+
+
+def test_critical_path_follows_the_longest_dependent_chain():
+    node_seconds = {
+        "monitor": 1.0,
+        "enrich": 4.0,
+        "analyze": 2.0,
+        "route": 0.5,
+        "deliver": 3.0,
+        "learn": 0.1
+    }
+
+    # monitor -> analyze -> route -> deliver beats monitor -> enrich
+    assert critical_path_seconds(node_seconds) == 6.5
+    assert critical_path_seconds(node_seconds) <= sum(node_seconds.values())
+
+
+def test_critical_path_without_an_alert_skips_route_and_deliver():
+    node_seconds = {"monitor": 1.0, "enrich": 0.5, "analyze": 2.0, "learn": 0.25}
+
+    assert critical_path_seconds(node_seconds) == 3.25
+    assert critical_path_seconds({}) == 0.0
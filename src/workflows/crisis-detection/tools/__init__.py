@@ -2,8 +2,28 @@
 Crisis Detection Tools
 """
 
-from .delivery import DeliveryManager
+import importlib
 
-__all__ = [
-    "DeliveryManager"
-]
\ No newline at end of file
+# Exports are resolved on first access (PEP 562); DeliveryManager loads the
+# HTTP channels and aiohttp, which the other tools do not need
+_EXPORTS = {
+    "DeliveryManager": ".delivery",
+    "EscalationScheduler": ".escalation",
+    "DeliveryOutbox": ".outbox",
+    "AlertSuppressor": ".suppression",
+    "DelayedRetryQueue": ".retry_queue"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
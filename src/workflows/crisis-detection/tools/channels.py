@@ -0,0 +1,581 @@
+"""
+Delivery Channels - async provider clients for SendGrid, Twilio, Slack and FCM
+"""
+
+import asyncio
+import aiohttp
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Request timeout (seconds) by alert priority: urgent alerts fail fast so
+# retries and fallback channels kick in sooner
+PRIORITY_TIMEOUTS = {
+    "critical": 3,
+    "high": 5,
+    "medium": 10,
+    "low": 20
+}
+
+# Slack API errors caused by the recipient rather than the provider
+SLACK_RECIPIENT_ERRORS = {
+    "channel_not_found",
+    "user_not_found",
+    "users_not_found",
+    "not_in_channel",
+    "is_archived",
+    "cannot_dm_bot",
+    "user_disabled"
+}
+
+# Twilio error codes for an unusable phone number (invalid, not mobile,
+# unsubscribed, unroutable or in a blocked region)
+TWILIO_RECIPIENT_ERRORS = {21211, 21214, 21217, 21401, 21407, 21408, 21610, 21612, 21614}
+
+# FCM error codes for a device token that is no longer valid
+FCM_RECIPIENT_ERRORS = {"UNREGISTERED"}
+
+# SendGrid error fields that point at a recipient address
+_SENDGRID_RECIPIENT_FIELD = re.compile(r"personalizations\.\d+\.(to|cc|bcc)\b")
+
+
+class DeliveryChannel:
+    """
+    Base class for delivery channels
+
+    Each channel talks to its provider over one pooled aiohttp session
+    (created on first use) at a configurable ``base_url``, so it can be
+    pointed at a local stand-in server. Channels without credentials run
+    in dry-run mode: sends are logged and reported as successful.
+    """
+
+    name = "channel"
+    default_base_url = ""
+
+    # Config keys that must be set for real sends
+    credential_fields: Tuple[str, ...] = ()
+
+    # Recipient field this channel addresses, and the error when it is missing
+    contact_field = "id"
+    missing_contact_error = "No recipient ID"
+
+    # Recipients one provider request can address (1: no bulk API)
+    bulk_size = 1
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.enabled = config.get("enabled", True)
+        self.base_url = config.get("base_url", self.default_base_url).rstrip("/")
+        self.dry_run = config.get(
+            "dry_run",
+            not all(config.get(field) for field in self.credential_fields)
+        )
+        self.timeouts = {**PRIORITY_TIMEOUTS, **config.get("timeouts", {})}
+        self.max_response_bytes = config.get("max_response_bytes", 65536)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def send(self, message: str, recipient: Dict, metadata: Dict = None) -> Dict:
+        """Send message through this channel"""
+        if not recipient.get(self.contact_field):
+            return self._invalid_recipient()
+
+        metadata = metadata or {}
+        if self.dry_run:
+            logger.info(f"[dry run] {self.name} to {recipient[self.contact_field]}: {message[:50]}...")
+            return self._success(recipient, f"{self.name}_{datetime.now().timestamp()}")
+
+        try:
+            return await self._deliver(message, recipient, metadata)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            logger.error(f"{self.name} delivery failed: {e!r}")
+            return self._request_error(e)
+
+    async def send_bulk(self, message: str, recipients: List[Dict], metadata: Dict = None) -> List[Dict]:
+        """
+        Send one message to up to bulk_size recipients
+
+        Channels with a bulk API send every recipient with contact details
+        in a single provider request; the response is demultiplexed into
+        one result per recipient, in recipient order.
+        """
+        if self.bulk_size <= 1:
+            return list(await asyncio.gather(*(self.send(message, r, metadata) for r in recipients)))
+
+        results: List[Optional[Dict]] = [None] * len(recipients)
+        addressable = []
+        for i, recipient in enumerate(recipients):
+            if recipient.get(self.contact_field):
+                addressable.append(i)
+            else:
+                results[i] = self._invalid_recipient()
+
+        if addressable:
+            batch_results = await self._send_batch(message, [recipients[i] for i in addressable], metadata or {})
+            for i, result in zip(addressable, batch_results):
+                results[i] = result
+        return results
+
+    async def _send_batch(self, message: str, recipients: List[Dict], metadata: Dict) -> List[Dict]:
+        """
+        One bulk provider request for recipients that all have contact details
+
+        A request rejected as a whole for its recipients (a recipient error
+        code, or Slack failing to open the group DM) is usually one bad
+        address, so the batch is split in halves and each half sent again:
+        only the recipients the provider rejects on their own are marked
+        invalid.
+        """
+        batch_id = f"{self.name}_batch_{datetime.now().timestamp()}"
+        if self.dry_run:
+            logger.info(f"[dry run] {self.name} to {len(recipients)} recipients: {message[:50]}...")
+            return self._batch_results(recipients, batch_id)
+
+        try:
+            results = await self._deliver_batch(message, recipients, metadata)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            logger.error(f"{self.name} bulk delivery failed: {e!r}")
+            return [self._request_error(e) for _ in recipients]
+
+        if len(recipients) > 1 and results[0].get("batch_rejected") \
+                and results[0].get("error_type") == "invalid_recipient":
+            logger.warning(f"{self.name} rejected a batch of {len(recipients)}, splitting it: {results[0]['error']}")
+            middle = len(recipients) // 2
+            first, second = await asyncio.gather(
+                self._send_batch(message, recipients[:middle], metadata),
+                self._send_batch(message, recipients[middle:], metadata)
+            )
+            return first + second
+        return results
+
+    async def _deliver(self, message: str, recipient: Dict, metadata: Dict) -> Dict:
+        """Provider request for one recipient"""
+        raise NotImplementedError
+
+    async def _deliver_batch(self, message: str, recipients: List[Dict], metadata: Dict) -> List[Dict]:
+        """Provider bulk request; one result per recipient"""
+        raise NotImplementedError
+
+    def is_available(self) -> bool:
+        """Check if channel is available"""
+        return self.enabled
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Pooled session with keep-alive connections, created on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.config.get("max_connections", 100),
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                ),
+                headers=self._auth_headers(),
+                auth=self._auth()
+            )
+        return self._session
+
+    def _auth_headers(self) -> Dict[str, str]:
+        """Headers sent with every request"""
+        return {}
+
+    def _auth(self) -> Optional[aiohttp.BasicAuth]:
+        """Basic auth sent with every request"""
+        return None
+
+    def _timeout(self, metadata: Dict) -> aiohttp.ClientTimeout:
+        """Request timeout for the alert's priority"""
+        total = self.timeouts.get(metadata.get("priority", "medium"), self.timeouts["medium"])
+        return aiohttp.ClientTimeout(total=total, connect=min(total, 2))
+
+    async def _post(
+        self,
+        path: str,
+        metadata: Dict,
+        base_url: Optional[str] = None,
+        **kwargs
+    ) -> Tuple[int, Dict, Any]:
+        """
+        POST to the provider and stream back at most max_response_bytes
+
+        Returns:
+            Status code, parsed JSON body ({} if empty or not JSON) and headers
+        """
+        url = f"{base_url or self.base_url}{path}"
+        async with self._get_session().post(url, timeout=self._timeout(metadata), **kwargs) as response:
+            body = await self._read_body(response)
+            return response.status, body, response.headers
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> Dict:
+        """Read the response in chunks, stopping at max_response_bytes"""
+        if response.status in (202, 204):
+            return {}
+
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(8192):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_response_bytes:
+                break
+
+        try:
+            body = json.loads(b"".join(chunks)[:self.max_response_bytes])
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    def _success(self, recipient: Dict, message_id: str, **extra) -> Dict:
+        """Result for a send the provider accepted"""
+        return {
+            "success": True,
+            "channel": self.name,
+            "recipient": recipient[self.contact_field],
+            "timestamp": datetime.now().isoformat(),
+            "message_id": message_id,
+            **extra
+        }
+
+    def _batch_results(self, recipients: List[Dict], batch_id: str) -> List[Dict]:
+        """Per-recipient results for a bulk request the provider accepted"""
+        return [
+            self._success(recipient, f"{batch_id}_{i}", batch_id=batch_id)
+            for i, recipient in enumerate(recipients)
+        ]
+
+    def _batch_rejected(self, error: Dict, recipients: List[Dict]) -> List[Dict]:
+        """Per-recipient results for a bulk request the provider rejected as a whole"""
+        return [{**error, "batch_rejected": True} for _ in recipients]
+
+    def _invalid_recipient(self) -> Dict:
+        return {"success": False, "error": self.missing_contact_error, "error_type": "invalid_recipient"}
+
+    def _http_error(self, status: int, detail: Any, recipient_rejected: bool = False) -> Dict:
+        """
+        Result for a request the provider rejected
+
+        Only rejections the caller recognized from the provider's
+        recipient error codes are invalid_recipient (not retried). Any
+        other 4xx, such as a wrong base_url or a malformed request, is a
+        provider_error like an outage, so it is retried and counts
+        against the circuit breaker.
+        """
+        if recipient_rejected:
+            error_type = "invalid_recipient"
+        elif status == 429:
+            error_type = "rate_limited"
+        elif status == 408:
+            error_type = "timeout"
+        else:
+            error_type = "provider_error"
+
+        return {
+            "success": False,
+            "error": f"{self.name} HTTP {status}: {detail}",
+            "error_type": error_type,
+            "status": status
+        }
+
+    def _request_error(self, error: Exception) -> Dict:
+        """Result for a request that timed out or failed to connect"""
+        if isinstance(error, asyncio.TimeoutError):
+            return {"success": False, "error": f"{self.name} request timed out", "error_type": "timeout"}
+        return {"success": False, "error": f"{self.name} request failed: {error}", "error_type": "provider_error"}
+
+
+class EmailChannel(DeliveryChannel):
+    """Email delivery via SendGrid"""
+
+    name = "email"
+    default_base_url = "https://api.sendgrid.com"
+    credential_fields = ("api_key",)
+    contact_field = "email"
+    missing_contact_error = "No email address"
+
+    # SendGrid accepts up to 1000 personalizations per request
+    bulk_size = 1000
+
+    def _auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.config.get('api_key', '')}"}
+
+    def _rejects_address(self, status: int, body: Dict) -> bool:
+        """Check whether SendGrid rejected the request for a recipient address"""
+        errors = body.get("errors")
+        return status == 400 and isinstance(errors, list) and any(
+            isinstance(error, dict) and _SENDGRID_RECIPIENT_FIELD.match(str(error.get("field") or ""))
+            for error in errors
+        )
+
+    def _bulk_request(self, message: str, recipients: List[Dict], metadata: Dict) -> Dict:
+        """SendGrid mail/send body with one personalization per recipient"""
+        return {
+            "personalizations": [
+                {
+                    "to": [{"email": recipient["email"]}],
+                    "custom_args": {"recipient_id": str(recipient.get("id", ""))}
+                }
+                for recipient in recipients
+            ],
+            "from": {"email": self.config.get("from_email", "alerts@example.com")},
+            "subject": f"Crisis Alert ({metadata.get('priority', 'medium')})",
+            "content": [{"type": "text/plain", "value": message}]
+        }
+
+    async def _deliver(self, message: str, recipient: Dict, metadata: Dict) -> Dict:
+        """Send email via SendGrid API"""
+        result = (await self._deliver_batch(message, [recipient], metadata))[0]
+        result.pop("batch_rejected", None)
+        return result
+
+    async def _deliver_batch(self, message: str, recipients: List[Dict], metadata: Dict) -> List[Dict]:
+        """Send one email to many recipients with a single SendGrid request"""
+        status, body, headers = await self._post(
+            "/v3/mail/send",
+            metadata,
+            json=self._bulk_request(message, recipients, metadata)
+        )
+        if status != 202:
+            error = self._http_error(status, body.get("errors", body), self._rejects_address(status, body))
+            return self._batch_rejected(error, recipients)
+
+        batch_id = headers.get("X-Message-Id", f"email_batch_{datetime.now().timestamp()}")
+        logger.info(f"Email sent to {len(recipients)} recipients: {message[:50]}...")
+        return self._batch_results(recipients, batch_id)
+
+
+class TwilioChannel(DeliveryChannel):
+    """Shared Twilio account settings for SMS and voice"""
+
+    default_base_url = "https://api.twilio.com"
+    credential_fields = ("account_sid", "auth_token", "from_number")
+    contact_field = "phone"
+    missing_contact_error = "No phone number"
+
+    def _auth(self) -> Optional[aiohttp.BasicAuth]:
+        return aiohttp.BasicAuth(self.config.get("account_sid", ""), self.config.get("auth_token", ""))
+
+    async def _create(self, resource: str, form: Dict, recipient: Dict, metadata: Dict) -> Dict:
+        """Create a Messages or Calls resource for one recipient"""
+        status, body, _ = await self._post(
+            f"/2010-04-01/Accounts/{self.config['account_sid']}/{resource}.json",
+            metadata,
+            data={"To": recipient["phone"], "From": self.config["from_number"], **form}
+        )
+        if status != 201:
+            return self._twilio_error(status, body)
+        return self._success(recipient, body.get("sid", f"{self.name}_{datetime.now().timestamp()}"))
+
+    def _twilio_error(self, status: int, body: Dict) -> Dict:
+        """Result for a rejected Twilio request (error codes mark bad numbers)"""
+        return self._http_error(status, body.get("message", body), body.get("code") in TWILIO_RECIPIENT_ERRORS)
+
+
+class SMSChannel(TwilioChannel):
+    """SMS delivery via Twilio"""
+
+    name = "sms"
+
+    @property
+    def bulk_size(self) -> int:
+        """Twilio Notify takes up to 10,000 bindings per notification; without it, one per request"""
+        return 10000 if self.config.get("notify_service_sid") else 1
+
+    def _sms_body(self, message: str) -> str:
+        """Truncate message for SMS (160 char limit)"""
+        return message[:160] + "..." if len(message) > 160 else message
+
+    def _bulk_request(self, message: str, recipients: List[Dict], metadata: Dict) -> List[Tuple[str, str]]:
+        """Twilio Notify form with one SMS binding per recipient"""
+        form = [
+            ("ToBinding", json.dumps({"binding_type": "sms", "address": recipient["phone"]}))
+            for recipient in recipients
+        ]
+        form.append(("Body", self._sms_body(message)))
+        return form
+
+    async def _deliver(self, message: str, recipient: Dict, metadata: Dict) -> Dict:
+        """Send SMS via Twilio"""
+        result = await self._create("Messages", {"Body": self._sms_body(message)}, recipient, metadata)
+        if result["success"]:
+            logger.info(f"SMS sent to {recipient['phone']}")
+        return result
+
+    async def _deliver_batch(self, message: str, recipients: List[Dict], metadata: Dict) -> List[Dict]:
+        """Send one SMS to many recipients with a single Twilio Notify request"""
+        status, body, _ = await self._post(
+            f"/v1/Services/{self.config['notify_service_sid']}/Notifications",
+            metadata,
+            base_url=self.config.get("notify_base_url", self.config.get("base_url", "https://notify.twilio.com")),
+            data=self._bulk_request(message, recipients, metadata)
+        )
+        if status != 201:
+            return self._batch_rejected(self._twilio_error(status, body), recipients)
+
+        logger.info(f"SMS sent to {len(recipients)} recipients via Notify")
+        return self._batch_results(recipients, body.get("sid", f"sms_batch_{datetime.now().timestamp()}"))
+
+
+class SlackChannel(DeliveryChannel):
+    """Slack delivery via Web API"""
+
+    name = "slack"
+    default_base_url = "https://slack.com"
+    credential_fields = ("bot_token",)
+    contact_field = "slack_id"
+    missing_contact_error = "No Slack ID"
+
+    @property
+    def bulk_size(self) -> int:
+        """One post reaches a whole broadcast channel, or a group DM of up to 8 users"""
+        return 1000 if self.config.get("broadcast_channel") else 8
+
+    def _auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.config.get('bot_token', '')}"}
+
+    def _format(self, message: str, metadata: Optional[Dict]) -> str:
+        """Format message for Slack"""
+        priority = metadata.get("priority", "medium") if metadata else "medium"
+        priority_emoji = {
+            "critical": "🚨",
+            "high": "⚠️",
+            "medium": "📢",
+            "low": "ℹ️"
+        }
+
+        return f"{priority_emoji.get(priority, '📢')} *Crisis Alert*\n\n{message}"
+
+    async def _call(self, method: str, payload: Dict, metadata: Dict) -> Tuple[Optional[Dict], Dict]:
+        """
+        Call a Web API method
+
+        Returns:
+            (error result or None, response body); Slack reports most errors
+            with HTTP 200 and "ok": false
+        """
+        status, body, _ = await self._post(f"/api/{method}", metadata, json=payload)
+        if status != 200:
+            return self._http_error(status, body.get("error", body)), body
+        if body.get("ok"):
+            return None, body
+
+        error = body.get("error", "unknown_error")
+        if error == "ratelimited":
+            error_type = "rate_limited"
+        elif error in SLACK_RECIPIENT_ERRORS:
+            error_type = "invalid_recipient"
+        else:
+            error_type = "provider_error"
+        return {"success": False, "error": f"Slack {method}: {error}", "error_type": error_type}, body
+
+    async def _deliver(self, message: str, recipient: Dict, metadata: Dict) -> Dict:
+        """Send Slack message"""
+        error, body = await self._call(
+            "chat.postMessage",
+            {"channel": recipient["slack_id"], "text": self._format(message, metadata)},
+            metadata
+        )
+        if error:
+            return error
+
+        logger.info(f"Slack message sent to {recipient['slack_id']}: {message[:50]}...")
+        return self._success(recipient, body.get("ts", f"slack_{datetime.now().timestamp()}"))
+
+    def _bulk_request(self, message: str, recipients: List[Dict], metadata: Dict) -> Dict:
+        """
+        conversations.open / chat.postMessage bodies for one shared post
+
+        With a broadcast channel configured the post goes there and mentions
+        each recipient; otherwise a group DM with the recipients is opened.
+        """
+        user_ids = [recipient["slack_id"] for recipient in recipients]
+        text = self._format(message, metadata)
+        broadcast_channel = self.config.get("broadcast_channel")
+        if broadcast_channel:
+            mentions = " ".join(f"<@{user_id}>" for user_id in user_ids)
+            return {"open": None, "post": {"channel": broadcast_channel, "text": f"{mentions}\n{text}"}}
+
+        return {"open": {"users": ",".join(user_ids)}, "post": {"channel": None, "text": text}}
+
+    async def _deliver_batch(self, message: str, recipients: List[Dict], metadata: Dict) -> List[Dict]:
+        """Post one Slack message that reaches every recipient"""
+        request = self._bulk_request(message, recipients, metadata)
+
+        if request["open"]:
+            error, body = await self._call("conversations.open", request["open"], metadata)
+            if error:
+                # e.g. user_not_found for any one of the users
+                return self._batch_rejected(error, recipients)
+            request["post"]["channel"] = body.get("channel", {}).get("id")
+
+        error, body = await self._call("chat.postMessage", request["post"], metadata)
+        if error:
+            return [dict(error) for _ in recipients]
+
+        logger.info(f"Slack message sent to {len(recipients)} recipients in {request['post']['channel']}")
+        return self._batch_results(recipients, body.get("ts", f"slack_batch_{datetime.now().timestamp()}"))
+
+
+class PhoneCallChannel(TwilioChannel):
+    """Phone call delivery via Twilio Voice"""
+
+    name = "phone_call"
+
+    async def _deliver(self, message: str, recipient: Dict, metadata: Dict) -> Dict:
+        """Initiate phone call"""
+        # Convert message to speech (truncate for call)
+        call_message = message[:200] + "..." if len(message) > 200 else message
+        twiml = f"<Response><Say>{escape(call_message)}</Say></Response>"
+
+        result = await self._create("Calls", {"Twiml": twiml}, recipient, metadata)
+        if result["success"]:
+            logger.info(f"Phone call initiated to {recipient['phone']}")
+        return result
+
+
+class PushNotificationChannel(DeliveryChannel):
+    """Push notifications via Firebase Cloud Messaging (HTTP v1)"""
+
+    name = "push"
+    default_base_url = "https://fcm.googleapis.com"
+    credential_fields = ("project_id", "access_token")
+    contact_field = "device_token"
+    missing_contact_error = "No device token"
+
+    def _auth_headers(self) -> Dict[str, str]:
+        # OAuth2 access token for the service account (refreshed by the deployment)
+        return {"Authorization": f"Bearer {self.config.get('access_token', '')}"}
+
+    async def _deliver(self, message: str, recipient: Dict, metadata: Dict) -> Dict:
+        """Send push notification"""
+        body_text = message[:100] + "..." if len(message) > 100 else message
+        status, body, _ = await self._post(
+            f"/v1/projects/{self.config['project_id']}/messages:send",
+            metadata,
+            json={
+                "message": {
+                    "token": recipient["device_token"],
+                    "notification": {"title": "Crisis Alert", "body": body_text}
+                }
+            }
+        )
+        if status != 200:
+            error = body.get("error") if isinstance(body.get("error"), dict) else {}
+            error_codes = {detail.get("errorCode") for detail in error.get("details", []) if isinstance(detail, dict)}
+            return self._http_error(
+                status,
+                error.get("message", body),
+                bool(error_codes & FCM_RECIPIENT_ERRORS)
+            )
+
+        logger.info(f"Push notification sent to device: {body_text}")
+        return self._success(recipient, body.get("name", f"push_{datetime.now().timestamp()}"))
@@ -3,184 +3,70 @@ Alert Delivery Manager - Multi-channel alert distribution
 """
 
 import asyncio
-import aiohttp
-from typing import Dict, List, Optional, Any
+import os
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import logging
 import json
+from collections import Counter
 
 from ..agents.alert_routing import AlertRoute, AlertPriority
 from ..agents.crisis_detection import CrisisAnalysis
+from ..utils.bounded_history import BoundedHistory
+from ..utils.circuit_breaker import CircuitBreaker
 from ..utils.rate_limiter import MultiServiceRateLimiter, create_default_rate_limiter
+from .channels import (
+    EmailChannel,
+    SMSChannel,
+    SlackChannel,
+    PhoneCallChannel,
+    PushNotificationChannel
+)
+from .delivery_stats import DeliveryStats
+from .escalation import EscalationHandler, EscalationScheduler
+from .outbox import DeliveryOutbox
+from .retry_queue import DelayedRetryQueue
+from .suppression import AlertSuppressor
 
 logger = logging.getLogger(__name__)
 
 
-class DeliveryChannel:
-    """Base class for delivery channels"""
-    
-    def __init__(self, config: Dict[str, Any]):
-        self.config = config
-        self.enabled = config.get("enabled", True)
-    
-    async def send(self, message: str, recipient: Dict, metadata: Dict = None) -> Dict:
-        """Send message through this channel"""
-        raise NotImplementedError
-    
-    def is_available(self) -> bool:
-        """Check if channel is available"""
-        return self.enabled
-
-
-class EmailChannel(DeliveryChannel):
-    """Email delivery via SendGrid"""
-    
-    async def send(self, message: str, recipient: Dict, metadata: Dict = None) -> Dict:
-        """Send email via SendGrid API"""
-        if not recipient.get("email"):
-            return {"success": False, "error": "No email address"}
-        
-        try:
-            # In production, integrate with SendGrid
-            logger.info(f"Email sent to {recipient['email']}: {message[:50]}...")
-            
-            return {
-                "success": True,
-                "channel": "email",
-                "recipient": recipient["email"],
-                "timestamp": datetime.now().isoformat(),
-                "message_id": f"email_{datetime.now().timestamp()}"
-            }
-        except Exception as e:
-            logger.error(f"Email delivery failed: {e}")
-            return {"success": False, "error": str(e)}
-
-
-class SMSChannel(DeliveryChannel):
-    """SMS delivery via Twilio"""
-    
-    async def send(self, message: str, recipient: Dict, metadata: Dict = None) -> Dict:
-        """Send SMS via Twilio"""
-        if not recipient.get("phone"):
-            return {"success": False, "error": "No phone number"}
-        
-        try:
-            # Truncate message for SMS (160 char limit)
-            sms_message = message[:160] + "..." if len(message) > 160 else message
-            
-            # In production, integrate with Twilio
-            logger.info(f"SMS sent to {recipient['phone']}: {sms_message}")
-            
-            return {
-                "success": True,
-                "channel": "sms", 
-                "recipient": recipient["phone"],
-                "timestamp": datetime.now().isoformat(),
-                "message_id": f"sms_{datetime.now().timestamp()}"
-            }
-        except Exception as e:
-            logger.error(f"SMS delivery failed: {e}")
-            return {"success": False, "error": str(e)}
-
-
-class SlackChannel(DeliveryChannel):
-    """Slack delivery via Web API"""
-    
-    async def send(self, message: str, recipient: Dict, metadata: Dict = None) -> Dict:
-        """Send Slack message"""
-        if not recipient.get("slack_id"):
-            return {"success": False, "error": "No Slack ID"}
-        
-        try:
-            # Format message for Slack
-            priority = metadata.get("priority", "medium") if metadata else "medium"
-            priority_emoji = {
-                "critical": "🚨",
-                "high": "⚠️", 
-                "medium": "📢",
-                "low": "ℹ️"
-            }
-            
-            slack_message = f"{priority_emoji.get(priority, '📢')} *Crisis Alert*\n\n{message}"
-            
-            # In production, use Slack Web API
-            logger.info(f"Slack message sent to {recipient['slack_id']}: {message[:50]}...")
-            
-            return {
-                "success": True,
-                "channel": "slack",
-                "recipient": recipient["slack_id"],
-                "timestamp": datetime.now().isoformat(),
-                "message_id": f"slack_{datetime.now().timestamp()}"
-            }
-        except Exception as e:
-            logger.error(f"Slack delivery failed: {e}")
-            return {"success": False, "error": str(e)}
-
-
-class PhoneCallChannel(DeliveryChannel):
-    """Phone call delivery via Twilio Voice"""
-    
-    async def send(self, message: str, recipient: Dict, metadata: Dict = None) -> Dict:
-        """Initiate phone call"""
-        if not recipient.get("phone"):
-            return {"success": False, "error": "No phone number"}
-        
-        try:
-            # Convert message to speech (truncate for call)
-            call_message = message[:200] + "..." if len(message) > 200 else message
-            
-            # In production, use Twilio Voice API with TTS
-            logger.info(f"Phone call initiated to {recipient['phone']}")
-            
-            return {
-                "success": True,
-                "channel": "phone_call",
-                "recipient": recipient["phone"],
-                "timestamp": datetime.now().isoformat(),
-                "message_id": f"call_{datetime.now().timestamp()}"
-            }
-        except Exception as e:
-            logger.error(f"Phone call failed: {e}")
-            return {"success": False, "error": str(e)}
+# Fallback order when a channel's circuit is open (fastest to slowest)
+CHANNEL_FALLBACK_ORDER = ["phone_call", "sms", "slack", "email", "push"]
 
+# Recipient field each channel needs
+CHANNEL_CONTACT_FIELDS = {
+    "phone_call": "phone",
+    "sms": "phone",
+    "slack": "slack_id",
+    "email": "email",
+    "push": "device_token"
+}
 
-class PushNotificationChannel(DeliveryChannel):
-    """Push notifications via Firebase/APNs"""
-    
-    async def send(self, message: str, recipient: Dict, metadata: Dict = None) -> Dict:
-        """Send push notification"""
-        device_token = recipient.get("device_token")
-        if not device_token:
-            return {"success": False, "error": "No device token"}
-        
-        try:
-            # Format for push
-            title = "Crisis Alert"
-            body = message[:100] + "..." if len(message) > 100 else message
-            
-            # In production, integrate with Firebase/APNs
-            logger.info(f"Push notification sent to device: {body}")
-            
-            return {
-                "success": True,
-                "channel": "push",
-                "recipient": device_token,
-                "timestamp": datetime.now().isoformat(),
-                "message_id": f"push_{datetime.now().timestamp()}"
-            }
-        except Exception as e:
-            logger.error(f"Push notification failed: {e}")
-            return {"success": False, "error": str(e)}
+# Failure types that count against a channel's circuit breaker
+PROVIDER_FAILURE_TYPES = ["provider_error", "timeout", "rate_limited"]
 
 
 class DeliveryManager:
     """Manages multi-channel alert delivery with retry and fallback"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        on_escalate: Optional[EscalationHandler] = None
+    ):
         self.config = config
         self.rate_limiter = create_default_rate_limiter()
         
+        # Escalation timers for unacknowledged alerts, persisted alongside
+        # the outbox so they survive close() and restarts
+        escalation_config = {"path": config.get("escalation_store_path"), **config.get("escalation", {})}
+        self.escalations = EscalationScheduler(
+            on_escalate=on_escalate,
+            store_path=self._store_path(escalation_config, "escalations.db")
+        )
+        
         # Initialize channels
         self.channels = {
             "email": EmailChannel(config.get("email", {})),
@@ -190,116 +76,710 @@ class DeliveryManager:
             "push": PushNotificationChannel(config.get("push", {}))
         }
         
-        # Delivery tracking
-        self.delivery_history: List[Dict] = []
-        self.retry_config = config.get("retry", {
+        # One breaker per channel, shared by every recipient
+        breaker_config = {
+            "failure_types": PROVIDER_FAILURE_TYPES,
+            **config.get("circuit_breaker", {})
+        }
+        self.breakers = {
+            channel_name: CircuitBreaker(channel_name, **breaker_config)
+            for channel_name in self.channels
+        }
+        
+        # Failed sends are retried in the background with jittered backoff
+        self.retry_config = {
             "max_attempts": 3,
-            "backoff_seconds": [1, 5, 15]
-        })
+            "base_delay_seconds": 1,
+            "max_delay_seconds": 60,
+            "max_age_seconds": 900,
+            **config.get("retry", {})
+        }
+        
+        # Durable outbox: routes are enqueued per channel and sent (and
+        # retried) by workers
+        outbox_config = config.get("outbox", {})
+        self.outbox: Optional[DeliveryOutbox] = None
+        if outbox_config.get("enabled", True):
+            outbox_path = self._store_path(outbox_config, "outbox.db")
+            if outbox_path is None:
+                logger.warning("No outbox path or history_dir configured; queued deliveries will not survive a restart")
+            self.outbox = DeliveryOutbox(
+                handler=self._send_job,
+                on_alert_complete=self._complete_outbox_alert,
+                store_path=outbox_path or ":memory:",
+                concurrency=outbox_config.get("workers", 4),
+                retention_hours=outbox_config.get("retention_hours", 24),
+                on_dead_letter=self._on_outbox_dead_letter,
+                **self.retry_config
+            )
+        
+        # Repeat alerts for an ongoing crisis are folded into digests
+        # (persisted alongside the outbox, so suppression spans workflow runs)
+        suppression_config = config.get("suppression", {})
+        self.suppressor: Optional[AlertSuppressor] = None
+        if suppression_config.get("enabled", True):
+            self.suppressor = AlertSuppressor(
+                on_digest=self._deliver_digest,
+                window_minutes=suppression_config.get("window_minutes", 30),
+                max_window_minutes=suppression_config.get("max_window_minutes", 240),
+                store_path=self._store_path(suppression_config, "suppression.db")
+            )
+        
+        # Routing plans at least this large are sent inline through bulk APIs
+        self.bulk_threshold = config.get("bulk_threshold", 10)
+        
+        # Delivery tracking: stats are updated per delivery; history keeps
+        # recent records in memory and spills older ones to history_dir
+        self.stats = DeliveryStats()
+        self.delivery_history = BoundedHistory(
+            "delivery",
+            max_records=config.get("history_size", 10000),
+            spill_dir=config.get("history_dir"),
+            aggregate_fields=("delivery_time_ms",)
+        )
+        
+        # Sends made without the outbox (inline and bulk) retry in memory
+        self.retry_queue = DelayedRetryQueue(
+            handler=self._retry_send,
+            on_dead_letter=self._on_dead_letter,
+            max_attempts=self.retry_config["max_attempts"],
+            base_delay_seconds=self.retry_config["base_delay_seconds"],
+            max_delay_seconds=self.retry_config["max_delay_seconds"],
+            max_age_seconds=self.retry_config["max_age_seconds"]
+        )
+    
+    def _store_path(self, section_config: Dict[str, Any], filename: str) -> Optional[str]:
+        """SQLite file for a store: its configured path, else filename under history_dir (None: memory only)"""
+        if section_config.get("path"):
+            return section_config["path"]
+        
+        history_dir = self.config.get("history_dir")
+        if not history_dir:
+            return None
+        os.makedirs(history_dir, exist_ok=True)
+        return os.path.join(history_dir, filename)
+    
+    def start(self) -> None:
+        """Resume persisted outbox jobs, escalation timers and pending digests (idempotent)"""
+        self.escalations.start()
+        if self.suppressor:
+            self.suppressor.start()
+        if self.outbox:
+            self.outbox.start()
+    
+    async def drain(self) -> None:
+        """Wait for every queued delivery job to finish"""
+        if self.outbox:
+            await self.outbox.drain()
+    
+    async def close(self) -> None:
+        """
+        Finish queued deliveries, then stop the outbox workers and timers,
+        close the SQLite stores and HTTP sessions and spill history
+        
+        Retries still waiting on backoff stay in the outbox and resume on
+        the next start.
+        """
+        await self.drain()
+        if self.outbox:
+            await self.outbox.close()
+        self.escalations.stop()
+        if self.suppressor:
+            self.suppressor.stop()
+        self.retry_queue.stop()
+        await asyncio.gather(*(channel.close() for channel in self.channels.values()))
+        self.delivery_history.close()
     
     async def deliver_multi_channel(
         self,
         route: AlertRoute,
-        crisis_analysis: CrisisAnalysis
+        crisis_analysis: CrisisAnalysis,
+        suppress: bool = True
     ) -> Dict[str, Any]:
-        """Deliver alert through multiple channels with fallback"""
+        """
+        Deliver alert through multiple channels with fallback
         
-        results = {
+        With the outbox enabled (default) this only enqueues one job per
+        channel and returns; workers send the jobs and complete the alert
+        (delivery record, escalation) once every channel has finished.
+        Repeats of an alert already sent to the recipient are suppressed
+        into a digest unless suppress is False (follow-ups, escalations).
+        """
+        if suppress and self._suppressed(route, crisis_analysis):
+            return self._suppressed_result(route)
+        
+        return await self._dispatch(route, crisis_analysis)
+    
+    async def deliver_broadcast(
+        self,
+        routes: List[AlertRoute],
+        crisis_analysis: CrisisAnalysis,
+        suppress: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Deliver many alerts at once, batching recipients that share a message
+        
+        Routes are grouped by (channel, message, priority) and each group is
+        sent through the channel's bulk API, so a roster-wide broadcast costs
+        one provider request (and rate-limit token) per bulk_size recipients
+        instead of one per recipient. Sends happen inline rather than through
+        the outbox. Routes copied for a roster share an alert ID; each copy
+        is given its own ("<alert_id>-<recipient id>") so escalation timers
+        and acknowledgements stay per recipient.
+        
+        Returns:
+            Delivery results keyed by recipient ID, as deliver_multi_channel
+            would return them
+        """
+        delivered_at = datetime.now().isoformat()
+        results = {}
+        sendable = []
+        # Groups hold positions in sendable
+        groups: Dict[Tuple[str, str, str], List[int]] = {}
+        
+        shared = Counter(route.alert_id for route in routes)
+        for route in routes:
+            if shared[route.alert_id] > 1:
+                route = route.copy(update={"alert_id": f"{route.alert_id}-{route.recipient.id}"})
+            
+            if suppress and self._suppressed(route, crisis_analysis):
+                results[route.recipient.id] = self._suppressed_result(route)
+                continue
+            
+            for channel_name in self._usable_channels(route.channels):
+                groups.setdefault((channel_name, route.message, route.priority.value), []).append(len(sendable))
+            sendable.append(route)
+        
+        channel_results: List[Dict[str, Dict]] = [{} for _ in sendable]
+        
+        async def send_group(channel_name: str, message: str, priority: str, group: List[int]) -> None:
+            group_results = await self._send_bulk_on_channel(
+                channel_name,
+                message,
+                [sendable[i].recipient.dict() for i in group],
+                self._message_metadata(priority, crisis_analysis),
+                excludes=[sendable[i].channels for i in group]
+            )
+            for i, result in zip(group, group_results):
+                channel_results[i][channel_name] = result
+        
+        await asyncio.gather(*(
+            send_group(channel_name, message, priority, group)
+            for (channel_name, message, priority), group in groups.items()
+        ))
+        
+        for route, route_results in zip(sendable, channel_results):
+            results[route.recipient.id] = await self._complete_delivery(
+                route, crisis_analysis, route_results, delivered_at
+            )
+        
+        logger.info(
+            f"Broadcast {len(sendable)} alerts in {len(groups)} channel groups "
+            f"({len(routes) - len(sendable)} suppressed)"
+        )
+        return results
+    
+    def _suppressed(self, route: AlertRoute, crisis_analysis: CrisisAnalysis) -> bool:
+        """Check (and record) a route against repeat-alert suppression"""
+        if not self.suppressor or self.suppressor.check(route, crisis_analysis):
+            return False
+        
+        logger.info(f"Suppressed repeat alert for {route.recipient.id} ({crisis_analysis.threat_type})")
+        return True
+    
+    def _suppressed_result(self, route: AlertRoute) -> Dict[str, Any]:
+        """Delivery result for an alert folded into a digest"""
+        return {
             "route_id": route.recipient.id,
-            "channels_attempted": [],
-            "successful_channels": [],
-            "failed_channels": [],
-            "total_success": False,
+            "alert_id": route.alert_id,
+            "suppressed": True,
+            "success": False,
             "delivery_time": datetime.now().isoformat()
         }
+    
+    async def _deliver_digest(
+        self,
+        route: AlertRoute,
+        crisis_analysis: CrisisAnalysis,
+        entry: Dict[str, Any]
+    ) -> None:
+        """Send one digest in place of the alerts suppressed during a window"""
+        digest = route.copy(update={
+            "message": self.suppressor.digest_message(route, entry),
+            "channels": [c for c in route.channels if c != "phone_call"],
+            "escalation_plan": None,
+            "alert_id": f"{route.alert_id}-digest"
+        })
+        await self._dispatch(digest, crisis_analysis)
+    
+    async def _dispatch(
+        self,
+        route: AlertRoute,
+        crisis_analysis: CrisisAnalysis
+    ) -> Dict[str, Any]:
+        """Queue (or, without the outbox, send) an alert on its channels"""
+        channels = self._usable_channels(route.channels)
+        if not self.outbox:
+            return await self._deliver_now(route, crisis_analysis, channels)
         
-        # Prepare message metadata
-        metadata = {
-            "priority": route.priority.value,
-            "severity": crisis_analysis.severity,
-            "threat_type": crisis_analysis.threat_type,
-            "escalation_required": crisis_analysis.escalation_required
-        }
+        queued_at = datetime.now().isoformat()
+        if not channels:
+            # Nothing can be queued; complete the alert as a failed delivery
+            return await self._complete_delivery(route, crisis_analysis, {}, queued_at)
+        
+        keys = self.outbox.enqueue(
+            route.alert_id,
+            {
+                "route": json.loads(route.json()),
+                "crisis_analysis": crisis_analysis.dict(),
+                "queued_at": queued_at
+            },
+            channels
+        )
         
-        # Try each channel in order
-        for channel_name in route.channels:
+        return {
+            "route_id": route.recipient.id,
+            "alert_id": route.alert_id,
+            "queued": True,
+            "success": True,
+            "channels_queued": [key.rsplit(":", 1)[1] for key in keys],
+            "duplicate": not keys,
+            "delivery_time": queued_at
+        }
+    
+    def _usable_channels(self, channel_names: List[str]) -> List[str]:
+        """Known, available channels from a route"""
+        usable = []
+        for channel_name in channel_names:
             if channel_name not in self.channels:
                 logger.warning(f"Unknown channel: {channel_name}")
                 continue
             
-            channel = self.channels[channel_name]
-            if not channel.is_available():
+            if not self.channels[channel_name].is_available():
                 logger.warning(f"Channel {channel_name} is not available")
                 continue
             
-            results["channels_attempted"].append(channel_name)
+            usable.append(channel_name)
+        return usable
+    
+    async def _deliver_now(
+        self,
+        route: AlertRoute,
+        crisis_analysis: CrisisAnalysis,
+        channels: List[str]
+    ) -> Dict[str, Any]:
+        """Send on each channel in order without the outbox"""
+        delivered_at = datetime.now().isoformat()
+        channel_results = {}
+        for channel_name in channels:
+            channel_results[channel_name] = await self._send_on_channel(
+                channel_name,
+                route.message,
+                route.recipient.dict(),
+                self._message_metadata(route.priority.value, crisis_analysis),
+                exclude=route.channels
+            )
+        
+        return await self._complete_delivery(route, crisis_analysis, channel_results, delivered_at)
+    
+    async def _send_job(self, payload: Dict[str, Any], channel_name: str, idempotency_key: str) -> Dict:
+        """Outbox job handler: one attempt to send an alert on one channel (the outbox retries)"""
+        route = payload["route"]
+        metadata = self._message_metadata(
+            route["priority"],
+            CrisisAnalysis(**payload["crisis_analysis"])
+        )
+        # Providers that support idempotency keys can drop replayed sends
+        metadata["idempotency_key"] = idempotency_key
+        
+        result = await self._send_on_channel(
+            channel_name,
+            route["message"],
+            route["recipient"],
+            metadata,
+            exclude=route["channels"],
+            retry=False
+        )
+        
+        if result.get("error_type") == "invalid_recipient":
+            result["retryable"] = False
+        elif result.get("error_type") == "circuit_open":
+            result["retry_at"] = self._circuit_retry_time(channel_name)
+        return result
+    
+    async def _on_outbox_dead_letter(self, payload: Dict[str, Any], channel_name: str, result: Dict) -> None:
+        """Outbox dead-letter handler"""
+        self.stats.record_dead_letter(channel_name)
+    
+    async def _complete_outbox_alert(self, payload: Dict[str, Any], channel_results: Dict[str, Dict]) -> None:
+        """Outbox completion handler: record the delivery and handle escalation"""
+        await self._complete_delivery(
+            AlertRoute(**payload["route"]),
+            CrisisAnalysis(**payload["crisis_analysis"]),
+            channel_results,
+            payload["queued_at"]
+        )
+    
+    def _message_metadata(self, priority: str, crisis_analysis: CrisisAnalysis) -> Dict[str, Any]:
+        """Prepare message metadata"""
+        return {
+            "priority": priority,
+            "severity": crisis_analysis.severity,
+            "threat_type": crisis_analysis.threat_type,
+            "escalation_required": crisis_analysis.escalation_required
+        }
+    
+    async def _send_on_channel(
+        self,
+        channel_name: str,
+        message: str,
+        recipient: Dict,
+        metadata: Dict,
+        exclude: List[str] = (),
+        retry: bool = True
+    ) -> Dict:
+        """
+        Rate-limited send on a single channel
+        
+        One attempt is made inline; unless retry is False (outbox jobs,
+        which the outbox retries), a failed send is handed to the retry
+        queue so callers never wait out backoff. If the channel's circuit
+        is open the send goes to the next channel in CHANNEL_FALLBACK_ORDER
+        that the recipient can use, skipping channels in exclude (those the
+        alert already goes out on).
+        """
+        if self.breakers[channel_name].is_open():
+            return await self._send_via_fallback(channel_name, message, recipient, metadata, exclude, retry)
+        
+        # Apply rate limiting
+        service_name = self._get_service_name(channel_name)
+        await self.rate_limiter.wait_for_capacity(service_name)
+        
+        # Attempt delivery
+        started = time.perf_counter()
+        delivery_result = await self._attempt_send(channel_name, message, recipient, metadata)
+        delivery_result["latency_ms"] = (time.perf_counter() - started) * 1000
+        
+        if delivery_result["success"]:
+            logger.info(f"Successfully delivered via {channel_name} to {recipient.get('id')}")
+            return delivery_result
+        
+        logger.error(f"Failed to deliver via {channel_name}: {delivery_result.get('error')}")
+        
+        if self.breakers[channel_name].is_open():
+            # This failure opened the circuit; don't retry a dead provider
+            return await self._send_via_fallback(channel_name, message, recipient, metadata, exclude, retry)
+        
+        if retry:
+            self._schedule_retry(channel_name, message, recipient, metadata, delivery_result)
+        return delivery_result
+    
+    async def _send_bulk_on_channel(
+        self,
+        channel_name: str,
+        message: str,
+        recipients: List[Dict],
+        metadata: Dict,
+        excludes: List[List[str]]
+    ) -> List[Dict]:
+        """
+        Rate-limited bulk send of one message on a single channel
+        
+        Each provider request takes one rate-limit token and counts once
+        against the circuit breaker. Recipients whose part of a request
+        failed are retried individually; while the circuit is open each
+        recipient falls back individually as in _send_on_channel.
+        
+        Returns:
+            One result per recipient, in order
+        """
+        channel = self.channels[channel_name]
+        if channel.bulk_size <= 1:
+            return list(await asyncio.gather(*(
+                self._send_on_channel(channel_name, message, recipient, metadata, exclude=exclude)
+                for recipient, exclude in zip(recipients, excludes)
+            )))
+        
+        service_name = self._get_service_name(channel_name)
+        results = []
+        for start in range(0, len(recipients), channel.bulk_size):
+            chunk = recipients[start:start + channel.bulk_size]
+            chunk_excludes = excludes[start:start + channel.bulk_size]
+            
+            if self.breakers[channel_name].is_open():
+                results.extend(await asyncio.gather(*(
+                    self._send_via_fallback(channel_name, message, recipient, metadata, exclude)
+                    for recipient, exclude in zip(chunk, chunk_excludes)
+                )))
+                continue
             
-            # Apply rate limiting
-            service_name = self._get_service_name(channel_name)
             await self.rate_limiter.wait_for_capacity(service_name)
             
-            # Attempt delivery with retry
-            delivery_result = await self._deliver_with_retry(
-                channel=channel,
-                message=route.message,
-                recipient=route.recipient.dict(),
-                metadata=metadata
-            )
+            started = time.perf_counter()
+            chunk_results = await self._attempt_bulk_send(channel_name, message, chunk, metadata)
+            latency_ms = (time.perf_counter() - started) * 1000
             
-            if delivery_result["success"]:
+            sent = sum(1 for result in chunk_results if result.get("success"))
+            logger.info(f"Bulk delivered via {channel_name} to {sent}/{len(chunk)} recipients")
+            
+            for recipient, exclude, result in zip(chunk, chunk_excludes, chunk_results):
+                result["latency_ms"] = latency_ms
+                if not result.get("success"):
+                    if self.breakers[channel_name].is_open():
+                        result = await self._send_via_fallback(channel_name, message, recipient, metadata, exclude)
+                    else:
+                        self._schedule_retry(channel_name, message, recipient, metadata, result)
+                results.append(result)
+        
+        return results
+    
+    def _schedule_retry(
+        self,
+        channel_name: str,
+        message: str,
+        recipient: Dict,
+        metadata: Dict,
+        delivery_result: Dict
+    ) -> None:
+        """Hand a failed send to the retry queue (marks the result)"""
+        if delivery_result.get("error_type") == "invalid_recipient":
+            # Retrying cannot fix missing contact details
+            return
+        
+        delivery_result["retry_scheduled"] = self.retry_queue.schedule(
+            {
+                "channel": channel_name,
+                "message": message,
+                "recipient": recipient,
+                "metadata": metadata
+            },
+            error=delivery_result.get("error")
+        )
+    
+    async def _send_via_fallback(
+        self,
+        channel_name: str,
+        message: str,
+        recipient: Dict,
+        metadata: Dict,
+        exclude: List[str],
+        retry: bool = True
+    ) -> Dict:
+        """Send on the next usable channel because channel_name's circuit is open"""
+        fallback = self._fallback_channel(channel_name, recipient, exclude)
+        if not fallback:
+            logger.error(f"Circuit open for {channel_name} and no fallback channel for {recipient.get('id')}")
+            return {
+                "success": False,
+                "error": f"Circuit open for {channel_name}, no fallback channel",
+                "error_type": "circuit_open",
+                "latency_ms": 0.0
+            }
+        
+        logger.warning(f"Circuit open for {channel_name}, falling back to {fallback}")
+        result = await self._send_on_channel(
+            fallback,
+            message,
+            recipient,
+            metadata,
+            exclude=[*exclude, channel_name, fallback],
+            retry=retry
+        )
+        result["fallback_from"] = channel_name
+        result["channel"] = fallback
+        return result
+    
+    async def _complete_delivery(
+        self,
+        route: AlertRoute,
+        crisis_analysis: CrisisAnalysis,
+        channel_results: Dict[str, Dict],
+        delivery_time: str
+    ) -> Dict[str, Any]:
+        """Summarize channel results, record the delivery and handle escalation"""
+        # Sends rerouted by an open circuit are credited to the channel used
+        channel_results = {
+            result.get("channel", channel_name): result
+            for channel_name, result in channel_results.items()
+        }
+        
+        results = {
+            "route_id": route.recipient.id,
+            "alert_id": route.alert_id,
+            "channels_attempted": list(channel_results),
+            "successful_channels": [],
+            "failed_channels": [],
+            "total_success": False,
+            "delivery_time": delivery_time
+        }
+        
+        for channel_name, delivery_result in channel_results.items():
+            if delivery_result.get("success"):
                 results["successful_channels"].append(channel_name)
                 results["total_success"] = True
-                logger.info(f"Successfully delivered via {channel_name} to {route.recipient.id}")
             else:
                 results["failed_channels"].append({
                     "channel": channel_name,
                     "error": delivery_result.get("error", "Unknown error")
                 })
-                logger.error(f"Failed to deliver via {channel_name}: {delivery_result.get('error')}")
+        results["success"] = results["total_success"]
         
         # Store delivery record
-        self._record_delivery(route, results, crisis_analysis)
+        self._record_delivery(route, results, crisis_analysis, channel_results)
         
         # Handle escalation if all channels failed
         if not results["total_success"] and route.escalation_plan:
             logger.warning(f"All channels failed for {route.recipient.id}, triggering escalation")
-            await self._trigger_escalation(route, results)
+            await self._trigger_escalation(route, results, crisis_analysis)
+        elif route.escalation_plan:
+            # Escalate unless the alert is acknowledged in time
+            self.escalations.schedule(
+                route.alert_id,
+                route.escalation_plan["escalate_after_minutes"],
+                self._escalation_record(route, crisis_analysis, route.escalation_plan["escalation_message"])
+            )
         
         return results
     
-    async def _deliver_with_retry(
+    def acknowledge_alert(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Acknowledge a delivered alert, cancelling its pending escalation
+        
+        Returns:
+            The escalation record that was cancelled, or None if none was pending
+        """
+        return self.escalations.acknowledge(alert_id)
+    
+    async def _attempt_send(
         self,
-        channel: DeliveryChannel,
+        channel_name: str,
         message: str,
         recipient: Dict,
         metadata: Dict
     ) -> Dict:
-        """Deliver message with retry logic"""
-        
-        last_error = None
-        
-        for attempt in range(self.retry_config["max_attempts"]):
-            try:
-                result = await channel.send(message, recipient, metadata)
-                if result.get("success"):
-                    if attempt > 0:
-                        logger.info(f"Delivery succeeded on attempt {attempt + 1}")
-                    return result
-                else:
-                    last_error = result.get("error", "Unknown error")
-                    
-            except Exception as e:
-                last_error = str(e)
-                logger.error(f"Delivery attempt {attempt + 1} failed: {e}")
-            
-            # Wait before retry (exponential backoff)
-            if attempt < self.retry_config["max_attempts"] - 1:
-                wait_time = self.retry_config["backoff_seconds"][
-                    min(attempt, len(self.retry_config["backoff_seconds"]) - 1)
-                ]
-                await asyncio.sleep(wait_time)
+        """Single send attempt, recorded against the channel's circuit breaker"""
+        breaker = self.breakers[channel_name]
+        if not breaker.allow_request():
+            return {
+                "success": False,
+                "error": f"Circuit open for {channel_name}",
+                "error_type": "circuit_open"
+            }
+        
+        try:
+            result = await self.channels[channel_name].send(message, recipient, metadata)
+        except Exception as e:
+            logger.error(f"Delivery attempt via {channel_name} failed: {e}")
+            result = {
+                "success": False,
+                "error": str(e),
+                "error_type": "timeout" if isinstance(e, asyncio.TimeoutError) else "provider_error"
+            }
+        
+        if result.get("success"):
+            breaker.record_success()
+        else:
+            breaker.record_failure(result.get("error_type", "provider_error"))
+        return result
+    
+    async def _attempt_bulk_send(
+        self,
+        channel_name: str,
+        message: str,
+        recipients: List[Dict],
+        metadata: Dict
+    ) -> List[Dict]:
+        """Single bulk provider request, recorded once against the circuit breaker"""
+        breaker = self.breakers[channel_name]
+        if not breaker.allow_request():
+            return [
+                {"success": False, "error": f"Circuit open for {channel_name}", "error_type": "circuit_open"}
+                for _ in recipients
+            ]
+        
+        try:
+            results = await self.channels[channel_name].send_bulk(message, recipients, metadata)
+        except Exception as e:
+            logger.error(f"Bulk delivery attempt via {channel_name} failed: {e}")
+            error_type = "timeout" if isinstance(e, asyncio.TimeoutError) else "provider_error"
+            results = [{"success": False, "error": str(e), "error_type": error_type} for _ in recipients]
         
-        return {"success": False, "error": f"Failed after {self.retry_config['max_attempts']} attempts: {last_error}"}
+        # The request as a whole succeeded if anyone got the message
+        if any(result.get("success") for result in results):
+            breaker.record_success()
+        else:
+            failure_types = [result.get("error_type", "provider_error") for result in results]
+            provider_failures = [t for t in failure_types if t != "invalid_recipient"]
+            breaker.record_failure(provider_failures[0] if provider_failures else "invalid_recipient")
+        return results
+    
+    async def _retry_send(self, payload: Dict[str, Any]) -> bool:
+        """Retry queue handler: one more attempt on the original channel"""
+        channel_name = payload["channel"]
+        if self.breakers[channel_name].is_open():
+            # Wait for the circuit to half-open rather than spend an attempt
+            payload["last_error"] = f"Circuit open for {channel_name}"
+            payload["retry_at"] = self._circuit_retry_time(channel_name)
+            return False
+        
+        await self.rate_limiter.wait_for_capacity(self._get_service_name(channel_name))
+        
+        started = time.perf_counter()
+        result = await self._attempt_send(
+            channel_name,
+            payload["message"],
+            payload["recipient"],
+            payload["metadata"]
+        )
+        if result.get("error_type") == "circuit_open":
+            # No half-open probe slot was free; nothing was sent
+            payload["last_error"] = result["error"]
+            payload["retry_at"] = self._circuit_retry_time(channel_name)
+            return False
+        
+        self.stats.record_retry(
+            channel_name,
+            success=bool(result.get("success")),
+            latency_ms=(time.perf_counter() - started) * 1000
+        )
+        
+        if result.get("success"):
+            logger.info(f"Retry delivered via {channel_name} to {payload['recipient'].get('id')}")
+            return True
+        
+        payload["last_error"] = result.get("error", "Unknown error")
+        return False
+    
+    async def _on_dead_letter(self, item: Dict[str, Any]) -> None:
+        """Retry queue dead-letter handler"""
+        payload = item["payload"]
+        self.stats.record_dead_letter(payload["channel"])
+        logger.error(
+            f"Giving up on {payload['channel']} delivery to {payload['recipient'].get('id')} "
+            f"after {item['attempts']} attempts: {item.get('last_error')}"
+        )
+    
+    def _circuit_retry_time(self, channel_name: str) -> float:
+        """When a send on channel_name is next worth attempting (no sooner than the base delay)"""
+        next_retry_time = self.breakers[channel_name].next_retry_time or 0.0
+        return max(next_retry_time, time.time() + self.retry_config["base_delay_seconds"])
+    
+    def _fallback_channel(
+        self,
+        channel_name: str,
+        recipient: Dict,
+        exclude: List[str]
+    ) -> Optional[str]:
+        """Next channel in the fallback order with a closed circuit the recipient can use"""
+        start = CHANNEL_FALLBACK_ORDER.index(channel_name) + 1 if channel_name in CHANNEL_FALLBACK_ORDER else 0
+        for candidate in CHANNEL_FALLBACK_ORDER[start:]:
+            if candidate in exclude or candidate not in self.channels:
+                continue
+            if not self.channels[candidate].is_available() or self.breakers[candidate].is_open():
+                continue
+            if recipient.get(CHANNEL_CONTACT_FIELDS[candidate]):
+                return candidate
+        return None
     
     def _get_service_name(self, channel_name: str) -> str:
         """Map channel name to service name for rate limiting"""
@@ -316,7 +796,8 @@ class DeliveryManager:
         self,
         route: AlertRoute,
         results: Dict,
-        crisis_analysis: CrisisAnalysis
+        crisis_analysis: CrisisAnalysis,
+        channel_results: Dict[str, Dict]
     ) -> None:
         """Record delivery attempt for analytics"""
         record = {
@@ -333,11 +814,23 @@ class DeliveryManager:
         }
         
         self.delivery_history.append(record)
+        self.stats.record(
+            priority=record["priority"],
+            role=record["recipient_role"],
+            success=record["total_success"],
+            delivery_time_ms=record["delivery_time_ms"],
+            channel_results=channel_results
+        )
         
         # In production, persist to database for analytics
         logger.info(f"Recorded delivery: {record['recipient_id']} - Success: {record['total_success']}")
     
-    async def _trigger_escalation(self, route: AlertRoute, failed_results: Dict) -> None:
+    async def _trigger_escalation(
+        self,
+        route: AlertRoute,
+        failed_results: Dict,
+        crisis_analysis: CrisisAnalysis
+    ) -> None:
         """Trigger escalation when all channels fail"""
         if not route.escalation_plan:
             return
@@ -348,41 +841,38 @@ class DeliveryManager:
             f"{', '.join([f['channel'] for f in failed_results['failed_channels']])}"
         )
         
-        # In production, create escalation task or notify escalation contact
-        logger.critical(f"ESCALATION TRIGGERED: {escalation_message}")
+        # Nobody received the alert, so escalate immediately
+        self.escalations.schedule(
+            route.alert_id,
+            0,
+            self._escalation_record(route, crisis_analysis, escalation_message)
+        )
+    
+    def _escalation_record(
+        self,
+        route: AlertRoute,
+        crisis_analysis: CrisisAnalysis,
+        escalation_message: str
+    ) -> Dict[str, Any]:
+        """Build the (JSON-serializable) record an escalation timer carries"""
+        return {
+            "recipient_id": route.recipient.id,
+            "recipient_name": route.recipient.name,
+            "recipient_role": route.recipient.role,
+            "escalate_to": route.escalation_plan["escalate_to"],
+            "escalation_message": escalation_message,
+            "priority": route.priority.value,
+            "message": route.message,
+            "crisis_analysis": crisis_analysis.dict()
+        }
     
     def get_delivery_stats(self) -> Dict[str, Any]:
-        """Get delivery statistics"""
-        if not self.delivery_history:
-            return {"total_deliveries": 0}
-        
-        total = len(self.delivery_history)
-        successful = sum(1 for record in self.delivery_history if record["total_success"])
-        
-        # Channel success rates
-        channel_stats = {}
-        for record in self.delivery_history:
-            for channel in record["successful_channels"]:
-                if channel not in channel_stats:
-                    channel_stats[channel] = {"attempts": 0, "successes": 0}
-                channel_stats[channel]["successes"] += 1
-            
-            for channel in record["channels_attempted"]:
-                if channel not in channel_stats:
-                    channel_stats[channel] = {"attempts": 0, "successes": 0}
-                channel_stats[channel]["attempts"] += 1
-        
-        # Calculate success rates
-        for channel in channel_stats:
-            stats = channel_stats[channel]
-            stats["success_rate"] = stats["successes"] / stats["attempts"] if stats["attempts"] > 0 else 0
-        
+        """Get delivery statistics (maintained incrementally, O(1) in history size)"""
         return {
-            "total_deliveries": total,
-            "successful_deliveries": successful,
-            "overall_success_rate": successful / total,
-            "channel_stats": channel_stats,
-            "avg_delivery_time_ms": sum(
-                record["delivery_time_ms"] for record in self.delivery_history
-            ) / total if total > 0 else 0
-        }
\ No newline at end of file
+            **self.stats.to_dict(),
+            "circuit_breakers": {
+                channel_name: breaker.get_metrics()
+                for channel_name, breaker in self.breakers.items()
+            },
+            "retries": self.retry_queue.get_stats()
+        }
@@ -0,0 +1,130 @@
+"""
+Delivery Statistics - running counters and latency sketches for deliveries
+"""
+
+from typing import Any, Dict, List
+
+from ..utils.latency_sketch import LatencySketch
+
+
+class _Counter:
+    """Deliveries, successes and latency for one dimension value"""
+
+    __slots__ = ("attempts", "successes", "latency", "retries", "retry_successes", "dead_letters")
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.latency = LatencySketch()
+        self.retries = 0
+        self.retry_successes = 0
+        self.dead_letters = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "success_rate": self.successes / self.attempts if self.attempts else 0,
+            "latency_ms": self.latency.quantiles(),
+            "retries": self.retries,
+            "retry_successes": self.retry_successes,
+            "dead_letters": self.dead_letters
+        }
+
+
+class DeliveryStats:
+    """
+    Delivery statistics maintained incrementally
+
+    Each delivery updates counters per channel, priority and recipient
+    role plus mergeable latency sketches, so reading the stats costs the
+    same regardless of how many deliveries have been made.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.successful = 0
+        self.latency = LatencySketch()
+        self.channels: Dict[str, _Counter] = {}
+        self.priorities: Dict[str, _Counter] = {}
+        self.roles: Dict[str, _Counter] = {}
+
+    def record(
+        self,
+        priority: str,
+        role: str,
+        success: bool,
+        delivery_time_ms: float,
+        channel_results: Dict[str, Dict]
+    ) -> None:
+        """
+        Update statistics with one delivery
+
+        Args:
+            priority: Alert priority value
+            role: Recipient role
+            success: Whether any channel succeeded
+            delivery_time_ms: End-to-end delivery time (queueing included)
+            channel_results: Per-channel results; "latency_ms" is recorded
+                in the channel's sketch when present
+        """
+        self.total += 1
+        self.successful += success
+        self.latency.add(delivery_time_ms)
+
+        for counters, key in ((self.priorities, priority), (self.roles, role)):
+            counter = counters.get(key)
+            if counter is None:
+                counter = counters[key] = _Counter()
+            counter.attempts += 1
+            counter.successes += success
+            counter.latency.add(delivery_time_ms)
+
+        for channel_name, result in channel_results.items():
+            counter = self._channel(channel_name)
+            counter.attempts += 1
+            counter.successes += bool(result.get("success"))
+            if "latency_ms" in result:
+                counter.latency.add(result["latency_ms"])
+
+    def record_retry(self, channel_name: str, success: bool, latency_ms: float) -> None:
+        """Update statistics with a background retry of a failed channel send"""
+        counter = self._channel(channel_name)
+        counter.retries += 1
+        counter.retry_successes += success
+        counter.latency.add(latency_ms)
+
+    def record_dead_letter(self, channel_name: str) -> None:
+        """Count a channel send that was given up on"""
+        self._channel(channel_name).dead_letters += 1
+
+    def _channel(self, channel_name: str) -> _Counter:
+        counter = self.channels.get(channel_name)
+        if counter is None:
+            counter = self.channels[channel_name] = _Counter()
+        return counter
+
+    def channel_latency(self, channel_names: List[str]) -> LatencySketch:
+        """Merged send-latency sketch for a set of channels"""
+        merged = LatencySketch()
+        for channel_name in channel_names:
+            if channel_name in self.channels:
+                merged.merge(self.channels[channel_name].latency)
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Statistics summary"""
+        if not self.total:
+            return {"total_deliveries": 0}
+
+        return {
+            "total_deliveries": self.total,
+            "successful_deliveries": self.successful,
+            "overall_success_rate": self.successful / self.total,
+            "channel_stats": {name: c.to_dict() for name, c in self.channels.items()},
+            "priority_stats": {name: c.to_dict() for name, c in self.priorities.items()},
+            "role_stats": {name: c.to_dict() for name, c in self.roles.items()},
+            "avg_delivery_time_ms": self.latency.mean,
+            "delivery_time_ms": self.latency.quantiles(),
+            "send_latency_ms": self.channel_latency(list(self.channels)).quantiles()
+        }
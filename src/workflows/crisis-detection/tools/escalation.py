@@ -0,0 +1,220 @@
+"""
+Escalation Scheduler - fires escalations for unacknowledged alerts
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import sqlite3
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+EscalationHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class EscalationScheduler:
+    """
+    Tracks outstanding alerts and escalates those not acknowledged in time
+
+    Timers live in a min-heap keyed by fire time; a single event-loop timer
+    is armed for the earliest entry, so there is no polling loop. Scheduling
+    is O(log n) and acknowledgement is O(1) (stale heap entries are skipped
+    lazily). Pending timers are optionally persisted to SQLite and re-armed
+    on start, so escalations survive restarts.
+    """
+
+    def __init__(
+        self,
+        on_escalate: Optional[EscalationHandler] = None,
+        store_path: Optional[str] = None
+    ):
+        """
+        Initialize escalation scheduler
+
+        Args:
+            on_escalate: Coroutine called with the timer record when it fires
+            store_path: SQLite file for pending timers (default: memory only)
+        """
+        self.on_escalate = on_escalate or self._log_escalation
+        self.store_path = store_path
+
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._armed_at: Optional[float] = None
+        self._tasks: set = set()
+        self._started = False
+
+        self.stats = {"scheduled": 0, "acknowledged": 0, "fired": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if store_path:
+            self._db = sqlite3.connect(store_path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS escalation_timers ("
+                "alert_id TEXT PRIMARY KEY, fire_at REAL NOT NULL, record TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def start(self) -> None:
+        """Load persisted timers and arm the earliest one (idempotent)"""
+        if self._started:
+            return
+        self._started = True
+
+        if self._db:
+            rows = self._db.execute("SELECT alert_id, fire_at, record FROM escalation_timers").fetchall()
+            for alert_id, fire_at, record in rows:
+                self._push(alert_id, fire_at, json.loads(record))
+            if rows:
+                logger.info(f"Restored {len(rows)} pending escalation timers")
+
+        self._arm()
+
+    def schedule(
+        self,
+        alert_id: str,
+        escalate_after_minutes: float,
+        record: Dict[str, Any]
+    ) -> float:
+        """
+        Start (or restart) the escalation timer for an alert
+
+        Args:
+            alert_id: Alert identifier used for acknowledgement
+            escalate_after_minutes: Delay before escalating
+            record: Escalation details passed to the handler when it fires
+
+        Returns:
+            Fire time as a Unix timestamp
+        """
+        self.start()
+
+        fire_at = time.time() + escalate_after_minutes * 60
+        record = {**record, "alert_id": alert_id, "scheduled_at": time.time(), "fire_at": fire_at}
+
+        self._push(alert_id, fire_at, record)
+        if self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO escalation_timers (alert_id, fire_at, record) VALUES (?, ?, ?)",
+                (alert_id, fire_at, json.dumps(record, default=str))
+            )
+            self._db.commit()
+
+        self.stats["scheduled"] += 1
+        self._arm()
+        return fire_at
+
+    def acknowledge(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Acknowledge an alert and cancel its escalation
+
+        Returns:
+            The cancelled timer record, or None if nothing was pending
+        """
+        record = self._pending.pop(alert_id, None)
+        if record is None:
+            return None
+
+        self._delete(alert_id)
+        self.stats["acknowledged"] += 1
+        logger.info(f"Alert {alert_id} acknowledged, escalation cancelled")
+        return record
+
+    def get_pending(self) -> List[Dict[str, Any]]:
+        """Pending escalation records, earliest first"""
+        return sorted(self._pending.values(), key=lambda r: r["fire_at"])
+
+    def pending_count(self) -> int:
+        """Number of outstanding (unacknowledged) alerts"""
+        return len(self._pending)
+
+    def stop(self) -> None:
+        """Disarm the timer and close the store; pending timers stay persisted"""
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+            self._armed_at = None
+        if self._db:
+            self._db.close()
+            self._db = None
+        self._started = False
+
+    def _push(self, alert_id: str, fire_at: float, record: Dict[str, Any]) -> None:
+        """Add a timer to the heap (replacing any pending timer for the alert)"""
+        self._pending[alert_id] = record
+        heapq.heappush(self._heap, (fire_at, next(self._sequence), alert_id))
+
+    def _arm(self) -> None:
+        """Arm a single loop timer for the earliest live heap entry"""
+        # Drop heap entries for acknowledged or rescheduled alerts
+        while self._heap:
+            fire_at, _, alert_id = self._heap[0]
+            record = self._pending.get(alert_id)
+            if record is not None and record["fire_at"] == fire_at:
+                break
+            heapq.heappop(self._heap)
+
+        if not self._heap:
+            return
+
+        next_fire = self._heap[0][0]
+        if self._handle and self._armed_at is not None and self._armed_at <= next_fire:
+            return
+
+        if self._handle:
+            self._handle.cancel()
+
+        loop = asyncio.get_running_loop()
+        self._handle = loop.call_later(max(0.0, next_fire - time.time()), self._fire_due)
+        self._armed_at = next_fire
+
+    def _fire_due(self) -> None:
+        """Fire every timer that is due, then re-arm for the next one"""
+        self._handle = None
+        self._armed_at = None
+        now = time.time()
+
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, alert_id = heapq.heappop(self._heap)
+            record = self._pending.get(alert_id)
+            if record is None or record["fire_at"] != fire_at:
+                continue
+
+            del self._pending[alert_id]
+            self._delete(alert_id)
+            self.stats["fired"] += 1
+
+            task = asyncio.ensure_future(self._run_handler(record))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        self._arm()
+
+    async def _run_handler(self, record: Dict[str, Any]) -> None:
+        """Run the escalation handler, logging failures"""
+        try:
+            await self.on_escalate(record)
+        except Exception as e:
+            logger.error(f"Escalation handler failed for {record.get('alert_id')}: {e}")
+
+    def _delete(self, alert_id: str) -> None:
+        """Remove a timer from the persistent store"""
+        if self._db:
+            self._db.execute("DELETE FROM escalation_timers WHERE alert_id = ?", (alert_id,))
+            self._db.commit()
+
+    async def _log_escalation(self, record: Dict[str, Any]) -> None:
+        """Default handler: log the escalation"""
+        logger.critical(
+            f"ESCALATION TRIGGERED: {record.get('escalation_message')} "
+            f"-> {record.get('escalate_to')}"
+        )
@@ -0,0 +1,365 @@
+"""
+Delivery Outbox - durable, idempotent queue of channel deliveries
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import logging
+
+from .retry_queue import full_jitter_backoff
+
+logger = logging.getLogger(__name__)
+
+
+# (alert payload, channel, idempotency key) -> channel result with "success"
+JobHandler = Callable[[Dict[str, Any], str, str], Awaitable[Dict[str, Any]]]
+
+# (alert payload, {channel: result}) once every channel job of an alert is done
+AlertCompleteHandler = Callable[[Dict[str, Any], Dict[str, Dict[str, Any]]], Awaitable[None]]
+
+# (alert payload, channel, last result) for a job that ran out of attempts or age
+JobDeadLetterHandler = Callable[[Dict[str, Any], str, Dict[str, Any]], Awaitable[None]]
+
+
+class DeliveryOutbox:
+    """
+    SQLite (WAL) outbox drained by a pool of async workers
+
+    Each alert is stored once with one job per channel, keyed by
+    ``"<alert_id>:<channel>"``. Enqueueing an existing key is a no-op, so
+    retried or replayed deliveries are never sent twice; jobs interrupted
+    by a crash are reset to pending on start (at-least-once delivery).
+    Workers wait on an in-memory queue, so an idle outbox does not poll.
+
+    A failed job goes back to pending with its attempt count and a
+    jittered backoff time (``next_attempt_at``), so retries survive a
+    restart and an alert only completes once every job is sent or has
+    given up. The handler can mark a result ``"retryable": False`` to fail
+    the job at once, or set ``"retry_at"`` to wait until then without
+    using up an attempt (e.g. while the channel's circuit is open).
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        on_alert_complete: Optional[AlertCompleteHandler] = None,
+        store_path: str = ":memory:",
+        concurrency: int = 4,
+        retention_hours: float = 24,
+        on_dead_letter: Optional[JobDeadLetterHandler] = None,
+        max_attempts: int = 3,
+        base_delay_seconds: float = 1,
+        max_delay_seconds: float = 60,
+        max_age_seconds: float = 900
+    ):
+        """
+        Initialize delivery outbox
+
+        Args:
+            handler: Coroutine that sends one channel job
+            on_alert_complete: Coroutine called once all jobs of an alert finish
+            store_path: SQLite file (":memory:" is not durable across restarts)
+            concurrency: Number of worker tasks
+            retention_hours: Completed alerts older than this are purged on start
+            on_dead_letter: Coroutine called for each job that gives up
+            max_attempts: Send attempts per job, including the first
+            base_delay_seconds: Backoff cap for the first retry
+            max_delay_seconds: Upper bound for any backoff
+            max_age_seconds: Jobs of alerts older than this are not retried again
+        """
+        self.handler = handler
+        self.on_alert_complete = on_alert_complete
+        self.store_path = store_path
+        self.concurrency = concurrency
+        self.retention_hours = retention_hours
+        self.on_dead_letter = on_dead_letter
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_age_seconds = max_age_seconds
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._completing: set = set()
+        self._tasks: set = set()
+        self.stats = {"enqueued": 0, "duplicates": 0, "sent": 0, "retried": 0, "deferred": 0, "failed": 0}
+
+        self._db = sqlite3.connect(store_path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS outbox_alerts (
+                alert_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS outbox_jobs (
+                idempotency_key TEXT PRIMARY KEY,
+                alert_id TEXT NOT NULL,
+                channel TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                result TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS outbox_jobs_alert ON outbox_jobs (alert_id);
+            CREATE INDEX IF NOT EXISTS outbox_jobs_status ON outbox_jobs (status);
+        """)
+        self._db.commit()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """Recover unfinished jobs and start the workers (idempotent)"""
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue()
+        with self._db:
+            # Jobs claimed by a process that died are sent again
+            self._db.execute("UPDATE outbox_jobs SET status = 'pending' WHERE status = 'in_progress'")
+            self._purge()
+
+        pending = self._db.execute(
+            "SELECT idempotency_key, next_attempt_at FROM outbox_jobs WHERE status = 'pending' "
+            "ORDER BY next_attempt_at, updated_at"
+        ).fetchall()
+        for key, next_attempt_at in pending:
+            self._queue_at(key, next_attempt_at)
+        if pending:
+            logger.info(f"Resuming {len(pending)} pending delivery jobs")
+
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"outbox-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+        # Alerts whose jobs all finished before a crash still need completing
+        incomplete = self._db.execute("""
+            SELECT a.alert_id FROM outbox_alerts a
+            WHERE a.completed = 0 AND NOT EXISTS (
+                SELECT 1 FROM outbox_jobs j
+                WHERE j.alert_id = a.alert_id AND j.status IN ('pending', 'in_progress')
+            )
+        """).fetchall()
+        for (alert_id,) in incomplete:
+            task = asyncio.create_task(self._complete_alert(alert_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def enqueue(self, alert_id: str, payload: Dict[str, Any], channels: List[str]) -> List[str]:
+        """
+        Durably enqueue one job per channel for an alert
+
+        Args:
+            alert_id: Alert identifier (part of each idempotency key)
+            payload: JSON-serializable alert data handed to the job handler
+            channels: Channels to deliver on
+
+        Returns:
+            Idempotency keys of newly enqueued jobs (existing keys are skipped)
+        """
+        self.start()
+        now = time.time()
+        new_keys = []
+
+        with self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO outbox_alerts (alert_id, payload, created_at) VALUES (?, ?, ?)",
+                (alert_id, json.dumps(payload, default=str), now)
+            )
+            for channel in channels:
+                key = f"{alert_id}:{channel}"
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO outbox_jobs (idempotency_key, alert_id, channel, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, alert_id, channel, now)
+                )
+                if cursor.rowcount:
+                    new_keys.append(key)
+                else:
+                    self.stats["duplicates"] += 1
+
+        for key in new_keys:
+            self._queue.put_nowait(key)
+        self.stats["enqueued"] += len(new_keys)
+        return new_keys
+
+    async def drain(self) -> None:
+        """Wait until every due job has been processed (retries waiting on backoff stay scheduled)"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Stop the workers; unfinished jobs (and pending retries) stay in the store"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def close(self) -> None:
+        """Stop the workers, finish completions started on start and close the store"""
+        await self.stop()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts by status plus session counters"""
+        by_status = dict(self._db.execute(
+            "SELECT status, COUNT(*) FROM outbox_jobs GROUP BY status"
+        ).fetchall())
+        return {
+            **self.stats,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "awaiting_retry": len(self._timers),
+            "jobs_by_status": by_status
+        }
+
+    async def _work(self) -> None:
+        """Worker loop: claim, send and settle one job at a time"""
+        while True:
+            key = await self._queue.get()
+            try:
+                await self._process(key)
+            except Exception as e:
+                logger.error(f"Outbox job {key} crashed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _queue_at(self, key: str, due: float) -> None:
+        """Hand a job to the workers now, or once its retry is due"""
+        delay = due - time.time()
+        if delay <= 0:
+            self._queue.put_nowait(key)
+            return
+        self._timers[key] = asyncio.get_running_loop().call_later(delay, self._release, key)
+
+    def _release(self, key: str) -> None:
+        """Timer callback: a retry is due"""
+        self._timers.pop(key, None)
+        if self._queue is not None:
+            self._queue.put_nowait(key)
+
+    async def _process(self, key: str) -> None:
+        """Send one job and record its outcome (sent, pending retry or failed)"""
+        row = self._db.execute("""
+            SELECT j.alert_id, j.channel, j.status, j.attempts, a.payload, a.created_at
+            FROM outbox_jobs j JOIN outbox_alerts a ON a.alert_id = j.alert_id
+            WHERE j.idempotency_key = ?
+        """, (key,)).fetchone()
+        if row is None or row[2] != "pending":
+            return
+        alert_id, channel, _, attempts, payload, created_at = row
+        alert_payload = json.loads(payload)
+
+        attempts += 1
+        with self._db:
+            self._db.execute(
+                "UPDATE outbox_jobs SET status = 'in_progress', attempts = ?, "
+                "updated_at = ? WHERE idempotency_key = ?",
+                (attempts, time.time(), key)
+            )
+
+        try:
+            result = await self.handler(alert_payload, channel, key)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        status, next_attempt_at = ("sent" if result.get("success") else "failed"), 0.0
+        if status == "failed" and time.time() - created_at < self.max_age_seconds:
+            if result.get("retry_at") is not None:
+                # Waited rather than attempted; the attempt is not used up
+                status, next_attempt_at = "pending", result["retry_at"]
+                attempts -= 1
+                self.stats["deferred"] += 1
+            elif result.get("retryable", True) and attempts < self.max_attempts:
+                status = "pending"
+                next_attempt_at = time.time() + full_jitter_backoff(
+                    attempts, self.base_delay_seconds, self.max_delay_seconds
+                )
+                self.stats["retried"] += 1
+        if status != "pending":
+            self.stats[status] += 1
+
+        with self._db:
+            self._db.execute(
+                "UPDATE outbox_jobs SET status = ?, attempts = ?, next_attempt_at = ?, result = ?, "
+                "updated_at = ? WHERE idempotency_key = ?",
+                (status, attempts, next_attempt_at, json.dumps(result, default=str), time.time(), key)
+            )
+
+        if status == "pending":
+            self._queue_at(key, next_attempt_at)
+            return
+        if status == "failed":
+            logger.error(f"Giving up on outbox job {key} after {attempts} attempts: {result.get('error')}")
+            if self.on_dead_letter:
+                try:
+                    await self.on_dead_letter(alert_payload, channel, result)
+                except Exception as e:
+                    logger.error(f"Dead-letter handler failed for job {key}: {e}")
+
+        remaining = self._db.execute(
+            "SELECT COUNT(*) FROM outbox_jobs WHERE alert_id = ? AND status IN ('pending', 'in_progress')",
+            (alert_id,)
+        ).fetchone()[0]
+        if not remaining:
+            await self._complete_alert(alert_id)
+
+    async def _complete_alert(self, alert_id: str) -> None:
+        """
+        Hand an alert's results to the callback, then mark it complete
+
+        The alert is only marked once the callback succeeds, so a crash or
+        a failing callback leaves it to be completed again on the next start.
+        """
+        if alert_id in self._completing:
+            return
+        row = self._db.execute(
+            "SELECT payload FROM outbox_alerts WHERE alert_id = ? AND completed = 0", (alert_id,)
+        ).fetchone()
+        if row is None:
+            return
+
+        self._completing.add(alert_id)
+        try:
+            if self.on_alert_complete:
+                results = {
+                    channel: json.loads(result or "{}")
+                    for channel, result in self._db.execute(
+                        "SELECT channel, result FROM outbox_jobs WHERE alert_id = ? ORDER BY rowid",
+                        (alert_id,)
+                    )
+                }
+                await self.on_alert_complete(json.loads(row[0]), results)
+
+            with self._db:
+                self._db.execute("UPDATE outbox_alerts SET completed = 1 WHERE alert_id = ?", (alert_id,))
+        except Exception as e:
+            logger.error(f"Completion handler failed for alert {alert_id} (retried on next start): {e}")
+        finally:
+            self._completing.discard(alert_id)
+
+    def _purge(self) -> None:
+        """Delete completed alerts (and their jobs) past the retention period"""
+        cutoff = time.time() - self.retention_hours * 3600
+        self._db.execute(
+            "DELETE FROM outbox_jobs WHERE alert_id IN "
+            "(SELECT alert_id FROM outbox_alerts WHERE completed = 1 AND created_at < ?)",
+            (cutoff,)
+        )
+        self._db.execute(
+            "DELETE FROM outbox_alerts WHERE completed = 1 AND created_at < ?", (cutoff,)
+        )
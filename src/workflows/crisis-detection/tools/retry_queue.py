@@ -0,0 +1,204 @@
+"""
+Delayed Retry Queue - backoff retries for failed sends without blocking callers
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Retries one item; returns True when it succeeded
+RetryHandler = Callable[[Dict[str, Any]], Awaitable[bool]]
+
+# Called with an item that ran out of attempts or age
+DeadLetterHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def full_jitter_backoff(
+    attempts: int,
+    base_delay_seconds: float,
+    max_delay_seconds: float,
+    rng: random.Random = random
+) -> float:
+    """Random delay up to min(max_delay, base_delay * 2**(attempts - 1))"""
+    return rng.uniform(0, min(max_delay_seconds, base_delay_seconds * 2 ** (attempts - 1)))
+
+
+class DelayedRetryQueue:
+    """
+    Schedules retries with jittered exponential backoff
+
+    Items wait in a min-heap keyed by due time with a single event-loop
+    timer armed for the earliest one, so callers return immediately and
+    nothing sleeps or polls. Retry n waits a random time up to
+    ``min(max_delay, base_delay * 2**(n - 1))`` ("full jitter"). Items that
+    exhaust ``max_attempts`` or exceed ``max_age_seconds`` are dead-lettered.
+    A handler that sets ``payload["retry_at"]`` and returns False defers
+    the item to that time without using up an attempt (e.g. while a
+    circuit is open).
+    """
+
+    def __init__(
+        self,
+        handler: RetryHandler,
+        on_dead_letter: Optional[DeadLetterHandler] = None,
+        max_attempts: int = 3,
+        base_delay_seconds: float = 1,
+        max_delay_seconds: float = 60,
+        max_age_seconds: float = 900,
+        dead_letter_size: int = 1000
+    ):
+        """
+        Initialize delayed retry queue
+
+        Args:
+            handler: Coroutine that retries an item (True on success)
+            on_dead_letter: Coroutine called for each dead-lettered item
+            max_attempts: Total attempts including the first, failed one
+            base_delay_seconds: Backoff cap for the first retry
+            max_delay_seconds: Upper bound for any backoff
+            max_age_seconds: Items older than this are not retried again
+            dead_letter_size: Dead-lettered items kept for inspection
+        """
+        self.handler = handler
+        self.on_dead_letter = on_dead_letter
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_age_seconds = max_age_seconds
+
+        self.dead_letters: Deque[Dict[str, Any]] = deque(maxlen=dead_letter_size)
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._armed_at: Optional[float] = None
+        self._tasks: set = set()
+        self._random = random.Random()
+
+        self.stats = {"scheduled": 0, "attempted": 0, "succeeded": 0, "deferred": 0, "dead_lettered": 0}
+
+    def schedule(self, payload: Dict[str, Any], error: Optional[str] = None) -> bool:
+        """
+        Schedule the first retry of an item whose initial attempt failed
+
+        Returns:
+            True if a retry was scheduled, False if it was dead-lettered
+        """
+        item = {
+            "payload": payload,
+            "attempts": 1,
+            "first_failed_at": time.time(),
+            "last_error": error
+        }
+        return self._schedule_next(item)
+
+    def backoff(self, attempts: int) -> float:
+        """Jittered delay before the retry that follows `attempts` attempts"""
+        return full_jitter_backoff(attempts, self.base_delay_seconds, self.max_delay_seconds, self._random)
+
+    def pending_count(self) -> int:
+        """Retries waiting or in flight"""
+        return len(self._heap) + len(self._tasks)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retry counters"""
+        return {
+            **self.stats,
+            "pending": self.pending_count(),
+            "dead_letter_queue": len(self.dead_letters)
+        }
+
+    def stop(self) -> None:
+        """Disarm the timer (pending retries are dropped)"""
+        if self._handle:
+            self._handle.cancel()
+        self._handle = None
+        self._armed_at = None
+        self._heap.clear()
+
+    def _schedule_next(self, item: Dict[str, Any], due: Optional[float] = None) -> bool:
+        """Queue the next attempt (after backoff unless due is given) or dead-letter the item"""
+        age = time.time() - item["first_failed_at"]
+        if item["attempts"] >= self.max_attempts or age >= self.max_age_seconds:
+            self._dead_letter(item)
+            return False
+
+        if due is None:
+            due = time.time() + self.backoff(item["attempts"])
+        heapq.heappush(self._heap, (due, next(self._sequence), item))
+        self.stats["scheduled"] += 1
+        self._arm()
+        return True
+
+    def _arm(self) -> None:
+        """Arm a single loop timer for the earliest retry"""
+        if not self._heap:
+            return
+
+        next_due = self._heap[0][0]
+        if self._handle and self._armed_at is not None and self._armed_at <= next_due:
+            return
+        if self._handle:
+            self._handle.cancel()
+
+        loop = asyncio.get_running_loop()
+        self._handle = loop.call_later(max(0.0, next_due - time.time()), self._fire_due)
+        self._armed_at = next_due
+
+    def _fire_due(self) -> None:
+        """Start every retry that is due, then re-arm"""
+        self._handle = None
+        self._armed_at = None
+        now = time.time()
+
+        while self._heap and self._heap[0][0] <= now:
+            _, _, item = heapq.heappop(self._heap)
+            task = asyncio.ensure_future(self._attempt(item))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        self._arm()
+
+    async def _attempt(self, item: Dict[str, Any]) -> None:
+        """Run one retry and reschedule it on failure"""
+        item["attempts"] += 1
+        self.stats["attempted"] += 1
+
+        try:
+            succeeded = await self.handler(item["payload"])
+        except Exception as e:
+            item["payload"]["last_error"] = str(e)
+            succeeded = False
+        item["last_error"] = item["payload"].get("last_error", item["last_error"])
+
+        if succeeded:
+            self.stats["succeeded"] += 1
+            return
+
+        retry_at = item["payload"].pop("retry_at", None)
+        if retry_at is not None:
+            # Deferred by the handler rather than attempted
+            item["attempts"] -= 1
+            self.stats["deferred"] += 1
+        self._schedule_next(item, retry_at)
+
+    def _dead_letter(self, item: Dict[str, Any]) -> None:
+        """Give up on an item"""
+        item["dead_lettered_at"] = time.time()
+        self.dead_letters.append(item)
+        self.stats["dead_lettered"] += 1
+
+        if not self.on_dead_letter:
+            logger.error(f"Dead-lettered after {item['attempts']} attempts: {item.get('last_error')}")
+            return
+
+        task = asyncio.ensure_future(self.on_dead_letter(item))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
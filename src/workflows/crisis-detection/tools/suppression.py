@@ -0,0 +1,293 @@
+"""
+Alert Suppression - collapses repeat alerts for an ongoing crisis into digests
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+
+from ..agents.alert_routing import AlertRoute
+from ..agents.crisis_detection import CrisisAnalysis
+
+logger = logging.getLogger(__name__)
+
+
+# (latest route, latest analysis, suppression entry) when a digest is due
+DigestHandler = Callable[[AlertRoute, CrisisAnalysis, Dict[str, Any]], Awaitable[None]]
+
+
+def topic_fingerprint(topics: List[str]) -> str:
+    """Order-insensitive fingerprint of a crisis' affected topics"""
+    normalized = "|".join(sorted({topic.strip().lower() for topic in topics}))
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+class AlertSuppressor:
+    """
+    Suppresses repeat alerts keyed by recipient, threat type and topics
+
+    The first alert for a key is sent; repeats inside the window are
+    counted instead of sent, and one digest summarizing them goes out when
+    the window closes. While repeats keep coming the key's window doubles
+    with each digest (up to ``max_window_minutes``); a window that closes
+    without repeats resets it. A higher severity than the last alert sent
+    always goes through immediately. Entries are optionally persisted to
+    SQLite and pending digests re-armed on start, so suppression carries
+    over between workflow runs and restarts.
+    """
+
+    def __init__(
+        self,
+        on_digest: Optional[DigestHandler] = None,
+        window_minutes: float = 30,
+        max_window_minutes: float = 240,
+        store_path: Optional[str] = None
+    ):
+        """
+        Initialize alert suppressor
+
+        Args:
+            on_digest: Coroutine that delivers a digest when a window closes
+            window_minutes: Repeats within this long of the last alert sent
+                for the same key are suppressed (the starting window)
+            max_window_minutes: Cap on a key's window as repeats continue
+            store_path: SQLite file for suppression entries (default: memory only)
+        """
+        self.on_digest = on_digest
+        self.window_seconds = window_minutes * 60
+        self.max_window_seconds = max(max_window_minutes * 60, self.window_seconds)
+        self.store_path = store_path
+
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._timers: Dict[Tuple[str, str, str], asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+        self._started = False
+        self.stats = {"sent": 0, "suppressed": 0, "severity_bypass": 0, "digests": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if store_path:
+            self._db = sqlite3.connect(store_path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS suppression_entries ("
+                "key TEXT PRIMARY KEY, touched_at REAL NOT NULL, entry TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def start(self) -> None:
+        """Load persisted entries and re-arm their pending digests (idempotent)"""
+        if self._started:
+            return
+        self._started = True
+
+        if not self._db:
+            return
+        rows = self._db.execute(
+            "SELECT key, entry FROM suppression_entries ORDER BY touched_at"
+        ).fetchall()
+        for key, entry in rows:
+            key = tuple(json.loads(key))
+            entry = json.loads(entry)
+            entry["latest_route"] = AlertRoute(**entry["latest_route"])
+            entry["latest_analysis"] = CrisisAnalysis(**entry["latest_analysis"])
+            self._entries[key] = entry
+            if entry["suppressed"]:
+                self._schedule_digest(key, entry["last_sent_at"] + entry["window_seconds"] - time.time())
+        if rows:
+            logger.info(f"Restored {len(rows)} alert suppression entries")
+
+    def stop(self) -> None:
+        """Disarm digest timers and close the store; persisted entries resume on the next start"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        if self._db:
+            self._db.close()
+            self._db = None
+        self._started = False
+
+    def key(self, route: AlertRoute, crisis_analysis: CrisisAnalysis) -> Tuple[str, str, str]:
+        """Suppression key for a route"""
+        return (
+            route.recipient.id,
+            (crisis_analysis.threat_type or "unknown").lower(),
+            topic_fingerprint(crisis_analysis.affected_topics)
+        )
+
+    def check(
+        self,
+        route: AlertRoute,
+        crisis_analysis: CrisisAnalysis,
+        now: Optional[float] = None
+    ) -> bool:
+        """
+        Decide whether an alert should be sent now
+
+        Returns:
+            True to send, False if the alert was folded into a pending digest
+        """
+        self.start()
+        now = now or time.time()
+        self._expire(now)
+        key = self.key(route, crisis_analysis)
+        entry = self._entries.get(key)
+
+        if entry is None or now - entry["last_sent_at"] >= entry["window_seconds"]:
+            self._mark_sent(key, route, crisis_analysis, now, self._next_window(entry))
+            self.stats["sent"] += 1
+            return True
+
+        if crisis_analysis.severity > entry["last_sent_severity"]:
+            # Escalating crisis: send now, the new alert supersedes the digest
+            logger.info(
+                f"Severity rose {entry['last_sent_severity']} -> {crisis_analysis.severity} "
+                f"for {route.recipient.id}, bypassing suppression"
+            )
+            self.stats["severity_bypass"] += 1
+            self.stats["sent"] += 1
+            self._mark_sent(key, route, crisis_analysis, now, entry["window_seconds"])
+            return True
+
+        entry["suppressed"] += 1
+        entry["total_suppressed"] += 1
+        entry["last_suppressed_at"] = now
+        entry["latest_route"] = route
+        entry["latest_analysis"] = crisis_analysis
+        self._entries.move_to_end(key)
+        self._save(key, entry, now)
+        self.stats["suppressed"] += 1
+
+        self._schedule_digest(key, entry["last_sent_at"] + entry["window_seconds"] - now)
+        return False
+
+    def digest_message(self, route: AlertRoute, entry: Dict[str, Any]) -> str:
+        """Digest text summarizing the suppressed repeats"""
+        since = time.strftime("%H:%M", time.localtime(entry["last_sent_at"]))
+        return (
+            f"[UPDATE] {entry['suppressed']} repeat alert(s) for this crisis since {since} "
+            f"(latest severity {entry['latest_analysis'].severity}/10).\n"
+            f"Latest:\n\n{route.message}"
+        )
+
+    def get_suppressed(self) -> List[Dict[str, Any]]:
+        """Keys with suppressed alerts, most suppressed first"""
+        report = [
+            {
+                "recipient_id": key[0],
+                "threat_type": key[1],
+                "topic_fingerprint": key[2],
+                "pending": entry["suppressed"],
+                "total_suppressed": entry["total_suppressed"],
+                "last_sent_severity": entry["last_sent_severity"],
+                "window_minutes": entry["window_seconds"] / 60
+            }
+            for key, entry in self._entries.items()
+            if entry["total_suppressed"]
+        ]
+        return sorted(report, key=lambda r: r["total_suppressed"], reverse=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Suppression counters"""
+        checked = self.stats["sent"] + self.stats["suppressed"]
+        return {
+            **self.stats,
+            "active_keys": len(self._entries),
+            "pending_digests": len(self._timers),
+            "suppression_rate": self.stats["suppressed"] / checked if checked else 0
+        }
+
+    def _mark_sent(
+        self,
+        key: Tuple[str, str, str],
+        route: AlertRoute,
+        crisis_analysis: CrisisAnalysis,
+        now: float,
+        window_seconds: float
+    ) -> None:
+        """Start a new suppression window for a key"""
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+
+        previous = self._entries.pop(key, None)
+        entry = self._entries[key] = {
+            "last_sent_at": now,
+            "last_sent_severity": crisis_analysis.severity,
+            "window_seconds": window_seconds,
+            "suppressed": 0,
+            "total_suppressed": previous["total_suppressed"] if previous else 0,
+            "last_suppressed_at": None,
+            "latest_route": route,
+            "latest_analysis": crisis_analysis
+        }
+        self._save(key, entry, now)
+
+    def _next_window(self, entry: Optional[Dict[str, Any]]) -> float:
+        """Window after one closes: doubled if repeats came during it, else the starting window"""
+        if not entry or not entry["suppressed"]:
+            return self.window_seconds
+        return min(entry["window_seconds"] * 2, self.max_window_seconds)
+
+    def _save(self, key: Tuple[str, str, str], entry: Dict[str, Any], now: float) -> None:
+        """Persist one entry"""
+        if not self._db:
+            return
+        record = {
+            **entry,
+            "latest_route": json.loads(entry["latest_route"].json()),
+            "latest_analysis": entry["latest_analysis"].dict()
+        }
+        self._db.execute(
+            "INSERT OR REPLACE INTO suppression_entries (key, touched_at, entry) VALUES (?, ?, ?)",
+            (json.dumps(key), now, json.dumps(record, default=str))
+        )
+        self._db.commit()
+
+    def _schedule_digest(self, key: Tuple[str, str, str], delay: float) -> None:
+        """Arm the digest timer for a key (once per window)"""
+        if key in self._timers or not self.on_digest:
+            return
+        loop = asyncio.get_running_loop()
+        self._timers[key] = loop.call_later(max(0.0, delay), self._flush, key)
+
+    def _flush(self, key: Tuple[str, str, str]) -> None:
+        """Send the digest for a key whose window closed"""
+        self._timers.pop(key, None)
+        entry = self._entries.get(key)
+        if not entry or not entry["suppressed"]:
+            return
+
+        route = entry["latest_route"]
+        analysis = entry["latest_analysis"]
+        digest = dict(entry)
+        self._mark_sent(key, route, analysis, time.time(), self._next_window(entry))
+        self.stats["digests"] += 1
+
+        task = asyncio.ensure_future(self._run_digest(route, analysis, digest))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_digest(self, route: AlertRoute, analysis: CrisisAnalysis, entry: Dict[str, Any]) -> None:
+        """Run the digest handler, logging failures"""
+        try:
+            await self.on_digest(route, analysis, entry)
+        except Exception as e:
+            logger.error(f"Digest delivery failed for {route.recipient.id}: {e}")
+
+    def _expire(self, now: float) -> None:
+        """Drop idle keys (least recently touched first)"""
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            last_touched = max(entry["last_sent_at"], entry["last_suppressed_at"] or 0)
+            if now - last_touched < 2 * entry["window_seconds"] or key in self._timers:
+                break
+            del self._entries[key]
+            if self._db:
+                self._db.execute("DELETE FROM suppression_entries WHERE key = ?", (json.dumps(key),))
+                self._db.commit()
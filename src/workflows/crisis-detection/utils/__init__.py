@@ -2,10 +2,41 @@
 Crisis Detection Workflow Utilities
 """
 
-from .state import WorkflowState
-from .rate_limiter import RateLimiter
+import importlib
 
-__all__ = [
-    "WorkflowState",
-    "RateLimiter"
-]
\ No newline at end of file
+# Exports are resolved on first access (PEP 562). ``state`` depends on the
+# agent schemas, and agents depend on utilities, so eager imports here would
+# form an import cycle.
+_EXPORTS = {
+    "WorkflowState": ".state",
+    "RateLimiter": ".rate_limiter",
+    "TrendingKeywordTracker": ".trending",
+    "ModelCascade": ".model_cascade",
+    "LLMGateway": ".llm_gateway",
+    "LatencySketch": ".latency_sketch",
+    "CircuitBreaker": ".circuit_breaker",
+    "BoundedHistory": ".bounded_history",
+    "MentionBatch": ".mention_batch",
+    "MentionRecord": ".mention_batch",
+    "MentionArchive": ".mention_archive",
+    "AuthorInfluenceCache": ".author_influence",
+    "CascadeDetector": ".cascades",
+    "FastLane": ".fast_lane",
+    "LoadShedder": ".load_shedding",
+    "MentionQueue": ".load_shedding",
+    "TextProcessingPool": ".text_processing"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
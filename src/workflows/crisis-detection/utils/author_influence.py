@@ -0,0 +1,272 @@
+"""
+Author influence cache - rolling per-author statistics across monitoring cycles
+"""
+
+import heapq
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+from .mention_batch import MentionBatch
+from .trending import TopK
+
+logger = logging.getLogger(__name__)
+
+
+def reach_influence(reach: int) -> float:
+    """Influence of a single mention from its author's reach alone"""
+    if reach > 100000:
+        return 1.0
+    elif reach > 10000:
+        return 0.8
+    elif reach > 1000:
+        return 0.6
+    elif reach > 100:
+        return 0.4
+    else:
+        return 0.2
+
+
+class AuthorStats:
+    """
+    Rolling statistics for one author
+
+    Weighted sums are forward-decayed (scaled by the cache's decay weight
+    at each mention's publish time), so ratios such as average sentiment
+    need no rescaling and decayed values are divided out on read.
+    """
+
+    __slots__ = (
+        "author", "source", "reach", "max_reach", "verified", "posts",
+        "first_seen", "last_seen", "crisis_count", "last_crisis",
+        "post_weight", "sentiment_weight", "reach_weight"
+    )
+
+    def __init__(self, author: str, timestamp: float):
+        self.author = author
+        self.source: Optional[str] = None
+        self.reach = 0
+        self.max_reach = 0
+        self.verified = False
+        self.posts = 0
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.crisis_count = 0
+        self.last_crisis: Optional[float] = None
+        self.post_weight = 0.0
+        self.sentiment_weight = 0.0
+        self.reach_weight = 0.0
+
+    @property
+    def avg_sentiment(self) -> float:
+        """Recency-weighted average sentiment"""
+        return self.sentiment_weight / self.post_weight if self.post_weight else 0.0
+
+    @property
+    def avg_reach(self) -> float:
+        """Recency-weighted average reach"""
+        return self.reach_weight / self.post_weight if self.post_weight else 0.0
+
+
+class AuthorInfluenceCache:
+    """
+    LRU-bounded table of authors seen in the mention stream
+
+    Every mention updates its author's entry in O(1): latest and peak
+    reach, verified flag, a decayed post count (posting rate), decayed
+    sentiment and reach sums, and crisis involvement recorded after
+    high-severity analyses. Influence scores are O(1) lookups. The most
+    impactful authors (decayed reach-weighted post volume) are kept in a
+    bounded top-k set, so top_authors(k) never scans the table. The least
+    recently seen author is evicted once ``max_authors`` is exceeded.
+    """
+
+    # Rescale weights once the forward-decay factor exceeds this
+    _RESCALE_THRESHOLD = 1e12
+
+    def __init__(
+        self,
+        max_authors: int = 100000,
+        top_k: int = 200,
+        half_life_seconds: float = 86400,
+        high_rate_per_hour: float = 5.0,
+        start_time: Optional[float] = None
+    ):
+        """
+        Initialize author influence cache
+
+        Args:
+            max_authors: Authors kept before the least recently seen is evicted
+            top_k: Candidates kept for top_authors queries
+            half_life_seconds: Half-life of posting rate, sentiment and reach averages
+            high_rate_per_hour: Posting rate that marks a high-volume account
+            start_time: Decay landmark (default: the first observed
+                publish time, so replayed archives work unchanged)
+        """
+        self.max_authors = max_authors
+        self.decay_rate = math.log(2) / half_life_seconds
+        self.high_rate_per_hour = high_rate_per_hour
+        self.landmark: Optional[float] = start_time
+        self.last_timestamp = start_time if start_time is not None else time.time()
+
+        self._authors: "OrderedDict[str, AuthorStats]" = OrderedDict()
+        self._top = TopK(top_k)
+        self.stats = {"observed": 0, "evicted": 0, "crisis_authors": 0}
+
+    def _weight(self, timestamp: float) -> float:
+        """Forward-decay weight of a mention published at timestamp"""
+        return math.exp(self.decay_rate * (timestamp - self.landmark))
+
+    def observe(
+        self,
+        author: Optional[str],
+        reach: int,
+        sentiment: float,
+        timestamp: float,
+        verified: bool = False,
+        source: Optional[str] = None
+    ) -> None:
+        """Update an author's statistics with one mention"""
+        if not author:
+            return
+
+        if self.landmark is None:
+            self.landmark = self.last_timestamp = timestamp
+        weight = self._weight(timestamp)
+        if weight > self._RESCALE_THRESHOLD:
+            self._rescale(timestamp)
+            weight = 1.0
+
+        stats = self._authors.get(author)
+        if stats is None:
+            stats = self._authors[author] = AuthorStats(author, timestamp)
+            if len(self._authors) > self.max_authors:
+                evicted, _ = self._authors.popitem(last=False)
+                self._top.discard(evicted)
+                self.stats["evicted"] += 1
+        else:
+            self._authors.move_to_end(author)
+
+        stats.reach = reach
+        if reach > stats.max_reach:
+            stats.max_reach = reach
+        if verified:
+            stats.verified = True
+        if source:
+            stats.source = source
+        stats.posts += 1
+        if timestamp > stats.last_seen:
+            stats.last_seen = timestamp
+        stats.post_weight += weight
+        stats.sentiment_weight += sentiment * weight
+        stats.reach_weight += reach * weight
+
+        self._top.offer(author, stats.reach_weight)
+        if timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+        self.stats["observed"] += 1
+
+    def observe_batch(self, mentions: MentionBatch) -> None:
+        """Update statistics with every mention of a batch"""
+        for author, reach, sentiment, timestamp, verified, source in zip(
+            mentions.author,
+            mentions.reach_count,
+            mentions.sentiment_score,
+            mentions.published_ts,
+            mentions.author_verified,
+            mentions.source
+        ):
+            self.observe(author, reach, sentiment, timestamp, bool(verified), source)
+
+    def record_crisis(self, authors: Iterable[Optional[str]], timestamp: Optional[float] = None) -> None:
+        """Count a crisis for each (known) author who took part in it"""
+        timestamp = timestamp if timestamp is not None else self.last_timestamp
+        for author in set(authors):
+            stats = self._authors.get(author) if author else None
+            if stats is None:
+                continue
+            stats.crisis_count += 1
+            stats.last_crisis = timestamp
+            self.stats["crisis_authors"] += 1
+
+    def get(self, author: Optional[str]) -> Optional[AuthorStats]:
+        """Statistics for an author (does not affect LRU order)"""
+        return self._authors.get(author) if author else None
+
+    def posting_rate(self, stats: AuthorStats, timestamp: Optional[float] = None) -> float:
+        """Recency-weighted posts per hour as of timestamp (default: latest mention)"""
+        timestamp = timestamp if timestamp is not None else self.last_timestamp
+        # A decayed count covers an exponential window of mean length 1/decay_rate
+        return stats.post_weight / self._weight(timestamp) * self.decay_rate * 3600
+
+    def influence_score(self, author: Optional[str], reach: int = 0) -> float:
+        """
+        Influence of an author between 0.2 and 1.0
+
+        Starts from the reach bucket (the author's latest known reach if it
+        is larger than the mention's) and adds 0.1 for verified accounts,
+        0.1 per past crisis (up to 0.2) and 0.1 for high-volume posting.
+        Unknown authors score on reach alone.
+        """
+        stats = self.get(author)
+        if stats is None:
+            return reach_influence(reach)
+
+        score = reach_influence(max(reach, stats.reach))
+        if stats.verified:
+            score += 0.1
+        score += 0.1 * min(stats.crisis_count, 2)
+        if self.posting_rate(stats) >= self.high_rate_per_hour:
+            score += 0.1
+        return min(score, 1.0)
+
+    def describe(self, stats: AuthorStats) -> Dict[str, Any]:
+        """Author statistics as a dict, with decayed values as of the latest mention"""
+        return {
+            "author": stats.author,
+            "source": stats.source,
+            "reach": stats.reach,
+            "max_reach": stats.max_reach,
+            "avg_reach": stats.avg_reach,
+            "verified": stats.verified,
+            "posts": stats.posts,
+            "posts_per_hour": self.posting_rate(stats),
+            "avg_sentiment": stats.avg_sentiment,
+            "crisis_count": stats.crisis_count,
+            "influence": self.influence_score(stats.author),
+            "first_seen": stats.first_seen,
+            "last_seen": stats.last_seen
+        }
+
+    def top_authors(self, k: int = 10) -> List[Dict[str, Any]]:
+        """The k authors with the highest recent reach-weighted volume"""
+        top = heapq.nlargest(k, self._top.scores.items(), key=lambda item: item[1])
+        return [self.describe(self._authors[author]) for author, _ in top if author in self._authors]
+
+    def _rescale(self, timestamp: float) -> None:
+        """Move the landmark to timestamp and rescale every decayed sum"""
+        factor = 1.0 / self._weight(timestamp)
+        for stats in self._authors.values():
+            stats.post_weight *= factor
+            stats.sentiment_weight *= factor
+            stats.reach_weight *= factor
+        self._top.rescale(factor)
+        self.landmark = timestamp
+        logger.debug(f"Author influence cache rescaled by {factor:.3e}")
+
+    def __len__(self) -> int:
+        return len(self._authors)
+
+    def __contains__(self, author: str) -> bool:
+        return author in self._authors
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and counters"""
+        return {
+            **self.stats,
+            "authors": len(self._authors),
+            "max_authors": self.max_authors,
+            "top_candidates": len(self._top.scores)
+        }
@@ -0,0 +1,313 @@
+"""
+Bounded history - recent records in memory, older ones in compressed segments
+"""
+
+import gzip
+import json
+import math
+import os
+import re
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+_SEGMENT_NAME = re.compile(
+    r"^(?P<name>.+)-(?P<seq>\d{8})-(?P<first>-?\d+)-(?P<last>-?\d+)-(?P<count>\d+)\.jsonl\.gz$"
+)
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """Timestamp (datetime, ISO string or epoch seconds) as epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        # Enums
+        return value.value
+    return str(value)
+
+
+class _Aggregate:
+    """Running count, sum, min and max of one numeric field"""
+
+    __slots__ = ("count", "sum", "min", "max")
+
+    def __init__(self, count: int = 0, total: float = 0.0, low: Optional[float] = None, high: Optional[float] = None):
+        self.count = count
+        self.sum = total
+        self.min = low
+        self.max = high
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "min": self.min,
+            "max": self.max
+        }
+
+
+class BoundedHistory:
+    """
+    Append-only record history with flat memory use
+
+    The newest ``max_records`` records live in an in-memory ring. Older
+    records are spilled to gzip-compressed JSON-lines segment files of
+    ``segment_records`` each under ``spill_dir`` (or dropped without one);
+    segment file names carry their first and last timestamps, so range
+    queries only open segments that overlap. Running aggregates of the
+    ``aggregate_fields`` cover every record ever appended and are kept
+    with the segments, so averages never rescan the history.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_records: int = 1000,
+        spill_dir: Optional[str] = None,
+        segment_records: int = 5000,
+        max_segments: Optional[int] = None,
+        aggregate_fields: Iterable[str] = (),
+        timestamp_field: str = "timestamp"
+    ):
+        """
+        Initialize bounded history
+
+        Args:
+            name: History name, used as the segment file prefix
+            max_records: Records kept in memory
+            spill_dir: Directory for segment files (None: evicted records are dropped)
+            segment_records: Evicted records per segment file
+            max_segments: Oldest segments beyond this are deleted (None: keep all)
+            aggregate_fields: Numeric fields with running aggregates
+            timestamp_field: Record field used for time-range queries
+        """
+        self.name = re.sub(r"[^A-Za-z0-9_.]+", "_", name)
+        self.max_records = max_records
+        self.spill_dir = spill_dir
+        self.segment_records = segment_records
+        self.max_segments = max_segments
+        self.timestamp_field = timestamp_field
+
+        self._records: Deque[Dict[str, Any]] = deque()
+        self._spill: List[Dict[str, Any]] = []
+        self._segments: List[Dict[str, Any]] = []
+        self._next_segment = 0
+        self._aggregates: Dict[str, _Aggregate] = {field: _Aggregate() for field in aggregate_fields}
+        self.total_count = 0
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._load()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add a record, spilling the oldest in-memory record if the ring is full"""
+        self._records.append(record)
+        self.total_count += 1
+
+        for field, aggregate in self._aggregates.items():
+            value = record.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                aggregate.add(value)
+
+        if len(self._records) > self.max_records:
+            evicted = self._records.popleft()
+            if self.spill_dir:
+                self._spill.append(evicted)
+                if len(self._spill) >= self.segment_records:
+                    self._write_segment()
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        """Records held in memory"""
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """In-memory records, oldest first"""
+        return iter(self._records)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return self._records[index]
+
+    def recent(self, n: int) -> List[Dict[str, Any]]:
+        """The n newest records, oldest first"""
+        if n <= 0:
+            return []
+        start = max(0, len(self._records) - n)
+        return [self._records[i] for i in range(start, len(self._records))]
+
+    def aggregate(self, field: str) -> Dict[str, Any]:
+        """Running count/sum/mean/min/max of an aggregate field over all records"""
+        return self._aggregates[field].to_dict()
+
+    def mean(self, field: str, default: float = 0.0) -> float:
+        """Running mean of an aggregate field over all records"""
+        aggregate = self._aggregates[field]
+        return aggregate.sum / aggregate.count if aggregate.count else default
+
+    def query(
+        self,
+        start: Any = None,
+        end: Any = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Records with start <= timestamp <= end, oldest first
+
+        Spilled records are read back from the segments that overlap the
+        range; records without a usable timestamp only match open ranges.
+        """
+        start_epoch = _to_epoch(start)
+        end_epoch = _to_epoch(end)
+
+        def matches(record: Dict[str, Any]) -> bool:
+            if start_epoch is None and end_epoch is None:
+                return True
+            ts = _to_epoch(record.get(self.timestamp_field))
+            if ts is None:
+                return False
+            return (start_epoch is None or ts >= start_epoch) and (end_epoch is None or ts <= end_epoch)
+
+        results = []
+        for segment in self._segments:
+            if start_epoch is not None and segment["last"] < start_epoch:
+                continue
+            if end_epoch is not None and segment["first"] > end_epoch:
+                continue
+            results.extend(r for r in self._read_segment(segment["path"]) if matches(r))
+
+        results.extend(r for r in self._spill if matches(r))
+        results.extend(r for r in self._records if matches(r))
+        return results
+
+    def flush(self) -> None:
+        """Write spilled records that have not filled a segment yet"""
+        if self._spill:
+            self._write_segment()
+        elif self.spill_dir and self.total_count:
+            self._save_aggregates()
+
+    def close(self) -> None:
+        """Spill every record, including the in-memory ring (e.g. on shutdown)"""
+        if not self.spill_dir:
+            return
+        self._spill.extend(self._records)
+        self._records.clear()
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """History size and aggregates"""
+        return {
+            "total_records": self.total_count,
+            "in_memory": len(self._records),
+            "pending_spill": len(self._spill),
+            "segments": len(self._segments),
+            "spilled_records": sum(segment["count"] for segment in self._segments),
+            "aggregates": {field: a.to_dict() for field, a in self._aggregates.items()}
+        }
+
+    def _write_segment(self) -> None:
+        """Compress pending spilled records into a new segment file"""
+        records, self._spill = self._spill, []
+        epochs = [ts for ts in (_to_epoch(r.get(self.timestamp_field)) for r in records) if ts is not None]
+        first = math.floor(min(epochs)) if epochs else 0
+        last = math.ceil(max(epochs)) if epochs else 0
+
+        path = os.path.join(
+            self.spill_dir,
+            f"{self.name}-{self._next_segment:08d}-{first}-{last}-{len(records)}.jsonl.gz"
+        )
+        self._next_segment += 1
+
+        # Segments are small and written once per segment_records appends,
+        # so writing inline keeps ordering simple
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=_json_default))
+                f.write("\n")
+
+        self._segments.append({"path": path, "first": first, "last": last, "count": len(records)})
+        if self.max_segments is not None:
+            while len(self._segments) > self.max_segments:
+                os.remove(self._segments.pop(0)["path"])
+
+        self._save_aggregates()
+
+    def _read_segment(self, path: str) -> Iterator[Dict[str, Any]]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+        except (OSError, ValueError) as e:
+            logger.error(f"Unreadable history segment {path}: {e}")
+
+    def _aggregates_path(self) -> str:
+        return os.path.join(self.spill_dir, f"{self.name}.aggregates.json")
+
+    def _save_aggregates(self) -> None:
+        """Persist running aggregates next to the segments"""
+        state = {
+            "total_count": self.total_count,
+            "aggregates": {
+                field: [a.count, a.sum, a.min, a.max]
+                for field, a in self._aggregates.items()
+            }
+        }
+        tmp_path = self._aggregates_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._aggregates_path())
+
+    def _load(self) -> None:
+        """Index existing segments and restore aggregates after a restart"""
+        for filename in sorted(os.listdir(self.spill_dir)):
+            match = _SEGMENT_NAME.match(filename)
+            if not match or match.group("name") != self.name:
+                continue
+            self._segments.append({
+                "path": os.path.join(self.spill_dir, filename),
+                "first": int(match.group("first")),
+                "last": int(match.group("last")),
+                "count": int(match.group("count"))
+            })
+            self._next_segment = int(match.group("seq")) + 1
+
+        if not os.path.exists(self._aggregates_path()):
+            return
+        try:
+            with open(self._aggregates_path()) as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not restore {self.name} history aggregates: {e}")
+            return
+
+        # Aggregates are as of the last segment write, flush or close
+        self.total_count = state.get("total_count", 0)
+        for field, (count, total, low, high) in state.get("aggregates", {}).items():
+            if field in self._aggregates:
+                self._aggregates[field] = _Aggregate(count, total, low, high)
@@ -0,0 +1,463 @@
+"""
+Amplification cascade detection - streaming clustering of linked mentions
+"""
+
+import heapq
+import math
+import time
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+import logging
+
+from .mention_batch import MentionBatch
+from .text_processing import content_signature, extract_urls, normalize_url
+from .trending import TopK
+
+logger = logging.getLogger(__name__)
+
+
+# How a mention joined its cascade
+LINK_TYPES = ("url", "reply", "content")
+
+
+class _Cascade:
+    """Aggregates for one cluster of linked mentions (held by its root)"""
+
+    __slots__ = (
+        "size", "authors", "first_author", "reach", "negative_reach", "sentiment_sum",
+        "first_seen", "last_seen", "growth_weight", "baseline_weight", "links",
+        "seed_id", "seed_author", "seed_content", "seed_url"
+    )
+
+    def __init__(self, timestamp: float):
+        self.size = 0
+        # Distinct authors are only tracked once a second mention joins
+        self.authors: Optional[Set[str]] = None
+        self.first_author: Optional[str] = None
+        self.reach = 0
+        self.negative_reach = 0
+        self.sentiment_sum = 0.0
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.growth_weight = 0.0
+        self.baseline_weight = 0.0
+        self.links = [0, 0, 0]
+        self.seed_id = ""
+        self.seed_author: Optional[str] = None
+        self.seed_content = ""
+        self.seed_url: Optional[str] = None
+
+    @property
+    def author_count(self) -> int:
+        if self.authors is not None:
+            return len(self.authors)
+        return 1 if self.first_author else 0
+
+
+class CascadeDetector:
+    """
+    Clusters the mention stream into amplification cascades
+
+    Mentions are linked when they share a URL (linked or the post's own
+    permalink), when one quotes, reposts or replies to another (parent and
+    own ids), or when their wording is near-identical (content signature
+    band keys). Every link key maps to a cluster in an incremental
+    union-find (path halving, union by size), so a mention costs a few
+    dict lookups. Each root holds the cascade's size, distinct authors,
+    reach, negative reach and forward-decayed growth weights over a short
+    and a baseline half-life; the fastest growing cascades are kept in a
+    bounded top-k set. A cascade counts as coordinated when many distinct
+    authors push it at a sustained rate that is also a burst against its
+    own baseline, which separates a sudden campaign from a link that is
+    steadily popular.
+
+    Memory is bounded by ``max_keys``: keys live in two generations that
+    rotate every half horizon (or when the current one fills), so a key
+    unused for a full horizon is forgotten, and clusters with no remaining
+    keys are dropped at rotation.
+    """
+
+    # Rescale growth weights once the forward-decay factor exceeds this
+    _RESCALE_THRESHOLD = 1e12
+
+    def __init__(
+        self,
+        horizon_seconds: float = 7200,
+        max_keys: int = 500000,
+        growth_half_life_seconds: float = 600,
+        baseline_half_life_seconds: float = 7200,
+        max_tracked_authors: int = 1000,
+        top_k: int = 100,
+        coordinated_min_size: int = 10,
+        coordinated_min_authors: int = 8,
+        coordinated_min_growth_per_minute: float = 1.0,
+        coordinated_min_burst: float = 2.0,
+        start_time: Optional[float] = None
+    ):
+        """
+        Initialize cascade detector
+
+        Args:
+            horizon_seconds: How long an unused link key can still join a cascade
+            max_keys: Link keys kept in memory (rotates generations early)
+            growth_half_life_seconds: Half-life of the growth rate
+            baseline_half_life_seconds: Half-life of the baseline rate bursts are measured against
+            max_tracked_authors: Distinct authors counted exactly per cascade
+            top_k: Fastest-growing cascades kept for top_cascades queries
+            coordinated_min_size: Mentions before a cascade can count as coordinated
+            coordinated_min_authors: Distinct authors a coordinated cascade needs
+            coordinated_min_growth_per_minute: Sustained growth a coordinated cascade needs
+            coordinated_min_burst: Growth to baseline rate ratio a coordinated cascade needs
+            start_time: Decay landmark (default: the first observed publish time)
+        """
+        self.horizon_seconds = horizon_seconds
+        self.max_keys = max_keys
+        self.decay_rate = math.log(2) / growth_half_life_seconds
+        self.baseline_decay_rate = math.log(2) / baseline_half_life_seconds
+        self.max_tracked_authors = max_tracked_authors
+        self.coordinated_min_size = coordinated_min_size
+        self.coordinated_min_authors = coordinated_min_authors
+        self.coordinated_min_growth_per_minute = coordinated_min_growth_per_minute
+        self.coordinated_min_burst = coordinated_min_burst
+        self.landmark: Optional[float] = start_time
+        self.last_timestamp = start_time if start_time is not None else time.time()
+        self._rotated_at: Optional[float] = start_time
+
+        self._keys: Dict[Hashable, int] = {}
+        self._previous_keys: Dict[Hashable, int] = {}
+        self._parent: Dict[int, int] = {}
+        self._cascades: Dict[int, _Cascade] = {}
+        self._next_id = 0
+        self._top = TopK(top_k)
+        self.stats = {
+            "observed": 0,
+            "linked": 0,
+            "merges": 0,
+            "rotations": 0,
+            "expired_cascades": 0
+        }
+
+    def _weight(self, timestamp: float) -> float:
+        """Forward-decay weight of a mention published at timestamp"""
+        return math.exp(self.decay_rate * (timestamp - self.landmark))
+
+    def _baseline_weight(self, timestamp: float) -> float:
+        """Baseline forward-decay weight of a mention published at timestamp"""
+        return math.exp(self.baseline_decay_rate * (timestamp - self.landmark))
+
+    def _find(self, cluster: int) -> int:
+        """Root of a cluster, halving the path on the way"""
+        parent = self._parent
+        while True:
+            up = parent[cluster]
+            if up == cluster:
+                return cluster
+            grand = parent[up]
+            parent[cluster] = grand
+            cluster = grand
+
+    def _union(self, a: int, b: int) -> int:
+        """Merge two root clusters and return the surviving root"""
+        first, second = self._cascades[a], self._cascades[b]
+        if first.size < second.size:
+            a, b, first, second = b, a, second, first
+        self._parent[b] = a
+        del self._cascades[b]
+        self._top.discard(b)
+
+        first.size += second.size
+        if first.authors is None:
+            first.authors = {first.first_author} if first.first_author else set()
+        if len(first.authors) < self.max_tracked_authors:
+            if second.authors is not None:
+                first.authors.update(second.authors)
+            elif second.first_author:
+                first.authors.add(second.first_author)
+        first.reach += second.reach
+        first.negative_reach += second.negative_reach
+        first.sentiment_sum += second.sentiment_sum
+        first.growth_weight += second.growth_weight
+        first.baseline_weight += second.baseline_weight
+        for i, count in enumerate(second.links):
+            first.links[i] += count
+        # The earliest mention seeds the merged cascade
+        if second.first_seen < first.first_seen:
+            first.first_seen = second.first_seen
+            first.seed_id = second.seed_id
+            first.seed_author = second.seed_author
+            first.seed_content = second.seed_content
+            first.seed_url = second.seed_url
+        if second.last_seen > first.last_seen:
+            first.last_seen = second.last_seen
+
+        self.stats["merges"] += 1
+        return a
+
+    def observe(
+        self,
+        mention_id: str,
+        content: str,
+        author: Optional[str],
+        reach: int,
+        sentiment: float,
+        timestamp: float,
+        url: Optional[str] = None,
+        parent_id: Optional[str] = None,
+        signature: Optional[Sequence[int]] = None
+    ) -> int:
+        """
+        Link one mention into its cascade
+
+        Args:
+            signature: Precomputed content_signature (computed here if None)
+
+        Returns:
+            Size of the mention's cascade after the update
+        """
+        if self.landmark is None:
+            self.landmark = self.last_timestamp = timestamp
+        if self._rotated_at is None:
+            self._rotated_at = timestamp
+        weight = self._weight(timestamp)
+        if weight > self._RESCALE_THRESHOLD:
+            self._rescale(timestamp)
+            weight = 1.0
+
+        # (key, link type) pairs; own id and permalink only receive links
+        keys: List[Tuple[Hashable, int]] = [(("i", mention_id), -1)]
+        if url:
+            keys.append((("u", normalize_url(url)), -1))
+        if parent_id:
+            keys.append((("i", parent_id), 1))
+        for linked in extract_urls(content):
+            keys.append((("u", linked), 0))
+        if signature is None:
+            signature = content_signature(content)
+        for band_key in signature:
+            keys.append((band_key, 2))
+
+        roots: List[int] = []
+        link_type = -1
+        current, previous, parent = self._keys, self._previous_keys, self._parent
+        for key, kind in keys:
+            cluster = current.get(key)
+            if cluster is None:
+                # Keys from the previous generation move to the current one
+                cluster = previous.pop(key, None) if previous else None
+                if cluster is None:
+                    continue
+                current[key] = cluster
+            root = cluster if parent[cluster] == cluster else self._find(cluster)
+            if root not in roots:
+                roots.append(root)
+            # The strongest link (URL, then reply, then wording) is recorded
+            if link_type < 0 or 0 <= kind < link_type:
+                link_type = kind
+
+        if roots:
+            root = roots[0]
+            for other in roots[1:]:
+                root = self._union(root, other)
+            cascade = self._cascades[root]
+            self.stats["linked"] += 1
+        else:
+            root = self._next_id
+            self._next_id += 1
+            self._parent[root] = root
+            cascade = self._cascades[root] = _Cascade(timestamp)
+            cascade.seed_id = mention_id
+            cascade.seed_author = author
+            cascade.seed_content = content[:200]
+            cascade.seed_url = url
+
+        cascade.size += 1
+        if author:
+            if cascade.authors is None:
+                if cascade.first_author is None:
+                    cascade.first_author = author
+                elif author != cascade.first_author:
+                    cascade.authors = {cascade.first_author, author}
+            elif len(cascade.authors) < self.max_tracked_authors:
+                cascade.authors.add(author)
+        cascade.reach += reach
+        if sentiment < -0.3:
+            cascade.negative_reach += reach
+        cascade.sentiment_sum += sentiment
+        cascade.growth_weight += weight
+        cascade.baseline_weight += self._baseline_weight(timestamp)
+        if link_type >= 0:
+            cascade.links[link_type] += 1
+        if timestamp < cascade.first_seen:
+            cascade.first_seen = timestamp
+        if timestamp > cascade.last_seen:
+            cascade.last_seen = timestamp
+
+        for key, _ in keys:
+            current[key] = root
+        if cascade.size > 1:
+            self._top.offer(root, cascade.growth_weight)
+
+        if timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+        self.stats["observed"] += 1
+        if (
+            len(self._keys) > self.max_keys // 2
+            or timestamp - self._rotated_at > self.horizon_seconds / 2
+        ):
+            self._rotate(timestamp)
+        return cascade.size
+
+    def observe_batch(
+        self,
+        mentions: MentionBatch,
+        signatures: Optional[Sequence[Sequence[int]]] = None
+    ) -> None:
+        """
+        Link every mention of a batch
+
+        Args:
+            signatures: Content signatures aligned with the batch (e.g. from
+                TextProcessingPool.content_signatures); computed inline if None
+        """
+        if signatures is None:
+            signatures = [content_signature(content) for content in mentions.content]
+        for mention_id, content, author, reach, sentiment, timestamp, url, parent_id, signature in zip(
+            mentions.mention_id,
+            mentions.content,
+            mentions.author,
+            mentions.reach_count,
+            mentions.sentiment_score,
+            mentions.published_ts,
+            mentions.url,
+            mentions.parent_id,
+            signatures
+        ):
+            self.observe(mention_id, content, author, reach, sentiment, timestamp, url, parent_id, signature)
+
+    def growth_per_minute(self, cascade: _Cascade, timestamp: Optional[float] = None) -> float:
+        """Recency-weighted mentions per minute as of timestamp (default: latest mention)"""
+        timestamp = timestamp if timestamp is not None else self.last_timestamp
+        return cascade.growth_weight / self._weight(timestamp) * self.decay_rate * 60
+
+    def baseline_per_minute(self, cascade: _Cascade, timestamp: Optional[float] = None) -> float:
+        """Mentions per minute over the baseline half-life"""
+        timestamp = timestamp if timestamp is not None else self.last_timestamp
+        return cascade.baseline_weight / self._baseline_weight(timestamp) * self.baseline_decay_rate * 60
+
+    def burst(self, cascade: _Cascade, timestamp: Optional[float] = None) -> float:
+        """
+        Growth rate relative to the cascade's baseline rate
+
+        About 1 for a cascade growing steadily; up to the ratio of the
+        half-lives for a cascade that only just appeared.
+        """
+        baseline = self.baseline_per_minute(cascade, timestamp)
+        return self.growth_per_minute(cascade, timestamp) / baseline if baseline else 0.0
+
+    def is_coordinated(self, cascade: _Cascade, timestamp: Optional[float] = None) -> bool:
+        """
+        Whether a cascade looks like coordinated amplification
+
+        Many distinct accounts pushing the same seed (URL, post or
+        wording) at a sustained rate well above the cascade's baseline.
+        """
+        return (
+            cascade.size >= self.coordinated_min_size
+            and cascade.author_count >= self.coordinated_min_authors
+            and self.growth_per_minute(cascade, timestamp) >= self.coordinated_min_growth_per_minute
+            and self.burst(cascade, timestamp) >= self.coordinated_min_burst
+        )
+
+    def describe(self, cascade: _Cascade, timestamp: Optional[float] = None) -> Dict[str, Any]:
+        """Cascade aggregates as a dict"""
+        return {
+            "seed_id": cascade.seed_id,
+            "seed_author": cascade.seed_author,
+            "seed_content": cascade.seed_content,
+            "seed_url": cascade.seed_url,
+            "size": cascade.size,
+            "authors": cascade.author_count,
+            "reach": cascade.reach,
+            "negative_reach": cascade.negative_reach,
+            "avg_sentiment": cascade.sentiment_sum / cascade.size if cascade.size else 0.0,
+            "growth_per_minute": self.growth_per_minute(cascade, timestamp),
+            "burst": self.burst(cascade, timestamp),
+            "links": dict(zip(LINK_TYPES, cascade.links)),
+            "coordinated": self.is_coordinated(cascade, timestamp),
+            "first_seen": cascade.first_seen,
+            "last_seen": cascade.last_seen
+        }
+
+    def top_cascades(
+        self,
+        limit: int = 5,
+        min_size: int = 3,
+        timestamp: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Fastest-growing cascades with at least min_size mentions"""
+        candidates = heapq.nlargest(limit * 4, self._top.scores.items(), key=lambda item: item[1])
+        results = []
+        for root, _ in candidates:
+            cascade = self._cascades.get(root)
+            if cascade is not None and cascade.size >= min_size:
+                results.append(self.describe(cascade, timestamp))
+                if len(results) == limit:
+                    break
+        return results
+
+    def coordinated_cascades(self, timestamp: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Cascades that look like coordinated amplification, fastest growing first"""
+        results = []
+        for root, _ in sorted(self._top.scores.items(), key=lambda item: item[1], reverse=True):
+            cascade = self._cascades.get(root)
+            if cascade is not None and self.is_coordinated(cascade, timestamp):
+                results.append(self.describe(cascade, timestamp))
+        return results
+
+    def _rotate(self, timestamp: float) -> None:
+        """Start a new key generation and drop clusters no key points to"""
+        expired = len(self._previous_keys)
+        self._previous_keys = self._keys
+        self._keys = {}
+        self._rotated_at = timestamp
+
+        # Point surviving keys straight at their roots, so the forest
+        # collapses to the live roots
+        find = self._find
+        live: Set[int] = set()
+        for key, cluster in self._previous_keys.items():
+            root = find(cluster)
+            self._previous_keys[key] = root
+            live.add(root)
+        self._parent = {root: root for root in live}
+
+        dropped = [root for root in self._cascades if root not in live]
+        for root in dropped:
+            del self._cascades[root]
+            self._top.discard(root)
+
+        self.stats["rotations"] += 1
+        self.stats["expired_cascades"] += len(dropped)
+        logger.debug(f"Cascade keys rotated: {expired} expired, {len(dropped)} cascades dropped")
+
+    def _rescale(self, timestamp: float) -> None:
+        """Move the landmark to timestamp and rescale every growth weight"""
+        factor = 1.0 / self._weight(timestamp)
+        baseline_factor = 1.0 / self._baseline_weight(timestamp)
+        for cascade in self._cascades.values():
+            cascade.growth_weight *= factor
+            cascade.baseline_weight *= baseline_factor
+        self._top.rescale(factor)
+        self.landmark = timestamp
+        logger.debug(f"Cascade growth weights rescaled by {factor:.3e}")
+
+    def __len__(self) -> int:
+        return len(self._cascades)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cluster and key counts"""
+        return {
+            **self.stats,
+            "cascades": len(self._cascades),
+            "keys": len(self._keys) + len(self._previous_keys),
+            "max_keys": self.max_keys
+        }
@@ -0,0 +1,215 @@
+"""
+Circuit breaker for external delivery providers
+"""
+
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreakerOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+    def __init__(self, name: str, next_retry_time: float):
+        self.name = name
+        self.next_retry_time = next_retry_time
+        super().__init__(
+            f"Circuit breaker for {name} is open; retry after "
+            f"{max(0.0, next_retry_time - time.time()):.0f}s"
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with CLOSED, OPEN and HALF_OPEN states
+
+    Opens after ``failure_threshold`` counted failures within the
+    monitoring period, rejects calls until ``reset_timeout_seconds`` has
+    passed, then half-opens: at most ``half_open_requests`` probe calls
+    are let through at a time, that many successes close it again and any
+    failure reopens it. Only failures whose type is in
+    ``failure_types`` count (all failures if None), so bad recipient data
+    does not trip a healthy provider.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 60,
+        half_open_requests: int = 3,
+        monitoring_period_seconds: float = 300,
+        failure_types: Optional[Iterable[str]] = None
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            name: Protected service or channel name
+            failure_threshold: Failures in the monitoring period that open the circuit
+            reset_timeout_seconds: Time the circuit stays open before half-opening
+            half_open_requests: Successful probes needed to close the circuit
+            monitoring_period_seconds: Window for counting failures
+            failure_types: Failure types that count (default: all)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.half_open_requests = half_open_requests
+        self.monitoring_period_seconds = monitoring_period_seconds
+        self.failure_types = set(failure_types) if failure_types is not None else None
+
+        self.status = self.CLOSED
+        self.failures = 0
+        self.last_failure_time: Optional[float] = None
+        self.next_retry_time: Optional[float] = None
+
+        self._success_count = 0
+        self._failure_timestamps: Deque[float] = deque()
+        self._half_open_tests = 0
+        self._probes_in_flight = 0
+        self._failure_details: Dict[str, int] = {}
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go through (half-opens after the reset timeout)
+
+        A call allowed while half-open takes a probe slot, released when
+        its success or failure is recorded.
+        """
+        if self.status == self.OPEN:
+            if time.time() < self.next_retry_time:
+                return False
+            self._transition_to_half_open()
+
+        if self.status == self.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_requests:
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def is_open(self) -> bool:
+        """True while calls are being rejected (does not change state)"""
+        if self.status == self.OPEN:
+            return time.time() < self.next_retry_time
+        return self.status == self.HALF_OPEN and self._probes_in_flight >= self.half_open_requests
+
+    async def execute(self, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """Run an operation with circuit breaker protection"""
+        if not self.allow_request():
+            raise CircuitBreakerOpenError(self.name, self.next_retry_time)
+
+        try:
+            result = await operation()
+        except Exception as e:
+            self.record_failure(getattr(e, "status", None) or type(e).__name__)
+            raise
+
+        self.record_success()
+        return result
+
+    def record_success(self) -> None:
+        """Record a successful call"""
+        self._success_count += 1
+
+        if self.status == self.HALF_OPEN:
+            self._release_probe()
+            self._half_open_tests += 1
+            if self._half_open_tests >= self.half_open_requests:
+                # Enough successful probes, close the circuit
+                self._transition_to_closed()
+        elif self.status == self.CLOSED:
+            self.failures = 0
+            self._clean_old_failures()
+
+    def record_failure(self, failure_type: str = "UNKNOWN") -> None:
+        """Record a failed call of the given type"""
+        now = time.time()
+        self.last_failure_time = now
+        if self.status == self.HALF_OPEN:
+            self._release_probe()
+
+        if self.failure_types is not None and failure_type not in self.failure_types:
+            # Not a provider failure (e.g. invalid recipient data)
+            return
+
+        self._failure_details[failure_type] = self._failure_details.get(failure_type, 0) + 1
+        self._failure_timestamps.append(now)
+
+        if self.status == self.HALF_OPEN:
+            # A failed probe reopens the circuit immediately
+            self._transition_to_open()
+        elif self.status == self.CLOSED:
+            self._clean_old_failures()
+            self.failures = len(self._failure_timestamps)
+            if self.failures >= self.failure_threshold:
+                self._transition_to_open()
+
+    def reset(self) -> None:
+        """Force the circuit closed and clear its history"""
+        self.status = self.CLOSED
+        self.failures = 0
+        self.last_failure_time = None
+        self.next_retry_time = None
+        self._success_count = 0
+        self._failure_timestamps.clear()
+        self._half_open_tests = 0
+        self._probes_in_flight = 0
+        self._failure_details.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get circuit breaker metrics"""
+        total = self._success_count + self.failures
+        return {
+            "state": self.status,
+            "failures": self.failures,
+            "success_rate": round(self._success_count / total * 100) if total else 100,
+            "last_failure": self.last_failure_time,
+            "next_retry": self.next_retry_time,
+            "failure_breakdown": dict(self._failure_details)
+        }
+
+    def _transition_to_open(self) -> None:
+        self.status = self.OPEN
+        self.next_retry_time = time.time() + self.reset_timeout_seconds
+        self._half_open_tests = 0
+        self._probes_in_flight = 0
+        logger.warning(
+            f"Circuit breaker for {self.name} opened due to excessive failures: "
+            f"{self._failure_details}"
+        )
+
+    def _transition_to_half_open(self) -> None:
+        self.status = self.HALF_OPEN
+        self._half_open_tests = 0
+        self._probes_in_flight = 0
+        logger.info(f"Circuit breaker for {self.name} transitioning to half-open")
+
+    def _transition_to_closed(self) -> None:
+        self.status = self.CLOSED
+        self.failures = 0
+        self.next_retry_time = None
+        self._failure_timestamps.clear()
+        self._half_open_tests = 0
+        self._probes_in_flight = 0
+        self._failure_details.clear()
+        logger.info(f"Circuit breaker for {self.name} closed")
+
+    def _release_probe(self) -> None:
+        # A call allowed before the circuit half-opened holds no slot
+        self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _clean_old_failures(self) -> None:
+        cutoff = time.time() - self.monitoring_period_seconds
+        while self._failure_timestamps and self._failure_timestamps[0] <= cutoff:
+            self._failure_timestamps.popleft()
+
+        if not self._failure_timestamps:
+            self._failure_details.clear()
@@ -0,0 +1,197 @@
+"""
+Fast lane - immediate templated alerts for high-reach negative mentions
+"""
+
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+import logging
+
+from ..agents.crisis_detection import CrisisAnalysis
+from .latency_sketch import LatencySketch
+from .mention_batch import MentionBatch
+
+logger = logging.getLogger(__name__)
+
+# Threat type for fast-lane mentions that match no crisis pattern
+DEFAULT_THREAT_TYPE = "high_reach_negative"
+
+
+class FastLane:
+    """
+    Picks out mentions too damaging to wait for the next analysis cycle
+
+    A mention qualifies when its sentiment is at or below ``max_sentiment``
+    and either its reach is at least ``min_reach``, or its reach is at
+    least ``elevated_reach`` and its author is verified or its text hits a
+    crisis pattern's indicators. With monitor keywords set, its text must
+    also contain one (the cycle's relevance filter, so off-topic mentions
+    never reach the fast lane). Qualifying mentions are grouped by threat
+    type (the matched pattern), each group gets a rule-based analysis with
+    no LLM call, and every mention is only selected once. The full
+    pipeline follows up with the detailed analysis.
+    """
+
+    def __init__(
+        self,
+        min_reach: int = 1000000,
+        elevated_reach: int = 100000,
+        max_sentiment: float = -0.5,
+        patterns: Optional[Iterable[Dict]] = None,
+        seen_size: int = 10000,
+        keywords: Optional[Iterable[str]] = None
+    ):
+        """
+        Initialize fast lane
+
+        Args:
+            min_reach: Negative mentions with at least this reach always qualify
+            elevated_reach: Minimum reach for verified authors and pattern hits
+            max_sentiment: Mentions must be at least this negative
+            patterns: Crisis patterns ({"type", "indicators", "typical_severity"})
+            seen_size: Mention IDs remembered to avoid alerting twice
+            keywords: Monitor keywords a mention must contain (None: no filter)
+        """
+        self.min_reach = min_reach
+        self.elevated_reach = elevated_reach
+        self.max_sentiment = max_sentiment
+        self.seen_size = seen_size
+        self._seen: "OrderedDict[str, str]" = OrderedDict()
+        self._patterns: List[Tuple[Dict, Pattern]] = []
+        self.set_patterns(patterns or [])
+        self._keywords: Tuple[str, ...] = ()
+        self.set_keywords(keywords or ())
+
+        self.latency = LatencySketch()
+        self.stats = {"selected": 0, "alerts": 0, "errors": 0}
+
+    def set_patterns(self, patterns: Iterable[Dict]) -> None:
+        """Replace the crisis patterns (one indicator regex per pattern)"""
+        self._patterns = [
+            (
+                pattern,
+                re.compile(
+                    r"\b(?:" + "|".join(re.escape(i.lower()) for i in pattern["indicators"]) + r")\b"
+                )
+            )
+            for pattern in patterns
+            if pattern.get("indicators")
+        ]
+
+    def set_keywords(self, keywords: Iterable[str]) -> None:
+        """Replace the monitor keywords (case-insensitive substrings; empty: no filter)"""
+        self._keywords = tuple(keyword.lower() for keyword in keywords)
+
+    def is_relevant(self, content: str) -> bool:
+        """Whether content contains a monitor keyword (always, without keywords)"""
+        if not self._keywords:
+            return True
+        text = content.lower()
+        return any(keyword in text for keyword in self._keywords)
+
+    def match_pattern(self, content: str) -> Optional[Tuple[Dict, List[str]]]:
+        """First crisis pattern whose indicators appear in content, with the indicators hit"""
+        text = content.lower()
+        for pattern, regex in self._patterns:
+            hits = regex.findall(text)
+            if hits:
+                return pattern, sorted(set(hits))
+        return None
+
+    def select(self, mentions: MentionBatch) -> Dict[str, List[int]]:
+        """
+        Qualifying mentions not selected before, grouped by threat type
+
+        Returns:
+            Threat type -> indices into mentions
+        """
+        groups: Dict[str, List[int]] = {}
+        elevated_reach, min_reach = self.elevated_reach, self.min_reach
+        max_sentiment = self.max_sentiment
+
+        for i, (reach, sentiment) in enumerate(zip(mentions.reach_count, mentions.sentiment_score)):
+            # Cheap column checks first; text is only scanned for the few left
+            if reach < elevated_reach or sentiment > max_sentiment:
+                continue
+            mention_id = mentions.mention_id[i]
+            if mention_id in self._seen or not self.is_relevant(mentions.content[i]):
+                continue
+
+            match = self.match_pattern(mentions.content[i])
+            if reach < min_reach and match is None and not mentions.author_verified[i]:
+                continue
+
+            threat_type = match[0]["type"] if match else DEFAULT_THREAT_TYPE
+            groups.setdefault(threat_type, []).append(i)
+            self._seen[mention_id] = threat_type
+            if len(self._seen) > self.seen_size:
+                self._seen.popitem(last=False)
+
+        self.stats["selected"] += sum(len(indices) for indices in groups.values())
+        return groups
+
+    def selected_ids(self, mention_ids: Iterable[str]) -> List[str]:
+        """Which of these mentions went through the fast lane (each ID once)"""
+        return [mention_id for mention_id in dict.fromkeys(mention_ids) if mention_id in self._seen]
+
+    def analyze(self, mentions: MentionBatch, threat_type: str) -> CrisisAnalysis:
+        """
+        Rule-based provisional analysis of one fast-lane group
+
+        Severity starts from the matched pattern's typical severity (6
+        without one) and goes up a point each for reach of min_reach or
+        more, a verified author and sentiment of -0.8 or below.
+        """
+        pattern = None
+        indicators: set = set()
+        for content in mentions.content:
+            match = self.match_pattern(content)
+            if match and match[0]["type"] == threat_type:
+                pattern = match[0]
+                indicators.update(match[1])
+
+        top_reach = max(mentions.reach_count)
+        lowest_sentiment = min(mentions.sentiment_score)
+        verified = any(mentions.author_verified)
+
+        severity = pattern.get("typical_severity", 6) if pattern else 6
+        severity += (top_reach >= self.min_reach) + verified + (lowest_sentiment <= -0.8)
+        severity = max(1, min(10, severity))
+
+        top = mentions.top_by_reach(1)[0]
+        signals = [f"reach {top_reach:,}", f"sentiment {lowest_sentiment:.2f}"]
+        if verified:
+            signals.append("verified author")
+        if indicators:
+            signals.append(f"matched {', '.join(sorted(indicators))}")
+
+        return CrisisAnalysis(
+            severity=severity,
+            confidence=0.5,
+            threat_type=threat_type,
+            affected_topics=sorted(indicators),
+            recommended_actions=[
+                f"Review the post now: {top.url or '@' + (top.author or 'unknown')}",
+                "Hold any public response until the detailed analysis follows",
+                "Prepare a holding statement"
+            ],
+            escalation_required=severity >= 8,
+            reasoning=(
+                f"Fast-lane alert on {len(mentions)} mention(s) ({'; '.join(signals)}), "
+                f"sent before full analysis; a detailed assessment follows"
+            )
+        )
+
+    def record_alert(self, mentions: MentionBatch, now: Optional[float] = None) -> None:
+        """Count a sent alert and its mention-to-alert latency"""
+        now = now or time.time()
+        self.stats["alerts"] += 1
+        self.latency.add(max(now - min(mentions.published_ts), 0.0))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Selection and alert counts, and mention-to-alert latency in seconds"""
+        return {
+            **self.stats,
+            "latency_seconds": self.latency.quantiles() if self.latency.count else {}
+        }
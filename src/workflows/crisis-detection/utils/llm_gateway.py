@@ -0,0 +1,275 @@
+"""
+Shared LLM gateway - rate budgets, request coalescing, deadlines and retries
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from .rate_limiter import RateLimiter, DEFAULT_RATE_LIMITS
+
+if TYPE_CHECKING:
+    from langchain_core.prompts import ChatPromptTemplate
+
+logger = logging.getLogger(__name__)
+
+
+# Provider errors worth retrying (matched by class name to avoid importing SDKs)
+RETRYABLE_ERRORS = {
+    "RateLimitError",
+    "APIConnectionError",
+    "APITimeoutError",
+    "InternalServerError",
+    "ServiceUnavailableError"
+}
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def count_tokens(response: Any) -> int:
+    """Token usage from response metadata, estimated from length if absent"""
+    metadata = getattr(response, "response_metadata", None) or {}
+    usage = metadata.get("token_usage") or {}
+    if usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+
+    content = getattr(response, "content", "") or ""
+    return len(str(content)) // 4
+
+
+class LLMGateway:
+    """
+    Single entry point for every LLM call made by the agents
+
+    Applies a shared requests-per-minute and tokens-per-minute budget,
+    coalesces identical in-flight requests (singleflight), enforces a
+    per-call deadline with retries, and records tokens and latency.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: int = 90000,
+        timeout_seconds: float = 60.0,
+        max_retries: int = 2,
+        backoff_seconds: Optional[List[float]] = None,
+        expected_output_tokens: int = 500,
+        history_size: int = 1000
+    ):
+        """
+        Initialize LLM gateway
+
+        Args:
+            requests_per_minute: Request budget (default: DEFAULT_RATE_LIMITS["openai"])
+            tokens_per_minute: Token budget shared by all calls
+            timeout_seconds: Deadline for a single attempt
+            max_retries: Retries after the first attempt for retryable errors
+            backoff_seconds: Wait before each retry
+            expected_output_tokens: Output tokens reserved per call up front
+            history_size: Number of recent call records to keep
+        """
+        if requests_per_minute is None:
+            openai_limits = DEFAULT_RATE_LIMITS["openai"]
+            requests_per_minute = openai_limits["max_requests"] * 60 // openai_limits["time_window"]
+
+        self.request_limiter = RateLimiter(max_requests=requests_per_minute, time_window=60)
+        self.token_limiter = RateLimiter(max_requests=tokens_per_minute, time_window=60)
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds or [1, 4]
+        self.expected_output_tokens = expected_output_tokens
+
+        self._templates: Dict[str, "ChatPromptTemplate"] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.call_history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.task_stats: Dict[str, Dict[str, float]] = {}
+
+    def get_prompt(self, name: str, messages: Sequence[Tuple[str, str]]) -> "ChatPromptTemplate":
+        """Return the compiled template for name, compiling it on first use"""
+        template = self._templates.get(name)
+        if template is None:
+            from langchain_core.prompts import ChatPromptTemplate
+
+            template = ChatPromptTemplate.from_messages(list(messages))
+            self._templates[name] = template
+        return template
+
+    async def ainvoke(
+        self,
+        llm: Any,
+        prompt: "ChatPromptTemplate",
+        inputs: Dict[str, Any],
+        task: str = "default",
+        timeout_seconds: Optional[float] = None
+    ) -> Any:
+        """
+        Invoke a prompt on a chat model through the gateway
+
+        Identical concurrent requests (same model, template and inputs)
+        share a single provider call.
+        """
+        key = self._request_key(llm, prompt, inputs)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats(task)["coalesced"] += 1
+            logger.debug(f"Coalesced in-flight LLM request for {task}")
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            response = await self._invoke_with_retry(llm, prompt, inputs, task, timeout_seconds)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception with no coalesced waiters is not logged
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _invoke_with_retry(
+        self,
+        llm: Any,
+        prompt: "ChatPromptTemplate",
+        inputs: Dict[str, Any],
+        task: str,
+        timeout_seconds: Optional[float]
+    ) -> Any:
+        """Run the call under rate budgets, deadline and retry policy"""
+        messages = prompt.format_messages(**inputs)
+        estimated_tokens = min(
+            sum(len(str(m.content)) for m in messages) // 4 + self.expected_output_tokens,
+            self.token_limiter.max_requests
+        )
+        timeout = timeout_seconds or self.timeout_seconds
+        stats = self._stats(task)
+
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                # The budget wait counts against the deadline, so a spent
+                # budget times out (and is retried) instead of hanging
+                response = await asyncio.wait_for(
+                    self._budgeted_call(llm, messages, estimated_tokens),
+                    timeout=timeout
+                )
+            except Exception as e:
+                latency_ms = (time.perf_counter() - started) * 1000
+                retryable = self._is_retryable(e)
+                self._record(task, llm, latency_ms, 0, attempt, "error")
+
+                if not retryable or attempt >= self.max_retries:
+                    stats["errors"] += 1
+                    raise
+
+                stats["retries"] += 1
+                wait_time = self.backoff_seconds[min(attempt, len(self.backoff_seconds) - 1)]
+                logger.warning(
+                    f"LLM call for {task} failed ({type(e).__name__}), "
+                    f"retry {attempt + 1} in {wait_time}s"
+                )
+                await asyncio.sleep(wait_time)
+                continue
+
+            latency_ms = (time.perf_counter() - started) * 1000
+            tokens = count_tokens(response)
+
+            # Charge any usage beyond the up-front reservation to the budget
+            if tokens > estimated_tokens:
+                self.token_limiter.tokens -= tokens - estimated_tokens
+
+            self._record(task, llm, latency_ms, tokens, attempt, "success")
+            return response
+
+    async def _budgeted_call(self, llm: Any, messages: List[Any], estimated_tokens: int) -> Any:
+        """Wait for the request and token budgets, then call the model"""
+        await self.request_limiter.acquire()
+        await self.token_limiter.acquire(estimated_tokens)
+        return await llm.ainvoke(messages)
+
+    def _request_key(self, llm: Any, prompt: "ChatPromptTemplate", inputs: Dict[str, Any]) -> str:
+        """Coalescing key for a request"""
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode()).hexdigest()
+        return f"{id(llm)}:{id(prompt)}:{digest}"
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """Check whether an error is transient"""
+        if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+            return True
+        if type(error).__name__ in RETRYABLE_ERRORS:
+            return True
+        return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+    def _stats(self, task: str) -> Dict[str, float]:
+        """Aggregate counters for a task"""
+        return self.task_stats.setdefault(task, {
+            "calls": 0,
+            "coalesced": 0,
+            "retries": 0,
+            "errors": 0,
+            "total_tokens": 0,
+            "total_latency_ms": 0.0
+        })
+
+    def _record(
+        self,
+        task: str,
+        llm: Any,
+        latency_ms: float,
+        tokens: int,
+        attempt: int,
+        outcome: str
+    ) -> None:
+        """Record a single provider call"""
+        stats = self._stats(task)
+        stats["calls"] += 1
+        stats["total_tokens"] += tokens
+        stats["total_latency_ms"] += latency_ms
+
+        self.call_history.append({
+            "timestamp": time.time(),
+            "task": task,
+            "model": getattr(llm, "model_name", None) or type(llm).__name__,
+            "latency_ms": latency_ms,
+            "tokens": tokens,
+            "attempt": attempt + 1,
+            "outcome": outcome
+        })
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-task gateway statistics and current budget usage"""
+        tasks = {}
+        for task, stats in self.task_stats.items():
+            calls = stats["calls"]
+            tasks[task] = {
+                **stats,
+                "avg_latency_ms": stats["total_latency_ms"] / calls if calls else 0,
+                "avg_tokens": stats["total_tokens"] / calls if calls else 0
+            }
+
+        return {
+            "tasks": tasks,
+            "inflight": len(self._inflight),
+            "requests": self.request_limiter.get_current_usage(),
+            "tokens": self.token_limiter.get_current_usage()
+        }
+
+
+_default_gateway: Optional[LLMGateway] = None
+
+
+def get_default_gateway() -> LLMGateway:
+    """Process-wide gateway shared by agents that are not given one"""
+    global _default_gateway
+    if _default_gateway is None:
+        _default_gateway = LLMGateway()
+    return _default_gateway
@@ -0,0 +1,190 @@
+"""
+Load shedding - bounded admission of mentions between workflow stages
+"""
+
+import heapq
+import math
+import random
+from typing import Any, Dict, List, Optional
+import logging
+
+from .mention_batch import MentionBatch
+
+logger = logging.getLogger(__name__)
+
+
+def mention_priority(reach: int, sentiment: float) -> float:
+    """
+    How much a mention matters when work has to be shed
+
+    Log reach scaled up by negativity, so a negative mention from a mid-size
+    account outranks a neutral one from a larger account.
+    """
+    negativity = -sentiment if sentiment < 0 else 0.0
+    return math.log10(1 + reach) * (1 + 2 * negativity)
+
+
+class LoadShedder:
+    """
+    Caps how many mentions a stage admits, shedding the least important first
+
+    When a batch exceeds a stage's capacity, every mention with reach of
+    at least ``protect_reach`` is kept regardless of capacity. The rest of
+    the capacity goes mostly to the highest-priority mentions (reach and
+    negativity, see mention_priority), with ``sample_fraction`` of it
+    reserved for a uniform sample of the remainder so low-priority volume
+    stays represented. Order within the batch is preserved. Shed counts
+    and the last overload's sizes are kept per stage.
+    """
+
+    def __init__(
+        self,
+        protect_reach: int = 10000,
+        sample_fraction: float = 0.1,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize load shedder
+
+        Args:
+            protect_reach: Mentions with at least this reach are never shed
+            sample_fraction: Share of the unprotected capacity filled by random sampling
+            seed: Sampling seed (for reproducible replays)
+        """
+        self.protect_reach = protect_reach
+        self.sample_fraction = sample_fraction
+        self._rng = random.Random(seed)
+        self.stages: Dict[str, Dict[str, int]] = {}
+
+    def shed(self, mentions: MentionBatch, capacity: int, stage: str = "default") -> MentionBatch:
+        """
+        Admit at most capacity mentions (plus protected ones)
+
+        Returns:
+            The batch itself if it fits, otherwise the admitted mentions
+        """
+        count = len(mentions)
+        if count <= capacity:
+            return mentions
+
+        protect_reach = self.protect_reach
+        protected: List[int] = []
+        candidates: List[int] = []
+        for i, reach in enumerate(mentions.reach_count):
+            if reach >= protect_reach:
+                protected.append(i)
+            else:
+                candidates.append(i)
+
+        room = max(capacity - len(protected), 0)
+        sampled = min(int(room * self.sample_fraction), len(candidates))
+        reach, sentiment = mentions.reach_count, mentions.sentiment_score
+        top = heapq.nlargest(
+            room - sampled,
+            candidates,
+            key=lambda i: mention_priority(reach[i], sentiment[i])
+        )
+        if sampled:
+            chosen = set(top)
+            rest = [i for i in candidates if i not in chosen]
+            top.extend(self._rng.sample(rest, min(sampled, len(rest))))
+
+        admitted = sorted(protected + top)
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = {"overloads": 0, "shed": 0}
+        stats["overloads"] += 1
+        stats["shed"] += count - len(admitted)
+        stats["last_offered"] = count
+        stats["last_kept"] = len(admitted)
+        stats["last_protected"] = len(protected)
+        logger.debug(
+            f"Load shedding at {stage}: kept {len(admitted)} of {count} mentions "
+            f"({len(protected)} protected by reach)"
+        )
+        return mentions.take(admitted)
+
+    def shed_count(self, stage: Optional[str] = None) -> int:
+        """Mentions shed at one stage (default: all stages)"""
+        if stage is not None:
+            return self.stages.get(stage, {}).get("shed", 0)
+        return sum(stats["shed"] for stats in self.stages.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-stage shed counts and last overload sizes"""
+        return {
+            "protect_reach": self.protect_reach,
+            "shed": self.shed_count(),
+            "stages": {stage: dict(stats) for stage, stats in self.stages.items()}
+        }
+
+
+class MentionQueue:
+    """
+    Bounded buffer for mentions pushed between workflow cycles
+
+    Webhook receivers put parsed batches here and the next cycle drains
+    them. Once ``max_mentions`` are buffered, the buffer is shed (see
+    LoadShedder) down to ``low_watermark`` of capacity, so a sustained
+    burst costs one shedding pass per few puts rather than one per put,
+    and memory stays bounded between cycles.
+    """
+
+    def __init__(
+        self,
+        max_mentions: int = 20000,
+        shedder: Optional[LoadShedder] = None,
+        low_watermark: float = 0.8,
+        name: str = "queue"
+    ):
+        """
+        Initialize mention queue
+
+        Args:
+            max_mentions: Mentions buffered before shedding
+            shedder: Shedding policy (default: LoadShedder())
+            low_watermark: Fraction of max_mentions kept after shedding
+            name: Stage name in shed metrics
+        """
+        self.max_mentions = max_mentions
+        self.shedder = shedder or LoadShedder()
+        self.low_watermark = low_watermark
+        self.name = name
+        self._buffer = MentionBatch()
+        self.received = 0
+        self.peak = 0
+
+    def put(self, mentions: MentionBatch) -> int:
+        """Buffer mentions, shedding if full; returns how many were shed"""
+        self._buffer.extend(mentions)
+        self.received += len(mentions)
+        buffered = len(self._buffer)
+        if buffered > self.peak:
+            self.peak = buffered
+        if buffered <= self.max_mentions:
+            return 0
+
+        self._buffer = self.shedder.shed(
+            self._buffer,
+            int(self.max_mentions * self.low_watermark),
+            self.name
+        )
+        return buffered - len(self._buffer)
+
+    def drain(self) -> MentionBatch:
+        """Take everything buffered"""
+        mentions, self._buffer = self._buffer, MentionBatch()
+        return mentions
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Received, buffered, peak and shed counts"""
+        return {
+            "received": self.received,
+            "buffered": len(self._buffer),
+            "peak": self.peak,
+            "max_mentions": self.max_mentions,
+            "shed": self.shedder.shed_count(self.name)
+        }
@@ -0,0 +1,573 @@
+"""
+Mention archive - append-only columnar segments with a time-range index
+"""
+
+import bisect
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import logging
+
+from .mention_batch import MentionBatch
+
+logger = logging.getLogger(__name__)
+
+
+_MAGIC = b"CDMARCH1"
+_PREFIX = struct.Struct("<8sQ")  # magic, header length
+_SEGMENT_NAME = re.compile(r"^mentions-(?P<partition>-?\d+)-(?P<seq>\d{8})\.seg$")
+
+# Fixed-width columns: name -> array typecode
+_NUMERIC_COLUMNS = {
+    "published_ts": "d",
+    "reach_count": "q",
+    "sentiment_score": "d",
+    "engagement_count": "q",
+    "author_verified": "b"
+}
+# Dictionary-encoded columns (int32 codes, -1 for None)
+_DICTIONARY_COLUMNS = ("source", "author")
+# Variable-length columns: int64 offsets followed by UTF-8 bytes
+_TEXT_COLUMNS = ("mention_id", "content", "url", "parent_id", "keywords")
+# Text columns where an empty string is stored for None
+_OPTIONAL_TEXT_COLUMNS = ("url", "parent_id")
+
+_KEYWORD_SEPARATOR = "\x1f"
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _encode_text(values: Iterable[Optional[str]]) -> Tuple[array, bytes]:
+    """Offsets (one more than values) and the concatenated UTF-8 bytes"""
+    encoded = [(value or "").encode("utf-8") for value in values]
+    offsets = array("q", [0])
+    total = 0
+    for data in encoded:
+        total += len(data)
+        offsets.append(total)
+    return offsets, b"".join(encoded)
+
+
+class _Segment:
+    """
+    One immutable segment file, memory-mapped on first read
+
+    Layout: magic and header length, a JSON header (row count, time
+    bounds, column offsets, dictionaries and the sparse time index), then
+    8-byte aligned column data. Rows are sorted by publish time.
+    """
+
+    def __init__(self, path: str, partition: int, seq: int, header: Dict[str, Any]):
+        self.path = path
+        self.partition = partition
+        self.seq = seq
+        self.header = header
+        self.count: int = header["count"]
+        self.first: float = header["first"]
+        self.last: float = header["last"]
+        self.dictionaries: Dict[str, List[str]] = header["dictionaries"]
+        self._index_ts: List[float] = [ts for ts, _ in header["time_index"]]
+        self._index_rows: List[int] = [row for _, row in header["time_index"]]
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._views: Dict[str, memoryview] = {}
+
+    @classmethod
+    def open(cls, path: str, partition: int, seq: int) -> "_Segment":
+        """Read the header of an existing segment file"""
+        with open(path, "rb") as f:
+            magic, header_length = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != _MAGIC:
+                raise ValueError("not a mention archive segment")
+            header = json.loads(f.read(header_length))
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"segment written with {header.get('byteorder')} byte order")
+        return cls(path, partition, seq, header)
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        partition: int,
+        seq: int,
+        batch: MentionBatch,
+        index_interval: int,
+        replaces: Sequence[int] = ()
+    ) -> "_Segment":
+        """Write batch (sorted by publish time here) as a new segment file"""
+        order = sorted(range(len(batch)), key=batch.published_ts.__getitem__)
+        batch = batch.take(order)
+
+        sections: List[Tuple[str, bytes]] = []
+        for name in _NUMERIC_COLUMNS:
+            sections.append((name, getattr(batch, name).tobytes()))
+
+        dictionaries: Dict[str, List[str]] = {}
+        for name in _DICTIONARY_COLUMNS:
+            codes: Dict[str, int] = {}
+            column = array("i", (
+                -1 if value is None else codes.setdefault(value, len(codes))
+                for value in getattr(batch, name)
+            ))
+            dictionaries[name] = list(codes)
+            sections.append((name, column.tobytes()))
+
+        for name in _TEXT_COLUMNS:
+            if name == "keywords":
+                values = (_KEYWORD_SEPARATOR.join(row) for row in batch.keywords)
+            else:
+                values = getattr(batch, name)
+            offsets, data = _encode_text(values)
+            sections.append((f"{name}.offsets", offsets.tobytes()))
+            sections.append((name, data))
+
+        columns: Dict[str, List[int]] = {}
+        position = 0
+        for name, data in sections:
+            columns[name] = [position, len(data)]
+            position = _align(position + len(data))
+
+        timestamps = batch.published_ts
+        header = {
+            "count": len(batch),
+            "first": timestamps[0],
+            "last": timestamps[-1],
+            "byteorder": sys.byteorder,
+            "columns": columns,
+            "dictionaries": dictionaries,
+            "time_index": [[timestamps[row], row] for row in range(0, len(batch), index_interval)],
+            "replaces": list(replaces)
+        }
+        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        data_start = _align(_PREFIX.size + len(header_bytes))
+
+        # Write under a temporary name and rename, so readers and restarts
+        # never see a partial segment
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_PREFIX.pack(_MAGIC, len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b"\0" * (data_start - f.tell()))
+            for name, data in sections:
+                f.write(data)
+                f.write(b"\0" * (_align(len(data)) - len(data)))
+        os.replace(tmp_path, path)
+
+        header["data_start"] = data_start
+        return cls(path, partition, seq, header)
+
+    def _column(self, name: str) -> memoryview:
+        """Memory-mapped view of a column (typed for numeric columns)"""
+        view = self._views.get(name)
+        if view is not None:
+            return view
+
+        if self._map is None:
+            self._file = open(self.path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if "data_start" not in self.header:
+                self.header["data_start"] = _align(_PREFIX.size + _PREFIX.unpack_from(self._map)[1])
+
+        offset, length = self.header["columns"][name]
+        start = self.header["data_start"] + offset
+        view = memoryview(self._map)[start:start + length]
+        if name in _NUMERIC_COLUMNS:
+            view = view.cast(_NUMERIC_COLUMNS[name])
+        elif name in _DICTIONARY_COLUMNS:
+            view = view.cast("i")
+        elif name.endswith(".offsets"):
+            view = view.cast("q")
+        self._views[name] = view
+        return view
+
+    def row_range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        """Rows with start <= publish time <= end, via the sparse time index"""
+        timestamps = self._column("published_ts")
+        low, high = 0, self.count
+        if start is not None:
+            block = max(0, bisect.bisect_left(self._index_ts, start) - 1)
+            low = bisect.bisect_left(timestamps, start, self._index_rows[block], self.count)
+        if end is not None:
+            block = bisect.bisect_right(self._index_ts, end)
+            limit = self._index_rows[block] if block < len(self._index_rows) else self.count
+            high = bisect.bisect_right(timestamps, end, low, limit)
+        return low, high
+
+    def select(
+        self,
+        start: Optional[float],
+        end: Optional[float],
+        min_reach: Optional[int],
+        max_sentiment: Optional[float],
+        sources: Optional[Sequence[str]]
+    ) -> List[int]:
+        """Row numbers matching the time range and column predicates"""
+        low, high = self.row_range(start, end)
+        if low >= high:
+            return []
+
+        # The most selective filter (reach) scans its column slice; later
+        # filters only look at the rows that survived
+        rows: Optional[List[int]] = None
+        if min_reach is not None:
+            reach = self._column("reach_count")
+            rows = [row for row, value in enumerate(reach[low:high], low) if value >= min_reach]
+
+        if max_sentiment is not None:
+            sentiment = self._column("sentiment_score")
+            if rows is None:
+                rows = [row for row, value in enumerate(sentiment[low:high], low) if value <= max_sentiment]
+            else:
+                rows = [row for row in rows if sentiment[row] <= max_sentiment]
+
+        if sources is not None:
+            codes = {i for i, source in enumerate(self.dictionaries["source"]) if source in sources}
+            source_codes = self._column("source")
+            if rows is None:
+                rows = [row for row, code in enumerate(source_codes[low:high], low) if code in codes]
+            else:
+                rows = [row for row in rows if source_codes[row] in codes]
+
+        return list(range(low, high)) if rows is None else rows
+
+    def take(self, rows: Sequence[int]) -> MentionBatch:
+        """Materialize rows as a MentionBatch"""
+        batch = MentionBatch()
+        for name, typecode in _NUMERIC_COLUMNS.items():
+            column = self._column(name)
+            setattr(batch, name, array(typecode, (column[row] for row in rows)))
+
+        for name in _DICTIONARY_COLUMNS:
+            column = self._column(name)
+            codes = [column[row] for row in rows]
+            # Decode (and intern) only the dictionary entries these rows use
+            values = self.dictionaries[name]
+            decoded = {code: sys.intern(values[code]) for code in set(codes) if code >= 0}
+            setattr(batch, name, [decoded.get(code) for code in codes])
+
+        for name in _TEXT_COLUMNS:
+            if name not in self.header["columns"]:
+                # Optional column added after this segment was written
+                setattr(batch, name, [None] * len(rows))
+                continue
+            offsets = self._column(f"{name}.offsets")
+            data = self._column(name)
+            texts = [str(data[offsets[row]:offsets[row + 1]], "utf-8") for row in rows]
+            if name == "keywords":
+                batch.keywords = [
+                    tuple(sys.intern(k) for k in text.split(_KEYWORD_SEPARATOR)) if text else ()
+                    for text in texts
+                ]
+            elif name in _OPTIONAL_TEXT_COLUMNS:
+                setattr(batch, name, [text or None for text in texts])
+            else:
+                setattr(batch, name, texts)
+        return batch
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+            self._file = None
+
+
+class MentionArchive:
+    """
+    Append-only columnar archive of scanned mentions
+
+    Mentions are buffered in memory and flushed into immutable segment
+    files, one or more per time partition (``partition_seconds`` of
+    publish time). Numeric columns are fixed-width and memory-mapped, so
+    a range scan reads only the columns and row ranges it filters on;
+    text is decoded only for matching rows. Each segment carries a sparse
+    time index (every ``index_interval`` rows) and partitions are skipped
+    by their time bounds. Small segments left by frequent flushes are
+    merged once a partition has ``compact_segments`` of them.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        partition_seconds: int = 3600,
+        flush_rows: int = 50000,
+        flush_seconds: float = 300,
+        index_interval: int = 1024,
+        compact_segments: int = 8
+    ):
+        """
+        Initialize mention archive
+
+        Args:
+            directory: Directory holding the segment files
+            partition_seconds: Publish-time span of one partition
+            flush_rows: Buffered mentions that trigger a flush
+            flush_seconds: Age of the oldest buffered mention that triggers a flush
+            index_interval: Rows between sparse time index entries
+            compact_segments: Segments in one partition that trigger compaction
+        """
+        self.directory = directory
+        self.partition_seconds = partition_seconds
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.index_interval = index_interval
+        self.compact_segments = compact_segments
+
+        self._partitions: Dict[int, List[_Segment]] = {}
+        self._buffer: Dict[int, MentionBatch] = {}
+        self._buffered = 0
+        self._buffered_since: Optional[float] = None
+        self._next_seq = 0
+        self.stats = {"appended": 0, "flushes": 0, "segments_written": 0, "compactions": 0}
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def append(self, mentions: MentionBatch) -> None:
+        """Buffer mentions, flushing when the buffer is large or old enough"""
+        if not mentions:
+            return
+
+        partitions = [int(ts // self.partition_seconds) * self.partition_seconds for ts in mentions.published_ts]
+        if len(set(partitions)) == 1:
+            self._buffer_rows(partitions[0], mentions)
+        else:
+            by_partition: Dict[int, List[int]] = {}
+            for row, partition in enumerate(partitions):
+                by_partition.setdefault(partition, []).append(row)
+            for partition, rows in by_partition.items():
+                self._buffer_rows(partition, mentions.take(rows))
+
+        self.stats["appended"] += len(mentions)
+        if self._buffered_since is None:
+            self._buffered_since = time.monotonic()
+        if (
+            self._buffered >= self.flush_rows
+            or time.monotonic() - self._buffered_since >= self.flush_seconds
+        ):
+            self.flush()
+
+    def _buffer_rows(self, partition: int, mentions: MentionBatch) -> None:
+        buffered = self._buffer.get(partition)
+        if buffered is None:
+            self._buffer[partition] = buffered = MentionBatch()
+        buffered.extend(mentions)
+        self._buffered += len(mentions)
+
+    def flush(self) -> None:
+        """Write buffered mentions as new segments, compacting busy partitions"""
+        if not self._buffer:
+            return
+
+        buffer, self._buffer = self._buffer, {}
+        self._buffered = 0
+        self._buffered_since = None
+        for partition, mentions in sorted(buffer.items()):
+            segments = self._partitions.setdefault(partition, [])
+            segments.append(self._write_segment(partition, mentions))
+            if len(segments) >= self.compact_segments:
+                self.compact(partition)
+        self.stats["flushes"] += 1
+
+    def compact(self, partition: Optional[int] = None) -> None:
+        """Merge each partition's segments (or one partition's) into a single segment"""
+        partitions = [partition] if partition is not None else list(self._partitions)
+        for key in partitions:
+            segments = self._partitions.get(key, [])
+            if len(segments) < 2:
+                continue
+
+            merged = MentionBatch()
+            for segment in segments:
+                merged.extend(segment.take(range(segment.count)))
+            replacement = self._write_segment(key, merged, replaces=[s.seq for s in segments])
+
+            self._partitions[key] = [replacement]
+            for segment in segments:
+                self._remove_segment(segment)
+            self.stats["compactions"] += 1
+
+    def drop_before(self, timestamp: float) -> int:
+        """Delete partitions that end before timestamp; returns mentions dropped"""
+        dropped = 0
+        for partition in [p for p in self._partitions if p + self.partition_seconds <= timestamp]:
+            for segment in self._partitions.pop(partition):
+                dropped += segment.count
+                self._remove_segment(segment)
+        return dropped
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        min_reach: Optional[float] = None,
+        max_sentiment: Optional[float] = None,
+        sources: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None
+    ) -> MentionBatch:
+        """
+        Mentions published in [start, end] matching every given filter
+
+        Args:
+            start: Earliest publish time (epoch seconds)
+            end: Latest publish time (epoch seconds)
+            min_reach: Minimum author reach
+            max_sentiment: Maximum sentiment score (e.g. -0.3 for negative mentions)
+            sources: Allowed sources
+            limit: Return at most this many mentions (oldest first)
+
+        Returns:
+            Matching mentions ordered by publish time (buffered mentions included)
+        """
+        if min_reach is not None:
+            # Reach is an integer column; compare int to int in the scan
+            min_reach = int(math.ceil(min_reach))
+        if max_sentiment is not None:
+            max_sentiment = float(max_sentiment)
+
+        results = MentionBatch()
+        for batch in self._scan(start, end, min_reach, max_sentiment, sources):
+            results.extend(batch)
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+        return results
+
+    def iter_batches(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        batch_size: int = 10000
+    ) -> Iterator[MentionBatch]:
+        """Mentions published in [start, end] in publish-time order, batch_size at a time"""
+        pending = MentionBatch()
+        for batch in self._scan(start, end, None, None, None):
+            pending.extend(batch)
+            while len(pending) >= batch_size:
+                yield pending[:batch_size]
+                pending = pending[batch_size:]
+        if pending:
+            yield pending
+
+    def count(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """Number of mentions published in [start, end] (no rows are decoded)"""
+        total = 0
+        for partition in self._overlapping(start, end):
+            for segment in self._partitions.get(partition, ()):
+                low, high = segment.row_range(start, end)
+                total += max(0, high - low)
+            buffered = self._buffer.get(partition)
+            if buffered is not None:
+                total += sum(
+                    1 for ts in buffered.published_ts
+                    if (start is None or ts >= start) and (end is None or ts <= end)
+                )
+        return total
+
+    def _scan(
+        self,
+        start: Optional[float],
+        end: Optional[float],
+        min_reach: Optional[int],
+        max_sentiment: Optional[float],
+        sources: Optional[Sequence[str]]
+    ) -> Iterator[MentionBatch]:
+        """Matching mentions, one batch per partition in publish-time order"""
+        for partition in self._overlapping(start, end):
+            parts = MentionBatch()
+            for segment in self._partitions.get(partition, ()):
+                rows = segment.select(start, end, min_reach, max_sentiment, sources)
+                if rows:
+                    parts.extend(segment.take(rows))
+
+            buffered = self._buffer.get(partition)
+            if buffered is not None:
+                parts.extend(buffered.take(
+                    i for i in range(len(buffered))
+                    if (start is None or buffered.published_ts[i] >= start)
+                    and (end is None or buffered.published_ts[i] <= end)
+                    and (min_reach is None or buffered.reach_count[i] >= min_reach)
+                    and (max_sentiment is None or buffered.sentiment_score[i] <= max_sentiment)
+                    and (sources is None or buffered.source[i] in sources)
+                ))
+
+            if parts:
+                # Segments of one partition may overlap in time until compacted
+                yield parts.take(sorted(range(len(parts)), key=parts.published_ts.__getitem__))
+
+    def _overlapping(self, start: Optional[float], end: Optional[float]) -> List[int]:
+        """Partitions (with segments or buffered rows) that overlap [start, end]"""
+        return [
+            partition for partition in sorted(set(self._partitions) | set(self._buffer))
+            if (start is None or partition + self.partition_seconds > start)
+            and (end is None or partition <= end)
+        ]
+
+    def _write_segment(self, partition: int, mentions: MentionBatch, replaces: Sequence[int] = ()) -> _Segment:
+        seq = self._next_seq
+        self._next_seq += 1
+        path = os.path.join(self.directory, f"mentions-{partition}-{seq:08d}.seg")
+        segment = _Segment.write(path, partition, seq, mentions, self.index_interval, replaces)
+        self.stats["segments_written"] += 1
+        return segment
+
+    def _remove_segment(self, segment: _Segment) -> None:
+        segment.close()
+        try:
+            os.remove(segment.path)
+        except FileNotFoundError:
+            pass
+
+    def _load(self) -> None:
+        """Index existing segments, finishing any compaction interrupted by a crash"""
+        segments: List[_Segment] = []
+        for filename in sorted(os.listdir(self.directory)):
+            match = _SEGMENT_NAME.match(filename)
+            if not match:
+                continue
+            path = os.path.join(self.directory, filename)
+            seq = int(match.group("seq"))
+            self._next_seq = max(self._next_seq, seq + 1)
+            try:
+                segments.append(_Segment.open(path, int(match.group("partition")), seq))
+            except (OSError, ValueError) as e:
+                logger.error(f"Skipping unreadable mention archive segment {path}: {e}")
+
+        # A compacted segment lists the segments it replaces; if the process
+        # stopped before deleting them, delete them now
+        replaced = {seq for segment in segments for seq in segment.header.get("replaces", ())}
+        for segment in segments:
+            if segment.seq in replaced:
+                self._remove_segment(segment)
+            else:
+                self._partitions.setdefault(segment.partition, []).append(segment)
+
+    def close(self) -> None:
+        """Flush buffered mentions and unmap segment files"""
+        self.flush()
+        for segments in self._partitions.values():
+            for segment in segments:
+                segment.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Archive size and write counters"""
+        segments = [segment for segments in self._partitions.values() for segment in segments]
+        return {
+            **self.stats,
+            "partitions": len(self._partitions),
+            "segments": len(segments),
+            "archived": sum(segment.count for segment in segments),
+            "buffered": self._buffered,
+            "disk_bytes": sum(os.path.getsize(segment.path) for segment in segments)
+        }
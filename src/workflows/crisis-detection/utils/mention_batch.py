@@ -0,0 +1,293 @@
+"""
+Compact mention storage - struct-of-arrays batches for the workflow hot path
+"""
+
+import sys
+from array import array
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import logging
+
+from ..agents.crisis_detection import CrisisMention
+
+logger = logging.getLogger(__name__)
+
+
+_intern = sys.intern
+
+
+def _intern_optional(value: Optional[str]) -> Optional[str]:
+    return _intern(value) if isinstance(value, str) else None
+
+
+class MentionRecord:
+    """
+    Read-only view of one mention in a MentionBatch
+
+    Has the same attributes as CrisisMention, so code that reads mentions
+    works with either, but holds only the batch and a row index.
+    """
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "MentionBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    @property
+    def mention_id(self) -> str:
+        return self._batch.mention_id[self._index]
+
+    @property
+    def content(self) -> str:
+        return self._batch.content[self._index]
+
+    @property
+    def source(self) -> str:
+        return self._batch.source[self._index]
+
+    @property
+    def author(self) -> Optional[str]:
+        return self._batch.author[self._index]
+
+    @property
+    def author_verified(self) -> bool:
+        return bool(self._batch.author_verified[self._index])
+
+    @property
+    def url(self) -> Optional[str]:
+        return self._batch.url[self._index]
+
+    @property
+    def parent_id(self) -> Optional[str]:
+        return self._batch.parent_id[self._index]
+
+    @property
+    def sentiment_score(self) -> float:
+        return self._batch.sentiment_score[self._index]
+
+    @property
+    def reach_count(self) -> int:
+        return self._batch.reach_count[self._index]
+
+    @property
+    def engagement_count(self) -> int:
+        return self._batch.engagement_count[self._index]
+
+    @property
+    def published_at(self) -> datetime:
+        return datetime.fromtimestamp(self._batch.published_ts[self._index])
+
+    @property
+    def keywords(self) -> List[str]:
+        return list(self._batch.keywords[self._index])
+
+    def dict(self) -> Dict[str, Any]:
+        """Field values as a dict (same shape as CrisisMention.dict())"""
+        return {field: getattr(self, field) for field in MentionBatch.FIELDS}
+
+    def to_model(self) -> CrisisMention:
+        """Validated pydantic model for API boundaries"""
+        return CrisisMention(**self.dict())
+
+    def __repr__(self) -> str:
+        return f"MentionRecord({self.mention_id!r}, source={self.source!r}, reach={self.reach_count})"
+
+
+class MentionBatch:
+    """
+    Mentions stored column by column
+
+    Numeric fields live in typed ``array`` columns (8 bytes per value, no
+    per-object overhead) and repeated strings such as sources, authors and
+    keywords are interned, so a batch of 100k mentions is a handful of
+    containers instead of 100k validated models and their field dicts.
+    Iterating yields MentionRecord views; pydantic CrisisMention models are
+    only built at API boundaries (to_models / from_models).
+    """
+
+    FIELDS = (
+        "mention_id", "content", "source", "author", "author_verified", "url", "parent_id",
+        "sentiment_score", "reach_count", "engagement_count", "published_at", "keywords"
+    )
+
+    def __init__(self):
+        self.mention_id: List[str] = []
+        self.content: List[str] = []
+        self.source: List[str] = []
+        self.author: List[Optional[str]] = []
+        self.author_verified = array("b")
+        self.url: List[Optional[str]] = []
+        self.parent_id: List[Optional[str]] = []  # Quoted or reposted post
+        self.sentiment_score = array("d")
+        self.reach_count = array("q")
+        self.engagement_count = array("q")
+        self.published_ts = array("d")  # Epoch seconds
+        self.keywords: List[Tuple[str, ...]] = []
+
+    @classmethod
+    def from_api_page(
+        cls,
+        items: Iterable[Dict[str, Any]],
+        extract_keywords: Optional[Callable[[str], List[str]]] = None
+    ) -> Tuple["MentionBatch", int]:
+        """
+        Build a batch from one page of Mentionlytics API items
+
+        Values are coerced row by row without building models, then the
+        page is range-checked column by column; rows that fail either step
+        are dropped together. Without extract_keywords, keywords are left
+        empty for set_keywords (e.g. after extraction in a process pool).
+
+        Returns:
+            (batch, number of rejected items)
+        """
+        batch = cls()
+        rejected = 0
+        now = datetime.now().timestamp()
+
+        for data in items:
+            try:
+                author = data.get("author") or {}
+                published_at = data.get("published_at")
+                row = (
+                    str(data.get("id", "")),
+                    data.get("content", "") or "",
+                    data.get("source", "unknown") or "unknown",
+                    author.get("name"),
+                    data.get("url"),
+                    float((data.get("sentiment") or {}).get("score", 0)),
+                    int(author.get("reach", 0) or 0),
+                    int((data.get("engagement") or {}).get("total", 0) or 0),
+                    datetime.fromisoformat(published_at).timestamp() if published_at else now
+                )
+                verified = bool(author.get("verified", False))
+                parent_id = data.get("quoted_id") or data.get("retweeted_id")
+            except (AttributeError, TypeError, ValueError) as e:
+                logger.error(f"Error parsing mention: {e}")
+                rejected += 1
+                continue
+            batch._append(
+                *row,
+                extract_keywords(row[1]) if extract_keywords else (),
+                verified,
+                str(parent_id) if parent_id else None
+            )
+
+        # Page-wide range checks (the CrisisMention field constraints)
+        invalid = [i for i, score in enumerate(batch.sentiment_score) if not -1.0 <= score <= 1.0]
+        if invalid:
+            logger.error(f"Dropping {len(invalid)} mentions with sentiment outside [-1, 1]")
+            invalid_set = set(invalid)
+            batch = batch.take(i for i in range(len(batch)) if i not in invalid_set)
+            rejected += len(invalid)
+
+        return batch, rejected
+
+    @classmethod
+    def from_models(cls, mentions: Iterable[Union[CrisisMention, MentionRecord]]) -> "MentionBatch":
+        """Build a batch from CrisisMention models (or records of another batch)"""
+        batch = cls()
+        for m in mentions:
+            batch._append(
+                m.mention_id, m.content, m.source, m.author, m.url, m.sentiment_score,
+                m.reach_count, m.engagement_count, m.published_at.timestamp(), m.keywords,
+                m.author_verified, m.parent_id
+            )
+        return batch
+
+    def _append(
+        self,
+        mention_id: str,
+        content: str,
+        source: str,
+        author: Optional[str],
+        url: Optional[str],
+        sentiment_score: float,
+        reach_count: int,
+        engagement_count: int,
+        published_ts: float,
+        keywords: Sequence[str],
+        author_verified: bool = False,
+        parent_id: Optional[str] = None
+    ) -> None:
+        self.mention_id.append(mention_id)
+        self.content.append(content)
+        self.source.append(_intern(source))
+        self.author.append(_intern_optional(author))
+        self.author_verified.append(author_verified)
+        self.url.append(url)
+        self.parent_id.append(parent_id)
+        self.sentiment_score.append(sentiment_score)
+        self.reach_count.append(reach_count)
+        self.engagement_count.append(engagement_count)
+        self.published_ts.append(published_ts)
+        self.keywords.append(tuple(_intern(k) for k in keywords))
+
+    def set_keywords(self, keywords: Sequence[Sequence[str]]) -> None:
+        """Replace the keywords column (one keyword sequence per mention)"""
+        if len(keywords) != len(self):
+            raise ValueError(f"Expected keywords for {len(self)} mentions, got {len(keywords)}")
+        self.keywords = [tuple(_intern(k) for k in row) for row in keywords]
+
+    def extend(self, other: "MentionBatch") -> None:
+        """Append every mention of another batch"""
+        self.mention_id.extend(other.mention_id)
+        self.content.extend(other.content)
+        self.source.extend(other.source)
+        self.author.extend(other.author)
+        self.author_verified.extend(other.author_verified)
+        self.url.extend(other.url)
+        self.parent_id.extend(other.parent_id)
+        self.sentiment_score.extend(other.sentiment_score)
+        self.reach_count.extend(other.reach_count)
+        self.engagement_count.extend(other.engagement_count)
+        self.published_ts.extend(other.published_ts)
+        self.keywords.extend(other.keywords)
+
+    def take(self, indices: Iterable[int]) -> "MentionBatch":
+        """New batch with the given rows, in the given order"""
+        indices = list(indices)
+        batch = MentionBatch()
+        batch.mention_id = [self.mention_id[i] for i in indices]
+        batch.content = [self.content[i] for i in indices]
+        batch.source = [self.source[i] for i in indices]
+        batch.author = [self.author[i] for i in indices]
+        batch.author_verified = array("b", (self.author_verified[i] for i in indices))
+        batch.url = [self.url[i] for i in indices]
+        batch.parent_id = [self.parent_id[i] for i in indices]
+        batch.sentiment_score = array("d", (self.sentiment_score[i] for i in indices))
+        batch.reach_count = array("q", (self.reach_count[i] for i in indices))
+        batch.engagement_count = array("q", (self.engagement_count[i] for i in indices))
+        batch.published_ts = array("d", (self.published_ts[i] for i in indices))
+        batch.keywords = [self.keywords[i] for i in indices]
+        return batch
+
+    def top_by_reach(self, n: int) -> List[MentionRecord]:
+        """The n mentions with the highest reach, highest first"""
+        reach = self.reach_count
+        order = sorted(range(len(reach)), key=reach.__getitem__, reverse=True)[:n]
+        return [MentionRecord(self, i) for i in order]
+
+    def to_models(self) -> List[CrisisMention]:
+        """Validated pydantic models for API boundaries"""
+        return [record.to_model() for record in self]
+
+    def __len__(self) -> int:
+        return len(self.mention_id)
+
+    def __iter__(self) -> Iterator[MentionRecord]:
+        for i in range(len(self.mention_id)):
+            yield MentionRecord(self, i)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[MentionRecord, "MentionBatch"]:
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("mention index out of range")
+        return MentionRecord(self, index)
+
+    def __repr__(self) -> str:
+        return f"MentionBatch({len(self)} mentions)"
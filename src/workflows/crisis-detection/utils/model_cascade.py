@@ -0,0 +1,227 @@
+"""
+Tiered LLM model cascade - cheap model first, escalate only when needed
+"""
+
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+import logging
+
+from .llm_gateway import LLMGateway, count_tokens, get_default_gateway
+
+if TYPE_CHECKING:
+    from langchain_core.prompts import ChatPromptTemplate
+
+logger = logging.getLogger(__name__)
+
+
+class ModelTier:
+    """A single model tier in the cascade"""
+
+    def __init__(
+        self,
+        name: str,
+        llm: Any = None,
+        cost_per_1k_tokens: float = 0.0,
+        llm_factory: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Initialize model tier
+
+        Args:
+            name: Tier name used in metrics (e.g. "fast", "full")
+            llm: Chat model (any LangChain runnable chat model)
+            cost_per_1k_tokens: Blended token price used for cost estimates
+            llm_factory: Builds the chat model on first use, instead of llm
+        """
+        if llm is None and llm_factory is None:
+            raise ValueError(f"Model tier {name} needs an llm or an llm_factory")
+        self.name = name
+        self._llm = llm
+        self._llm_factory = llm_factory
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+
+    @property
+    def llm(self) -> Any:
+        """Chat model, built by llm_factory on first access"""
+        if self._llm is None:
+            self._llm = self._llm_factory()
+        return self._llm
+
+
+class ModelCascade:
+    """
+    Runs each LLM call on the cheapest tier first and escalates to the
+    next tier only when the caller's escalation check rejects the result
+    (low confidence, high severity) or the tier errors out.
+    """
+
+    def __init__(self, tiers: List[ModelTier], gateway: Optional[LLMGateway] = None):
+        if not tiers:
+            raise ValueError("ModelCascade requires at least one tier")
+        self.tiers = tiers
+        self.gateway = gateway or get_default_gateway()
+        self.metrics: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    @property
+    def top_tier(self) -> ModelTier:
+        """Most capable (last) tier"""
+        return self.tiers[-1]
+
+    async def ainvoke(
+        self,
+        task: str,
+        prompt: "ChatPromptTemplate",
+        inputs: Dict[str, Any],
+        parse: Optional[Callable[[Any], Any]] = None,
+        should_escalate: Optional[Callable[[Any], bool]] = None,
+        min_tier: int = 0
+    ) -> Any:
+        """
+        Invoke the prompt through the cascade
+
+        Args:
+            task: Task name used to group metrics (e.g. "analyze_mentions")
+            prompt: Prompt template to run
+            inputs: Template variables
+            parse: Converts the raw model response into the returned value
+                (default: response content)
+            should_escalate: Returns True if a parsed result is not good
+                enough and the next tier should be tried
+            min_tier: Index of the first tier to try (skip cheap tiers for
+                calls already known to be high stakes)
+
+        Returns:
+            Parsed result from the first accepted tier (or the top tier)
+        """
+        parse = parse or (lambda response: response.content)
+        start = min(max(min_tier, 0), len(self.tiers) - 1)
+        last_error: Optional[Exception] = None
+
+        for index in range(start, len(self.tiers)):
+            tier = self.tiers[index]
+            is_last = index == len(self.tiers) - 1
+            started = time.perf_counter()
+
+            try:
+                response = await self.gateway.ainvoke(
+                    tier.llm,
+                    prompt,
+                    inputs,
+                    task=f"{task}:{tier.name}"
+                )
+                result = parse(response)
+            except Exception as e:
+                self._record(task, tier, started, None, "error")
+                last_error = e
+                if is_last:
+                    raise
+                logger.warning(f"Tier {tier.name} failed for {task}, escalating: {e}")
+                continue
+
+            if not is_last and should_escalate and should_escalate(result):
+                self._record(task, tier, started, response, "escalated")
+                logger.info(f"Escalating {task} from tier {tier.name}")
+                continue
+
+            self._record(task, tier, started, response, "accepted")
+            return result
+
+        # Unreachable: the last tier either returns or raises
+        raise RuntimeError(f"Model cascade exhausted for {task}: {last_error}")
+
+    def _record(
+        self,
+        task: str,
+        tier: ModelTier,
+        started: float,
+        response: Any,
+        outcome: str
+    ) -> None:
+        """Record a tier decision"""
+        stats = self.metrics.setdefault(task, {}).setdefault(tier.name, {
+            "calls": 0,
+            "accepted": 0,
+            "escalated": 0,
+            "error": 0,
+            "total_latency_ms": 0.0,
+            "total_tokens": 0,
+            "estimated_cost": 0.0
+        })
+
+        tokens = count_tokens(response) if response is not None else 0
+        stats["calls"] += 1
+        stats[outcome] += 1
+        stats["total_latency_ms"] += (time.perf_counter() - started) * 1000
+        stats["total_tokens"] += tokens
+        stats["estimated_cost"] += tokens / 1000 * tier.cost_per_1k_tokens
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get per-task, per-tier decision metrics"""
+        summary = {}
+        for task, tiers in self.metrics.items():
+            summary[task] = {}
+            for tier_name, stats in tiers.items():
+                calls = stats["calls"]
+                summary[task][tier_name] = {
+                    **stats,
+                    "avg_latency_ms": stats["total_latency_ms"] / calls if calls else 0,
+                    "acceptance_rate": stats["accepted"] / calls if calls else 0
+                }
+        return summary
+
+    def reset_metrics(self) -> None:
+        """Clear collected metrics"""
+        self.metrics.clear()
+
+
+# Default tiers: fast/cheap model first, GPT-4 as the escalation target
+DEFAULT_MODEL_TIERS = [
+    {"name": "fast", "model": "gpt-4o-mini", "cost_per_1k_tokens": 0.0003},
+    {"name": "full", "model": "gpt-4", "cost_per_1k_tokens": 0.045}
+]
+
+
+def _create_openai_llm(model: str, temperature: float, openai_api_key: str) -> Any:
+    """OpenAI chat model (langchain_openai is imported on the first call)"""
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        openai_api_key=openai_api_key
+    )
+
+
+def create_model_cascade(
+    openai_api_key: str,
+    temperature: float = 0.2,
+    tiers: Optional[List[Dict[str, Any]]] = None,
+    gateway: Optional[LLMGateway] = None
+) -> ModelCascade:
+    """
+    Create an OpenAI model cascade from tier configurations
+
+    Tier models are created when a tier is first invoked, so building a
+    cascade does not import the OpenAI client.
+
+    Args:
+        openai_api_key: OpenAI API key
+        temperature: Sampling temperature for every tier
+        tiers: Tier configs with name, model and cost_per_1k_tokens
+            (default: DEFAULT_MODEL_TIERS)
+        gateway: Gateway all tiers call through (default: shared gateway)
+    """
+    return ModelCascade([
+        ModelTier(
+            name=config["name"],
+            llm_factory=partial(
+                _create_openai_llm,
+                config["model"],
+                config.get("temperature", temperature),
+                openai_api_key
+            ),
+            cost_per_1k_tokens=config.get("cost_per_1k_tokens", 0.0)
+        )
+        for config in (tiers or DEFAULT_MODEL_TIERS)
+    ], gateway=gateway)
@@ -45,39 +45,41 @@ class RateLimiter:
     
     async def acquire(self, tokens: int = 1) -> bool:
         """
-        Acquire tokens from the rate limiter
+        Acquire tokens from the rate limiter, waiting until they are available
+        
+        The wait is computed under the lock but slept outside it, so other
+        callers are not blocked behind a sleeping one. A request larger than
+        the bucket goes through once the bucket is full.
         
         Args:
             tokens: Number of tokens to acquire
             
         Returns:
-            True if tokens were acquired, False if rate limited
+            True once the tokens were acquired
         """
-        async with self._lock:
-            now = time.time()
-            
-            # Refill tokens based on elapsed time
-            elapsed = now - self.last_update
-            tokens_to_add = elapsed * (self.max_requests / self.time_window)
-            self.tokens = min(self.max_requests, self.tokens + tokens_to_add)
-            self.last_update = now
-            
-            # Check if we have enough tokens
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                self._record_request(now)
-                logger.debug(f"Rate limiter: {tokens} tokens acquired, {self.tokens:.2f} remaining")
-                return True
-            else:
-                # Calculate wait time
-                wait_time = self._calculate_wait_time(tokens)
-                logger.warning(f"Rate limited: need {tokens} tokens, have {self.tokens:.2f}. Wait {wait_time:.2f}s")
+        needed = min(tokens, self.max_requests)
+        
+        while True:
+            async with self._lock:
+                now = time.time()
+                
+                # Refill tokens based on elapsed time
+                elapsed = now - self.last_update
+                tokens_to_add = elapsed * (self.max_requests / self.time_window)
+                self.tokens = min(self.max_requests, self.tokens + tokens_to_add)
+                self.last_update = now
                 
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    return await self.acquire(tokens)
+                # Check if we have enough tokens
+                if self.tokens >= needed:
+                    self.tokens -= tokens
+                    self._record_request(now)
+                    logger.debug(f"Rate limiter: {tokens} tokens acquired, {self.tokens:.2f} remaining")
+                    return True
                 
-                return False
+                wait_time = self._calculate_wait_time(needed)
+            
+            logger.warning(f"Rate limited: need {tokens} tokens, have {self.tokens:.2f}. Wait {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
     
     async def wait_for_capacity(self, tokens: int = 1) -> None:
         """
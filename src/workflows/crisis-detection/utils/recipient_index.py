@@ -0,0 +1,229 @@
+"""
+Indexed recipient selection - inverted index over expertise with availability ranking
+"""
+
+import heapq
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Expertise areas relevant to each threat type
+THREAT_EXPERTISE = {
+    "scandal": ["crisis", "legal", "press", "scandal", "media"],
+    "scandal_emergence": ["crisis", "legal", "press", "scandal", "media"],
+    "misinformation": ["digital", "social_media", "online_reputation", "messaging"],
+    "misinformation_spread": ["digital", "social_media", "online_reputation", "messaging"],
+    "policy_criticism": ["strategy", "messaging", "media"],
+    "policy_backlash": ["strategy", "messaging", "media"],
+    "legal": ["legal", "compliance"],
+    "unknown": ["crisis", "messaging"]
+}
+
+# How many recipients to notify by priority
+RECIPIENTS_PER_PRIORITY = {
+    "critical": 4,
+    "high": 3,
+    "medium": 2,
+    "low": 1
+}
+
+
+class RecipientIndex:
+    """
+    Inverted index from expertise and role terms to recipients
+
+    Selection only scores recipients that match the query terms, checks
+    availability in each recipient's own timezone (once per distinct
+    timezone and hours pair) and ranks by response score. Results are
+    cached per query and quarter-hour, and invalidated whenever the index
+    or a score changes, so repeat selections on rosters of thousands are
+    sub-millisecond.
+    """
+
+    def __init__(self, profiles: Optional[Iterable[Any]] = None, cache_size: int = 1024):
+        self.profiles: Dict[str, Any] = {}
+        self._terms: Dict[str, Set[str]] = {}
+        self._zones: Dict[str, Any] = {}
+        self._groups: Dict[str, tuple] = {}
+        self._scores: Dict[str, float] = {}
+        self._cache: Dict[tuple, List[str]] = {}
+        self.cache_size = cache_size
+
+        for profile in profiles or []:
+            self.add(profile)
+
+    def add(self, profile: Any) -> None:
+        """Index a recipient profile (replaces any profile with the same id)"""
+        if profile.id in self.profiles:
+            self.remove(profile.id)
+
+        self.profiles[profile.id] = profile
+        self._groups[profile.id] = (profile.timezone, tuple(profile.availability_hours))
+        self._scores[profile.id] = profile.response_history.get("avg_score", 0.7)
+        self._cache.clear()
+        for term in self._profile_terms(profile):
+            self._terms.setdefault(term, set()).add(profile.id)
+
+    def remove(self, recipient_id: str) -> None:
+        """Remove a recipient from the index"""
+        profile = self.profiles.pop(recipient_id, None)
+        if not profile:
+            return
+        del self._groups[recipient_id]
+        del self._scores[recipient_id]
+        self._cache.clear()
+
+        for term in self._profile_terms(profile):
+            ids = self._terms.get(term)
+            if ids:
+                ids.discard(recipient_id)
+                if not ids:
+                    del self._terms[term]
+
+    def update_score(self, recipient_id: str, score: float) -> None:
+        """Update a recipient's response score used for ranking"""
+        if recipient_id in self._scores:
+            self._scores[recipient_id] = score
+            self._cache.clear()
+
+    def _profile_terms(self, profile: Any) -> Set[str]:
+        """Index terms for a profile"""
+        terms = {area.lower() for area in profile.expertise_areas}
+        terms.add(profile.role.lower())
+        return terms
+
+    def query_terms(self, threat_type: str, affected_topics: Optional[List[str]] = None) -> Set[str]:
+        """Expand a threat type and topics into index terms"""
+        threat_type = (threat_type or "unknown").lower()
+        terms = set(THREAT_EXPERTISE.get(threat_type, THREAT_EXPERTISE["unknown"]))
+        terms.update(threat_type.split("_"))
+        for topic in affected_topics or []:
+            terms.add(topic.lower())
+        return terms
+
+    def select(
+        self,
+        threat_type: str,
+        priority: str,
+        current_time: Optional[datetime] = None,
+        affected_topics: Optional[List[str]] = None,
+        limit: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Select the best recipients for a threat
+
+        Recipients are scored by expertise matches, availability in their
+        local timezone and past response score. Unavailable recipients are
+        only used when there are not enough available matches.
+
+        Args:
+            threat_type: Crisis threat type
+            priority: Alert priority value ("critical", "high", ...)
+            current_time: Time of the alert (default: now, UTC)
+            affected_topics: Topics that may match expertise areas
+            limit: Number of recipients (default: RECIPIENTS_PER_PRIORITY)
+
+        Returns:
+            Recipient profiles, best first
+        """
+        current_time = current_time or datetime.now(timezone.utc)
+        if current_time.tzinfo is None:
+            current_time = current_time.astimezone()
+        limit = limit or RECIPIENTS_PER_PRIORITY.get(priority, 2)
+        terms = self.query_terms(threat_type, affected_topics)
+
+        # Every real timezone offset is a multiple of 15 minutes, so local
+        # hours (and therefore availability) are constant within a bucket
+        bucket = int(current_time.timestamp() // 900)
+        cache_key = (frozenset(terms), limit, bucket)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return [self.profiles[recipient_id] for recipient_id in cached]
+
+        # Count expertise matches for candidates only
+        matches = Counter()
+        for term in terms:
+            ids = self._terms.get(term)
+            if ids:
+                matches.update(ids)
+
+        # Availability is evaluated once per (timezone, hours) group
+        hours: Dict[str, int] = {}
+        group_available: Dict[tuple, bool] = {}
+        available = []
+        unavailable = []
+        groups = self._groups
+        scores = self._scores
+        for recipient_id, match_count in matches.items():
+            group = groups[recipient_id]
+            is_available = group_available.get(group)
+            if is_available is None:
+                is_available = self.is_available(self.profiles[recipient_id], current_time, hours)
+                group_available[group] = is_available
+
+            entry = (match_count + scores[recipient_id], recipient_id)
+            if is_available:
+                available.append(entry)
+            else:
+                unavailable.append(entry)
+
+        ranked = heapq.nlargest(limit, available)
+        if len(ranked) < limit:
+            ranked += heapq.nlargest(limit - len(ranked), unavailable)
+
+        selected_ids = [recipient_id for _, recipient_id in ranked]
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[cache_key] = selected_ids
+
+        return [self.profiles[recipient_id] for recipient_id in selected_ids]
+
+    def is_available(
+        self,
+        profile: Any,
+        current_time: datetime,
+        hour_cache: Optional[Dict[str, int]] = None
+    ) -> bool:
+        """Check a recipient's availability hours in their own timezone"""
+        hour = self.local_hour(profile.timezone, current_time, hour_cache)
+        start, end = profile.availability_hours
+
+        if start <= end:
+            return start <= hour <= end
+        # Overnight shifts, e.g. (22, 6)
+        return hour >= start or hour <= end
+
+    def local_hour(
+        self,
+        tz_name: str,
+        current_time: datetime,
+        hour_cache: Optional[Dict[str, int]] = None
+    ) -> int:
+        """Hour of current_time in a timezone (naive times are taken as local)"""
+        if hour_cache is not None and tz_name in hour_cache:
+            return hour_cache[tz_name]
+
+        if current_time.tzinfo is None:
+            current_time = current_time.astimezone()
+
+        zone = self._zones.get(tz_name)
+        if zone is None:
+            try:
+                zone = ZoneInfo(tz_name)
+            except (ZoneInfoNotFoundError, ValueError):
+                logger.warning(f"Unknown timezone {tz_name}, using UTC")
+                zone = timezone.utc
+            self._zones[tz_name] = zone
+
+        hour = current_time.astimezone(zone).hour
+        if hour_cache is not None:
+            hour_cache[tz_name] = hour
+        return hour
+
+    def __len__(self) -> int:
+        return len(self.profiles)
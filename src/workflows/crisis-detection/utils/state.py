@@ -2,12 +2,25 @@
 Workflow State Management for Crisis Detection
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Annotated, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field
 
-from ..agents.crisis_detection import CrisisMention, CrisisAnalysis
+from ..agents.crisis_detection import CrisisAnalysis
 from ..agents.alert_routing import AlertRoute
+from .mention_batch import MentionBatch
+
+
+def merge_dicts(left: Optional[Dict], right: Optional[Dict]) -> Optional[Dict]:
+    """
+    Reducer for state fields that concurrent graph branches both write
+    (LangGraph applies it to every update instead of keeping the last)
+    """
+    if not left:
+        return right
+    if not right:
+        return left
+    return {**left, **right}
 
 
 class WorkflowState(BaseModel):
@@ -16,13 +29,17 @@ class WorkflowState(BaseModel):
     # Workflow timestamps
     timestamp: datetime = Field(default_factory=datetime.now)
     
-    # Input data
-    mentions: List[CrisisMention] = []
+    # Input data (columnar; convert with MentionBatch.to_models() at API boundaries)
+    mentions: MentionBatch = Field(default_factory=MentionBatch)
     campaign_context: Dict[str, Any] = {}
     
     # Processing data
     enriched_mentions: List[Dict] = []
     source_count: int = 0
+    mentions_shed: int = 0
+    trending_terms: List[Dict] = []
+    cascades: List[Dict] = []
+    fast_lane_mentions: List[str] = []  # Mentions already alerted on by the fast lane
     
     # Analysis results
     analysis: Optional[CrisisAnalysis] = None
@@ -36,9 +53,13 @@ class WorkflowState(BaseModel):
     # Delivery tracking
     delivery_results: Dict[str, Dict] = {}
     alerts_sent: int = 0
+    alerts_suppressed: int = 0
+    
+    # Learning data (learning and delivery outcomes are merged in)
+    learning_data: Annotated[Optional[Dict], merge_dicts] = None
     
-    # Learning data
-    learning_data: Optional[Dict] = None
+    # Graph node (start, finish) perf_counter times, merged across branches
+    node_timings: Annotated[Dict[str, Tuple[float, float]], merge_dicts] = {}
     
     # Error handling
     error: Optional[str] = None
@@ -51,11 +72,14 @@ class WorkflowState(BaseModel):
         return {
             "timestamp": self.timestamp.isoformat(),
             "mentions_count": len(self.mentions),
+            "mentions_shed": self.mentions_shed,
+            "fast_lane_mentions": len(self.fast_lane_mentions),
             "campaign_context": self.campaign_context,
             "severity": self.severity,
             "threat_detected": self.threat_detected,
             "alert_count": self.alert_count,
             "alerts_sent": self.alerts_sent,
+            "alerts_suppressed": self.alerts_suppressed,
             "error": self.error
         }
     
@@ -0,0 +1,355 @@
+"""
+CPU text processing - keyword extraction and relevance scoring off the event loop
+"""
+
+import asyncio
+import multiprocessing
+import os
+import re
+import time
+import zlib
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'})
+
+
+def extract_keywords(content: str) -> List[str]:
+    """Up to 10 most common words longer than 3 characters, excluding stop words"""
+    # Simple keyword extraction - in production use NLP
+    words = content.lower().split()
+    keywords = [
+        word.strip('.,!?;:"')
+        for word in words
+        if len(word) > 3 and word not in STOP_WORDS
+    ]
+    return [word for word, _ in Counter(keywords).most_common(10)]
+
+
+def relevance_score(content: str, campaign_context: Dict) -> float:
+    """How relevant a mention is to the campaign (0.5 base, capped at 1.0)"""
+    text = content.lower()
+    score = 0.5
+
+    candidate = campaign_context.get("candidate_name")
+    if candidate and candidate.lower() in text:
+        score += 0.3
+
+    for issue in campaign_context.get("key_issues") or ():
+        if issue.lower() in text:
+            score += 0.1
+
+    for opponent in campaign_context.get("opponents") or ():
+        if opponent.lower() in text:
+            score += 0.2
+
+    return min(score, 1.0)
+
+
+_URL = re.compile(r"https?://[^\s<>\"')\]]+", re.IGNORECASE)
+_HANDLE = re.compile(r"@\w+")
+_WORD = re.compile(r"[a-z0-9#]+(?:'[a-z]+)?")
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "igshid", "ref_src")
+
+# Content signatures: one-permutation MinHash over word bigrams, banded
+# for locality-sensitive lookup (near-identical texts share a band key)
+SIGNATURE_BINS = 16
+SIGNATURE_BANDS = 4
+MIN_SIGNATURE_WORDS = 4
+_EMPTY_BIN = 1 << 40  # Above any crc32 >> 4 value or borrowed offset
+
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme and host, drop fragment, tracking parameters and trailing slash"""
+    url = url.rstrip(".,;:!?")
+    if "?" not in url and "#" not in url:
+        # Common case (permalinks, short links) without urlsplit
+        scheme, separator, rest = url.partition("://")
+        host, slash, path = rest.partition("/")
+        return f"{scheme.lower()}{separator}{host.lower()}{slash}{path}".rstrip("/")
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    query = parts.query
+    if query:
+        query = urlencode([
+            (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+            if not key.lower().startswith(_TRACKING_PARAMS)
+        ])
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip("/"),
+        query,
+        ""
+    ))
+
+
+def extract_urls(content: str) -> List[str]:
+    """Normalized URLs linked from a mention"""
+    if "http" not in content and "HTTP" not in content:
+        return []
+    return [normalize_url(url) for url in _URL.findall(content)]
+
+
+def content_signature(content: str) -> Tuple[int, ...]:
+    """
+    Locality-sensitive band keys of a mention's wording
+
+    Text is normalized (lowercase, URLs, @handles and a leading "rt"
+    removed) and shingled into word bigrams. A one-permutation MinHash
+    (crc32, so keys agree across worker processes) fills SIGNATURE_BINS
+    minimums, grouped into SIGNATURE_BANDS band keys: two texts share at
+    least one key with high probability once their bigram Jaccard
+    similarity exceeds ~0.7, and rarely below ~0.4. Texts shorter than
+    MIN_SIGNATURE_WORDS words get no keys (too generic to link on).
+    """
+    text = content.lower()
+    if "http" in text:
+        text = _URL.sub(" ", text)
+    if "@" in text:
+        text = _HANDLE.sub(" ", text)
+    words = _WORD.findall(text)
+    if words and words[0] == "rt":
+        words = words[1:]
+    if len(words) < MIN_SIGNATURE_WORDS:
+        return ()
+
+    mins = [_EMPTY_BIN] * SIGNATURE_BINS
+    previous = words[0]
+    for word in words[1:]:
+        h = zlib.crc32(f"{previous} {word}".encode("utf-8"))
+        previous = word
+        value = h >> 4
+        slot = h & (SIGNATURE_BINS - 1)
+        if value < mins[slot]:
+            mins[slot] = value
+
+    # Densify: an empty bin borrows the next filled bin's minimum (offset
+    # by the distance, so borrowed values never equal real ones)
+    if _EMPTY_BIN in mins:
+        borrowed, distance = _EMPTY_BIN, 0
+        for slot in range(2 * SIGNATURE_BINS - 1, -1, -1):
+            slot %= SIGNATURE_BINS
+            value = mins[slot]
+            if value < 0x10000000:
+                borrowed, distance = value, 0
+            else:
+                distance += 1
+                if borrowed < 0x10000000:
+                    mins[slot] = borrowed + distance * 0x10000000
+
+    rows = SIGNATURE_BINS // SIGNATURE_BANDS
+    return tuple(
+        hash((band, *mins[band * rows:(band + 1) * rows]))
+        for band in range(SIGNATURE_BANDS)
+    )
+
+
+# Chunk operations: run on a list of texts in a worker (or inline) and
+# return compact results
+
+def _keywords_chunk(texts: List[str], _: Any) -> List[Tuple[str, ...]]:
+    return [tuple(extract_keywords(text)) for text in texts]
+
+
+def _signatures_chunk(texts: List[str], _: Any) -> List[Tuple[int, ...]]:
+    return [content_signature(text) for text in texts]
+
+
+def _relevance_chunk(texts: List[str], campaign_context: Dict) -> array:
+    return array("d", (relevance_score(text, campaign_context) for text in texts))
+
+
+def _match_chunk(texts: List[str], keywords: Sequence[str]) -> array:
+    return array("b", (any(kw in text.lower() for kw in keywords) for text in texts))
+
+
+def _run_chunk(
+    shm_name: str,
+    count: int,
+    start: int,
+    end: int,
+    operation: Callable[[List[str], Any], Any],
+    arg: Any
+) -> Any:
+    """Worker: decode texts start..end from the shared buffer and run operation"""
+    shm = SharedMemory(name=shm_name)
+    try:
+        header = 8 * (count + 1)
+        offsets = shm.buf[:header].cast("q")
+        body = shm.buf[header:]
+        texts = [str(body[offsets[i]:offsets[i + 1]], "utf-8") for i in range(start, end)]
+        offsets.release()
+        body.release()
+        return operation(texts, arg)
+    finally:
+        shm.close()
+
+
+class TextProcessingPool:
+    """
+    Runs per-mention text work in a process pool
+
+    Texts are packed once into a shared-memory block (int64 offsets
+    followed by UTF-8 bytes) and workers decode their own slice, so only
+    the block name and index ranges are pickled on the way out and compact
+    results (keyword tuples, typed arrays) on the way back. Batches below
+    ``min_batch_size`` run inline, where pool overhead would outweigh the
+    work. If the pool breaks, the batch is processed inline and a new pool
+    is started on the next offloaded batch.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        min_batch_size: int = 2000,
+        chunks_per_worker: int = 4
+    ):
+        """
+        Initialize text processing pool
+
+        Args:
+            max_workers: Worker processes (default: CPU count)
+            min_batch_size: Smallest batch sent to the pool
+            chunks_per_worker: Chunks each batch is split into per worker
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_batch_size = min_batch_size
+        self.chunks_per_worker = chunks_per_worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.stats = {
+            "batches_offloaded": 0,
+            "batches_inline": 0,
+            "texts_offloaded": 0,
+            "texts_inline": 0,
+            "pool_failures": 0,
+            "offload_seconds": 0.0
+        }
+
+    async def extract_keywords(self, texts: Sequence[str]) -> List[Tuple[str, ...]]:
+        """Keywords of each text (see extract_keywords)"""
+        chunks = await self._map(_keywords_chunk, texts, None)
+        return [keywords for chunk in chunks for keywords in chunk]
+
+    async def content_signatures(self, texts: Sequence[str]) -> List[Tuple[int, ...]]:
+        """Near-duplicate band keys of each text (see content_signature)"""
+        chunks = await self._map(_signatures_chunk, texts, None)
+        return [signature for chunk in chunks for signature in chunk]
+
+    async def relevance_scores(self, texts: Sequence[str], campaign_context: Dict) -> array:
+        """Campaign relevance of each text (see relevance_score)"""
+        scores = array("d")
+        for chunk in await self._map(_relevance_chunk, texts, campaign_context):
+            scores.extend(chunk)
+        return scores
+
+    async def match_keywords(self, texts: Sequence[str], keywords: Sequence[str]) -> List[int]:
+        """Indices of texts containing any of the keywords (case-insensitive)"""
+        keywords = [kw.lower() for kw in keywords]
+        matches = array("b")
+        for chunk in await self._map(_match_chunk, texts, keywords):
+            matches.extend(chunk)
+        return [i for i, matched in enumerate(matches) if matched]
+
+    async def _map(
+        self,
+        operation: Callable[[List[str], Any], Any],
+        texts: Sequence[str],
+        arg: Any
+    ) -> List[Any]:
+        """Run operation over texts in chunks; returns chunk results in order"""
+        count = len(texts)
+        if count < self.min_batch_size:
+            self.stats["batches_inline"] += 1
+            self.stats["texts_inline"] += count
+            return [operation(list(texts), arg)]
+
+        started = time.perf_counter()
+        shm = self._pack(texts)
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            chunk_size = -(-count // (self.max_workers * self.chunks_per_worker))
+            results = await asyncio.gather(*(
+                loop.run_in_executor(
+                    executor,
+                    _run_chunk,
+                    shm.name,
+                    count,
+                    start,
+                    min(start + chunk_size, count),
+                    operation,
+                    arg
+                )
+                for start in range(0, count, chunk_size)
+            ))
+        except (BrokenProcessPool, OSError) as e:
+            logger.error(f"Text processing pool failed, processing {count} texts inline: {e}")
+            self.stats["pool_failures"] += 1
+            self._shutdown_executor()
+            self.stats["batches_inline"] += 1
+            self.stats["texts_inline"] += count
+            return [operation(list(texts), arg)]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        self.stats["batches_offloaded"] += 1
+        self.stats["texts_offloaded"] += count
+        self.stats["offload_seconds"] += time.perf_counter() - started
+        return results
+
+    def _pack(self, texts: Sequence[str]) -> SharedMemory:
+        """Copy texts into a new shared-memory block: offsets then UTF-8 bytes"""
+        encoded = [text.encode("utf-8") for text in texts]
+        offsets = array("q", [0])
+        total = 0
+        for data in encoded:
+            total += len(data)
+            offsets.append(total)
+
+        header = offsets.itemsize * len(offsets)
+        shm = SharedMemory(create=True, size=max(header + total, 1))
+        shm.buf[:header] = offsets.tobytes()
+        shm.buf[header:header + total] = b"".join(encoded)
+        return shm
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Offload counters"""
+        return {
+            **self.stats,
+            "max_workers": self.max_workers,
+            "pool_running": self._executor is not None
+        }
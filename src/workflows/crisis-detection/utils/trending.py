@@ -0,0 +1,340 @@
+"""
+Streaming heavy-hitter detection for trending keywords
+"""
+
+import heapq
+import math
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CountMinSketch:
+    """
+    Count-min sketch with forward exponential decay
+
+    Counts are stored scaled by ``exp(decay_rate * (t - landmark))`` so that
+    decay costs nothing per update: estimates are divided by the same factor
+    at query time. The landmark is moved forward (and all counters rescaled)
+    only when the scale factor grows large enough to threaten precision.
+    """
+
+    # Rescale counters once the forward-decay weight exceeds this factor
+    _RESCALE_THRESHOLD = 1e12
+
+    def __init__(
+        self,
+        width: int = 4096,
+        depth: int = 4,
+        half_life_seconds: Optional[float] = None,
+        start_time: Optional[float] = None
+    ):
+        """
+        Initialize count-min sketch
+
+        Args:
+            width: Counters per row (error ~ 2/width of total weight)
+            depth: Number of hash rows (failure probability ~ 0.5^depth)
+            half_life_seconds: Decay half-life (default: no decay)
+            start_time: Landmark timestamp (default: now)
+        """
+        self.width = width
+        self.depth = depth
+        self.decay_rate = math.log(2) / half_life_seconds if half_life_seconds else 0.0
+        self.landmark = start_time if start_time is not None else time.time()
+
+        self._rows = [array("d", bytes(8 * width)) for _ in range(depth)]
+        self._seeds = [0x9E3779B1 * (i + 1) for i in range(depth)]
+        self.total_weight = 0.0
+        self.on_rescale: Optional[Callable[[float], None]] = None
+
+    def _weight(self, timestamp: float) -> float:
+        """Forward-decay weight of an item observed at timestamp"""
+        if not self.decay_rate:
+            return 1.0
+        return math.exp(self.decay_rate * (timestamp - self.landmark))
+
+    def _indexes(self, key: str) -> List[int]:
+        """Column index of key in each row"""
+        return [hash((seed, key)) % self.width for seed in self._seeds]
+
+    def add(self, key: str, count: float = 1.0, timestamp: Optional[float] = None) -> float:
+        """
+        Add an observation and return the updated landmark-scaled counter
+
+        The returned value is comparable across timestamps (until the next
+        rescale), which makes it a stable ranking score for top-k tracking.
+        Uses conservative update: only the minimal counters are raised,
+        which tightens overestimation for skewed keyword distributions.
+        """
+        timestamp = timestamp if timestamp is not None else time.time()
+        weight = self._weight(timestamp)
+        if weight > self._RESCALE_THRESHOLD:
+            self._rescale(timestamp)
+            weight = self._weight(timestamp)
+
+        increment = count * weight
+        indexes = self._indexes(key)
+        current = min(row[i] for row, i in zip(self._rows, indexes))
+        target = current + increment
+
+        for row, i in zip(self._rows, indexes):
+            if row[i] < target:
+                row[i] = target
+
+        self.total_weight += increment
+        return target
+
+    def estimate(self, key: str, timestamp: Optional[float] = None) -> float:
+        """Estimate the decayed count of key as of timestamp"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        raw = min(row[i] for row, i in zip(self._rows, self._indexes(key)))
+        return raw / self._weight(timestamp)
+
+    def total(self, timestamp: Optional[float] = None) -> float:
+        """Decayed total weight of all observations"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        return self.total_weight / self._weight(timestamp)
+
+    def _rescale(self, timestamp: float) -> None:
+        """Move landmark to timestamp and rescale all counters"""
+        factor = 1.0 / self._weight(timestamp)
+        for row in self._rows:
+            for i in range(self.width):
+                row[i] *= factor
+        self.total_weight *= factor
+        self.landmark = timestamp
+
+        if self.on_rescale:
+            self.on_rescale(factor)
+        logger.debug(f"Count-min sketch rescaled by {factor:.3e}")
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the counter arrays"""
+        return sum(row.itemsize * len(row) for row in self._rows)
+
+
+class TopK:
+    """
+    Bounded top-k candidate set over sketch estimates
+
+    Keeps at most ``capacity`` keys. A lazy min-heap finds the eviction
+    victim; stale heap entries are discarded when they surface.
+    """
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self.scores: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def offer(self, key: str, score: float) -> None:
+        """Offer a key with its latest ranking score"""
+        if key in self.scores or len(self.scores) < self.capacity:
+            self.scores[key] = score
+            heapq.heappush(self._heap, (score, key))
+        else:
+            floor_score, floor_key = self._peek_min()
+            if score <= floor_score:
+                return
+            del self.scores[floor_key]
+            heapq.heappop(self._heap)
+            self.scores[key] = score
+            heapq.heappush(self._heap, (score, key))
+
+        # Heap accumulates stale entries; rebuild when it grows too far
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(s, k) for k, s in self.scores.items()]
+            heapq.heapify(self._heap)
+
+    def discard(self, key: str) -> None:
+        """Drop a key (its heap entry goes stale and is skipped)"""
+        self.scores.pop(key, None)
+
+    def rescale(self, factor: float) -> None:
+        """Multiply all scores by factor (order is preserved)"""
+        self.scores = {k: s * factor for k, s in self.scores.items()}
+        self._heap = [(s, k) for k, s in self.scores.items()]
+        heapq.heapify(self._heap)
+
+    def _peek_min(self) -> Tuple[float, str]:
+        """Return the current minimum entry, dropping stale ones"""
+        while self._heap:
+            score, key = self._heap[0]
+            if self.scores.get(key) == score:
+                return score, key
+            heapq.heappop(self._heap)
+        return 0.0, ""
+
+    def items(self) -> List[Tuple[str, float]]:
+        """Candidates sorted by score, highest first"""
+        return sorted(self.scores.items(), key=lambda x: x[1], reverse=True)
+
+
+class TrendingKeywordTracker:
+    """
+    Detects emerging keywords across the whole mention stream
+
+    Two decayed count-min sketches run side by side: a short half-life
+    sketch tracks current activity and a long half-life sketch serves as
+    the baseline. A term is emerging when its short-window share of traffic
+    jumps well above its baseline share. Memory is fixed by sketch
+    dimensions and top-k capacity regardless of stream volume.
+    """
+
+    def __init__(
+        self,
+        width: int = 4096,
+        depth: int = 4,
+        top_k: int = 200,
+        short_half_life_seconds: float = 900,
+        baseline_half_life_seconds: float = 86400,
+        min_count: float = 5.0,
+        min_ratio: float = 3.0,
+        start_time: Optional[float] = None
+    ):
+        """
+        Initialize trending tracker
+
+        Args:
+            width: Count-min sketch width
+            depth: Count-min sketch depth
+            top_k: Number of heavy-hitter candidates to keep
+            short_half_life_seconds: Half-life of the current-activity window
+            baseline_half_life_seconds: Half-life of the baseline window
+            min_count: Minimum decayed count for a term to be reported
+            min_ratio: Minimum share ratio (current vs baseline) to report
+            start_time: Decay landmark (default: now; set to the first
+                timestamp when replaying archived mentions)
+        """
+        now = start_time if start_time is not None else time.time()
+        self.current = CountMinSketch(width, depth, short_half_life_seconds, now)
+        self.baseline = CountMinSketch(width, depth, baseline_half_life_seconds, now)
+        self.top_k = TopK(top_k)
+        self.current.on_rescale = self.top_k.rescale
+        self.min_count = min_count
+        self.min_ratio = min_ratio
+        self.updates = 0
+        self.last_timestamp = now
+
+    def update(self, terms: Iterable[str], timestamp: Optional[float] = None) -> None:
+        """Record the terms of one mention"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        self.last_timestamp = max(self.last_timestamp, timestamp)
+
+        for term in terms:
+            score = self.current.add(term, timestamp=timestamp)
+            self.baseline.add(term, timestamp=timestamp)
+            self.top_k.offer(term, score)
+
+        self.updates += 1
+
+    def update_many(
+        self,
+        term_rows: Iterable[Iterable[str]],
+        timestamps: Iterable[float]
+    ) -> None:
+        """
+        Record the terms of many mentions at once
+
+        Repeated terms are merged before touching the sketches: each
+        mention's forward-decay weight is folded into a per-term count
+        expressed relative to the latest timestamp, so every distinct term
+        costs one sketch update per page instead of one per mention.
+        """
+        counts: Dict[str, List[float]] = {}
+        rows = []
+        latest = self.last_timestamp
+        for terms, timestamp in zip(term_rows, timestamps):
+            rows.append((terms, timestamp))
+            if timestamp > latest:
+                latest = timestamp
+        if not rows:
+            return
+
+        current_rate = self.current.decay_rate
+        baseline_rate = self.baseline.decay_rate
+        for terms, timestamp in rows:
+            age = timestamp - latest
+            current_weight = math.exp(current_rate * age)
+            baseline_weight = math.exp(baseline_rate * age)
+            for term in terms:
+                pair = counts.get(term)
+                if pair is None:
+                    counts[term] = [current_weight, baseline_weight]
+                else:
+                    pair[0] += current_weight
+                    pair[1] += baseline_weight
+
+        for term, (current_count, baseline_count) in counts.items():
+            score = self.current.add(term, current_count, timestamp=latest)
+            self.baseline.add(term, baseline_count, timestamp=latest)
+            self.top_k.offer(term, score)
+
+        self.last_timestamp = latest
+        self.updates += len(rows)
+
+    def heavy_hitters(
+        self,
+        limit: int = 20,
+        timestamp: Optional[float] = None
+    ) -> List[Dict[str, float]]:
+        """Most frequent terms in the current window"""
+        timestamp = timestamp if timestamp is not None else self.last_timestamp
+        results = [
+            {"term": term, "count": self.current.estimate(term, timestamp)}
+            for term, _ in self.top_k.items()
+        ]
+        results.sort(key=lambda x: x["count"], reverse=True)
+        return results[:limit]
+
+    def emerging_terms(
+        self,
+        limit: int = 10,
+        timestamp: Optional[float] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Terms whose current frequency jumps versus baseline
+
+        Returns:
+            Dicts with term, current count, baseline count and jump ratio,
+            strongest jump first
+        """
+        timestamp = timestamp if timestamp is not None else self.last_timestamp
+        current_total = self.current.total(timestamp)
+        baseline_total = self.baseline.total(timestamp)
+        if current_total <= 0 or baseline_total <= 0:
+            return []
+
+        emerging = []
+        for term, _ in self.top_k.items():
+            count = self.current.estimate(term, timestamp)
+            if count < self.min_count:
+                continue
+
+            baseline_count = self.baseline.estimate(term, timestamp)
+            current_share = count / current_total
+            # Laplace smoothing keeps brand-new terms from dividing by zero
+            baseline_share = (baseline_count + 1.0) / (baseline_total + self.current.width)
+            ratio = current_share / baseline_share
+
+            if ratio >= self.min_ratio:
+                emerging.append({
+                    "term": term,
+                    "count": count,
+                    "baseline_count": baseline_count,
+                    "ratio": ratio
+                })
+
+        emerging.sort(key=lambda x: x["ratio"], reverse=True)
+        return emerging[:limit]
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get tracker statistics"""
+        return {
+            "updates": self.updates,
+            "candidates": len(self.top_k.scores),
+            "memory_bytes": self.current.memory_bytes() + self.baseline.memory_bytes()
+        }
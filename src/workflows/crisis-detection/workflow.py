@@ -3,21 +3,70 @@ Crisis Detection Workflow - Main orchestration using LangGraph
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Any, Set
 from datetime import datetime
 import logging
 
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import BaseMessage
-
-from .agents.crisis_detection import CrisisDetectionAgent, CrisisMention, CrisisAnalysis
+from .agents.crisis_detection import CrisisDetectionAgent, CrisisAnalysis
 from .agents.monitoring import MentionlyticsAgent, MentionlyticsConfig
-from .agents.alert_routing import AlertRoutingAgent, AlertRoute
+from .agents.alert_routing import AlertRoutingAgent, AlertRoute, AlertPriority, PersonalizationMode
 from .tools.delivery import DeliveryManager
+from .utils.author_influence import AuthorInfluenceCache
+from .utils.cascades import CascadeDetector
+from .utils.fast_lane import FastLane
+from .utils.llm_gateway import LLMGateway, get_default_gateway
+from .utils.load_shedding import LoadShedder, MentionQueue
+from .utils.mention_archive import MentionArchive
+from .utils.mention_batch import MentionBatch, MentionRecord
 from .utils.state import WorkflowState
+from .utils.text_processing import TextProcessingPool
+
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
 
 logger = logging.getLogger(__name__)
 
+# State fields each graph node may change. Nodes hand LangGraph only these
+# (when changed), so concurrent branches never write the same field;
+# fields both branches of a step write use a reducer (see WorkflowState)
+NODE_OUTPUTS = {
+    "monitor": (
+        "mentions", "source_count", "mentions_shed", "trending_terms",
+        "cascades", "fast_lane_mentions", "error"
+    ),
+    "enrich": ("enriched_mentions",),
+    "analyze": ("analysis", "severity", "threat_detected", "error"),
+    "route": ("routing_plan", "alert_count", "error"),
+    "deliver": ("delivery_results", "alerts_sent", "alerts_suppressed"),
+    "learn": ("learning_data",),
+    "join": ("learning_data",)
+}
+
+# Nodes each graph node waits on (learn follows analyze directly when there
+# is no alert to route)
+NODE_DEPENDENCIES = {
+    "monitor": (),
+    "enrich": ("monitor",),
+    "analyze": ("monitor",),
+    "route": ("analyze",),
+    "deliver": ("route",),
+    "learn": ("analyze", "route")
+}
+
+
+def critical_path_seconds(node_seconds: Dict[str, float]) -> float:
+    """Longest chain of dependent node durations among the nodes that ran"""
+    path_seconds: Dict[str, float] = {}
+    for node in NODE_DEPENDENCIES:
+        if node not in node_seconds:
+            continue
+        path_seconds[node] = node_seconds[node] + max(
+            (path_seconds[dep] for dep in NODE_DEPENDENCIES[node] if dep in path_seconds),
+            default=0.0
+        )
+    return max(path_seconds.values(), default=0.0)
+
 
 class CrisisDetectionWorkflow:
     """Main workflow for crisis detection and response"""
@@ -26,35 +75,98 @@ class CrisisDetectionWorkflow:
         self,
         openai_api_key: str,
         mentionlytics_config: MentionlyticsConfig,
-        delivery_config: Optional[Dict] = None
+        delivery_config: Optional[Dict] = None,
+        model_tiers: Optional[List[Dict]] = None,
+        llm_gateway: Optional[LLMGateway] = None,
+        history_dir: Optional[str] = None,
+        archive_dir: Optional[str] = None,
+        text_pool: Optional[TextProcessingPool] = None,
+        author_cache: Optional[AuthorInfluenceCache] = None,
+        cascade_detector: Optional[CascadeDetector] = None,
+        crisis_agent: Optional[CrisisDetectionAgent] = None,
+        alert_threshold: int = 4,
+        load_shedder: Optional[LoadShedder] = None,
+        max_cycle_mentions: int = 10000,
+        max_enrich_mentions: int = 2000,
+        fast_lane: Optional[FastLane] = None
     ):
-        # Initialize agents
-        self.crisis_agent = CrisisDetectionAgent(openai_api_key)
-        self.monitoring_agent = MentionlyticsAgent(mentionlytics_config)
-        self.routing_agent = AlertRoutingAgent(openai_api_key)
-        self.delivery_manager = DeliveryManager(delivery_config or {})
+        # One gateway shares LLM rate budgets and in-flight requests across agents
+        self.llm_gateway = llm_gateway or get_default_gateway()
+        
+        # Rolling per-author statistics shared by enrichment and analysis
+        self.author_cache = author_cache or AuthorInfluenceCache()
+        # Clusters the scanned stream into amplification cascades (shared
+        # URLs, quotes/reposts, near-identical wording)
+        self.cascade_detector = cascade_detector or CascadeDetector()
+        
+        # Histories keep recent records in memory; with history_dir set,
+        # older ones spill to compressed segment files there
+        self.crisis_agent = crisis_agent or CrisisDetectionAgent(
+            openai_api_key,
+            model_tiers=model_tiers,
+            gateway=self.llm_gateway,
+            history_dir=history_dir,
+            author_cache=self.author_cache
+        )
+        
+        # Minimum severity that routes alerts (tune with replay.py)
+        self.alert_threshold = alert_threshold
+        # High-reach negative mentions get a templated alert as soon as they
+        # arrive; the cycle's full analysis follows up with the details
+        self.fast_lane = fast_lane or FastLane(patterns=self.crisis_agent.known_patterns)
+        # Keyword extraction, filtering and relevance scoring for large
+        # pages run in worker processes shared by the workflow and monitoring
+        self.text_pool = text_pool or TextProcessingPool()
+        self.monitoring_agent = MentionlyticsAgent(mentionlytics_config, text_pool=self.text_pool)
+        
+        # Bounded work per cycle: pushed mentions wait in a bounded queue,
+        # and a cycle admits (and enriches) at most a fixed number of
+        # mentions, shedding low-reach, low-negativity ones first
+        self.load_shedder = load_shedder or LoadShedder()
+        self.mention_queue = MentionQueue(shedder=self.load_shedder)
+        self.max_cycle_mentions = max_cycle_mentions
+        self.max_enrich_mentions = max_enrich_mentions
+        self.routing_agent = AlertRoutingAgent(
+            openai_api_key,
+            model_tiers=model_tiers,
+            gateway=self.llm_gateway,
+            history_dir=history_dir
+        )
+        # With archive_dir set, every scanned mention is kept in a columnar
+        # archive there (velocity baselines, lookups and replay.py)
+        self.mention_archive = MentionArchive(archive_dir) if archive_dir else None
+        self.delivery_manager = DeliveryManager(
+            {"history_dir": history_dir, **(delivery_config or {})},
+            on_escalate=self._escalate_alert
+        )
+        
+        # Follow-up work that outlives a single workflow run
+        self._background_tasks: Set[asyncio.Task] = set()
         
         # Build workflow graph
         self.workflow = self._build_workflow()
         self.compiled_workflow = self.workflow.compile()
         
-    def _build_workflow(self) -> StateGraph:
+    def _build_workflow(self) -> "StateGraph":
         """Build the crisis detection workflow graph"""
+        # Imported here so importing the package stays cheap
+        from langgraph.graph import StateGraph, END
         
         # Create workflow with state
         workflow = StateGraph(WorkflowState)
         
         # Add nodes
-        workflow.add_node("monitor", self.monitor_sources)
-        workflow.add_node("enrich", self.enrich_context)
-        workflow.add_node("analyze", self.analyze_crisis)
-        workflow.add_node("route", self.route_alerts)
-        workflow.add_node("deliver", self.deliver_alerts)
-        workflow.add_node("learn", self.learn_from_outcome)
-        
-        # Add edges
+        workflow.add_node("monitor", self._graph_node("monitor", self.monitor_sources))
+        workflow.add_node("enrich", self._graph_node("enrich", self.enrich_context))
+        workflow.add_node("analyze", self._graph_node("analyze", self.analyze_crisis))
+        workflow.add_node("route", self._graph_node("route", self.route_alerts))
+        workflow.add_node("deliver", self._graph_node("deliver", self.deliver_alerts))
+        workflow.add_node("learn", self._graph_node("learn", self.learn_from_outcome))
+        workflow.add_node("join", self._graph_node("join", self.join_branches))
+        
+        # Analysis only reads the mentions, so enrichment runs alongside it
         workflow.add_edge("monitor", "enrich")
-        workflow.add_edge("enrich", "analyze")
+        workflow.add_edge("monitor", "analyze")
         
         # Conditional routing based on severity
         workflow.add_conditional_edges(
@@ -66,19 +178,53 @@ class CrisisDetectionWorkflow:
             }
         )
         
+        # Learning does not wait for delivery
         workflow.add_edge("route", "deliver")
-        workflow.add_edge("deliver", "learn")
-        workflow.add_edge("learn", END)
+        workflow.add_edge("route", "learn")
+        workflow.add_edge("deliver", END)
+        
+        # Join once enrichment and learning have finished; graph steps run
+        # in lockstep, so delivery (same step as learning) has finished too
+        workflow.add_edge(["enrich", "learn"], "join")
+        workflow.add_edge("join", END)
         
         # Set entry point
         workflow.set_entry_point("monitor")
         
         return workflow
     
+    def _graph_node(
+        self,
+        name: str,
+        method: Callable[[WorkflowState], Awaitable[WorkflowState]]
+    ) -> Callable[[WorkflowState], Awaitable[Dict[str, Any]]]:
+        """
+        Wrap a node method for the graph: time it and return only the
+        NODE_OUTPUTS fields it changed, plus its timing
+        """
+        fields = NODE_OUTPUTS[name]
+        
+        async def node(state: WorkflowState) -> Dict[str, Any]:
+            before = {field: getattr(state, field) for field in fields}
+            started = time.perf_counter()
+            state = await method(state)
+            update = {
+                field: getattr(state, field)
+                for field in fields
+                if getattr(state, field) is not before[field]
+            }
+            update["node_timings"] = {name: (started, time.perf_counter())}
+            return update
+        
+        return node
+    
     async def run(self, initial_state: Optional[Dict] = None) -> Dict:
         """Run the workflow"""
+        # Resume delivery jobs and escalation timers persisted by a previous process
+        self.delivery_manager.start()
+        
         state = WorkflowState(
-            mentions=[],
+            mentions=MentionBatch(),
             enriched_mentions=[],
             analysis=None,
             routing_plan=[],
@@ -88,13 +234,32 @@ class CrisisDetectionWorkflow:
         )
         
         try:
-            # Run workflow
-            result = await self.compiled_workflow.ainvoke(state)
+            # Run workflow (graph input is a plain dict of state fields)
+            result = await self.compiled_workflow.ainvoke(dict(state))
             return result
         except Exception as e:
             logger.error(f"Workflow error: {e}")
             raise
     
+    def get_load_metrics(self) -> Dict[str, Any]:
+        """Get queue depth and per-stage load shedding counts"""
+        return {
+            "queue": self.mention_queue.get_stats(),
+            "shedding": self.load_shedder.get_stats()
+        }
+    
+    def get_fast_lane_metrics(self) -> Dict[str, Any]:
+        """Get fast-lane selection and alert counts and mention-to-alert latency"""
+        return self.fast_lane.get_stats()
+    
+    def get_llm_metrics(self) -> Dict[str, Any]:
+        """Get model cascade decision metrics and gateway call statistics"""
+        return {
+            "crisis_detection": self.crisis_agent.cascade.get_metrics(),
+            "alert_routing": self.routing_agent.cascade.get_metrics(),
+            "gateway": self.llm_gateway.get_stats()
+        }
+    
     async def monitor_sources(self, state: WorkflowState) -> WorkflowState:
         """Monitor external sources for mentions"""
         logger.info("Starting source monitoring...")
@@ -103,14 +268,32 @@ class CrisisDetectionWorkflow:
             # Use monitoring agent to fetch mentions
             async with self.monitoring_agent as agent:
                 mentions = await agent.scan()
+                self.start_fast_lane(mentions, state.campaign_context)
+                
+                # Mentions pushed since the last cycle (webhooks)
+                queued = self.mention_queue.drain()
+                if queued:
+                    queued.set_keywords(await self.text_pool.extract_keywords(queued.content))
+                    agent.trending.update_many(queued.keywords, queued.published_ts)
+                    mentions.extend(queued)
+                
+                trending_terms = agent.get_emerging_terms()
             
-            # Filter mentions if keywords provided in campaign context
-            if state.campaign_context.get("monitor_keywords"):
-                keywords = state.campaign_context["monitor_keywords"]
-                mentions = [
-                    m for m in mentions
-                    if any(kw.lower() in m.content.lower() for kw in keywords)
-                ]
+            # Every scanned mention counts towards its author's statistics
+            # and, before filtering, towards amplification cascades
+            self.author_cache.observe_batch(mentions)
+            self.cascade_detector.observe_batch(
+                mentions,
+                await self.text_pool.content_signatures(mentions.content)
+            )
+            if self.mention_archive is not None:
+                self.mention_archive.append(mentions)
+            
+            state.trending_terms = trending_terms
+            state.cascades = self.cascade_detector.top_cascades()
+            mentions = await self.filter_mentions(mentions, state.campaign_context, trending_terms)
+            mentions = self.shed_mentions(state, mentions)
+            state.fast_lane_mentions = self.fast_lane.selected_ids(mentions.mention_id)
             
             logger.info(f"Found {len(mentions)} relevant mentions")
             
@@ -123,20 +306,111 @@ class CrisisDetectionWorkflow:
         
         return state
     
+    async def filter_mentions(
+        self,
+        mentions: MentionBatch,
+        campaign_context: Dict,
+        trending_terms: List[Dict]
+    ) -> MentionBatch:
+        """Keep mentions matching the campaign's monitor keywords (if any are set)"""
+        if not campaign_context.get("monitor_keywords"):
+            return mentions
+        
+        keywords = list(campaign_context["monitor_keywords"])
+        
+        # Optionally widen the filter with terms trending stream-wide
+        if campaign_context.get("monitor_trending_terms"):
+            keywords.extend(t["term"] for t in trending_terms)
+        
+        return mentions.take(await self.text_pool.match_keywords(mentions.content, keywords))
+    
+    def enqueue_mentions(self, mentions: MentionBatch, campaign_context: Optional[Dict] = None) -> int:
+        """
+        Queue mentions pushed outside the scan (e.g. webhook deliveries)
+        for the next cycle; returns how many were shed because the queue
+        was full. Call from the event loop: fast-lane alerts for the
+        mentions start right away rather than with the next cycle.
+        """
+        self.start_fast_lane(mentions, campaign_context)
+        return self.mention_queue.put(mentions)
+    
+    def start_fast_lane(self, mentions: MentionBatch, campaign_context: Optional[Dict] = None) -> int:
+        """
+        Send fast-lane alerts for qualifying mentions in the background
+        (see FastLane); returns how many mentions qualified
+        
+        Only mentions matching the campaign's monitor keywords qualify;
+        without a campaign_context the keywords of the last one seen
+        (e.g. the last cycle's) apply.
+        """
+        if campaign_context is not None:
+            self.fast_lane.set_keywords(campaign_context.get("monitor_keywords") or ())
+        groups = self.fast_lane.select(mentions)
+        for threat_type, indices in groups.items():
+            self._run_in_background(self.send_fast_lane_alert(mentions.take(indices), threat_type))
+        return sum(len(indices) for indices in groups.values())
+    
+    async def send_fast_lane_alert(self, mentions: MentionBatch, threat_type: str) -> List[AlertRoute]:
+        """Route and deliver a templated alert without enrichment or LLM calls"""
+        try:
+            analysis = self.fast_lane.analyze(mentions, threat_type)
+            logger.warning(f"Fast lane ({threat_type}, severity {analysis.severity}): {analysis.reasoning}")
+            
+            routes = await self.routing_agent.route_alert(
+                crisis_analysis=analysis,
+                mention_summary=self._create_mention_summary(mentions),
+                current_time=datetime.now(),
+                personalization_mode=PersonalizationMode.TEMPLATE,
+                use_llm_selection=False,
+                alert_key="fast_lane:" + ",".join(sorted(mentions.mention_id))
+            )
+            
+            # Fast-lane alerts can arrive before the first cycle starts delivery
+            self.delivery_manager.start()
+            await asyncio.gather(*(
+                self.delivery_manager.deliver_multi_channel(route=route, crisis_analysis=analysis)
+                for route in routes
+            ))
+            self.fast_lane.record_alert(mentions)
+            return routes
+            
+        except Exception as e:
+            self.fast_lane.stats["errors"] += 1
+            logger.error(f"Fast-lane alert error: {e}")
+            return []
+    
+    def shed_mentions(self, state: WorkflowState, mentions: MentionBatch) -> MentionBatch:
+        """Admit at most max_cycle_mentions for analysis (see LoadShedder)"""
+        admitted = self.load_shedder.shed(mentions, self.max_cycle_mentions, "cycle")
+        shed = len(mentions) - len(admitted)
+        if shed:
+            logger.warning(
+                f"Cycle over capacity: admitted {len(admitted)} of {len(mentions)} mentions, "
+                f"shed {shed} low-reach, low-negativity mentions"
+            )
+        state.mentions_shed += shed
+        return admitted
+    
     async def enrich_context(self, state: WorkflowState) -> WorkflowState:
         """Enrich mentions with additional context"""
         logger.info("Enriching mention context...")
         
+        # Per-mention lookups are the expensive part; enrich the most
+        # important mentions when a cycle is larger than that budget
+        mentions = self.load_shedder.shed(state.mentions, self.max_enrich_mentions, "enrich")
+        
         enriched_mentions = []
+        relevance = await self.text_pool.relevance_scores(
+            mentions.content,
+            state.campaign_context
+        )
         
-        for mention in state.mentions:
-            # Add campaign-specific context
+        for mention, campaign_relevance in zip(mentions, relevance):
+            # Add campaign-specific context; the record is a view into the
+            # mention batch, so nothing is copied
             enriched = {
-                "mention": mention.dict(),
-                "campaign_relevance": self._calculate_relevance(
-                    mention,
-                    state.campaign_context
-                ),
+                "mention": mention,
+                "campaign_relevance": campaign_relevance,
                 "historical_similar": await self._find_similar_past_mentions(mention),
                 "author_influence_score": self._calculate_influence_score(mention)
             }
@@ -155,14 +429,29 @@ class CrisisDetectionWorkflow:
         
         try:
             # Use crisis detection agent
+            campaign_context = state.campaign_context
+            if state.trending_terms:
+                campaign_context = {
+                    **campaign_context,
+                    "trending_terms": [t["term"] for t in state.trending_terms]
+                }
+            if state.cascades:
+                campaign_context = {
+                    **campaign_context,
+                    "amplification_cascades": [
+                        self._summarize_cascade(c) for c in state.cascades
+                    ]
+                }
+            
             analysis = await self.crisis_agent.analyze_mentions(
                 mentions=state.mentions,
-                campaign_context=state.campaign_context
+                campaign_context=campaign_context,
+                current_time=state.timestamp
             )
             
             state.analysis = analysis
             state.severity = analysis.severity
-            state.threat_detected = analysis.severity >= 4
+            state.threat_detected = analysis.severity >= self.alert_threshold
             
             logger.info(
                 f"Crisis analysis complete - Severity: {analysis.severity}/10, "
@@ -178,7 +467,10 @@ class CrisisDetectionWorkflow:
     
     def should_alert(self, state: WorkflowState) -> str:
         """Determine if alert should be sent"""
-        if state.analysis and state.analysis.severity >= 4:
+        if state.analysis and state.analysis.severity >= self.alert_threshold:
+            return "alert"
+        # Fast-lane alerts always get the detailed follow-up, even a downgrade
+        if state.analysis and state.fast_lane_mentions:
             return "alert"
         return "monitor"
     
@@ -192,12 +484,19 @@ class CrisisDetectionWorkflow:
         try:
             # Create mention summary for routing
             mention_summary = self._create_mention_summary(state.mentions)
+            if state.fast_lane_mentions:
+                mention_summary = (
+                    f"Detailed follow-up to the fast-lane alert on "
+                    f"{len(state.fast_lane_mentions)} mention(s)\n{mention_summary}"
+                )
             
             # Get routing plan
             routing_plan = await self.routing_agent.route_alert(
                 crisis_analysis=state.analysis,
                 mention_summary=mention_summary,
-                current_time=datetime.now()
+                current_time=datetime.now(),
+                # Same mentions, same alert IDs: re-running a cycle is deduplicated by the outbox
+                alert_key=",".join(sorted(state.mentions.mention_id)) or None
             )
             
             state.routing_plan = routing_plan
@@ -216,13 +515,33 @@ class CrisisDetectionWorkflow:
         logger.info("Delivering alerts...")
         
         delivery_results = {}
+        # Follow-ups to fast-lane alerts must not be folded into their digest
+        suppress = not state.fast_lane_mentions
+        
+        if len(state.routing_plan) >= self.delivery_manager.bulk_threshold:
+            # Large plans go out through provider bulk APIs, grouped by message
+            try:
+                delivery_results = await self.delivery_manager.deliver_broadcast(
+                    routes=state.routing_plan,
+                    crisis_analysis=state.analysis,
+                    suppress=suppress
+                )
+            except Exception as e:
+                logger.error(f"Broadcast delivery error: {e}")
+                delivery_results = {
+                    route.recipient.id: {"error": str(e), "success": False}
+                    for route in state.routing_plan
+                }
         
         for route in state.routing_plan:
+            if route.recipient.id in delivery_results:
+                continue
             try:
                 # Deliver through each channel
                 results = await self.delivery_manager.deliver_multi_channel(
                     route=route,
-                    crisis_analysis=state.analysis
+                    crisis_analysis=state.analysis,
+                    suppress=suppress
                 )
                 
                 delivery_results[route.recipient.id] = results
@@ -239,101 +558,210 @@ class CrisisDetectionWorkflow:
             1 for r in delivery_results.values() 
             if r.get("success", False)
         )
+        state.alerts_suppressed = sum(
+            1 for r in delivery_results.values()
+            if r.get("suppressed", False)
+        )
         
-        logger.info(f"Delivered {state.alerts_sent} alerts successfully")
+        logger.info(
+            f"Accepted {state.alerts_sent} alerts for delivery "
+            f"({state.alerts_suppressed} repeats suppressed)"
+        )
+        
+        # Templated alerts went out immediately; send personalized follow-ups
+        pending = [route for route in state.routing_plan if route.enrich_pending]
+        if pending:
+            self._run_in_background(self._deliver_enriched_follow_ups(
+                routes=pending,
+                crisis_analysis=state.analysis,
+                mention_summary=self._create_mention_summary(state.mentions)
+            ))
         
         return state
     
+    async def _deliver_enriched_follow_ups(
+        self,
+        routes: List[AlertRoute],
+        crisis_analysis: CrisisAnalysis,
+        mention_summary: str
+    ) -> None:
+        """Deliver LLM-personalized versions of alerts first sent from templates"""
+        try:
+            enriched_routes = await self.routing_agent.enrich_routes(
+                routes=routes,
+                crisis_analysis=crisis_analysis,
+                mention_summary=mention_summary
+            )
+            
+            for route in enriched_routes:
+                # The phone call and escalation already went out with the first alert
+                follow_up = route.copy(update={
+                    "channels": [c for c in route.channels if c != "phone_call"],
+                    "escalation_plan": None,
+                    "alert_id": f"{route.alert_id}-update"
+                })
+                await self.delivery_manager.deliver_multi_channel(
+                    route=follow_up,
+                    crisis_analysis=crisis_analysis,
+                    suppress=False
+                )
+            
+            logger.info(f"Delivered {len(enriched_routes)} personalized follow-up alerts")
+            
+        except Exception as e:
+            logger.error(f"Follow-up delivery error: {e}")
+    
+    async def _escalate_alert(self, record: Dict[str, Any]) -> None:
+        """Deliver an escalation for an unacknowledged alert to the escalation contact"""
+        contact = self.routing_agent.recipient_profiles.get(record["escalate_to"])
+        if not contact:
+            logger.critical(
+                f"ESCALATION TRIGGERED: {record['escalation_message']} "
+                f"(no profile for {record['escalate_to']})"
+            )
+            return
+        
+        priority = AlertPriority(record["priority"])
+        channels = await self.routing_agent._select_channels(contact, priority, datetime.now())
+        
+        # The contact's own escalation plan continues the chain if they don't respond either
+        route = AlertRoute(
+            recipient=contact,
+            channels=channels,
+            message=f"ESCALATION: {record['escalation_message']}\n\n{record['message']}",
+            priority=priority,
+            expected_response_time=self.routing_agent._get_expected_response_time(priority),
+            escalation_plan=self.routing_agent._create_escalation_plan(contact, priority),
+            message_source="template"
+        )
+        
+        logger.warning(f"Escalating alert {record['alert_id']} to {contact.id}")
+        await self.delivery_manager.deliver_multi_channel(
+            route=route,
+            crisis_analysis=CrisisAnalysis(**record["crisis_analysis"]),
+            suppress=False
+        )
+    
+    def acknowledge_alert(self, alert_id: str) -> bool:
+        """
+        Acknowledge an alert (AlertRoute.alert_id), cancelling its escalation
+        
+        Returns:
+            True if a pending escalation was cancelled
+        """
+        return self.delivery_manager.acknowledge_alert(alert_id) is not None
+    
+    def _run_in_background(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until done"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    async def wait_for_background_tasks(self) -> None:
+        """Wait for follow-up work and queued deliveries (e.g. before shutdown)"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self.delivery_manager.drain()
+    
+    async def close(self) -> None:
+        """Finish pending work, close provider sessions, stop text workers and spill histories"""
+        await self.wait_for_background_tasks()
+        await self.delivery_manager.close()
+        self.text_pool.close()
+        if self.mention_archive is not None:
+            self.mention_archive.close()
+        self.routing_agent.close()
+        self.crisis_agent.crisis_patterns.close()
+    
     async def learn_from_outcome(self, state: WorkflowState) -> WorkflowState:
         """Learn from the crisis detection outcome"""
         logger.info("Learning from outcome...")
         
-        # Store workflow run for analysis
+        # Store workflow run for analysis; delivery runs alongside, so its
+        # outcome is added at the join (join_branches)
         learning_data = {
             "timestamp": state.timestamp,
             "mentions_count": len(state.mentions),
             "severity": state.analysis.severity if state.analysis else 0,
-            "threat_detected": state.threat_detected,
-            "alerts_sent": state.alerts_sent,
-            "delivery_success_rate": self._calculate_delivery_success_rate(
-                state.delivery_results
-            )
+            "threat_detected": state.threat_detected
         }
         
-        # Update agent patterns if crisis was significant
-        if state.analysis and state.analysis.severity >= 7:
-            await self.crisis_agent._update_crisis_patterns(
-                state.mentions,
-                state.analysis
-            )
-        
-        # Log learning data
-        logger.info(f"Workflow learning data: {learning_data}")
+        # Crisis patterns are already learned by analyze_mentions
+        self.record_crisis_authors(state)
         
         state.learning_data = learning_data
         return state
     
-    def _calculate_relevance(
-        self,
-        mention: CrisisMention,
-        campaign_context: Dict
-    ) -> float:
-        """Calculate how relevant a mention is to the campaign"""
-        relevance_score = 0.5  # Base score
-        
-        # Check for candidate name
-        if campaign_context.get("candidate_name"):
-            if campaign_context["candidate_name"].lower() in mention.content.lower():
-                relevance_score += 0.3
+    async def join_branches(self, state: WorkflowState) -> WorkflowState:
+        """Record the delivery outcome and per-node timings once every branch has finished"""
+        timings = state.node_timings
+        node_seconds = {node: finished - started for node, (started, finished) in timings.items()}
         
-        # Check for key issues
-        if campaign_context.get("key_issues"):
-            for issue in campaign_context["key_issues"]:
-                if issue.lower() in mention.content.lower():
-                    relevance_score += 0.1
+        state.learning_data = {
+            **(state.learning_data or {}),
+            "alerts_sent": state.alerts_sent,
+            "alerts_suppressed": state.alerts_suppressed,
+            "delivery_success_rate": self._calculate_delivery_success_rate(
+                state.delivery_results
+            ),
+            "node_seconds": node_seconds,
+            # Longest chain of nodes that had to wait on each other, against
+            # what the same nodes would take run one after another
+            "critical_path_seconds": critical_path_seconds(node_seconds),
+            "serial_seconds": sum(node_seconds.values())
+        }
         
-        # Check for opponent names
-        if campaign_context.get("opponents"):
-            for opponent in campaign_context["opponents"]:
-                if opponent.lower() in mention.content.lower():
-                    relevance_score += 0.2
+        # Log learning data
+        logger.info(f"Workflow learning data: {state.learning_data}")
         
-        return min(relevance_score, 1.0)
+        return state
+    
+    def record_crisis_authors(self, state: WorkflowState, min_severity: int = 7) -> None:
+        """Count a crisis against the authors of negative mentions in a high-severity analysis"""
+        if not state.analysis or state.analysis.severity < min_severity:
+            return
+        self.author_cache.record_crisis(
+            (
+                author for author, sentiment in zip(state.mentions.author, state.mentions.sentiment_score)
+                if sentiment < -0.3
+            ),
+            state.timestamp.timestamp()
+        )
+    
+    def _summarize_cascade(self, cascade: Dict[str, Any]) -> Dict[str, Any]:
+        """Compact cascade description for the analysis prompt"""
+        return {
+            "seed": cascade["seed_content"][:100],
+            "seed_author": cascade["seed_author"],
+            "mentions": cascade["size"],
+            "authors": cascade["authors"],
+            "per_minute": round(cascade["growth_per_minute"], 1),
+            "negative_reach": cascade["negative_reach"],
+            "coordinated": cascade["coordinated"]
+        }
     
-    def _calculate_influence_score(self, mention: CrisisMention) -> float:
+    def _calculate_influence_score(self, mention: MentionRecord) -> float:
         """Calculate influence score of mention author"""
-        # Simple influence calculation based on reach
-        if mention.reach_count > 100000:
-            return 1.0
-        elif mention.reach_count > 10000:
-            return 0.8
-        elif mention.reach_count > 1000:
-            return 0.6
-        elif mention.reach_count > 100:
-            return 0.4
-        else:
-            return 0.2
+        # Reach bucket, adjusted by the author's history across cycles
+        return self.author_cache.influence_score(mention.author, mention.reach_count)
     
     async def _find_similar_past_mentions(
         self,
-        mention: CrisisMention
+        mention: MentionRecord
     ) -> List[Dict]:
         """Find similar mentions from history"""
         # In production, query vector database for similar mentions
         # For now, return empty list
         return []
     
-    def _create_mention_summary(self, mentions: List[CrisisMention]) -> str:
+    def _create_mention_summary(self, mentions: MentionBatch) -> str:
         """Create summary of mentions for alert"""
         if not mentions:
             return "No mentions"
         
         # Sort by reach
-        top_mentions = sorted(
-            mentions,
-            key=lambda m: m.reach_count,
-            reverse=True
-        )[:5]
+        top_mentions = mentions.top_by_reach(5)
         
         summary_parts = []
         for m in top_mentions:
@@ -342,7 +770,7 @@ class CrisisDetectionWorkflow:
                 f"(reach: {m.reach_count:,}): {m.content[:100]}..."
             )
         
-        total_reach = sum(m.reach_count for m in mentions)
+        total_reach = sum(mentions.reach_count)
         
         return (
             f"Total mentions: {len(mentions)}\n"
@@ -354,25 +782,34 @@ class CrisisDetectionWorkflow:
         self,
         delivery_results: Dict[str, Dict]
     ) -> float:
-        """Calculate overall delivery success rate"""
-        if not delivery_results:
+        """Calculate overall delivery success rate (suppressed repeats excluded)"""
+        attempted = [r for r in delivery_results.values() if not r.get("suppressed")]
+        if not attempted:
             return 0.0
         
         successful = sum(
-            1 for r in delivery_results.values()
+            1 for r in attempted
             if r.get("success", False)
         )
         
-        return successful / len(delivery_results)
+        return successful / len(attempted)
 
 
 async def run_crisis_detection(
     openai_api_key: str,
     mentionlytics_api_key: str,
     mentionlytics_api_secret: str,
-    campaign_context: Optional[Dict] = None
+    campaign_context: Optional[Dict] = None,
+    history_dir: Optional[str] = None
 ) -> Dict:
-    """Convenience function to run crisis detection workflow"""
+    """
+    Convenience function to run crisis detection workflow once
+    
+    Each call builds (and closes) its own workflow; with history_dir set,
+    the delivery outbox, alert suppression and histories persist there
+    between calls. Scheduled scans should rather keep one workflow and
+    call run() on it each cycle.
+    """
     
     # Configure Mentionlytics
     mentionlytics_config = MentionlyticsConfig(
@@ -383,9 +820,13 @@ async def run_crisis_detection(
     # Create and run workflow
     workflow = CrisisDetectionWorkflow(
         openai_api_key=openai_api_key,
-        mentionlytics_config=mentionlytics_config
+        mentionlytics_config=mentionlytics_config,
+        history_dir=history_dir
     )
     
     result = await workflow.run({"campaign_context": campaign_context or {}})
     
+    # Let follow-up alerts and queued deliveries finish before returning
+    await workflow.close()
+    
     return result
\ No newline at end of file